@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+collector 수집 처리량 벤치마크.
+
+mock_naver_api 목 서버(프로세스 내 기동 또는 --api-base-url 로 지정)와 로컬 Postgres 를 상대로
+collector.run_account_collection_tasks 를 그대로 돌리고, 단계별 소요 시간과 초당 적재 행 수를 보고합니다.
+
+단계별 시간은 collector_timing 이 계정마다 result["stage_sec"] 에 남기는 배타 시간(하위 구간 시간은 상위에서 뺌)을
+그대로 합산합니다. 단계 이름도 수집 코드와 같습니다.
+  job_lock / load_dim_targets / fetch_reports / save_stats_and_breakdowns ...   process_account 상위 단계
+  stats_api / report_download / report_parse / db_write / media ...              그 안의 하위 구간
+  other                                                                          계정 wall time - 단계 합
+
+예시:
+  python bench_collector.py --database-url postgresql://localhost/da_ads_local --accounts 20 --workers 4
+  python bench_collector.py --database-url ... --accounts 50 --campaigns 12 --keywords 60 --json bench.json --md bench.md
+  python bench_collector.py --database-url ... --baseline bench_prev.json   # 이전 결과와 비교
+
+메모리 (--memory)
+  계정마다 처리 중 최대 RSS(시작 시점 대비 증가분 포함)와 tracemalloc 기준 Python 할당 peak 를 잽니다.
+  계정별 값이 섞이지 않도록 --workers 1 로 돌리는 것을 권장합니다 (tracemalloc peak 는 workers=1 일 때만 기록).
+  python bench_collector.py --database-url ... --workers 1 --memory --no-compact-frames --json mem_before.json
+  python bench_collector.py --database-url ... --workers 1 --memory --baseline mem_before.json
+
+목 계정 customer_id 는 --customer-base 부터 씁니다. 운영 DB에는 쓰지 마세요.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import date, datetime
+from typing import Any, Dict, List
+
+from bench_utils import git_commit, percentile
+from collector_timing import summarize_stage_timings
+from mock_naver_api import ScaleSpec, start_background_server, synthetic_accounts
+
+BENCH_CUSTOMER_BASE = 9200000
+ROW_KEYS = [
+    "campaign_rows_saved", "keyword_rows_saved", "ad_rows_saved",
+    "device_campaign_rows_saved", "device_ad_rows_saved", "media_rows_saved", "shopping_query_rows_saved",
+]
+
+
+def die(msg: str, code: int = 1) -> None:
+    print(f"❌ {msg}", file=sys.stderr)
+    raise SystemExit(code)
+
+
+class RssSampler:
+    """현재 RSS 를 주기적으로 읽어 열려 있는 계정 구간마다 최대값을 갱신한다."""
+
+    def __init__(self, interval_sec: float = 0.005):
+        self.interval_sec = max(0.001, float(interval_sec))
+        self.process_peak_mb = 0.0
+        self._windows: Dict[int, List[float]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._page_mb = os.sysconf("SC_PAGE_SIZE") / (1024 * 1024) if hasattr(os, "sysconf") else 0.0
+
+    def current_mb(self) -> float:
+        try:
+            with open("/proc/self/statm", encoding="ascii") as fp:
+                return int(fp.read().split()[1]) * self._page_mb
+        except (OSError, ValueError, IndexError):
+            # /proc 가 없으면(macOS 등) 누적 최대값밖에 없어 구간 증가분은 0 에 가깝게 나온다.
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+    def _sample(self) -> None:
+        mb = self.current_mb()
+        with self._lock:
+            self.process_peak_mb = max(self.process_peak_mb, mb)
+            for window in self._windows.values():
+                window[1] = max(window[1], mb)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_sec):
+            self._sample()
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="rss-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+
+    def open_window(self) -> int:
+        mb = self.current_mb()
+        with self._lock:
+            key = id(threading.current_thread())
+            self._windows[key] = [mb, mb]
+        return key
+
+    def close_window(self, key: int) -> Dict[str, float]:
+        self._sample()
+        with self._lock:
+            start_mb, peak_mb = self._windows.pop(key, [0.0, 0.0])
+        return {"start_mb": start_mb, "peak_mb": peak_mb, "delta_mb": max(0.0, peak_mb - start_mb)}
+
+
+def _mb_stats(values: List[float]) -> Dict[str, float]:
+    return {
+        "p50": round(percentile(values, 0.50), 2),
+        "p95": round(percentile(values, 0.95), 2),
+        "max": round(max(values), 2) if values else 0.0,
+    }
+
+
+def silence_collector_logs(collector_mod) -> None:
+    quiet = lambda *_a, **_k: None  # noqa: E731
+    collector_mod.log = quiet
+    for name in ("collector_api_mod", "collector_db_mod", "collector_media_mod", "collector_parsers_mod"):
+        mod = getattr(collector_mod, name, None)
+        if mod is not None and hasattr(mod, "log"):
+            mod.log = quiet
+
+
+def build_memory_report(samples: List[Dict[str, float]], sampler: RssSampler) -> Dict[str, Any]:
+    traced = [s["traced_peak_mb"] for s in samples if "traced_peak_mb" in s]
+    out = {
+        "accounts": len(samples),
+        "rss_peak_mb": _mb_stats([s["peak_mb"] for s in samples]),
+        "rss_delta_mb": _mb_stats([s["delta_mb"] for s in samples]),
+        "process_peak_mb": round(sampler.process_peak_mb, 2),
+    }
+    if traced:
+        out["traced_peak_mb"] = _mb_stats(traced)
+    return out
+
+
+def build_report(args, spec: ScaleSpec, results: List[Dict[str, Any]], account_secs: List[float], wall_sec: float, mock_stats: Dict[str, Any], memory: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    account_total = sum(account_secs)
+    timing = summarize_stage_timings(results)
+    stage_secs = {s["stage"]: s["total_sec"] for s in timing["stages"]}
+    stage_secs["other"] = round(max(0.0, account_total - timing["total_sec"]), 3)
+    rows = {k: sum(int(r.get(k) or 0) for r in results) for k in ROW_KEYS}
+    total_rows = sum(rows.values())
+    status_counts: Dict[str, int] = {}
+    for r in results:
+        status_counts[str(r.get("status") or "unknown")] = status_counts.get(str(r.get("status") or "unknown"), 0) + 1
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "target_date": str(args.date),
+            "accounts": args.accounts,
+            "workers": args.workers,
+            "collect_mode": args.collect_mode,
+            "fast": bool(args.fast),
+            "compact_frames": not bool(args.no_compact_frames),
+            "scale": {"campaigns": spec.campaigns, "adgroups": spec.adgroups, "keywords": spec.keywords, "ads": spec.ads, "shopping_ratio": spec.shopping_ratio},
+            "mock": {"report_latency": args.report_latency, "latency_ms": args.latency_ms, "throttle_rate": args.throttle_rate, "max_rps": args.max_rps},
+        },
+        "wall_sec": round(wall_sec, 3),
+        "accounts_per_min": round(len(results) / wall_sec * 60.0, 2) if wall_sec else 0.0,
+        "rows": rows,
+        "rows_total": total_rows,
+        "rows_per_sec": round(total_rows / wall_sec, 1) if wall_sec else 0.0,
+        "status": status_counts,
+        "account_sec": {
+            "p50": round(percentile(account_secs, 0.50), 3),
+            "p95": round(percentile(account_secs, 0.95), 3),
+            "max": round(max(account_secs), 3) if account_secs else 0.0,
+            "sum": round(account_total, 3),
+        },
+        "stage_sec": stage_secs,
+        "stage_calls": {s["stage"]: s["calls"] for s in timing["stages"]},
+        "api": mock_stats.get("counters", {}),
+        **({"memory": memory} if memory else {}),
+    }
+
+
+def _delta(cur: float, base: float) -> str:
+    if not base:
+        return "-"
+    return f"{(cur - base) / base * 100.0:+.1f}%"
+
+
+def render_markdown(report: Dict[str, Any], baseline: Dict[str, Any] | None = None) -> str:
+    meta = report["meta"]
+    scale = meta["scale"]
+    lines = [
+        f"## collector 벤치마크 ({meta.get('commit') or 'working tree'})",
+        "",
+        f"- 계정 {meta['accounts']}개 x (캠페인 {scale['campaigns']} / 광고그룹 {scale['adgroups']} / 키워드 {scale['keywords']} / 소재 {scale['ads']}), workers={meta['workers']}, mode={meta['collect_mode']}{' fast' if meta['fast'] else ''}",
+        f"- 목 API: 리포트 지연 {meta['mock']['report_latency']}s, 요청 지연 {meta['mock']['latency_ms']}ms, 429 비율 {meta['mock']['throttle_rate']}",
+        f"- 상태: {', '.join(f'{k}={v}' for k, v in sorted(report['status'].items()))}",
+        f"- 리포트 프레임 compact: {'on' if meta.get('compact_frames', True) else 'off'}",
+        "",
+    ]
+    b = baseline or {}
+    head = "|지표|값|" + ("기준|변화|" if baseline else "")
+    sep = "|---|---:|" + ("---:|---:|" if baseline else "")
+    lines += [head, sep]
+
+    def row(label: str, cur: float, base: float | None):
+        if baseline:
+            lines.append(f"|{label}|{cur}|{base if base is not None else '-'}|{_delta(cur, base or 0)}|")
+        else:
+            lines.append(f"|{label}|{cur}|")
+
+    row("wall (s)", report["wall_sec"], b.get("wall_sec"))
+    row("계정/분", report["accounts_per_min"], b.get("accounts_per_min"))
+    row("적재 행", report["rows_total"], b.get("rows_total"))
+    row("행/초", report["rows_per_sec"], b.get("rows_per_sec"))
+    row("계정 p50 (s)", report["account_sec"]["p50"], (b.get("account_sec") or {}).get("p50"))
+    row("계정 p95 (s)", report["account_sec"]["p95"], (b.get("account_sec") or {}).get("p95"))
+
+    lines += ["", "|단계|누적 초(스레드 합)|비중|" + ("기준|변화|" if baseline else ""), "|---|---:|---:|" + ("---:|---:|" if baseline else "")]
+    total = sum(report["stage_sec"].values()) or 1.0
+    # 단계 이름은 수집 코드에서 오므로 기준 결과에만 있는 단계도 0 으로 보여 준다.
+    stages = list(report["stage_sec"]) + [k for k in (b.get("stage_sec") or {}) if k not in report["stage_sec"]]
+    for stage in stages:
+        cur = report["stage_sec"].get(stage, 0.0)
+        share = f"{cur / total * 100.0:.1f}%"
+        if baseline:
+            base = (b.get("stage_sec") or {}).get(stage)
+            lines.append(f"|{stage}|{cur}|{share}|{base if base is not None else '-'}|{_delta(cur, base or 0)}|")
+        else:
+            lines.append(f"|{stage}|{cur}|{share}|")
+
+    mem = report.get("memory")
+    if mem:
+        b_mem = b.get("memory") or {}
+        lines += ["", "|메모리 (계정당 MB)|p50|p95|max|" + ("기준 p95|변화|" if baseline else ""), "|---|---:|---:|---:|" + ("---:|---:|" if baseline else "")]
+        for key, label in (("rss_peak_mb", "최대 RSS"), ("rss_delta_mb", "RSS 증가분"), ("traced_peak_mb", "Python 할당 peak")):
+            cur = mem.get(key)
+            if not cur:
+                continue
+            line = f"|{label}|{cur['p50']}|{cur['p95']}|{cur['max']}|"
+            if baseline:
+                base = (b_mem.get(key) or {}).get("p95")
+                line += f"{base if base is not None else '-'}|{_delta(cur['p95'], base or 0)}|"
+            lines.append(line)
+        lines.append(f"\n- 프로세스 최대 RSS: {mem['process_peak_mb']} MB (계정 {mem['accounts']}개 측정)")
+
+    if report.get("api"):
+        lines += ["", "|API|요청 수|", "|---|---:|"]
+        for k, v in report["api"].items():
+            lines.append(f"|{k}|{v}|")
+    return "\n".join(lines) + "\n"
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="collector 처리량 벤치마크 (목 API + 로컬 Postgres)")
+    ap.add_argument("--database-url", default=os.getenv("DATABASE_URL", ""), help="기본값: DATABASE_URL 환경변수")
+    ap.add_argument("--api-base-url", default="", help="이미 떠 있는 목 서버 주소 (비우면 프로세스 안에서 띄움)")
+    ap.add_argument("--date", default="2026-04-01")
+    ap.add_argument("--accounts", type=int, default=10)
+    ap.add_argument("--customer-base", type=int, default=BENCH_CUSTOMER_BASE)
+    ap.add_argument("--workers", type=int, default=4)
+    ap.add_argument("--collect-mode", default="sa_with_device")
+    ap.add_argument("--fast", action="store_true", help="collector --fast 와 동일")
+    ap.add_argument("--skip-dim", action="store_true")
+    ap.add_argument("--campaigns", type=int, default=8)
+    ap.add_argument("--adgroups", type=int, default=6)
+    ap.add_argument("--keywords", type=int, default=30)
+    ap.add_argument("--ads", type=int, default=3)
+    ap.add_argument("--shopping-ratio", type=float, default=0.25)
+    ap.add_argument("--report-latency", type=float, default=2.0)
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--throttle-rate", type=float, default=0.0)
+    ap.add_argument("--max-rps", type=float, default=0.0)
+    ap.add_argument("--quiet", action="store_true", help="collector 로그 숨김")
+    ap.add_argument("--json", dest="json_out", default="", help="결과를 JSON 파일로 저장")
+    ap.add_argument("--md", dest="md_out", default="", help="결과를 markdown 파일로 저장 (GITHUB_STEP_SUMMARY 에도 추가)")
+    ap.add_argument("--baseline", default="", help="비교할 이전 --json 결과")
+    ap.add_argument("--memory", action="store_true", help="계정별 최대 RSS / tracemalloc peak 측정 (--workers 1 권장)")
+    ap.add_argument("--no-compact-frames", action="store_true", help="리포트 프레임을 dtype=str 그대로 보관 (REPORT_FRAME_COMPACT=0, 비교 기준용)")
+    args = ap.parse_args()
+
+    if not args.database_url:
+        die("--database-url 또는 DATABASE_URL 이 필요합니다.")
+    target_date = date.fromisoformat(args.date)
+    spec = ScaleSpec(args.campaigns, args.adgroups, args.keywords, args.ads, args.shopping_ratio)
+
+    server = state = None
+    base_url = args.api_base_url.rstrip("/")
+    if not base_url:
+        server, state = start_background_server(
+            spec,
+            report_latency=args.report_latency,
+            latency_ms=args.latency_ms,
+            throttle_rate=args.throttle_rate,
+            max_rps=args.max_rps,
+        )
+        base_url = state.base_url
+
+    # collector 는 import 시점에 BASE_URL / API 키 / DATABASE_URL 을 읽는다.
+    os.environ["NAVER_API_BASE_URL"] = base_url
+    os.environ.setdefault("NAVER_API_KEY", "mock")
+    os.environ.setdefault("NAVER_API_SECRET", "mock")
+    os.environ["DATABASE_URL"] = args.database_url
+    import collector as collector_mod
+
+    if args.quiet:
+        silence_collector_logs(collector_mod)
+    if args.fast:
+        collector_mod.FAST_MODE = True
+        os.environ["COLLECTOR_FAST_MODE"] = "1"
+    if args.no_compact_frames:
+        collector_mod.REPORT_FRAME_COMPACT = False
+
+    engine = collector_mod.get_engine()
+    collector_mod.ensure_tables(engine)
+
+    run_args = collector_mod.build_main_arg_parser().parse_args(["--workers", str(args.workers), "--collect_mode", args.collect_mode])
+    run_args.collect_mode = collector_mod.normalize_collect_mode(run_args.collect_mode)
+    run_args.fast = bool(args.fast)
+    run_args.skip_dim = bool(args.skip_dim or args.fast)
+    args.collect_mode = run_args.collect_mode
+
+    accounts = [{"id": a["id"], "name": a["name"]} for a in synthetic_accounts(args.accounts, start=args.customer_base)]
+    account_secs: List[float] = []
+    account_lock = threading.Lock()
+    process_account = collector_mod.process_account
+
+    sampler = RssSampler() if args.memory else None
+    memory_samples: List[Dict[str, float]] = []
+    trace_python = bool(args.memory and args.workers == 1)
+
+    def timed_process_account(*a, **kw):
+        window = sampler.open_window() if sampler else None
+        if trace_python:
+            tracemalloc.reset_peak()
+            traced_start = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        try:
+            return process_account(*a, **kw)
+        finally:
+            elapsed = time.perf_counter() - t0
+            sample = sampler.close_window(window) if sampler else None
+            if sample is not None and trace_python:
+                sample["traced_peak_mb"] = max(0, tracemalloc.get_traced_memory()[1] - traced_start) / (1024 * 1024)
+            with account_lock:
+                account_secs.append(elapsed)
+                if sample is not None:
+                    memory_samples.append(sample)
+
+    collector_mod.process_account = timed_process_account
+    if sampler:
+        if args.workers != 1:
+            print("ℹ️ --memory: workers>1 이면 계정 구간이 겹쳐 RSS 가 섞이고 tracemalloc peak 는 생략됩니다.", flush=True)
+        if trace_python:
+            tracemalloc.start()
+        sampler.start()
+
+    print(f"⏱️ 벤치마크 시작 | 계정 {len(accounts)}개 / workers {args.workers} / API {base_url}", flush=True)
+    t0 = time.perf_counter()
+    results = collector_mod.run_account_collection_tasks(engine, accounts, target_date, run_args)
+    wall_sec = time.perf_counter() - t0
+    memory = None
+    if sampler:
+        sampler.stop()
+        if trace_python:
+            tracemalloc.stop()
+        memory = build_memory_report(memory_samples, sampler)
+
+    mock_stats: Dict[str, Any] = {}
+    if state is not None:
+        mock_stats = state.snapshot()
+        server.shutdown()
+    else:
+        try:
+            import requests
+            mock_stats = requests.get(f"{base_url}/__mock/stats", timeout=10).json()
+        except Exception:
+            mock_stats = {}
+
+    report = build_report(args, spec, results, account_secs, wall_sec, mock_stats, memory)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fp:
+            baseline = json.load(fp)
+    md = render_markdown(report, baseline)
+    print(md, flush=True)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as fp:
+            json.dump(report, fp, ensure_ascii=False, indent=2)
+    if args.md_out:
+        with open(args.md_out, "w", encoding="utf-8") as fp:
+            fp.write(md)
+    summary_path = (os.getenv("GITHUB_STEP_SUMMARY") or "").strip()
+    if summary_path:
+        with open(summary_path, "a", encoding="utf-8") as fp:
+            fp.write(md)
+    return 1 if report["status"].get("error") else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
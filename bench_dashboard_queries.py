@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+"""
+대시보드 로더 지연시간 벤치마크.
+
+data.py 의 무거운 로더(query_keyword_bundle / query_ad_bundle / query_campaign_timeseries /
+query_shopping_search_terms / query_budget_bundle)를 Streamlit 없이 캐시를 우회해서 직접 호출하고,
+조회 기간 x top-N x 계정 범위 매트릭스별로 p50/p95 를 잽니다. p95 가 지연 예산을 넘으면 exit 1.
+
+데이터는 seed_dashboard_data.py 로 먼저 채웁니다.
+
+예시:
+  python seed_dashboard_data.py --database-url postgresql://localhost/da_ads_bench --preset large
+  python bench_dashboard_queries.py --database-url postgresql://localhost/da_ads_bench
+  python bench_dashboard_queries.py --database-url ... --ranges 7 30 90 365 --topn 800 1800 10000 --repeat 5
+  python bench_dashboard_queries.py --database-url ... --budget keyword_bundle=1500 --budget keyword_bundle@365d=4000 --json bench.json
+
+지연 예산(ms)은 DEFAULT_LATENCY_BUDGET_MS 위에 --budget-file(JSON) -> --budget NAME=MS 순으로 덮어씁니다.
+키는 "로더@기간d" > "로더" > "default" 순으로 찾습니다.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from bench_utils import git_commit, percentile
+from explain_dashboard_queries import die, make_engine
+
+LOADER_ORDER = ["keyword_bundle", "ad_bundle", "campaign_timeseries", "shopping_search_terms", "budget_bundle"]
+# top-N 이 SQL LIMIT 에 들어가는 로더. 나머지는 top-N 축 없이 한 번만 잰다.
+TOPN_LOADERS = {"keyword_bundle", "ad_bundle"}
+# 예산 화면은 조회 기간이 아니라 어제/이번달/전월 고정 창을 쓰므로 기간 축 없이 한 번만 잰다.
+RANGE_FREE_LOADERS = {"budget_bundle"}
+
+DEFAULT_LATENCY_BUDGET_MS = {
+    "default": 3000,
+    "keyword_bundle": 3000,
+    "ad_bundle": 3000,
+    "campaign_timeseries": 1000,
+    "shopping_search_terms": 2000,
+    "budget_bundle": 1500,
+}
+
+
+def silence_streamlit_logs() -> None:
+    for logger_name in list(logging.root.manager.loggerDict):
+        if logger_name.startswith("streamlit"):
+            logging.getLogger(logger_name).setLevel(logging.ERROR)
+
+
+def load_budgets(budget_file: str, overrides: List[str]) -> Dict[str, float]:
+    budgets: Dict[str, float] = dict(DEFAULT_LATENCY_BUDGET_MS)
+    if budget_file:
+        try:
+            with open(budget_file, encoding="utf-8") as fp:
+                budgets.update({str(k): float(v) for k, v in json.load(fp).items()})
+        except (OSError, ValueError, AttributeError) as e:
+            die(f"--budget-file 읽기 실패: {budget_file} | {type(e).__name__}: {e}")
+    for item in overrides or []:
+        name, sep, value = str(item).partition("=")
+        try:
+            if not sep:
+                raise ValueError(item)
+            budgets[name.strip()] = float(value)
+        except ValueError:
+            die(f"--budget 형식 오류 (NAME=MS): {item}")
+    return budgets
+
+
+def budget_for(budgets: Dict[str, float], loader: str, range_days: int | None) -> float:
+    if range_days is not None and f"{loader}@{range_days}d" in budgets:
+        return budgets[f"{loader}@{range_days}d"]
+    return budgets.get(loader, budgets.get("default", 0.0))
+
+
+def resolve_scope(engine: Engine, cid_count: int) -> tuple[date, tuple]:
+    with engine.connect() as conn:
+        max_dt = conn.execute(text("SELECT MAX(dt) FROM fact_campaign_daily")).scalar()
+        if max_dt is None:
+            die("fact_campaign_daily가 비어 있습니다. seed_dashboard_data.py 로 데이터를 먼저 넣어주세요.")
+        if cid_count <= 0:
+            return max_dt, tuple()
+        rows = conn.execute(
+            text(
+                """
+                SELECT customer_id FROM fact_campaign_daily
+                WHERE dt BETWEEN CAST(:d1 AS DATE) AND CAST(:d2 AS DATE)
+                GROUP BY customer_id ORDER BY SUM(cost) DESC, customer_id LIMIT :n
+                """
+            ),
+            {"d1": max_dt - timedelta(days=29), "d2": max_dt, "n": int(cid_count)},
+        )
+        return max_dt, tuple(str(r[0]) for r in rows)
+
+
+def build_loader_calls(data_mod, page_helpers_mod) -> Dict[str, Callable[..., Any]]:
+    """Uncached loader callables with the dashboard's argument shapes: fn(engine, d1, d2, cids, topn)."""
+    topup_avg_days = max(int(getattr(page_helpers_mod, "TOPUP_AVG_DAYS", 3) or 3), 1)
+
+    def _budget(engine, d1, d2, cids, topn):
+        # view_budget 과 같은 창: 어제 기준 평균 소진 / 이번달 / 전월
+        avg_d1 = d2 - timedelta(days=topup_avg_days - 1)
+        month_d1 = d2.replace(day=1)
+        prev_month_d2 = month_d1 - timedelta(days=1)
+        return data_mod.query_budget_bundle.__wrapped__(
+            engine, cids, d2, avg_d1, d2, month_d1, d2, prev_month_d2.replace(day=1), prev_month_d2, topup_avg_days
+        )
+
+    return {
+        "keyword_bundle": lambda engine, d1, d2, cids, topn: data_mod.query_keyword_bundle.__wrapped__(engine, d1, d2, cids, tuple(), topn),
+        "ad_bundle": lambda engine, d1, d2, cids, topn: data_mod.query_ad_bundle.__wrapped__(engine, d1, d2, cids, tuple(), topn),
+        "campaign_timeseries": lambda engine, d1, d2, cids, topn: data_mod.query_campaign_timeseries.__wrapped__(engine, d1, d2, cids, tuple()),
+        "shopping_search_terms": lambda engine, d1, d2, cids, topn: data_mod.query_shopping_search_terms.__wrapped__(engine, d1, d2, cids),
+        "budget_bundle": _budget,
+    }
+
+
+def build_matrix(loaders: List[str], ranges: List[int], topns: List[int], cid_scopes: Dict[int, tuple]) -> List[Dict[str, Any]]:
+    cases: List[Dict[str, Any]] = []
+    for cid_count, cids in cid_scopes.items():
+        for loader in loaders:
+            loader_ranges = [None] if loader in RANGE_FREE_LOADERS else ranges
+            loader_topns = topns if loader in TOPN_LOADERS else [None]
+            for range_days in loader_ranges:
+                for topn in loader_topns:
+                    cases.append({"loader": loader, "range_days": range_days, "topn": topn, "cid_count": cid_count, "cids": cids})
+    return cases
+
+
+def case_label(case: Dict[str, Any]) -> str:
+    parts = [case["loader"]]
+    if case["range_days"] is not None:
+        parts.append(f"{case['range_days']}d")
+    if case["topn"] is not None:
+        parts.append(f"top{case['topn']}")
+    parts.append(f"cid{case['cid_count'] or 'all'}")
+    return " ".join(parts)
+
+
+def run_case(engine: Engine, data_mod, fn: Callable[..., Any], case: Dict[str, Any], end_dt: date, *, warmup: int, repeat: int) -> Dict[str, Any]:
+    range_days = case["range_days"] or 1
+    d1 = end_dt - timedelta(days=range_days - 1)
+    sql_secs: List[float] = []
+    raw_sql_read = data_mod.sql_read
+
+    def _timed_sql_read(*a, **kw):
+        t0 = time.perf_counter()
+        try:
+            return raw_sql_read(*a, **kw)
+        finally:
+            sql_secs.append(time.perf_counter() - t0)
+
+    total_ms: List[float] = []
+    sql_ms: List[float] = []
+    rows = 0
+    data_mod.sql_read = _timed_sql_read
+    try:
+        for i in range(max(0, warmup) + max(1, repeat)):
+            sql_secs.clear()
+            t0 = time.perf_counter()
+            df = fn(engine, d1, end_dt, case["cids"], case["topn"])
+            elapsed = time.perf_counter() - t0
+            if i < warmup:
+                continue
+            total_ms.append(elapsed * 1000.0)
+            sql_ms.append(sum(sql_secs) * 1000.0)
+            rows = 0 if df is None else int(len(df))
+    finally:
+        data_mod.sql_read = raw_sql_read
+    return {
+        "loader": case["loader"],
+        "range_days": case["range_days"],
+        "topn": case["topn"],
+        "cid_count": case["cid_count"],
+        "rows": rows,
+        "p50_ms": round(percentile(total_ms, 0.50), 1),
+        "p95_ms": round(percentile(total_ms, 0.95), 1),
+        "max_ms": round(max(total_ms), 1),
+        "sql_p50_ms": round(percentile(sql_ms, 0.50), 1),
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="대시보드 로더 지연시간 벤치마크 (Streamlit 없이 data.py 직접 호출)")
+    ap.add_argument("--database-url", default=os.getenv("DATABASE_URL", ""), help="기본값: DATABASE_URL 환경변수")
+    ap.add_argument("--loaders", nargs="*", choices=LOADER_ORDER, default=LOADER_ORDER)
+    ap.add_argument("--ranges", nargs="*", type=int, default=[7, 30, 90], help="조회 기간(일) 목록, 최신 적재일 기준")
+    ap.add_argument("--topn", nargs="*", type=int, default=[800, 1800, 10000], help="keyword/ad 번들 topn_cost 목록")
+    ap.add_argument("--cid-counts", nargs="*", type=int, default=[0], help="계정 범위 목록 (0=전체, N=최근 30일 비용 상위 N개)")
+    ap.add_argument("--warmup", type=int, default=1)
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--budget-file", default="", help='JSON {"default": 3000, "keyword_bundle": 1500, "keyword_bundle@365d": 4000}')
+    ap.add_argument("--budget", action="append", default=[], help="NAME=MS (반복 가능)")
+    ap.add_argument("--no-budget", action="store_true", help="예산 초과여도 exit 0 (측정만)")
+    ap.add_argument("--json", dest="json_out", default="", help="결과를 JSON 파일로 저장")
+    args = ap.parse_args()
+
+    if not args.database_url:
+        die("DATABASE_URL 또는 --database-url 이 필요합니다.")
+    budgets = load_budgets(args.budget_file, args.budget)
+    engine = make_engine(args.database_url)
+
+    import data
+    import page_helpers
+
+    silence_streamlit_logs()
+    # 로더 안의 sql_read 도 st.cache_data 라서 반복 측정이 캐시 적중이 되지 않도록 원본으로 교체한다.
+    data.sql_read = getattr(data.sql_read, "__wrapped__", data.sql_read)
+    calls = build_loader_calls(data, page_helpers)
+
+    end_dt = None
+    cid_scopes: Dict[int, tuple] = {}
+    for cid_count in sorted(set(args.cid_counts)):
+        end_dt, cid_scopes[cid_count] = resolve_scope(engine, cid_count)
+    cases = build_matrix(args.loaders, sorted(set(args.ranges)), sorted(set(args.topn)), cid_scopes)
+    print(f"⏱️ 대시보드 벤치마크 | 기준일 {end_dt} | 케이스 {len(cases)}개 x {args.repeat}회 (warmup {args.warmup})", flush=True)
+
+    results: List[Dict[str, Any]] = []
+    over: List[str] = []
+    for case in cases:
+        label = case_label(case)
+        try:
+            row = run_case(engine, data, calls[case["loader"]], case, end_dt, warmup=args.warmup, repeat=args.repeat)
+        except Exception as e:
+            print(f"⚠️ {label} 실패 | {type(e).__name__}: {e}", flush=True)
+            results.append({"case": label, "error": f"{type(e).__name__}: {e}"})
+            over.append(label)
+            continue
+        row["case"] = label
+        row["budget_ms"] = budget_for(budgets, case["loader"], case["range_days"])
+        row["over_budget"] = bool(row["budget_ms"]) and row["p95_ms"] > row["budget_ms"]
+        results.append(row)
+        if row["over_budget"]:
+            over.append(label)
+        mark = "❌" if row["over_budget"] else "✅"
+        print(
+            f"{mark} {label:<40} rows={row['rows']:>6} p50={row['p50_ms']:>8.1f}ms p95={row['p95_ms']:>8.1f}ms "
+            f"(sql {row['sql_p50_ms']:.1f}ms) budget={row['budget_ms']:.0f}ms",
+            flush=True,
+        )
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as fp:
+            json.dump(
+                {"meta": {"commit": git_commit(), "end_dt": str(end_dt), "repeat": args.repeat, "warmup": args.warmup}, "budgets": budgets, "results": results},
+                fp,
+                ensure_ascii=False,
+                indent=2,
+            )
+        print(f"📝 저장: {args.json_out}")
+
+    print(f"예산 초과/실패 {len(over)}건" + (f" | {', '.join(over)}" if over else ""))
+    if over and not args.no_budget:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""bench_utils.py - 벤치마크 스크립트 공용 헬퍼
+
+bench_collector.py / bench_dashboard_queries.py 가 같이 쓰는 것만 둔다 (무거운 import 없음).
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+from typing import List
+
+
+def git_commit() -> str:
+    """결과 JSON 에 남길 현재 커밋 (git 이 없으면 빈 문자열)."""
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10, cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip()
+    except Exception:
+        return ""
+
+
+def percentile(values: List[float], q: float) -> float:
+    """선형 보간 백분위수 (q 는 0~1). 값이 없으면 0."""
+    if not values:
+        return 0.0
+    vals = sorted(values)
+    k = (len(vals) - 1) * q
+    lo, hi = int(k), min(int(k) + 1, len(vals) - 1)
+    return vals[lo] + (vals[hi] - vals[lo]) * (k - lo)
@@ -1,12 +1,26 @@
 # -*- coding: utf-8 -*-
-"""check_off.py - 매시간 캠페인 및 광고그룹 꺼짐(EXHAUSTED) 여부를 가볍게 스캔하는 스크립트"""
+"""check_off.py - 매시간 캠페인 및 광고그룹 꺼짐(EXHAUSTED) 여부를 가볍게 스캔하는 스크립트
+
+직전 스캔의 상태 지문(check_off_state)을 Postgres 에 보관하고, 상태/예산이 바뀐 캠페인과
+자체 예산을 쓰는 광고그룹이 있는 캠페인만 광고그룹까지 내려가 조회한다.
+캠페인 변경 없이 생긴 광고그룹 변경을 놓치지 않도록 KST 하루 첫 실행과 일정 시간마다
+광고그룹 전체를 다시 받고, 그때 사라진 캠페인/광고그룹의 상태 행을 정리한다.
+꺼짐 로그는 새로 꺼졌거나 날짜가 바뀐 경우에만 기록한다.
+
+API 호출은 공용 세션(커넥션 풀) + 초당 요청 수 제한을 거치고, 계정은 제한된 워커로
+병렬 스캔한 뒤 실행 단위로 한 번에 적재한다.
+"""
 
 import os
+import json
 import time
+import random
+import threading
 import hmac
 import base64
 import hashlib
 import requests
+from requests.adapters import HTTPAdapter
 import concurrent.futures
 import pandas as pd
 from datetime import datetime, date, timedelta
@@ -25,28 +39,83 @@ load_dotenv(override=True)
 API_KEY = (os.getenv("NAVER_API_KEY") or os.getenv("NAVER_ADS_API_KEY") or "").strip()
 API_SECRET = (os.getenv("NAVER_API_SECRET") or os.getenv("NAVER_ADS_SECRET") or "").strip()
 DB_URL = os.getenv("DATABASE_URL", "").strip()
-BASE_URL = "https://api.searchad.naver.com"
+BASE_URL = (os.getenv("NAVER_API_BASE_URL") or "https://api.searchad.naver.com").strip().rstrip("/")
+ACCOUNT_WORKERS = max(1, int(os.getenv("CHECK_OFF_WORKERS", "8") or 8))
+REQUEST_WORKERS = max(1, int(os.getenv("CHECK_OFF_REQUEST_WORKERS", "16") or 16))
+MAX_RPS = float(os.getenv("CHECK_OFF_MAX_RPS", "20") or 20)
+HTTP_MAX_RETRIES = max(1, int(os.getenv("CHECK_OFF_HTTP_MAX_RETRIES", "3") or 3))
+
+# 이 필드가 바뀐 캠페인/그룹만 변경으로 본다.
+CAMPAIGN_FP_FIELDS = ["status", "statusReason", "userLock", "dailyBudget", "useDailyBudget"]
+ADGROUP_FP_FIELDS = ["status", "statusReason", "userLock", "dailyBudget", "useDailyBudget"]
+# 내려가야 할 캠페인이 이보다 많으면 캠페인별 호출 대신 광고그룹 전체 목록을 한 번에 받는다.
+ADGROUP_FULL_SCAN_MIN = max(1, int(os.getenv("CHECK_OFF_ADGROUP_FULL_SCAN_MIN", "5") or 5))
+# 마지막 전체 스캔 후 이 시간이 지났거나 KST 날짜가 바뀌면 광고그룹 전체 목록을 다시 받는다.
+ADGROUP_FULL_SCAN_HOURS = max(1, int(os.getenv("CHECK_OFF_FULL_SCAN_HOURS", "6") or 6))
+# 마지막 전체 스캔 시각(KST)은 check_off_state 에 이 키의 행으로 계정마다 남긴다 (fingerprint 칸).
+FULL_SCAN_MARKER = ("meta", "last_full_scan")
+FULL_SCAN_TS_FMT = "%Y-%m-%d %H:%M"
 
 def sign(method, path, ts):
     msg = f"{ts}.{method}.{path}".encode("utf-8")
     dig = hmac.new(API_SECRET.encode("utf-8"), msg, hashlib.sha256).digest()
     return base64.b64encode(dig).decode("utf-8")
 
-def get_data(cid, path):
-    """네이버 API에서 캠페인/그룹 정보를 가져오는 공통 함수"""
-    ts = str(int(time.time() * 1000))
-    headers = {
-        "X-Timestamp": ts, 
-        "X-API-KEY": API_KEY, 
-        "X-Customer": str(cid), 
-        "X-Signature": sign("GET", path, ts)
-    }
-    try:
-        r = requests.get(BASE_URL + path, headers=headers, timeout=10)
-        if r.status_code == 200: return r.json()
-    except Exception: 
-        pass
-    return []
+class RateLimiter:
+    """모든 스레드가 공유하는 초당 요청 수 제한 (일정 간격 슬롯 방식)"""
+    def __init__(self, rps):
+        self.interval = 1.0 / rps if rps and rps > 0 else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        if self.interval <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+_limiter = RateLimiter(MAX_RPS)
+_session_lock = threading.Lock()
+_session = None
+_request_pool = concurrent.futures.ThreadPoolExecutor(max_workers=REQUEST_WORKERS)
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=REQUEST_WORKERS + ACCOUNT_WORKERS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+def get_data(cid, path, params=None):
+    """네이버 API에서 캠페인/그룹 정보를 가져오는 공통 함수 (실패 시 None)"""
+    session = get_session()
+    for attempt in range(HTTP_MAX_RETRIES):
+        _limiter.wait()
+        ts = str(int(time.time() * 1000))
+        headers = {
+            "X-Timestamp": ts,
+            "X-API-KEY": API_KEY,
+            "X-Customer": str(cid),
+            "X-Signature": sign("GET", path, ts)
+        }
+        try:
+            r = session.get(BASE_URL + path, headers=headers, params=params, timeout=10)
+            if r.status_code == 200: return r.json()
+            if r.status_code == 429 or r.status_code >= 500:
+                time.sleep(1 + attempt + random.uniform(0.1, 1.0))
+                continue
+            return None
+        except Exception:
+            time.sleep(1 + attempt)
+    return None
 
 def init_db(engine):
     """테이블이 없으면 자동으로 생성해주는 안전장치"""
@@ -62,90 +131,251 @@ def init_db(engine):
         PRIMARY KEY (dt, customer_id, adgroup_id)
     );
     """
+    sql_state = """
+    CREATE TABLE IF NOT EXISTS check_off_state (
+        customer_id VARCHAR(50), entity_type VARCHAR(10), entity_id VARCHAR(50), parent_id VARCHAR(50),
+        fingerprint VARCHAR(40), is_off BOOLEAN DEFAULT FALSE, off_dt DATE, own_budget BOOLEAN DEFAULT FALSE,
+        updated_at TIMESTAMP DEFAULT NOW(),
+        PRIMARY KEY (customer_id, entity_type, entity_id)
+    );
+    """
     try:
         conn = engine.raw_connection()
         cur = conn.cursor()
         cur.execute(sql_camp)
         cur.execute(sql_grp)
+        cur.execute(sql_state)
         conn.commit()
         cur.close()
         conn.close()
     except Exception:
         pass
 
-def check_account(engine, cid):
-    # 1. 네이버에서 캠페인과 그룹 전체 리스트를 한 번에 다운로드
+def fingerprint(item, fields):
+    raw = json.dumps([item.get(f) for f in fields], ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+def _is_budget_stop(status: str, reason: str) -> bool:
+    s = (status or "").upper()
+    r = (reason or "").upper()
+    return ("EXHAUSTED" in s) or any(k in r for k in ["LIMIT", "BUDGET", "EXHAUSTED"])
+
+def _off_time(item, scan_kst, target_date):
+    edit_tm = item.get("editTm", "")
+    off_time = scan_kst.strftime("%H:%M")
+    if edit_tm:
+        try:
+            utc_dt = datetime.strptime(edit_tm[:19], "%Y-%m-%dT%H:%M:%S")
+            kst_dt = utc_dt + timedelta(hours=9)
+            off_time = kst_dt.strftime("%H:%M") if kst_dt.date() == target_date else off_time
+        except Exception:
+            pass
+    return off_time
+
+def load_states(engine, cids):
+    """{customer_id: {(entity_type, entity_id): {...}}} 형태의 직전 스캔 상태 (한 번의 쿼리)"""
+    states = {str(c): {} for c in cids}
+    raw_conn = None
+    cur = None
+    try:
+        raw_conn = engine.raw_connection()
+        cur = raw_conn.cursor()
+        cur.execute(
+            "SELECT customer_id, entity_type, entity_id, parent_id, fingerprint, is_off, off_dt, own_budget FROM check_off_state WHERE customer_id = ANY(%s)",
+            (list(states.keys()),),
+        )
+        for cid, etype, eid, parent, fp, is_off, off_dt, own_budget in cur.fetchall():
+            states.setdefault(cid, {})[(etype, eid)] = {"parent_id": parent, "fingerprint": fp, "is_off": bool(is_off), "off_dt": off_dt, "own_budget": bool(own_budget)}
+    except Exception:
+        states = {str(c): {} for c in cids}
+    finally:
+        if cur: cur.close()
+        if raw_conn: raw_conn.close()
+    return states
+
+def load_state(engine, cid):
+    return load_states(engine, [cid]).get(str(cid), {})
+
+def diff_entities(cid, etype, items, id_key, parent_key, fields, state, scan_kst, target_date):
+    """현재 목록과 직전 상태를 비교해 (상태 upsert 행, 꺼짐 로그 행, 바뀐 ID 집합)을 돌려준다."""
+    state_rows = []
+    off_rows = []
+    changed = set()
+    for it in items or []:
+        eid = str(it.get(id_key) or "")
+        if not eid:
+            continue
+        fp = fingerprint(it, fields)
+        prev = state.get((etype, eid))
+        is_off = _is_budget_stop(it.get("status", ""), it.get("statusReason", ""))
+        off_dt = prev["off_dt"] if (prev and prev["is_off"]) else None
+        if prev is None or prev["fingerprint"] != fp:
+            changed.add(eid)
+        # 새로 꺼졌거나, 꺼진 상태로 날짜가 넘어간 경우에만 로그를 남긴다.
+        if is_off and (off_dt != target_date):
+            off_rows.append((target_date, str(cid), eid, _off_time(it, scan_kst, target_date)))
+            off_dt = target_date
+        own_budget = bool(it.get("useDailyBudget")) and etype == "adgroup"
+        parent_id = str(it.get(parent_key) or "") if parent_key else ""
+        off_dt = off_dt if is_off else None
+        # 지문/꺼짐 상태가 그대로면 상태 행도 다시 쓰지 않는다.
+        if prev and (prev["fingerprint"], prev["is_off"], prev["off_dt"], prev["own_budget"], prev["parent_id"]) == (fp, is_off, off_dt, own_budget, parent_id):
+            continue
+        state_rows.append((str(cid), etype, eid, parent_id, fp, is_off, off_dt, own_budget))
+    return state_rows, off_rows, changed
+
+def _full_scan_due(state, scan_kst):
+    """마커가 없거나, KST 날짜가 바뀌었거나, ADGROUP_FULL_SCAN_HOURS 가 지났으면 True"""
+    marker = state.get(FULL_SCAN_MARKER)
+    try:
+        last = datetime.strptime(str(marker["fingerprint"]), FULL_SCAN_TS_FMT)
+    except Exception:
+        return True
+    return last.date() != scan_kst.date() or (scan_kst - last) >= timedelta(hours=ADGROUP_FULL_SCAN_HOURS)
+
+def _stale_keys(cid, state, camps, grps):
+    """전체 스캔 결과에 없는 캠페인/광고그룹의 상태 키 (삭제 대상)"""
+    live = {("campaign", str(c.get("nccCampaignId") or "")) for c in camps or []}
+    live |= {("adgroup", str(g.get("nccAdgroupId") or "")) for g in grps or []}
+    return [(str(cid), etype, eid) for (etype, eid) in state if etype in ("campaign", "adgroup") and (etype, eid) not in live]
+
+def fetch_adgroups(cid, campaign_ids, full_scan):
+    if full_scan:
+        grps = get_data(cid, "/ncc/adgroups")
+        return grps if grps is not None else None
+    # 캠페인별 광고그룹 요청은 공용 요청 풀에 한꺼번에 올려 파이프라인으로 처리한다.
+    futures = [_request_pool.submit(get_data, cid, "/ncc/adgroups", {"nccCampaignId": camp_id}) for camp_id in campaign_ids]
+    out = []
+    for fut in futures:
+        grps = fut.result()
+        if grps is None:
+            return None
+        out.extend(grps)
+    return out
+
+def scan_account(cid, state, target_date, scan_kst):
+    """한 계정을 스캔해 (캠페인 꺼짐, 그룹 꺼짐, 상태 행, 삭제할 상태 키)를 돌려준다. 캠페인 조회 실패 시 None."""
+    # 1. 캠페인 목록은 매번 받고, 광고그룹은 바뀐 캠페인 아래만 내려간다.
+    #    직전 광고그룹 상태가 없거나 주기 전체 스캔 차례면 전체 목록이 필요하므로 캠페인 요청과 동시에 미리 보낸다.
+    has_adgroup_state = any(etype == "adgroup" for (etype, _) in state)
+    periodic_full = _full_scan_due(state, scan_kst)
+    prefetch = _request_pool.submit(get_data, cid, "/ncc/adgroups") if (periodic_full or not has_adgroup_state) else None
     camps = get_data(cid, "/ncc/campaigns")
-    grps = get_data(cid, "/ncc/adgroups")
-    
-    target_date = date.today()
-    camp_off = []
-    grp_off = []
-    
-    scan_kst = datetime.utcnow() + timedelta(hours=9)
+    if camps is None:
+        return None
+
+    camp_state, camp_off, changed_camps = diff_entities(
+        cid, "campaign", camps, "nccCampaignId", None, CAMPAIGN_FP_FIELDS, state, scan_kst, target_date
+    )
+    # 광고그룹 자체 예산이 소진되면 캠페인 상태는 그대로일 수 있으므로 그런 캠페인은 항상 본다.
+    own_budget_camps = {v["parent_id"] for (etype, _), v in state.items() if etype == "adgroup" and v["own_budget"]}
+    live_camps = {str(c.get("nccCampaignId") or "") for c in camps}
+    descend = sorted((changed_camps | own_budget_camps) & live_camps)
+    full_scan = periodic_full or (not has_adgroup_state) or len(descend) > ADGROUP_FULL_SCAN_MIN
+
+    grp_state, grp_off, stale = [], [], []
+    if descend or full_scan:
+        grps = prefetch.result() if prefetch is not None else fetch_adgroups(cid, descend, full_scan)
+        if grps is None:
+            # 광고그룹 조회 실패 시 캠페인 상태도 저장하지 않아 다음 실행에서 다시 내려가게 한다.
+            camp_state = [row for row in camp_state if row[2] not in changed_camps]
+        else:
+            grp_state, grp_off, _ = diff_entities(
+                cid, "adgroup", grps, "nccAdgroupId", "nccCampaignId", ADGROUP_FP_FIELDS, state, scan_kst, target_date
+            )
+            if full_scan:
+                # 전체 목록을 받은 경우에만 사라진 캠페인/광고그룹 상태를 지우고 전체 스캔 시각을 남긴다.
+                stale = _stale_keys(cid, state, camps, grps)
+                grp_state.append((str(cid), *FULL_SCAN_MARKER, "", scan_kst.strftime(FULL_SCAN_TS_FMT), False, None, False))
 
-    def _is_budget_stop(status: str, reason: str) -> bool:
-        s = (status or "").upper()
-        r = (reason or "").upper()
-        return ("EXHAUSTED" in s) or any(k in r for k in ["LIMIT", "BUDGET", "EXHAUSTED"])
-
-    # 2. 캠페인 꺼짐 검사
-    if camps:
-        for c in camps:
-            if _is_budget_stop(c.get("status", ""), c.get("statusReason", "")):
-                edit_tm = c.get("editTm", "")
-                off_time = scan_kst.strftime("%H:%M")
-                if edit_tm:
-                    try:
-                        utc_dt = datetime.strptime(edit_tm[:19], "%Y-%m-%dT%H:%M:%S")
-                        kst_dt = utc_dt + timedelta(hours=9)
-                        off_time = kst_dt.strftime("%H:%M") if kst_dt.date() == target_date else off_time
-                    except Exception:
-                        pass
-                camp_off.append((target_date, str(cid), str(c["nccCampaignId"]), off_time))
-
-    # 3. 🚨 추가된 기능: 광고그룹 꺼짐 검사
-    if grps:
-        for g in grps:
-            if _is_budget_stop(g.get("status", ""), g.get("statusReason", "")):
-                edit_tm = g.get("editTm", "")
-                off_time = scan_kst.strftime("%H:%M")
-                if edit_tm:
-                    try:
-                        utc_dt = datetime.strptime(edit_tm[:19], "%Y-%m-%dT%H:%M:%S")
-                        kst_dt = utc_dt + timedelta(hours=9)
-                        off_time = kst_dt.strftime("%H:%M") if kst_dt.date() == target_date else off_time
-                    except Exception:
-                        pass
-                grp_off.append((target_date, str(cid), str(g["nccAdgroupId"]), off_time))
-
-    # 4. 발견된 내역 DB에 꽂아넣기
+    return camp_off, grp_off, camp_state + grp_state, stale
+
+def write_results(engine, camp_off, grp_off, state_rows, stale_keys=()):
+    """꺼짐 로그와 상태 지문을 실행 단위로 모아 테이블별 multi-row insert 한 번씩 기록 (사라진 상태 행은 삭제)"""
+    # 같은 키가 한 INSERT 안에 두 번 있으면 ON CONFLICT 가 실패하므로 마지막 값만 남긴다.
+    camp_off = list({(r[0], r[1], r[2]): r for r in camp_off}.values())
+    grp_off = list({(r[0], r[1], r[2]): r for r in grp_off}.values())
+    state_rows = list({(r[0], r[1], r[2]): r for r in state_rows}.values())
+    stale_keys = list(dict.fromkeys(tuple(k) for k in stale_keys))
     raw_conn = None
     cur = None
     try:
         raw_conn = engine.raw_connection()
         cur = raw_conn.cursor()
-        
+
         # 캠페인 기록
         if camp_off:
             sql_c = 'INSERT INTO fact_campaign_off_log ("dt", "customer_id", "campaign_id", "off_time") VALUES %s ON CONFLICT ("dt", "customer_id", "campaign_id") DO UPDATE SET "off_time"=EXCLUDED."off_time"'
-            psycopg2.extras.execute_values(cur, sql_c, camp_off)
-            
+            psycopg2.extras.execute_values(cur, sql_c, camp_off, page_size=max(1, len(camp_off)))
+
         # 광고그룹 기록
         if grp_off:
             sql_g = 'INSERT INTO fact_adgroup_off_log ("dt", "customer_id", "adgroup_id", "off_time") VALUES %s ON CONFLICT ("dt", "customer_id", "adgroup_id") DO UPDATE SET "off_time"=EXCLUDED."off_time"'
-            psycopg2.extras.execute_values(cur, sql_g, grp_off)
-            
-        if camp_off or grp_off:
-            raw_conn.commit()
-            print(f"✅ [{cid}] 꺼짐 감지! (캠페인 {len(camp_off)}개, 그룹 {len(grp_off)}개 기록 완료)")
-            
+            psycopg2.extras.execute_values(cur, sql_g, grp_off, page_size=max(1, len(grp_off)))
+
+        if state_rows:
+            sql_s = (
+                'INSERT INTO check_off_state (customer_id, entity_type, entity_id, parent_id, fingerprint, is_off, off_dt, own_budget) VALUES %s '
+                'ON CONFLICT (customer_id, entity_type, entity_id) DO UPDATE SET parent_id=EXCLUDED.parent_id, fingerprint=EXCLUDED.fingerprint, '
+                'is_off=EXCLUDED.is_off, off_dt=EXCLUDED.off_dt, own_budget=EXCLUDED.own_budget, updated_at=NOW()'
+            )
+            psycopg2.extras.execute_values(cur, sql_s, state_rows, page_size=5000)
+
+        if stale_keys:
+            sql_d = 'DELETE FROM check_off_state WHERE (customer_id, entity_type, entity_id) IN (VALUES %s)'
+            psycopg2.extras.execute_values(cur, sql_d, stale_keys, page_size=5000)
+
+        raw_conn.commit()
+        return len(camp_off), len(grp_off), len(state_rows), len(stale_keys)
     except Exception as e:
+        print(f"⚠️ 꺼짐 로그 적재 실패: {e}")
         if raw_conn: raw_conn.rollback()
+        return None
     finally:
         if cur: cur.close()
         if raw_conn: raw_conn.close()
 
+def check_account(engine, cid):
+    target_date = date.today()
+    scan_kst = datetime.utcnow() + timedelta(hours=9)
+    res = scan_account(cid, load_state(engine, cid), target_date, scan_kst)
+    if res is None:
+        return
+    camp_off, grp_off, state_rows, stale = res
+    if write_results(engine, camp_off, grp_off, state_rows, stale) and (camp_off or grp_off):
+        print(f"✅ [{cid}] 꺼짐 감지! (캠페인 {len(camp_off)}개, 그룹 {len(grp_off)}개 기록 완료)")
+
+def check_accounts(engine, cids):
+    """계정은 제한된 워커로 병렬 스캔하고, 결과는 실행당 한 번에 적재한다."""
+    cids = [str(c) for c in dict.fromkeys(cids)]
+    if not cids:
+        return
+    target_date = date.today()
+    scan_kst = datetime.utcnow() + timedelta(hours=9)
+    states = load_states(engine, cids)
+    camp_off, grp_off, state_rows, stale_keys = [], [], [], []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(ACCOUNT_WORKERS, len(cids))) as exe:
+        futures = {exe.submit(scan_account, cid, states.get(cid, {}), target_date, scan_kst): cid for cid in cids}
+        for fut in concurrent.futures.as_completed(futures):
+            cid = futures[fut]
+            try:
+                res = fut.result()
+            except Exception as e:
+                print(f"⚠️ [{cid}] 스캔 실패: {e}")
+                continue
+            if res is None:
+                continue
+            c_off, g_off, rows, stale = res
+            camp_off.extend(c_off)
+            grp_off.extend(g_off)
+            state_rows.extend(rows)
+            stale_keys.extend(stale)
+            if c_off or g_off:
+                print(f"✅ [{cid}] 꺼짐 감지! (캠페인 {len(c_off)}개, 그룹 {len(g_off)}개)")
+    written = write_results(engine, camp_off, grp_off, state_rows, stale_keys)
+    if written:
+        print(f"💾 꺼짐 로그 적재: 캠페인 {written[0]}건 / 그룹 {written[1]}건 / 상태 변경 {written[2]}건 / 삭제된 대상 정리 {written[3]}건")
+
 def main():
     print("="*60)
     print(f"🚀 캠페인/그룹 꺼짐 1초 컷 스캔 시작 ({datetime.now().strftime('%Y-%m-%d %H:%M:%S')})")
@@ -193,11 +423,9 @@ def main():
     if not accounts and os.getenv("CUSTOMER_ID"):
         accounts = [os.getenv("CUSTOMER_ID")]
 
-    # DB 부하를 막기 위해 워커 3개로 천천히 스캔
-    with concurrent.futures.ThreadPoolExecutor(max_workers=3) as exe:
-        for a in accounts:
-            exe.submit(check_account, engine, a)
-        
+    # API 는 공용 세션 + 초당 요청 제한으로 병렬 스캔, DB 는 실행당 한 번만 적재
+    check_accounts(engine, accounts)
+
     print("🎉 순찰 100% 완료! (DB 안전 해제)")
 
 if __name__ == "__main__": 
@@ -13,11 +13,14 @@ import time
 import hmac
 import base64
 import hashlib
+import random
+import threading
 import concurrent.futures
 from datetime import date
 from typing import Any, Dict, List, Optional, Tuple, Callable
 
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 import psycopg2
 import psycopg2.extras
@@ -35,7 +38,10 @@ API_KEY = (os.getenv("NAVER_API_KEY") or os.getenv("NAVER_ADS_API_KEY") or "").s
 API_SECRET = (os.getenv("NAVER_API_SECRET") or os.getenv("NAVER_ADS_SECRET") or "").strip()
 DB_URL = os.getenv("DATABASE_URL", "").strip()
 ACCOUNT_MASTER_FILE = (os.getenv("ACCOUNT_MASTER_FILE") or "account_master.xlsx").strip()
-BASE_URL = "https://api.searchad.naver.com"
+BASE_URL = (os.getenv("NAVER_API_BASE_URL") or "https://api.searchad.naver.com").strip().rstrip("/")
+BIZMONEY_WORKERS = max(1, int(os.getenv("BIZMONEY_WORKERS", "10") or 10))
+HTTP_MAX_RETRIES = max(1, int(os.getenv("BIZMONEY_HTTP_MAX_RETRIES", "4") or 4))
+HTTP_TIMEOUT = max(5, int(os.getenv("BIZMONEY_HTTP_TIMEOUT", "20") or 20))
 DB_MAX_RETRIES = max(1, int(os.getenv("BIZMONEY_DB_MAX_RETRIES", "3") or 3))
 DB_RETRY_BASE_SEC = max(1.0, float(os.getenv("BIZMONEY_DB_RETRY_BASE_SEC", "2") or 2))
 
@@ -152,15 +158,36 @@ def get_header(method: str, uri: str, customer_id: str) -> Dict[str, str]:
 
 
 
+_session_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+
+
+def get_session() -> requests.Session:
+    """워커 수만큼 keep-alive 커넥션을 재사용하는 공용 세션."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=BIZMONEY_WORKERS)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+
 def get_bizmoney(customer_id: str) -> Tuple[Optional[int], Optional[dict]]:
+    # 서명(X-Timestamp)이 매 요청마다 새로 필요하므로 urllib3 Retry 대신
+    # collector.request_json 과 같은 방식으로 직접 재시도한다.
     uri = "/billing/bizmoney"
-    for attempt in range(3):
+    session = get_session()
+    for attempt in range(HTTP_MAX_RETRIES):
         try:
-            r = requests.get(BASE_URL + uri, headers=get_header("GET", uri, customer_id), timeout=20)
+            r = session.get(BASE_URL + uri, headers=get_header("GET", uri, customer_id), timeout=HTTP_TIMEOUT)
             if r.status_code == 403:
                 return None, None
             if r.status_code == 429 or r.status_code >= 500:
-                time.sleep(2 + attempt)
+                time.sleep(2 + attempt + random.uniform(0.1, 1.5))
                 continue
             if r.status_code != 200:
                 return None, None
@@ -209,11 +236,8 @@ def _verify_connection(engine: Engine):
 
 
 
-def upsert_dim_account_meta_bulk(engine: Engine, accounts: List[Dict[str, str]]):
-    if not accounts:
-        return
-
-    def ensure_meta_schema():
+def ensure_meta_schema(engine: Engine):
+    def do_ensure():
         with engine.begin() as conn:
             conn.execute(text("""
                 CREATE TABLE IF NOT EXISTS dim_account_meta (
@@ -240,8 +264,11 @@ def upsert_dim_account_meta_bulk(engine: Engine, accounts: List[Dict[str, str]])
                 except Exception:
                     pass
 
-    _run_db_op(engine, "dim_account_meta 스키마 보장", ensure_meta_schema)
+    _run_db_op(engine, "dim_account_meta 스키마 보장", do_ensure)
+
 
+
+def _meta_upsert_statement(accounts: List[Dict[str, str]]) -> Tuple[str, List[tuple]]:
     sql = """
         INSERT INTO dim_account_meta (
             customer_id, account_name, manager, platform, naver_media_type, bizmoney_group_key, bizmoney_mode
@@ -263,14 +290,57 @@ def upsert_dim_account_meta_bulk(engine: Engine, accounts: List[Dict[str, str]])
         )
         for a in accounts
     ]
+    return sql, tuples
+
+
+
+def _bizmoney_upsert_statements(account_rows: List[Dict[str, Any]], group_rows: List[Dict[str, Any]]) -> List[Tuple[str, List[tuple]]]:
+    statements: List[Tuple[str, List[tuple]]] = []
+    if account_rows:
+        df = pd.DataFrame(account_rows).drop_duplicates(subset=["dt", "customer_id"], keep="last")
+        sql = """
+            INSERT INTO fact_bizmoney_daily (
+                dt, customer_id, bizmoney_balance, bizmoney_group_key, bizmoney_mode, source_customer_id, is_group_representative
+            )
+            VALUES %s
+            ON CONFLICT (dt, customer_id) DO UPDATE SET
+                bizmoney_balance = EXCLUDED.bizmoney_balance,
+                bizmoney_group_key = EXCLUDED.bizmoney_group_key,
+                bizmoney_mode = EXCLUDED.bizmoney_mode,
+                source_customer_id = EXCLUDED.source_customer_id,
+                is_group_representative = EXCLUDED.is_group_representative
+        """
+        statements.append((sql, list(df.itertuples(index=False, name=None))))
+    if group_rows:
+        df = pd.DataFrame(group_rows).drop_duplicates(subset=["dt", "bizmoney_group_key"], keep="last")
+        sql = """
+            INSERT INTO fact_bizmoney_group_daily (
+                dt, bizmoney_group_key, representative_customer_id, bizmoney_balance, bizmoney_mode
+            )
+            VALUES %s
+            ON CONFLICT (dt, bizmoney_group_key) DO UPDATE SET
+                representative_customer_id = EXCLUDED.representative_customer_id,
+                bizmoney_balance = EXCLUDED.bizmoney_balance,
+                bizmoney_mode = EXCLUDED.bizmoney_mode
+        """
+        statements.append((sql, list(df.itertuples(index=False, name=None))))
+    return statements
+
 
-    def do_upsert():
+
+def _execute_in_transaction(engine: Engine, label: str, statements: List[Tuple[str, List[tuple]]]):
+    statements = [(sql, tuples) for sql, tuples in statements if tuples]
+    if not statements:
+        return
+
+    def do_execute():
         raw_conn = None
         cur = None
         try:
             raw_conn = engine.raw_connection()
             cur = raw_conn.cursor()
-            psycopg2.extras.execute_values(cur, sql, tuples, page_size=1000)
+            for sql, tuples in statements:
+                psycopg2.extras.execute_values(cur, sql, tuples, page_size=1000)
             raw_conn.commit()
         except Exception:
             _safe_rollback(raw_conn)
@@ -279,7 +349,15 @@ def upsert_dim_account_meta_bulk(engine: Engine, accounts: List[Dict[str, str]])
             _safe_close(cur)
             _safe_close(raw_conn)
 
-    _run_db_op(engine, "dim_account_meta 업서트", do_upsert)
+    _run_db_op(engine, label, do_execute)
+
+
+
+def upsert_dim_account_meta_bulk(engine: Engine, accounts: List[Dict[str, str]]):
+    if not accounts:
+        return
+    ensure_meta_schema(engine)
+    _execute_in_transaction(engine, "dim_account_meta 업서트", [_meta_upsert_statement(accounts)])
 
 
 
@@ -326,69 +404,15 @@ def ensure_fact_tables(engine: Engine):
 
 def upsert_bizmoney_bulk(engine: Engine, account_rows: List[Dict[str, Any]], group_rows: List[Dict[str, Any]]):
     ensure_fact_tables(engine)
-    if account_rows:
-        df = pd.DataFrame(account_rows).drop_duplicates(subset=["dt", "customer_id"], keep="last")
-        sql = """
-            INSERT INTO fact_bizmoney_daily (
-                dt, customer_id, bizmoney_balance, bizmoney_group_key, bizmoney_mode, source_customer_id, is_group_representative
-            )
-            VALUES %s
-            ON CONFLICT (dt, customer_id) DO UPDATE SET
-                bizmoney_balance = EXCLUDED.bizmoney_balance,
-                bizmoney_group_key = EXCLUDED.bizmoney_group_key,
-                bizmoney_mode = EXCLUDED.bizmoney_mode,
-                source_customer_id = EXCLUDED.source_customer_id,
-                is_group_representative = EXCLUDED.is_group_representative
-        """
-        tuples = list(df.itertuples(index=False, name=None))
-
-        def upsert_account_rows():
-            raw_conn = None
-            cur = None
-            try:
-                raw_conn = engine.raw_connection()
-                cur = raw_conn.cursor()
-                psycopg2.extras.execute_values(cur, sql, tuples, page_size=1000)
-                raw_conn.commit()
-            except Exception:
-                _safe_rollback(raw_conn)
-                raise
-            finally:
-                _safe_close(cur)
-                _safe_close(raw_conn)
+    _execute_in_transaction(engine, "fact_bizmoney 업서트", _bizmoney_upsert_statements(account_rows, group_rows))
 
-        _run_db_op(engine, "fact_bizmoney_daily 업서트", upsert_account_rows)
 
-    if group_rows:
-        df = pd.DataFrame(group_rows).drop_duplicates(subset=["dt", "bizmoney_group_key"], keep="last")
-        sql = """
-            INSERT INTO fact_bizmoney_group_daily (
-                dt, bizmoney_group_key, representative_customer_id, bizmoney_balance, bizmoney_mode
-            )
-            VALUES %s
-            ON CONFLICT (dt, bizmoney_group_key) DO UPDATE SET
-                representative_customer_id = EXCLUDED.representative_customer_id,
-                bizmoney_balance = EXCLUDED.bizmoney_balance,
-                bizmoney_mode = EXCLUDED.bizmoney_mode
-        """
-        tuples = list(df.itertuples(index=False, name=None))
-
-        def upsert_group_rows():
-            raw_conn = None
-            cur = None
-            try:
-                raw_conn = engine.raw_connection()
-                cur = raw_conn.cursor()
-                psycopg2.extras.execute_values(cur, sql, tuples, page_size=1000)
-                raw_conn.commit()
-            except Exception:
-                _safe_rollback(raw_conn)
-                raise
-            finally:
-                _safe_close(cur)
-                _safe_close(raw_conn)
 
-        _run_db_op(engine, "fact_bizmoney_group_daily 업서트", upsert_group_rows)
+def upsert_bizmoney_run(engine: Engine, accounts: List[Dict[str, str]], account_rows: List[Dict[str, Any]], group_rows: List[Dict[str, Any]]):
+    """dim_account_meta + fact_bizmoney_daily + fact_bizmoney_group_daily 를 한 트랜잭션으로 적재."""
+    statements = [_meta_upsert_statement(accounts)] if accounts else []
+    statements.extend(_bizmoney_upsert_statements(account_rows, group_rows))
+    _execute_in_transaction(engine, "비즈머니 일괄 적재", statements)
 
 
 
@@ -403,7 +427,9 @@ def main():
         log(f"⚠️ 수집할 네이버 계정이 없습니다. ACCOUNT_MASTER_FILE={ACCOUNT_MASTER_FILE}")
         return
 
-    upsert_dim_account_meta_bulk(engine, all_naver_accounts)
+    # 스키마는 먼저 보장하고, 적재는 수집이 끝난 뒤 한 트랜잭션으로 처리한다.
+    ensure_meta_schema(engine)
+    ensure_fact_tables(engine)
 
     separate_count = sum(1 for t in targets if t.get("bizmoney_mode") == "separate")
     shared_count = sum(1 for t in targets if t.get("bizmoney_mode") == "shared")
@@ -418,7 +444,7 @@ def main():
         balance, raw = get_bizmoney(rep["id"])
         return target, balance, raw
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+    with concurrent.futures.ThreadPoolExecutor(max_workers=BIZMONEY_WORKERS) as executor:
         futures = {executor.submit(task, target): target for target in targets}
         for future in concurrent.futures.as_completed(futures):
             target, balance, _raw = future.result()
@@ -460,7 +486,7 @@ def main():
                 })
                 log(f"💰 [개별:{rep['name']}] 잔액={balance:,}원")
 
-    upsert_bizmoney_bulk(engine, account_rows, group_rows)
+    upsert_bizmoney_run(engine, all_naver_accounts, account_rows, group_rows)
     log(f"✅ 완료: 계정 적재 {len(account_rows)}건 / 그룹 적재 {len(group_rows)}건")
 
 
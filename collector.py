@@ -36,10 +36,12 @@ from device_collector_helpers import (
 )
 
 import collector_api as collector_api_mod
+import collector_debug as collector_debug_mod
 import collector_db as collector_db_mod
 import collector_media as collector_media_mod
 import collector_parsers as collector_parsers_mod
 import collector_runner as collector_runner_mod
+import collector_timing as collector_timing_mod
 
 try:
     from account_master import load_naver_accounts
@@ -53,7 +55,7 @@ API_SECRET = (os.getenv("NAVER_API_SECRET") or os.getenv("NAVER_ADS_SECRET") or
 DB_URL = os.getenv("DATABASE_URL", "").strip()
 CUSTOMER_ID = (os.getenv("CUSTOMER_ID") or "").strip()
 
-BASE_URL = "https://api.searchad.naver.com"
+BASE_URL = (os.getenv("NAVER_API_BASE_URL") or "https://api.searchad.naver.com").strip().rstrip("/")
 TIMEOUT = 60
 
 SKIP_KEYWORD_DIM = False
@@ -61,6 +63,8 @@ SKIP_AD_DIM = False
 SKIP_KEYWORD_STATS = False
 SKIP_AD_STATS = False
 FAST_MODE = False
+# 리포트 프레임을 숫자/category dtype 으로 줄여 보관 (0 이면 기존 dtype=str 그대로)
+REPORT_FRAME_COMPACT = os.getenv("REPORT_FRAME_COMPACT", "1") in ["1", "true", "TRUE", "yes", "YES"]
 
 CART_ENABLE_DATE = date(2026, 3, 11)
 SHOPPING_HINT_KEYS = ('shopping', '쇼핑', 'product', 'productcatalog', 'catalog', 'shop')
@@ -199,10 +203,8 @@ def save_debug_report(tp: str, customer_id: str, job_id: str, content: str):
             return
         if not os.getenv("DEBUG_REPORTS", "1") in ["1", "true", "TRUE", "yes", "YES"]:
             return
-        DEBUG_DIR.mkdir(parents=True, exist_ok=True)
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        fname = DEBUG_DIR / f"{ts}_{customer_id}_{tp}_{job_id}.txt"
-        fname.write_text(content or "", encoding="utf-8")
+        collector_debug_mod.save_debug_artifact(DEBUG_DIR, f"{ts}_{customer_id}_{tp}_{job_id}.txt", content or "")
     except Exception as e:
         _log_best_effort_failure("debug report 저장", e, ctx=f"tp={tp} customer_id={customer_id}")
 
@@ -343,6 +345,18 @@ def emit_collection_run_summary(results: List[Dict[str, Any]], target_date: date
             log(f"   … 외 {len(interesting) - 30}개 계정은 GitHub Step Summary 표에서 확인하세요.")
     else:
         log("🧾 점검 필요 계정 없음")
+
+    stage_summary = collector_timing_mod.summarize_stage_timings(rows)
+    if stage_summary["stages"]:
+        log(
+            f"⏱️ 단계별 소요 (계정 합계 {stage_summary['total_sec']:.1f}s) | "
+            + " | ".join(f"{item['stage']}={item['total_sec']:.1f}s({item['share'] * 100:.0f}%)" for item in stage_summary["stages"][:8])
+        )
+        slow_parts = []
+        for r in stage_summary["slowest"][:5]:
+            top_stage = next(iter(r.get("stage_sec") or {}), "-")
+            slow_parts.append(f"{r.get('account_name')} {float(r.get('elapsed_sec') or 0.0):.1f}s({top_stage})")
+        log(f"🐢 오래 걸린 계정: {', '.join(slow_parts)}")
     log("=" * 72)
 
     summary_path = (os.getenv("GITHUB_STEP_SUMMARY") or "").strip()
@@ -359,8 +373,8 @@ def emit_collection_run_summary(results: List[Dict[str, Any]], target_date: date
         f"- 정상 {ok_cnt} / 0건 {zero_cnt} / 오류 {err_cnt} / 건너뜀 {skip_cnt}",
         f"- 실시간 대체 {fallback_cnt} / split 성공 {split_ok_cnt} / PC/M 성공 {device_ok_cnt}",
         "",
-        "|업체|상태|캠페인|키워드|소재|PC/M 캠페인|PC/M 소재|매체행|AD|Split|실시간대체|비고|",
-        "|---|---:|---:|---:|---:|---:|---:|---:|---|---|---|---|",
+        "|업체|상태|캠페인|키워드|소재|PC/M 캠페인|PC/M 소재|매체행|AD|Split|실시간대체|소요(s)|비고|",
+        "|---|---:|---:|---:|---:|---:|---:|---:|---|---|---|---:|---|",
     ]
     for r in rows:
         note_parts = []
@@ -372,7 +386,7 @@ def emit_collection_run_summary(results: List[Dict[str, Any]], target_date: date
             note_parts.append(f"PC/M 매핑누락 {r.get('device_missing_campaign_rows')}")
         note_text = "; ".join(note_parts)
         lines.append(
-            "|{account}|{status}|{c}|{k}|{a}|{dc}|{da}|{m}|{ad}|{split}|{fb}|{note}|".format(
+            "|{account}|{status}|{c}|{k}|{a}|{dc}|{da}|{m}|{ad}|{split}|{fb}|{sec}|{note}|".format(
                 account=_markdown_escape(r.get("account_name")),
                 status=_markdown_escape(f"{_summary_icon(r.get('status'))} {r.get('status') or ''}"),
                 c=int(r.get("campaign_rows_saved") or 0),
@@ -384,9 +398,20 @@ def emit_collection_run_summary(results: List[Dict[str, Any]], target_date: date
                 ad=_markdown_escape(r.get("ad_report_status")),
                 split=_markdown_escape("ok" if r.get("split_report_ok") else ("skip" if not r.get("split_attempted") else "fail")),
                 fb=_markdown_escape(r.get("realtime_reason") if r.get("used_realtime_fallback") else "-"),
+                sec=f"{float(r.get('elapsed_sec') or 0.0):.1f}",
                 note=_markdown_escape(note_text),
             )
         )
+    if stage_summary["stages"]:
+        lines.extend([
+            "",
+            f"### 단계별 소요 (계정 합계 {stage_summary['total_sec']:.1f}s)",
+            "",
+            "|단계|합계(s)|비중|호출|계정 p95(s)|",
+            "|---|---:|---:|---:|---:|",
+        ])
+        for item in stage_summary["stages"]:
+            lines.append(f"|{_markdown_escape(item['stage'])}|{item['total_sec']:.1f}|{item['share'] * 100:.1f}%|{item['calls']}|{item['p95_sec']:.2f}|")
     try:
         with open(summary_path, "a", encoding="utf-8") as fp:
             fp.write("\n".join(lines) + "\n")
@@ -663,7 +688,7 @@ def build_campaign_type_map(engine: Engine, customer_id: str) -> Dict[str, str]:
     return collector_media_mod.build_campaign_type_map(engine, customer_id)
 
 
-def collect_media_fact(engine: Engine, customer_id: str, target_date: date, ad_report_df: pd.DataFrame | None, ad_to_campaign_map: Dict[str, str], campaign_type_map: Dict[str, str], camp_device_stat: Dict[Tuple[str, str], Dict[str, Any]] | None = None, allowed_campaign_ids: set[str] | None = None, scoped_campaign_types: List[str] | None = None) -> Tuple[int, Dict[str, Any]]:
+def collect_media_fact(engine: Engine, customer_id: str, target_date: date, ad_report_df: pd.DataFrame | None, ad_to_campaign_map: Dict[str, str], campaign_type_map: Dict[str, str], camp_device_stat: Dict[Tuple[str, str], Dict[str, Any]] | None = None, allowed_campaign_ids: set[str] | None = None, scoped_campaign_types: List[str] | None = None, campaign_total_rows: List[Dict[str, Any]] | None = None) -> Tuple[int, Dict[str, Any]]:
     return collector_media_mod.collect_media_fact(
         engine,
         customer_id,
@@ -674,6 +699,7 @@ def collect_media_fact(engine: Engine, customer_id: str, target_date: date, ad_r
         camp_device_stat,
         allowed_campaign_ids=allowed_campaign_ids,
         scoped_campaign_types=scoped_campaign_types,
+        campaign_total_rows=campaign_total_rows,
     )
 
 
@@ -771,7 +797,7 @@ def get_stats_range(customer_id: str, ids: List[str], d1: date) -> List[dict]:
     return collector_api_mod.get_stats_range(customer_id, ids, d1, request_json)
 
 
-def fetch_stats_fallback(engine: Engine, customer_id: str, target_date: date, ids: List[str], id_key: str, table_name: str, split_map: dict | None = None, scoped_replace: bool = False) -> int:
+def fetch_stats_fallback(engine: Engine, customer_id: str, target_date: date, ids: List[str], id_key: str, table_name: str, split_map: dict | None = None, scoped_replace: bool = False, rows_out: List[Dict[str, Any]] | None = None) -> int:
     return collector_api_mod.fetch_stats_fallback(
         engine,
         customer_id,
@@ -785,6 +811,7 @@ def fetch_stats_fallback(engine: Engine, customer_id: str, target_date: date, id
         clear_fact_range_fn=clear_fact_range,
         replace_fact_scope_fn=replace_fact_scope,
         replace_fact_range_fn=replace_fact_range,
+        rows_out=rows_out,
     )
 
 
@@ -797,7 +824,7 @@ def resolve_download_url(dl_url: str) -> str:
 
 
 def parse_report_text_to_df(txt: str) -> pd.DataFrame:
-    return collector_api_mod.parse_report_text_to_df(txt)
+    return collector_api_mod.parse_report_text_to_df(txt, compact=REPORT_FRAME_COMPACT)
 
 
 def download_report_dataframe(customer_id: str, tp: str, job_id: str, initial_url: str) -> pd.DataFrame | None:
@@ -1110,6 +1137,8 @@ def build_main_arg_parser() -> argparse.ArgumentParser:
     parser.add_argument("--sa_scope", type=str, default="full", help="full/ad_only 또는 전체/소재만")
     parser.add_argument("--shopping_only", action="store_true", help="쇼핑검색 캠페인만 수집/재적재")
     parser.add_argument("--include_gfa_accounts", action="store_true", help="이름 끝이 GFA 인 네이버 GFA 계정도 함께 대상으로 포함")
+    parser.add_argument("--backfill_media_monthly", action="store_true", help="fact_media_monthly 에 없는 계정-월만 일별 매체 데이터로 채우고 종료 (배포 후 1회 / 실패 시 재실행)")
+    parser.add_argument("--stage_trace", type=str, default=collector_timing_mod.STAGE_TRACE_FILE, help="계정별 단계 소요 span 을 JSONL 로 남길 경로 (기본: COLLECTOR_STAGE_TRACE_FILE)")
     return parser
 
 
@@ -1316,6 +1345,9 @@ def main():
         args.skip_dim = True
 
     target_date = resolve_target_date(args.date)
+    collector_timing_mod.set_trace_path(args.stage_trace)
+    if args.stage_trace:
+        log(f"🧵 단계별 소요 trace 기록: {args.stage_trace}")
     emit_main_run_banner(target_date, args)
 
     try:
@@ -1324,6 +1356,12 @@ def main():
     except Exception as e:
         die(f"DB 초기화 실패: {_exc_label(e)}")
 
+    if args.backfill_media_monthly:
+        res = collector_media_mod.backfill_media_monthly_rollup(engine)
+        if res["failed"]:
+            die(f"fact_media_monthly 채우기 일부 실패: {res['failed']}/{res['targets']}개 계정-월 (재실행하면 남은 월만 다시 채웁니다)")
+        return
+
     accounts_info = resolve_accounts_info(engine, args)
     accounts_info = apply_account_name_filters(accounts_info, args)
     accounts_info = dedupe_accounts_info(accounts_info)
@@ -1335,6 +1373,19 @@ def main():
     log(f"📋 최종 수집 대상 계정: {len(accounts_info)}개 / 동시 작업: {args.workers}개")
     results = run_account_collection_tasks(engine, accounts_info, target_date, args)
     emit_collection_run_summary(results, target_date, args.collect_mode, args.shopping_only, args.sa_scope)
+    emit_debug_artifact_summary()
+
+
+def emit_debug_artifact_summary() -> None:
+    stats = collector_debug_mod.flush_debug_artifacts()
+    if not stats:
+        return
+    mb = 1024 * 1024
+    log(
+        f"🗂️ debug report 저장 {stats['written']}건 ({stats['bytes_raw'] / mb:.1f}MB → {stats['bytes_written'] / mb:.1f}MB, "
+        f"{collector_debug_mod.DEBUG_REPORT_POLICY}) | 건너뜀 {stats['skipped']} | 드롭 {stats['dropped']} | "
+        f"용량 정리 {stats['pruned']} | 실패 {stats['failed']}"
+    )
 
 
 if __name__ == "__main__":
@@ -12,6 +12,8 @@ from urllib.parse import urlparse
 import pandas as pd
 from sqlalchemy.engine import Engine
 
+from collector_timing import stage_span
+
 
 def list_ads(customer_id: str, adgroup_id: str, safe_call: Callable[..., Tuple[bool, Any]]) -> List[dict]:
     ok, data = safe_call("GET", "/ncc/ads", customer_id, {"nccAdgroupId": adgroup_id})
@@ -121,13 +123,15 @@ def fetch_stats_fallback(
     clear_fact_range_fn: Callable[[Engine, str, str, date], None],
     replace_fact_scope_fn: Callable[[Engine, str, List[Dict[str, Any]], str, date, str, List[str]], None],
     replace_fact_range_fn: Callable[[Engine, str, List[Dict[str, Any]], str, date], None],
+    rows_out: List[Dict[str, Any]] | None = None,
 ) -> int:
     if not ids:
         if not scoped_replace:
             clear_fact_range_fn(engine, table_name, customer_id, target_date)
         return 0
 
-    raw_stats = get_stats_range_fn(customer_id, ids, target_date)
+    with stage_span("stats_api", table=table_name, ids=len(ids)):
+        raw_stats = get_stats_range_fn(customer_id, ids, target_date)
     rows: List[Dict[str, Any]] = []
     for r in raw_stats or []:
         obj_id = str(r.get("id") or "").strip()
@@ -182,6 +186,8 @@ def fetch_stats_fallback(
             row["avg_rnk"] = float(r.get("avgRnk", 0) or 0)
         rows.append(row)
 
+    if rows_out is not None:
+        rows_out.extend(rows)
     pk_name = id_key
     if scoped_replace:
         replace_fact_scope_fn(engine, table_name, rows, customer_id, target_date, pk_name, ids)
@@ -217,12 +223,85 @@ def resolve_download_url(dl_url: str, base_url: str) -> str:
 
 
 
-def parse_report_text_to_df(txt: str) -> pd.DataFrame:
+REPORT_ID_PREFIXES = ("cmp-", "grp-", "nkw-", "nad-", "bsn-")
+# 고유값 비율이 이 이하인 텍스트 컬럼(날짜/기기/매체/헤더가 섞인 지표 등)은 category 로 둔다.
+REPORT_CATEGORY_MAX_RATIO = 0.5
+
+
+def _looks_numeric_text(value: Any) -> bool:
+    s = str(value).strip()
+    return bool(s) and s.lstrip("-").replace(".", "", 1).isdigit()
+
+
+def _compact_numeric_column(col: pd.Series) -> pd.Series | None:
+    """int32/int64/float64 version of ``col`` when every cell keeps the same ``str()``, else None."""
+    values = col.dropna()
+    if values.empty or not _looks_numeric_text(values.iloc[0]):
+        return None
+    text = values.astype(object).astype(str)
+    num = pd.to_numeric(text, errors="coerce")
+    if num.isna().any():
+        return None
+    if not col.isna().any() and (num % 1 == 0).all():
+        lo, hi = num.min(), num.max()
+        target = "int32" if -2**31 <= lo and hi < 2**31 else "int64"
+        out = pd.to_numeric(col.astype(object), errors="coerce").astype(target)
+    else:
+        # float32 는 매출/전환값 자릿수를 잃으므로 소수 컬럼은 float64 로 둔다.
+        out = pd.to_numeric(col.astype(object), errors="coerce").astype("float64")
+    # "007", "2.50", "+3" 처럼 숫자로 바꾸면 str() 이 달라지는 값이 있으면 원문 유지
+    if not out.dropna().astype(object).map(str).reset_index(drop=True).equals(text.reset_index(drop=True)):
+        return None
+    return out
+
+
+def _is_category_column(col: pd.Series) -> bool:
+    values = col.dropna()
+    if values.empty:
+        return False
+    head = values.iloc[: min(20, len(values))].astype(object).astype(str).str.strip().str.lower()
+    if head.str.startswith(REPORT_ID_PREFIXES).any():
+        return True
+    return values.nunique() <= len(values) * REPORT_CATEGORY_MAX_RATIO
+
+
+def compact_report_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Shrink a raw ``dtype=str`` report frame without changing any cell's ``str()``.
+
+    Parsers read cells positionally as text (header rows sit in-band), so conversion is
+    per column and content based: fully numeric columns become int32/int64/float64 and
+    ID / repetitive text columns become ``category``. NaN cells stay NaN.
+    """
+    if df is None or df.empty:
+        return df
+    numeric: Dict[Any, pd.Series] = {}
+    categorical: Dict[Any, pd.Series] = {}
+    for key in df.columns:
+        col = df[key]
+        num = _compact_numeric_column(col)
+        if num is not None:
+            numeric[key] = num
+        elif _is_category_column(col):
+            categorical[key] = col.astype("category")
+    # 텍스트 컬럼이 하나도 안 남으면 iloc/iterrows 행이 float 로 합쳐져 "1" 이 "1.0" 이 되므로 숫자 변환은 건너뛴다.
+    if len(numeric) == len(df.columns):
+        numeric = {}
+    changed = {**numeric, **categorical}
+    if not changed:
+        return df
+    out = df.copy(deep=False)
+    for key, col in changed.items():
+        out[key] = col
+    return out
+
+
+def parse_report_text_to_df(txt: str, *, compact: bool = True) -> pd.DataFrame:
     txt = txt.strip()
     if not txt:
         return pd.DataFrame()
     sep = "\t" if "\t" in txt else ","
-    return pd.read_csv(io.StringIO(txt), sep=sep, header=None, dtype=str, on_bad_lines="skip")
+    df = pd.read_csv(io.StringIO(txt), sep=sep, header=None, dtype=str, on_bad_lines="skip")
+    return compact_report_frame(df) if compact else df
 
 
 
@@ -247,22 +326,26 @@ def download_report_dataframe(
     for retry in range(3):
         url = resolve_download_url(current_url, base_url)
         try:
-            r = session.get(url, timeout=60, allow_redirects=True)
+            with stage_span("report_download", report=tp):
+                r = session.get(url, timeout=60, allow_redirects=True)
             if r.status_code == 200:
                 r.encoding = "utf-8"
                 save_debug_report(tp, customer_id, job_id, r.text)
-                return parse_report_text_to_df_fn(r.text)
+                with stage_span("report_parse", report=tp, bytes=len(r.content)):
+                    return parse_report_text_to_df_fn(r.text)
 
             last_error = f"plain HTTP {r.status_code}"
 
             parsed = urlparse(url)
             if url.startswith(base_url):
                 auth_headers = make_headers("GET", parsed.path or "/", customer_id)
-                r2 = session.get(url, headers=auth_headers, timeout=60, allow_redirects=True)
+                with stage_span("report_download", report=tp):
+                    r2 = session.get(url, headers=auth_headers, timeout=60, allow_redirects=True)
                 if r2.status_code == 200:
                     r2.encoding = "utf-8"
                     save_debug_report(tp, customer_id, job_id, r2.text)
-                    return parse_report_text_to_df_fn(r2.text)
+                    with stage_span("report_parse", report=tp, bytes=len(r2.content)):
+                        return parse_report_text_to_df_fn(r2.text)
                 last_error = f"plain HTTP {r.status_code} / auth HTTP {r2.status_code}"
 
             s_status, s_data = request_json("GET", f"/stat-reports/{job_id}", customer_id, raise_error=False)
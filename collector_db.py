@@ -12,6 +12,8 @@ from sqlalchemy import create_engine, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.pool import NullPool, QueuePool
 
+from collector_media import refresh_media_monthly_rollup_in_txn
+from collector_timing import stage_span
 from device_collector_helpers import ensure_device_tables
 
 
@@ -108,6 +110,11 @@ def _execute_values_in_chunks(engine: Engine, sql: str, tuples: list[tuple], *,
         return
     spec = _table_write_spec(table, len(tuples))
     total_chunks = (len(tuples) + spec.chunk_rows - 1) // spec.chunk_rows
+    with stage_span("db_write", table=table, rows=len(tuples), chunks=total_chunks):
+        _execute_chunks_with_retry(engine, sql, tuples, spec, total_chunks, ctx=ctx)
+
+
+def _execute_chunks_with_retry(engine: Engine, sql: str, tuples: list[tuple], spec: _TableWriteSpec, total_chunks: int, *, ctx: str) -> None:
     for chunk_idx0, chunk in _iter_chunks(tuples, spec.chunk_rows):
         chunk_no = chunk_idx0 // spec.chunk_rows + 1
         chunk_ctx = f"{ctx} chunk={chunk_no}/{total_chunks} chunk_rows={len(chunk)} page_size={spec.page_size}"
@@ -256,6 +263,19 @@ def ensure_tables(engine: Engine):
                     source_report TEXT,
                     PRIMARY KEY(dt, customer_id, campaign_type, media_name, region_name, device_name)
                 )"""))
+                conn.execute(text("""CREATE TABLE IF NOT EXISTS fact_media_monthly (
+                    month_start DATE,
+                    customer_id TEXT,
+                    campaign_type TEXT,
+                    media_name TEXT,
+                    device_name TEXT,
+                    imp BIGINT,
+                    clk BIGINT,
+                    cost BIGINT,
+                    conv DOUBLE PRECISION,
+                    sales BIGINT DEFAULT 0,
+                    PRIMARY KEY(month_start, customer_id, campaign_type, media_name, device_name)
+                )"""))
                 conn.execute(text("""
                     CREATE TABLE IF NOT EXISTS overview_report_source_cache (
                         dt DATE,
@@ -635,61 +655,51 @@ def replace_media_fact_range(engine: Engine, rows: List[Dict[str, Any]], custome
     dropped_zero_rows = max(0, input_rows - len(rows))
     if dropped_zero_rows:
         _log(f"ℹ️ fact_media_daily 0성과 행 제외 | cid={customer_id} dt={d1} dropped={dropped_zero_rows} kept={len(rows)}")
-    last_delete_err: Exception | None = None
-    delete_sql = text(
-        f"DELETE FROM {table} WHERE customer_id=:cid AND dt=:dt" + (" AND campaign_type = ANY(:types)" if scoped_campaign_types else "")
-    )
-
-    for attempt in range(1, 4):
-        try:
-            with engine.begin() as conn:
-                conn.execute(delete_sql, {"cid": str(customer_id), "dt": d1, "types": scoped_campaign_types or []})
-            last_delete_err = None
-            break
-        except Exception as e:
-            last_delete_err = e
-            _log(f"⚠️ fact_media_daily 삭제 실패 {attempt}/3 | cid={customer_id} dt={d1} pk={pk_cols} | {type(e).__name__}: {e}")
-            time.sleep(2)
-    if last_delete_err is not None:
-        raise RuntimeError(f"fact_media_daily 삭제 실패 | cid={customer_id} dt={d1} pk={pk_cols} | {type(last_delete_err).__name__}: {last_delete_err}") from last_delete_err
-
-    if not rows:
-        reason = "all_zero_filtered" if input_rows else "empty"
-        _log(f"ℹ️ fact_media_daily 적재 대상 없음 | cid={customer_id} dt={d1} reason={reason} input_rows={input_rows}")
-        return 0
-
-    df = pd.DataFrame(rows).astype(object).where(pd.notnull, None)
-    df = _prepare_media_fact_rows_for_conflict(df, pk_cols).astype(object).where(pd.notnull, None)
-    cols = list(df.columns)
-    update_cols = [c for c in cols if c not in pk_cols]
-    col_names = ", ".join([f'"{c}"' for c in cols])
-    conflict_cols_sql = ", ".join(pk_cols)
-    conflict_clause = (
-        f'ON CONFLICT ({conflict_cols_sql}) DO UPDATE SET ' + ", ".join([f'"{c}"=EXCLUDED."{c}"' for c in update_cols])
-        if update_cols else
-        f'ON CONFLICT ({conflict_cols_sql}) DO NOTHING'
-    )
-    sql = f'INSERT INTO {table} ({col_names}) VALUES %s {conflict_clause}'
-    tuples = list(df.itertuples(index=False, name=None))
+    delete_sql = f"DELETE FROM {table} WHERE customer_id=%(cid)s AND dt=%(dt)s" + (" AND campaign_type = ANY(%(types)s)" if scoped_campaign_types else "")
+    delete_params = {"cid": str(customer_id), "dt": d1, "types": list(scoped_campaign_types or [])}
+
+    sql, tuples = None, []
+    if rows:
+        df = pd.DataFrame(rows).astype(object).where(pd.notnull, None)
+        df = _prepare_media_fact_rows_for_conflict(df, pk_cols).astype(object).where(pd.notnull, None)
+        cols = list(df.columns)
+        update_cols = [c for c in cols if c not in pk_cols]
+        col_names = ", ".join([f'"{c}"' for c in cols])
+        conflict_cols_sql = ", ".join(pk_cols)
+        conflict_clause = (
+            f'ON CONFLICT ({conflict_cols_sql}) DO UPDATE SET ' + ", ".join([f'"{c}"=EXCLUDED."{c}"' for c in update_cols])
+            if update_cols else
+            f'ON CONFLICT ({conflict_cols_sql}) DO NOTHING'
+        )
+        sql = f'INSERT INTO {table} ({col_names}) VALUES %s {conflict_clause}'
+        tuples = list(df.itertuples(index=False, name=None))
 
-    last_upsert_err: Exception | None = None
+    # 일별 삭제/적재와 월 rollup 재계산은 한 트랜잭션 (collector_media.replace_media_fact_range 와 동일)
+    last_err: Exception | None = None
     for attempt in range(1, 4):
         raw_conn = None
         cur = None
         try:
             raw_conn = engine.raw_connection()
             cur = raw_conn.cursor()
-            psycopg2.extras.execute_values(cur, sql, tuples, page_size=5000)
+            cur.execute(delete_sql, delete_params)
+            if tuples:
+                psycopg2.extras.execute_values(cur, sql, tuples, page_size=5000)
+            refresh_media_monthly_rollup_in_txn(cur, customer_id, d1)
             raw_conn.commit()
-            _log(f"✅ fact_media_daily 적재 완료 | cid={customer_id} dt={d1} rows={len(df)} pk={pk_cols}")
-            return len(df)
+            if tuples:
+                _log(f"✅ fact_media_daily 적재 완료 | cid={customer_id} dt={d1} rows={len(tuples)} pk={pk_cols}")
+            else:
+                reason = "all_zero_filtered" if input_rows else "empty"
+                _log(f"ℹ️ fact_media_daily 적재 대상 없음 | cid={customer_id} dt={d1} reason={reason} input_rows={input_rows}")
+            return len(tuples)
         except Exception as e:
-            last_upsert_err = e
+            last_err = e
             if raw_conn:
-                _safe_rollback(raw_conn, ctx=f"fact_media_daily upsert cid={customer_id} dt={d1}")
-            _log(f"⚠️ fact_media_daily 적재 실패 {attempt}/3 | cid={customer_id} dt={d1} rows={len(df)} pk={pk_cols} | {type(e).__name__}: {e}")
+                _safe_rollback(raw_conn, ctx=f"fact_media_daily replace cid={customer_id} dt={d1}")
+            _log(f"⚠️ fact_media_daily 교체 실패 {attempt}/3 | cid={customer_id} dt={d1} rows={len(tuples)} pk={pk_cols} | {type(e).__name__}: {e}")
             time.sleep(2)
         finally:
-            _safe_close(cur, label="cursor", ctx=f"fact_media_daily upsert cid={customer_id} dt={d1}")
-            _safe_close(raw_conn, label="connection", ctx=f"fact_media_daily upsert cid={customer_id} dt={d1}")
-    raise RuntimeError(f"fact_media_daily 적재 최종 실패 | cid={customer_id} dt={d1} rows={len(df)} pk={pk_cols} | {type(last_upsert_err).__name__}: {last_upsert_err}") from last_upsert_err
+            _safe_close(cur, label="cursor", ctx=f"fact_media_daily replace cid={customer_id} dt={d1}")
+            _safe_close(raw_conn, label="connection", ctx=f"fact_media_daily replace cid={customer_id} dt={d1}")
+    raise RuntimeError(f"fact_media_daily 교체 최종 실패 | cid={customer_id} dt={d1} rows={len(tuples)} pk={pk_cols} | {type(last_err).__name__}: {last_err}") from last_err
@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""Background writer for collector debug artifacts (raw reports, split-row CSVs).
+
+Artifacts are compressed (zstd when ``zstandard`` is installed, otherwise gzip) and
+written by one daemon thread so report downloads never wait on disk. Which artifacts
+are kept is controlled by ``DEBUG_REPORT_POLICY``:
+
+- ``all``: every artifact (기존 동작)
+- ``failures``: buffered per account and written only when the account ends in error
+- ``sample``: a deterministic ``DEBUG_REPORT_SAMPLE_PCT`` % of accounts/dates
+- ``off``: nothing
+
+Each output directory is trimmed oldest-first once it exceeds ``DEBUG_REPORT_MAX_MB``.
+
+The account scope lives in a ``ContextVar``: work handed to a thread pool must be
+submitted via ``contextvars.copy_context().run`` to save under the same scope.
+"""
+from __future__ import annotations
+
+import atexit
+import contextvars
+import gzip
+import importlib.util
+import os
+import queue
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)) or default)
+    except Exception:
+        return default
+
+
+DEBUG_REPORT_POLICIES = ("all", "failures", "sample", "off")
+DEBUG_REPORT_POLICY = (os.getenv("DEBUG_REPORT_POLICY") or "all").strip().lower()
+DEBUG_REPORT_SAMPLE_PCT = max(0.0, min(100.0, _env_float("DEBUG_REPORT_SAMPLE_PCT", 10.0)))
+# auto | zstd | gzip | none
+DEBUG_REPORT_COMPRESSION = (os.getenv("DEBUG_REPORT_COMPRESSION") or "auto").strip().lower()
+# 디렉터리별 보관 상한, 0 이면 무제한
+DEBUG_REPORT_MAX_MB = max(0.0, _env_float("DEBUG_REPORT_MAX_MB", 2048.0))
+DEBUG_REPORT_QUEUE_MAX = max(1, int(_env_float("DEBUG_REPORT_QUEUE_MAX", 256)))
+# failures 정책에서 계정 하나가 메모리에 들고 있을 수 있는 원문 크기
+DEBUG_REPORT_PENDING_MAX_MB = max(1.0, _env_float("DEBUG_REPORT_PENDING_MAX_MB", 64.0))
+
+_HAS_ZSTD = importlib.util.find_spec("zstandard") is not None
+# 스레드 로컬이 아니라 ContextVar 라서 contextvars.copy_context().run 으로 넘긴 worker 스레드에서도 같은 계정 scope 를 본다.
+_current_scope: contextvars.ContextVar["DebugScope | None"] = contextvars.ContextVar("collector_debug_scope", default=None)
+
+
+def _log(msg: str) -> None:
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}", flush=True)
+
+
+def resolve_compression(value: str | None = None) -> str:
+    mode = (value if value is not None else DEBUG_REPORT_COMPRESSION).strip().lower()
+    if mode in {"", "auto"}:
+        return "zstd" if _HAS_ZSTD else "gzip"
+    if mode == "zstd" and not _HAS_ZSTD:
+        return "gzip"
+    return mode if mode in {"zstd", "gzip", "none"} else "gzip"
+
+
+def _compress(payload: bytes, mode: str) -> Tuple[bytes, str]:
+    if mode == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=3).compress(payload), ".zst"
+    if mode == "gzip":
+        # 원문 텍스트 리포트는 level 1 에서도 5~10배 줄고 CPU 부담이 가장 적다.
+        return gzip.compress(payload, compresslevel=1), ".gz"
+    return payload, ""
+
+
+@dataclass
+class DebugScope:
+    """Per-account artifact scope; holds artifacts for the ``failures`` policy."""
+
+    key: str
+    pending: List[Tuple[Path, str, bytes]] = field(default_factory=list)
+    pending_bytes: int = 0
+    overflow: int = 0
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+class DebugArtifactWriter:
+    """Bounded queue drained by one daemon thread; ``submit`` never blocks."""
+
+    def __init__(self, *, compression: str | None = None, max_mb: float = DEBUG_REPORT_MAX_MB, queue_max: int = DEBUG_REPORT_QUEUE_MAX):
+        self.compression = resolve_compression(compression)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.stats: Dict[str, int] = {"written": 0, "bytes_raw": 0, "bytes_written": 0, "dropped": 0, "skipped": 0, "failed": 0, "pruned": 0}
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(queue_max)))
+        self._dirs: Dict[Path, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += n
+
+    def submit(self, directory: Path, name: str, payload: bytes) -> None:
+        self._start()
+        try:
+            self._queue.put_nowait((Path(directory), name, payload))
+        except queue.Full:
+            self._count("dropped")
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        if self._thread is None:
+            return True
+        deadline = time.monotonic() + max(0.0, timeout)
+        while self._queue.unfinished_tasks and time.monotonic() < deadline:
+            time.sleep(0.02)
+        return not self._queue.unfinished_tasks
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="debug-artifacts", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            directory, name, payload = self._queue.get()
+            try:
+                self._write(directory, name, payload)
+            except Exception as e:
+                self._count("failed")
+                _log(f"⚠️ debug artifact 저장 실패 | {directory / name} | {type(e).__name__}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _dir_state(self, directory: Path) -> Dict[str, Any]:
+        state = self._dirs.get(directory)
+        if state is None:
+            directory.mkdir(parents=True, exist_ok=True)
+            files = []
+            for p in directory.iterdir():
+                try:
+                    if p.is_file():
+                        st = p.stat()
+                        files.append((st.st_mtime, p, st.st_size))
+                except OSError:
+                    continue
+            files.sort(key=lambda x: x[0])
+            state = {"files": [(p, size) for _, p, size in files], "bytes": sum(size for _, _, size in files)}
+            self._dirs[directory] = state
+        return state
+
+    def _write(self, directory: Path, name: str, payload: bytes) -> None:
+        state = self._dir_state(directory)
+        data, suffix = _compress(payload, self.compression)
+        path = directory / f"{name}{suffix}"
+        path.write_bytes(data)
+        # 같은 이름(일별 재실행 CSV 등)을 다시 쓰면 이전 항목을 빼야 prune 이 방금 쓴 파일을 지우지 않는다.
+        kept = [(p, size) for p, size in state["files"] if p != path]
+        state["bytes"] -= sum(size for p, size in state["files"] if p == path)
+        state["files"] = kept
+        state["files"].append((path, len(data)))
+        state["bytes"] += len(data)
+        self._count("written")
+        self._count("bytes_raw", len(payload))
+        self._count("bytes_written", len(data))
+        self._prune(state)
+
+    def _prune(self, state: Dict[str, Any]) -> None:
+        if self.max_bytes <= 0:
+            return
+        while state["bytes"] > self.max_bytes and len(state["files"]) > 1:
+            old, size = state["files"].pop(0)
+            state["bytes"] -= size
+            try:
+                old.unlink()
+                self._count("pruned")
+            except FileNotFoundError:
+                pass
+
+
+_writer: DebugArtifactWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_debug_writer() -> DebugArtifactWriter:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = DebugArtifactWriter()
+                atexit.register(_writer.flush, 10.0)
+    return _writer
+
+
+def _sampled(key: str, pct: float | None = None) -> bool:
+    pct = DEBUG_REPORT_SAMPLE_PCT if pct is None else pct
+    if pct >= 100.0:
+        return True
+    # 같은 계정/날짜의 리포트는 함께 남거나 함께 빠지도록 키 해시로 결정한다.
+    return (zlib.crc32(key.encode("utf-8")) % 10000) < pct * 100
+
+
+def begin_debug_scope(customer_id: str, target_date: Any) -> DebugScope:
+    scope = DebugScope(key=f"{customer_id}:{target_date}")
+    _current_scope.set(scope)
+    return scope
+
+
+def end_debug_scope(scope: DebugScope, *, failed: bool) -> None:
+    """Release the account scope; under ``failures`` its buffered artifacts are written only if it failed."""
+    try:
+        if scope.pending and failed:
+            writer = get_debug_writer()
+            for directory, name, payload in scope.pending:
+                writer.submit(directory, name, payload)
+        elif scope.pending:
+            get_debug_writer()._count("skipped", len(scope.pending))
+        if scope.overflow:
+            get_debug_writer()._count("dropped", scope.overflow)
+    finally:
+        scope.pending = []
+        scope.pending_bytes = 0
+        if _current_scope.get() is scope:
+            _current_scope.set(None)
+
+
+def save_debug_artifact(directory: str | Path, name: str, content: str | bytes, *, encoding: str = "utf-8", policy: str | None = None) -> None:
+    """Queue one debug artifact under ``directory`` according to the active policy."""
+    policy = (policy or DEBUG_REPORT_POLICY).strip().lower()
+    if policy not in DEBUG_REPORT_POLICIES:
+        policy = "all"
+    if policy == "off" or not content:
+        return
+    scope = _current_scope.get()
+    if policy == "sample" and not _sampled(scope.key if scope is not None else name):
+        get_debug_writer()._count("skipped")
+        return
+    payload = content if isinstance(content, bytes) else content.encode(encoding)
+    if policy == "failures":
+        if scope is None:
+            get_debug_writer()._count("skipped")
+            return
+        with scope.lock:
+            if scope.pending_bytes + len(payload) > DEBUG_REPORT_PENDING_MAX_MB * 1024 * 1024:
+                scope.overflow += 1
+                return
+            scope.pending.append((Path(directory), name, payload))
+            scope.pending_bytes += len(payload)
+        return
+    get_debug_writer().submit(Path(directory), name, payload)
+
+
+def flush_debug_artifacts(timeout: float = 30.0) -> Dict[str, int]:
+    """Wait for queued artifacts and return the writer counters (empty when nothing was saved)."""
+    if _writer is None:
+        return {}
+    _writer.flush(timeout)
+    with _writer._lock:
+        return dict(_writer.stats)
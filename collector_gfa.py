@@ -2,19 +2,21 @@
 from __future__ import annotations
 
 import argparse
+import concurrent.futures
+import importlib.util
 import json
 import os
 import re
 import sys
+import threading
 import time
 from contextlib import contextmanager
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
-import psycopg2
-import psycopg2.extras
 import requests
 from dotenv import load_dotenv
 from sqlalchemy import create_engine, text
@@ -22,6 +24,7 @@ from sqlalchemy.engine import Engine
 from sqlalchemy.pool import NullPool
 
 from account_master import load_naver_accounts
+from collector_db import clear_fact_range, upsert_many
 
 load_dotenv(override=False)
 
@@ -59,6 +62,16 @@ GFA_DEBUG_DIR = Path(os.getenv("GFA_DEBUG_DIR") or "gfa_debug")
 GFA_DOWNLOAD_DIR = Path(os.getenv("GFA_DOWNLOAD_DIR") or "gfa_downloads")
 GFA_TIMEOUT = int((os.getenv("GFA_TIMEOUT") or "60").strip())
 GFA_PLAYWRIGHT_TIMEOUT_MS = int((os.getenv("GFA_PLAYWRIGHT_TIMEOUT_MS") or "40000").strip())
+# 로그인 세션(쿠키/localStorage) 저장 위치. 디버그 아티팩트로 업로드되지 않도록 별도 경로를 쓴다.
+GFA_STORAGE_STATE_FILE = Path(os.getenv("GFA_STORAGE_STATE_FILE") or "gfa_state/storage_state.json")
+GFA_STORAGE_STATE_MAX_AGE_HOURS = float((os.getenv("GFA_STORAGE_STATE_MAX_AGE_HOURS") or "12").strip())
+GFA_CRAWL_WORKERS = max(1, int((os.getenv("GFA_CRAWL_WORKERS") or "3").strip()))
+# 실행 중 세션이 만료되면 계정당 몇 번까지 재로그인 후 재시도할지
+GFA_SESSION_RELOGIN_RETRIES = max(0, int((os.getenv("GFA_SESSION_RELOGIN_RETRIES") or "1").strip()))
+GFA_API_WORKERS = max(1, int((os.getenv("GFA_API_WORKERS") or "4").strip()))
+GFA_API_PAGE_PREFETCH = max(1, int((os.getenv("GFA_API_PAGE_PREFETCH") or "4").strip()))
+GFA_ACCOUNT_CACHE_FILE = Path(os.getenv("GFA_ACCOUNT_CACHE_FILE") or "gfa_state/account_manager_map.json")
+GFA_ACCOUNT_CACHE_TTL_HOURS = float((os.getenv("GFA_ACCOUNT_CACHE_TTL_HOURS") or "24").strip())
 
 TOKEN_URL = "https://nid.naver.com/oauth2.0/token"
 OPENAPI_BASE = "https://openapi.naver.com"
@@ -140,94 +153,12 @@ def ensure_tables(engine: Engine) -> None:
         ensure_column(engine, table, "data_source", "TEXT")
 
 
-def upsert_many(engine: Engine, table: str, rows: List[Dict[str, Any]], pk_cols: List[str]) -> None:
-    if not rows:
-        return
-    df = pd.DataFrame(rows).drop_duplicates(subset=pk_cols, keep="last").astype(object).where(pd.notnull, None)
-    cols = list(df.columns)
-    update_cols = [c for c in cols if c not in pk_cols]
-    col_names = ", ".join([f'"{c}"' for c in cols])
-    pk_str = ", ".join([f'"{c}"' for c in pk_cols])
-    if update_cols:
-        conflict_clause = f'ON CONFLICT ({pk_str}) DO UPDATE SET ' + ", ".join([f'"{c}"=EXCLUDED."{c}"' for c in update_cols])
-    else:
-        conflict_clause = f'ON CONFLICT ({pk_str}) DO NOTHING'
-    sql = f"INSERT INTO {table} ({col_names}) VALUES %s {conflict_clause}"
-    tuples = list(df.itertuples(index=False, name=None))
-    raw_conn = engine.raw_connection()
-    try:
-        cur = raw_conn.cursor()
-        psycopg2.extras.execute_values(cur, sql, tuples, page_size=2000)
-        raw_conn.commit()
-    finally:
-        try:
-            cur.close()
-        except Exception:
-            pass
-        raw_conn.close()
-
-
-def clear_fact_range(engine: Engine, table: str, customer_id: str, target_dt: date) -> None:
-    with engine.begin() as conn:
-        conn.execute(text(f"DELETE FROM {table} WHERE customer_id = :cid AND dt = :dt"), {"cid": str(customer_id), "dt": target_dt})
-
-def clear_fact_scope(engine: Engine, table: str, customer_id: str, target_dt: date, pk: str, ids: List[str]) -> None:
-    ids = [str(x).strip() for x in (ids or []) if str(x).strip()]
-    if not ids:
-        return
-    with engine.begin() as conn:
-        conn.execute(
-            text(f"DELETE FROM {table} WHERE customer_id = :cid AND dt = :dt AND {pk} = ANY(:ids)"),
-            {"cid": str(customer_id), "dt": target_dt, "ids": ids},
-        )
-
-
-def _fetch_existing_scope_ids(engine: Engine, table: str, customer_id: str, target_dt: date, pk: str, ids: List[str]) -> List[str]:
-    ids = [str(x).strip() for x in (ids or []) if str(x).strip()]
-    if not ids:
-        return []
-    with engine.connect() as conn:
-        rows = conn.execute(
-            text(f"SELECT {pk}::text AS scope_id FROM {table} WHERE customer_id = :cid AND dt = :dt AND {pk} = ANY(:ids)"),
-            {"cid": str(customer_id), "dt": target_dt, "ids": ids},
-        ).fetchall()
-    seen = set()
-    out: List[str] = []
-    for row in rows or []:
-        value = str((row[0] if row else '') or '').strip()
-        if value and value not in seen:
-            seen.add(value)
-            out.append(value)
-    return out
-
-
 def replace_fact_range(engine: Engine, table: str, rows: List[Dict[str, Any]], customer_id: str, target_dt: date) -> None:
+    # GFA 는 해당 일자의 캠페인/소재 행을 upsert 하고, 리포트가 비었을 때만 그 날짜를 비운다.
     pk = "campaign_id" if table == "fact_campaign_daily" else "ad_id"
-    scope_ids = []
-    seen = set()
-    for row in rows or []:
-        value = str((row or {}).get(pk) or '').strip()
-        if value and value not in seen:
-            seen.add(value)
-            scope_ids.append(value)
-
-    if not scope_ids:
-        if not rows:
-            clear_fact_range(engine, table, customer_id, target_dt)
-            return
-        upsert_many(engine, table, rows, ["dt", "customer_id", pk])
-        return
-
     if not rows:
-        clear_fact_scope(engine, table, customer_id, target_dt, pk, scope_ids)
+        clear_fact_range(engine, table, customer_id, target_dt)
         return
-
-    existing_ids = _fetch_existing_scope_ids(engine, table, customer_id, target_dt, pk, scope_ids)
-    keep = {str(x).strip() for x in scope_ids if str(x).strip()}
-    stale_ids = [str(x).strip() for x in existing_ids if str(x).strip() and str(x).strip() not in keep]
-    if stale_ids:
-        clear_fact_scope(engine, table, customer_id, target_dt, pk, stale_ids)
-
     upsert_many(engine, table, rows, ["dt", "customer_id", pk])
 
 def _to_int(v: Any) -> Optional[int]:
@@ -341,10 +272,49 @@ def get_access_token_if_available() -> Optional[str]:
     return None
 
 
+def load_account_manager_cache(path: Path = GFA_ACCOUNT_CACHE_FILE) -> Dict[str, Any]:
+    """광고계정 → AccessManagerAccountNo 캐시를 읽는다. TTL 이 지났거나 깨졌으면 빈 dict."""
+    try:
+        if not path.is_file():
+            return {}
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    age_hours = (time.time() - float(data.get("saved_at") or 0)) / 3600.0
+    if GFA_ACCOUNT_CACHE_TTL_HOURS <= 0 or age_hours > GFA_ACCOUNT_CACHE_TTL_HOURS:
+        return {}
+    return data
+
+
+def save_account_manager_cache(accounts: Dict[str, str], managers: List[str], path: Path = GFA_ACCOUNT_CACHE_FILE) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        payload = {"saved_at": time.time(), "accounts": dict(accounts), "managers": list(managers)}
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+    except Exception as e:
+        log(f"⚠️ GFA 계정 캐시 저장 실패 | {type(e).__name__}: {e}")
+
+
 class GfaApiClient:
     def __init__(self, access_token: str):
         self.access_token = access_token
-        self.session = requests.Session()
+        self._local = threading.local()
+        self._map_lock = threading.Lock()
+        self._account_managers: Optional[Dict[str, str]] = None
+        self._manager_nos: List[str] = []
+        self._manager_details: Dict[str, Any] = {}
+        self._map_from_cache = False
+
+    @property
+    def session(self) -> requests.Session:
+        # 계정 병렬 수집 시 스레드마다 커넥션 풀을 따로 쓴다.
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
 
     def request_json(self, method: str, path: str, *, params: Optional[Dict[str, Any]] = None, access_manager_account_no: Optional[str] = None, raise_for_status: bool = True) -> Any:
         headers = {"Authorization": f"Bearer {self.access_token}"}
@@ -376,56 +346,102 @@ class GfaApiClient:
             raise last_err
         raise RuntimeError("unexpected request failure")
 
+    def fetch_pages(self, path: str, *, params: Optional[Dict[str, Any]] = None, size: int = 100, access_manager_account_no: Optional[str] = None, raise_for_status: bool = True) -> List[Dict[str, Any]]:
+        """page/size 방식 목록을 모두 읽는다.
+
+        첫 페이지가 꽉 차 있으면 이후 페이지를 GFA_API_PAGE_PREFETCH 개씩 동시에 요청하고,
+        페이지 순서대로 이어 붙이다가 덜 찬 페이지에서 멈춘다.
+        """
+        base = dict(params or {})
+        base["size"] = size
+
+        def _get(page: int) -> List[Dict[str, Any]]:
+            data = self.request_json("GET", path, params={**base, "page": page}, access_manager_account_no=access_manager_account_no, raise_for_status=raise_for_status)
+            return _extract_items(data)
+
+        out = _get(0)
+        if len(out) < size:
+            return out
+        page = 1
+        window = GFA_API_PAGE_PREFETCH
+        with concurrent.futures.ThreadPoolExecutor(max_workers=window) as executor:
+            while True:
+                pages = list(executor.map(_get, range(page, page + window)))
+                for items in pages:
+                    out.extend(items)
+                    if len(items) < size:
+                        return out
+                page += window
+
     def list_ad_accounts(self) -> List[Dict[str, Any]]:
-        page = 0
-        out: List[Dict[str, Any]] = []
-        while True:
-            data = self.request_json("GET", f"/v1/ad-api/{GFA_API_VERSION}/adAccounts", params={"page": page, "size": 100}, raise_for_status=False)
-            items = _extract_items(data)
-            if not items:
-                break
-            out.extend(items)
-            if len(items) < 100:
-                break
-            page += 1
-        return out
+        return self.fetch_pages(f"/v1/ad-api/{GFA_API_VERSION}/adAccounts", size=100, raise_for_status=False)
 
     def list_manager_accounts(self) -> List[Dict[str, Any]]:
-        page = 0
-        out: List[Dict[str, Any]] = []
-        while True:
-            data = self.request_json("GET", f"/v1/ad-api/{GFA_API_VERSION}/managerAccounts", params={"page": page, "size": 100}, raise_for_status=False)
-            items = _extract_items(data)
-            if not items:
-                break
-            out.extend(items)
-            if len(items) < 100:
-                break
-            page += 1
-        return out
+        return self.fetch_pages(f"/v1/ad-api/{GFA_API_VERSION}/managerAccounts", size=100, raise_for_status=False)
+
+    def _load_account_manager_map(self, use_cache: bool = True) -> None:
+        cached = load_account_manager_cache() if use_cache else {}
+        self._map_from_cache = bool(cached)
+        if cached:
+            self._account_managers = {str(k): str(v) for k, v in (cached.get("accounts") or {}).items()}
+            self._manager_nos = [str(x) for x in (cached.get("managers") or [])]
+            log(f"♻️ GFA 계정 캐시 사용 | accounts={len(self._account_managers)} managers={len(self._manager_nos)}")
+            return
 
-    def resolve_manager_account_no(self, ad_account_no: str) -> str:
-        if GFA_MANAGER_ACCOUNT_NO:
-            return GFA_MANAGER_ACCOUNT_NO
-        ad_accounts = self.list_ad_accounts()
-        for item in ad_accounts:
+        accounts: Dict[str, str] = {}
+        for item in self.list_ad_accounts():
             acc_no = _pick_id(item, ["adAccountNo", "accountNo", "no", "id"])
-            if acc_no == str(ad_account_no):
-                mgr = _pick_id(item, ["accessManagerAccountNo", "managerAccountNo", "managerNo", "parentManagerAccountNo"])
-                if mgr:
-                    return mgr
-        managers = self.list_manager_accounts()
+            mgr = _pick_id(item, ["accessManagerAccountNo", "managerAccountNo", "managerNo", "parentManagerAccountNo"])
+            if acc_no and mgr and acc_no not in accounts:
+                accounts[acc_no] = mgr
         manager_nos: List[str] = []
-        for item in managers:
+        for item in self.list_manager_accounts():
             mgr = _pick_id(item, ["managerAccountNo", "accessManagerAccountNo", "no", "id"])
             if mgr:
                 manager_nos.append(mgr)
-        manager_nos = list(dict.fromkeys(manager_nos))
-        if len(manager_nos) == 1:
-            return manager_nos[0]
-        for mgr in manager_nos:
-            detail = self.request_json("GET", f"/v1/ad-api/{GFA_API_VERSION}/managerAccounts/{mgr}", access_manager_account_no=mgr, raise_for_status=False)
-            if _contains_value(detail, str(ad_account_no)):
+        self._account_managers = accounts
+        self._manager_nos = list(dict.fromkeys(manager_nos))
+        save_account_manager_cache(self._account_managers, self._manager_nos)
+
+    def _load_manager_details(self) -> None:
+        missing = [m for m in self._manager_nos if m not in self._manager_details]
+        if not missing:
+            return
+
+        def _detail(mgr: str) -> Any:
+            return self.request_json("GET", f"/v1/ad-api/{GFA_API_VERSION}/managerAccounts/{mgr}", access_manager_account_no=mgr, raise_for_status=False)
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(GFA_API_PAGE_PREFETCH, len(missing))) as executor:
+            for mgr, detail in zip(missing, executor.map(_detail, missing)):
+                self._manager_details[mgr] = detail
+
+    def _lookup_manager(self, acc: str) -> Optional[str]:
+        mgr = (self._account_managers or {}).get(acc)
+        if mgr:
+            return mgr
+        if len(self._manager_nos) == 1:
+            return self._manager_nos[0]
+        self._load_manager_details()
+        for mgr in self._manager_nos:
+            if _contains_value(self._manager_details.get(mgr), acc):
+                self._account_managers[acc] = mgr
+                save_account_manager_cache(self._account_managers, self._manager_nos)
+                return mgr
+        return None
+
+    def resolve_manager_account_no(self, ad_account_no: str) -> str:
+        if GFA_MANAGER_ACCOUNT_NO:
+            return GFA_MANAGER_ACCOUNT_NO
+        acc = str(ad_account_no)
+        with self._map_lock:
+            if self._account_managers is None:
+                self._load_account_manager_map()
+            mgr = self._lookup_manager(acc)
+            if not mgr and self._map_from_cache:
+                # 캐시 이후 새로 생긴 계정일 수 있으니 API 로 한 번 다시 만든다.
+                self._load_account_manager_map(use_cache=False)
+                mgr = self._lookup_manager(acc)
+            if mgr:
                 return mgr
         raise RuntimeError(
             f"광고계정 {ad_account_no} 의 AccessManagerAccountNo 를 자동 판별하지 못했습니다. GFA_MANAGER_ACCOUNT_NO 시크릿을 추가해 주세요."
@@ -433,29 +449,21 @@ class GfaApiClient:
 
     def paginate(self, path: str, *, params: Optional[Dict[str, Any]] = None, access_manager_account_no: Optional[str] = None) -> List[Dict[str, Any]]:
         params = dict(params or {})
+        if "limit" not in params and "next" not in params:
+            size = int(params.pop("size", 100))
+            params.pop("page", None)
+            return self.fetch_pages(path, params=params, size=size, access_manager_account_no=access_manager_account_no)
+
+        # next 토큰 방식은 다음 요청이 이전 응답에 의존하므로 순차로 읽는다.
         out: List[Dict[str, Any]] = []
-        next_token: Optional[str] = None
-        page = 0
+        params.setdefault("limit", 1000)
         while True:
-            if "limit" in params or "next" in params:
-                if next_token:
-                    params["next"] = next_token
-                else:
-                    params.setdefault("limit", 1000)
-            else:
-                params["page"] = page
-                params.setdefault("size", 100)
             data = self.request_json("GET", path, params=params, access_manager_account_no=access_manager_account_no)
-            items = _extract_items(data)
-            out.extend(items)
-            if "next" in params or "limit" in params:
-                next_token = _to_str(data.get("next")) if isinstance(data, dict) else ""
-                if not next_token:
-                    break
-            else:
-                if len(items) < int(params.get("size", 100)):
-                    break
-                page += 1
+            out.extend(_extract_items(data))
+            next_token = _to_str(data.get("next")) if isinstance(data, dict) else ""
+            if not next_token:
+                break
+            params["next"] = next_token
         return out
 
 
@@ -698,25 +706,51 @@ def upsert_placeholder_dims_from_perf(engine: Engine, customer_id: str, campaign
 # Crawl mode (ID/PW)
 # ------------------------------
 
+GFA_REPORT_COLUMN_ALIASES: Dict[str, List[str]] = {
+    "campaign_id": ["캠페인ID", "캠페인번호", "campaign id", "campaign no", "campaignno"],
+    "campaign_name": ["캠페인명", "캠페인", "campaign name", "campaign"],
+    "adgroup_id": ["광고그룹ID", "광고그룹번호", "adset id", "adset no", "adgroup id", "ad group id"],
+    "adgroup_name": ["광고그룹명", "광고그룹", "adset name", "ad group"],
+    "ad_id": ["소재ID", "소재번호", "creative id", "creative no", "ad id"],
+    "ad_name": ["소재명", "소재", "creative name", "creative"],
+    "imp": ["노출수", "impressions", "imp"],
+    "clk": ["클릭수", "clicks", "clk"],
+    "cost": ["총비용(VAT포함, 원)", "총비용원", "총비용", "cost", "spend"],
+    "conv": ["총 전환수", "총전환수", "전환수", "conversions", "conv"],
+    "sales": ["총 전환매출액", "총전환매출액", "전환매출액", "sales", "convsales"],
+    "campaign_tp": ["캠페인목적", "목적", "objective"],
+    "status": ["상태", "status"],
+}
+
+
 def normalize_header(s: str) -> str:
     return re.sub(r"[^0-9a-zA-Z가-힣]+", "", str(s or "")).lower()
 
 
-def choose_col(headers: List[str], aliases: Iterable[str]) -> Optional[str]:
-    norm_map = {normalize_header(h): h for h in headers}
-    for alias in aliases:
-        key = normalize_header(alias)
+def _choose_normalized(headers: List[str], norm_headers: List[str], norm_map: Dict[str, str], aliases: Iterable[str]) -> Optional[str]:
+    keys = [normalize_header(alias) for alias in aliases]
+    for key in keys:
         if key in norm_map:
             return norm_map[key]
-    for h in headers:
-        nh = normalize_header(h)
-        for alias in aliases:
-            key = normalize_header(alias)
+    for h, nh in zip(headers, norm_headers):
+        for key in keys:
             if key and key in nh:
                 return h
     return None
 
 
+def choose_col(headers: List[str], aliases: Iterable[str]) -> Optional[str]:
+    norm_headers = [normalize_header(h) for h in headers]
+    return _choose_normalized(headers, norm_headers, dict(zip(norm_headers, headers)), aliases)
+
+
+def resolve_report_columns(headers: List[str]) -> Dict[str, Optional[str]]:
+    """GFA_REPORT_COLUMN_ALIASES 의 각 필드를 리포트 헤더에 한 번에 매핑한다."""
+    norm_headers = [normalize_header(h) for h in headers]
+    norm_map = dict(zip(norm_headers, headers))
+    return {field: _choose_normalized(headers, norm_headers, norm_map, aliases) for field, aliases in GFA_REPORT_COLUMN_ALIASES.items()}
+
+
 def detect_header_row(df: pd.DataFrame) -> int:
     target_tokens = [
         "캠페인", "광고그룹", "소재", "노출수", "클릭수", "총비용", "전환수", "전환매출액",
@@ -735,210 +769,175 @@ def detect_header_row(df: pd.DataFrame) -> int:
     return best_idx
 
 
-def read_report_file(path: Path) -> pd.DataFrame:
-    suffix = path.suffix.lower()
-    if suffix in {".xlsx", ".xlsm", ".xls"}:
-        raw = pd.read_excel(path, header=None)
-    else:
-        encodings = ["utf-8-sig", "cp949", "euc-kr", "utf-8"]
-        seps = ["\t", ",", None]
-        last_err = None
-        raw = None
-        for enc in encodings:
-            for sep in seps:
+def _excel_engine() -> Optional[str]:
+    # python-calamine(Rust) 가 있으면 openpyxl 보다 훨씬 빠르게 읽는다.
+    return "calamine" if importlib.util.find_spec("python_calamine") is not None else None
+
+
+def _read_report_csv(path: Path) -> pd.DataFrame:
+    encodings = ["utf-8-sig", "cp949", "euc-kr", "utf-8"]
+    seps = ["\t", ",", None]
+    last_err = None
+    for enc in encodings:
+        for sep in seps:
+            # 구분자가 정해진 경우 C 엔진을 먼저 쓰고, 행마다 컬럼 수가 다르면 python 엔진으로 재시도한다.
+            for engine in (["c", "python"] if sep else ["python"]):
                 try:
-                    raw = pd.read_csv(path, header=None, sep=sep, engine="python", encoding=enc)
-                    if raw is not None and not raw.empty:
-                        break
+                    raw = pd.read_csv(path, header=None, sep=sep, engine=engine, encoding=enc)
                 except Exception as e:
                     last_err = e
                     continue
-            if raw is not None and not raw.empty:
+                if raw is not None and not raw.empty:
+                    return raw
                 break
-        if raw is None:
-            raise RuntimeError(f"리포트 파일 읽기 실패: {path.name} | {last_err}")
+    raise RuntimeError(f"리포트 파일 읽기 실패: {path.name} | {last_err}")
+
+
+def read_report_file(path: Path) -> pd.DataFrame:
+    suffix = path.suffix.lower()
+    if suffix in {".xlsx", ".xlsm", ".xls"}:
+        engine = _excel_engine()
+        try:
+            raw = pd.read_excel(path, header=None, engine=engine)
+        except Exception:
+            if engine is None:
+                raise
+            raw = pd.read_excel(path, header=None)
+    else:
+        raw = _read_report_csv(path)
     hdr = detect_header_row(raw)
     header = [str(x).strip() for x in raw.iloc[hdr].fillna("").tolist()]
     data = raw.iloc[hdr + 1 :].copy()
-    data.columns = header
+    data.columns = [c or f"col_{i}" for i, c in enumerate(header)]
     data = data.dropna(how="all")
-    data = data.loc[:, [str(c).strip() for c in data.columns].count if False else data.columns]
-    data.columns = [str(c).strip() or f"col_{i}" for i, c in enumerate(data.columns)]
     data = data.reset_index(drop=True)
     return data
 
 
+def _report_str(df: pd.DataFrame, headers: List[str], col: Optional[str], default: str = "") -> pd.Series:
+    if not col:
+        return pd.Series(default, index=df.index, dtype=object)
+    s = df.iloc[:, headers.index(col)]
+    out = s.astype(str).str.strip()
+    out = out.where(s.notna() & (out.str.lower() != "nan"), "")
+    return out.astype(object)
+
+
+def _report_num(df: pd.DataFrame, headers: List[str], col: Optional[str]) -> pd.Series:
+    if not col:
+        return pd.Series(0.0, index=df.index)
+    s = df.iloc[:, headers.index(col)]
+    num = pd.to_numeric(s, errors="coerce")
+    retry = num.isna() & s.notna()
+    if retry.any():
+        cleaned = s[retry].astype(str).str.replace(",", "", regex=False).str.strip()
+        num.loc[retry] = pd.to_numeric(cleaned, errors="coerce")
+    return num.astype(float).fillna(0.0)
+
+
+def _gfa_fact_rows(parts: pd.DataFrame, key: str, customer_id: str, target_dt: date) -> List[Dict[str, Any]]:
+    sub = parts.loc[parts[key] != "", [key, "imp", "clk", "cost", "conv", "sales"]]
+    if sub.empty:
+        return []
+    g = sub.groupby(key, sort=False).sum()
+    cost = g["cost"].astype("int64")
+    sales = g["sales"].astype("int64")
+    roas = np.where(cost > 0, sales / cost.where(cost > 0, 1) * 100.0, 0.0)
+    out = pd.DataFrame({
+        "dt": target_dt,
+        "customer_id": str(customer_id),
+        key: g.index.astype(object),
+        "imp": g["imp"].astype("int64"),
+        "clk": g["clk"].astype("int64"),
+        "cost": cost,
+        "conv": g["conv"].astype(float),
+        "sales": sales,
+        "roas": roas,
+        "avg_rnk": 0.0,
+        "purchase_conv": g["conv"].astype(float),
+        "purchase_sales": sales,
+        "purchase_roas": roas,
+        "cart_conv": 0.0,
+        "cart_sales": 0,
+        "cart_roas": 0.0,
+        "wishlist_conv": 0.0,
+        "wishlist_sales": 0,
+        "wishlist_roas": 0.0,
+        "primary_conv": g["conv"].astype(float),
+        "primary_sales": sales,
+        "primary_roas": roas,
+        "split_available": False,
+        "data_source": "gfa_ui_report",
+    })
+    return out.to_dict("records")
+
+
 def parse_gfa_report(df: pd.DataFrame, customer_id: str, account_name: str, target_dt: date) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]], List[Dict[str, Any]]]:
     if df is None or df.empty:
         raise RuntimeError("다운로드된 GFA 리포트가 비어 있습니다.")
 
-    headers = list(df.columns)
+    headers = [str(c) for c in df.columns]
     write_debug_text(f"parsed_columns_{slugify(account_name)}_{target_dt.isoformat()}.txt", "\n".join(headers))
 
-    campaign_id_col = choose_col(headers, ["캠페인ID", "캠페인번호", "campaign id", "campaign no", "campaignno"])
-    campaign_name_col = choose_col(headers, ["캠페인명", "캠페인", "campaign name", "campaign"])
-    adgroup_id_col = choose_col(headers, ["광고그룹ID", "광고그룹번호", "adset id", "adset no", "adgroup id", "ad group id"])
-    adgroup_name_col = choose_col(headers, ["광고그룹명", "광고그룹", "adset name", "ad group"])
-    ad_id_col = choose_col(headers, ["소재ID", "소재번호", "creative id", "creative no", "ad id"])
-    ad_name_col = choose_col(headers, ["소재명", "소재", "creative name", "creative"])
-    imp_col = choose_col(headers, ["노출수", "impressions", "imp"])
-    clk_col = choose_col(headers, ["클릭수", "clicks", "clk"])
-    cost_col = choose_col(headers, ["총비용(VAT포함, 원)", "총비용원", "총비용", "cost", "spend"])
-    conv_col = choose_col(headers, ["총 전환수", "총전환수", "전환수", "conversions", "conv"])
-    sales_col = choose_col(headers, ["총 전환매출액", "총전환매출액", "전환매출액", "sales", "convsales"])
-    campaign_tp_col = choose_col(headers, ["캠페인목적", "목적", "objective"])
-    status_col = choose_col(headers, ["상태", "status"])
-
-    if not campaign_id_col and not ad_id_col:
+    cols = resolve_report_columns(headers)
+    if not cols["campaign_id"] and not cols["ad_id"]:
         raise RuntimeError(
             "GFA 리포트에서 캠페인/소재 식별 컬럼을 찾지 못했습니다. 광고 단위를 '캠페인 또는 소재'로 맞춘 리포트인지 확인해 주세요."
         )
-    if not imp_col and not clk_col and not cost_col:
+    if not cols["imp"] and not cols["clk"] and not cols["cost"]:
         raise RuntimeError("GFA 리포트에서 성과 컬럼(노출/클릭/비용)을 찾지 못했습니다.")
 
-    dim_campaign_map: Dict[str, Dict[str, Any]] = {}
-    dim_adgroup_map: Dict[str, Dict[str, Any]] = {}
-    dim_ad_map: Dict[str, Dict[str, Any]] = {}
-    fact_campaign_map: Dict[Tuple[date, str, str], Dict[str, Any]] = {}
-    fact_ad_map: Dict[Tuple[date, str, str], Dict[str, Any]] = {}
-
-    for _, row in df.iterrows():
-        campaign_id = _to_str(row.get(campaign_id_col)) if campaign_id_col else ""
-        campaign_name = _to_str(row.get(campaign_name_col)) if campaign_name_col else ""
-        adgroup_id = _to_str(row.get(adgroup_id_col)) if adgroup_id_col else ""
-        adgroup_name = _to_str(row.get(adgroup_name_col)) if adgroup_name_col else ""
-        ad_id = _to_str(row.get(ad_id_col)) if ad_id_col else ""
-        ad_name = _to_str(row.get(ad_name_col)) if ad_name_col else ""
-        status = _to_str(row.get(status_col)) if status_col else ""
-        campaign_tp = _to_str(row.get(campaign_tp_col)) if campaign_tp_col else "gfa"
-
-        if not campaign_id and ad_id:
-            campaign_id = f"campaign_of_{ad_id}"
-        if not campaign_name and campaign_id:
-            campaign_name = campaign_id
-        if not adgroup_name and adgroup_id:
-            adgroup_name = adgroup_id
-        if not ad_name and ad_id:
-            ad_name = ad_id
-
-        imp = int(round(_to_float(row.get(imp_col), 0.0))) if imp_col else 0
-        clk = int(round(_to_float(row.get(clk_col), 0.0))) if clk_col else 0
-        cost = int(round(_to_float(row.get(cost_col), 0.0))) if cost_col else 0
-        conv = _to_float(row.get(conv_col), 0.0) if conv_col else 0.0
-        sales = int(round(_to_float(row.get(sales_col), 0.0))) if sales_col else 0
-        roas = (sales / cost * 100.0) if cost > 0 else 0.0
-
-        if campaign_id:
-            dim_campaign_map[campaign_id] = {
-                "customer_id": str(customer_id),
-                "campaign_id": campaign_id,
-                "campaign_name": campaign_name or campaign_id,
-                "campaign_tp": f"gfa_{campaign_tp.lower()}" if campaign_tp and not campaign_tp.lower().startswith("gfa") else (campaign_tp.lower() or "gfa"),
-                "status": status,
-            }
-            key_c = (target_dt, str(customer_id), campaign_id)
-            bucket_c = fact_campaign_map.setdefault(key_c, {
-                "dt": target_dt,
-                "customer_id": str(customer_id),
-                "campaign_id": campaign_id,
-                "imp": 0,
-                "clk": 0,
-                "cost": 0,
-                "conv": 0.0,
-                "sales": 0,
-                "roas": 0.0,
-                "avg_rnk": 0.0,
-                "purchase_conv": 0.0,
-                "purchase_sales": 0,
-                "purchase_roas": 0.0,
-                "cart_conv": 0.0,
-                "cart_sales": 0,
-                "cart_roas": 0.0,
-                "wishlist_conv": 0.0,
-                "wishlist_sales": 0,
-                "wishlist_roas": 0.0,
-                "primary_conv": 0.0,
-                "primary_sales": 0,
-                "primary_roas": 0.0,
-                "split_available": False,
-                "data_source": "gfa_ui_report",
-            })
-            bucket_c["imp"] += imp
-            bucket_c["clk"] += clk
-            bucket_c["cost"] += cost
-            bucket_c["conv"] += conv
-            bucket_c["sales"] += sales
-            bucket_c["purchase_conv"] += conv
-            bucket_c["purchase_sales"] += sales
-            bucket_c["primary_conv"] += conv
-            bucket_c["primary_sales"] += sales
-
-        if adgroup_id:
-            dim_adgroup_map[adgroup_id] = {
-                "customer_id": str(customer_id),
-                "adgroup_id": adgroup_id,
-                "adgroup_name": adgroup_name or adgroup_id,
-                "campaign_id": campaign_id,
-                "status": status,
-            }
-
-        if ad_id:
-            dim_ad_map[ad_id] = {
-                "customer_id": str(customer_id),
-                "ad_id": ad_id,
-                "adgroup_id": adgroup_id,
-                "ad_name": ad_name or ad_id,
-                "status": status,
-                "ad_title": ad_name or "",
-                "ad_desc": "",
-                "pc_landing_url": "",
-                "mobile_landing_url": "",
-                "creative_text": ad_name or "",
-                "image_url": "",
-            }
-            key_a = (target_dt, str(customer_id), ad_id)
-            bucket_a = fact_ad_map.setdefault(key_a, {
-                "dt": target_dt,
-                "customer_id": str(customer_id),
-                "ad_id": ad_id,
-                "imp": 0,
-                "clk": 0,
-                "cost": 0,
-                "conv": 0.0,
-                "sales": 0,
-                "roas": 0.0,
-                "avg_rnk": 0.0,
-                "purchase_conv": 0.0,
-                "purchase_sales": 0,
-                "purchase_roas": 0.0,
-                "cart_conv": 0.0,
-                "cart_sales": 0,
-                "cart_roas": 0.0,
-                "wishlist_conv": 0.0,
-                "wishlist_sales": 0,
-                "wishlist_roas": 0.0,
-                "primary_conv": 0.0,
-                "primary_sales": 0,
-                "primary_roas": 0.0,
-                "split_available": False,
-                "data_source": "gfa_ui_report",
-            })
-            bucket_a["imp"] += imp
-            bucket_a["clk"] += clk
-            bucket_a["cost"] += cost
-            bucket_a["conv"] += conv
-            bucket_a["sales"] += sales
-            bucket_a["purchase_conv"] += conv
-            bucket_a["purchase_sales"] += sales
-            bucket_a["primary_conv"] += conv
-            bucket_a["primary_sales"] += sales
-
-    campaign_facts = list(fact_campaign_map.values())
-    ad_facts = list(fact_ad_map.values())
-    for row in campaign_facts + ad_facts:
-        row["roas"] = (row["sales"] / row["cost"] * 100.0) if row["cost"] > 0 else 0.0
-        row["purchase_roas"] = (row["purchase_sales"] / row["cost"] * 100.0) if row["cost"] > 0 else 0.0
-        row["primary_roas"] = (row["primary_sales"] / row["cost"] * 100.0) if row["cost"] > 0 else 0.0
+    # 별칭 매핑은 파일당 한 번, 문자열 정리/숫자 변환은 컬럼 단위로 처리한다.
+    campaign_id = _report_str(df, headers, cols["campaign_id"])
+    ad_id = _report_str(df, headers, cols["ad_id"])
+    adgroup_id = _report_str(df, headers, cols["adgroup_id"])
+    campaign_id = campaign_id.where((campaign_id != "") | (ad_id == ""), "campaign_of_" + ad_id)
+    campaign_name = _report_str(df, headers, cols["campaign_name"])
+    adgroup_name = _report_str(df, headers, cols["adgroup_name"])
+    ad_name = _report_str(df, headers, cols["ad_name"])
+    campaign_tp = _report_str(df, headers, cols["campaign_tp"], default="gfa")
+    tp_lower = campaign_tp.str.lower()
+    parts = pd.DataFrame({
+        "campaign_id": campaign_id,
+        "campaign_name": campaign_name.where(campaign_name != "", campaign_id),
+        "adgroup_id": adgroup_id,
+        "adgroup_name": adgroup_name.where(adgroup_name != "", adgroup_id),
+        "ad_id": ad_id,
+        "ad_name": ad_name.where(ad_name != "", ad_id),
+        "status": _report_str(df, headers, cols["status"]),
+        "campaign_tp": np.where(
+            (campaign_tp != "") & ~tp_lower.str.startswith("gfa"),
+            "gfa_" + tp_lower,
+            tp_lower.where(tp_lower != "", "gfa"),
+        ),
+        "imp": np.round(_report_num(df, headers, cols["imp"])),
+        "clk": np.round(_report_num(df, headers, cols["clk"])),
+        "cost": np.round(_report_num(df, headers, cols["cost"])),
+        "conv": _report_num(df, headers, cols["conv"]),
+        "sales": np.round(_report_num(df, headers, cols["sales"])),
+    })
+
+    # dim 은 같은 ID 의 마지막 행 값을 쓰되 순서는 처음 등장한 순서를 유지한다.
+    camp = parts.loc[parts["campaign_id"] != "", ["campaign_id", "campaign_name", "campaign_tp", "status"]].groupby("campaign_id", sort=False).last().reset_index()
+    camp.insert(0, "customer_id", str(customer_id))
+    dim_campaign_map: Dict[str, Dict[str, Any]] = {r["campaign_id"]: r for r in camp[["customer_id", "campaign_id", "campaign_name", "campaign_tp", "status"]].to_dict("records")}
+
+    grp = parts.loc[parts["adgroup_id"] != "", ["adgroup_id", "adgroup_name", "campaign_id", "status"]].groupby("adgroup_id", sort=False).last().reset_index()
+    grp.insert(0, "customer_id", str(customer_id))
+    dim_adgroup_rows = grp[["customer_id", "adgroup_id", "adgroup_name", "campaign_id", "status"]].to_dict("records")
+
+    ads = parts.loc[parts["ad_id"] != "", ["ad_id", "adgroup_id", "ad_name", "status"]].groupby("ad_id", sort=False).last().reset_index()
+    ads.insert(0, "customer_id", str(customer_id))
+    ads["ad_title"] = ads["ad_name"]
+    ads["ad_desc"] = ""
+    ads["pc_landing_url"] = ""
+    ads["mobile_landing_url"] = ""
+    ads["creative_text"] = ads["ad_name"]
+    ads["image_url"] = ""
+    dim_ad_rows = ads[["customer_id", "ad_id", "adgroup_id", "ad_name", "status", "ad_title", "ad_desc", "pc_landing_url", "mobile_landing_url", "creative_text", "image_url"]].to_dict("records")
+
+    campaign_facts = _gfa_fact_rows(parts, "campaign_id", customer_id, target_dt)
+    ad_facts = _gfa_fact_rows(parts, "ad_id", customer_id, target_dt)
 
     if not campaign_facts and ad_facts:
         # 소재 레벨만 있고 캠페인 식별이 불완전한 경우 최소 placeholder 생성
@@ -980,12 +979,28 @@ def parse_gfa_report(df: pd.DataFrame, customer_id: str, account_name: str, targ
         campaign_facts[-1]["purchase_roas"] = (campaign_facts[-1]["purchase_sales"] / campaign_facts[-1]["cost"] * 100.0) if campaign_facts[-1]["cost"] > 0 else 0.0
         campaign_facts[-1]["primary_roas"] = (campaign_facts[-1]["primary_sales"] / campaign_facts[-1]["cost"] * 100.0) if campaign_facts[-1]["cost"] > 0 else 0.0
 
-    return list(dim_campaign_map.values()), list(dim_adgroup_map.values()), list(dim_ad_map.values()), campaign_facts, ad_facts
+    return list(dim_campaign_map.values()), dim_adgroup_rows, dim_ad_rows, campaign_facts, ad_facts
+
+
+def load_storage_state_path(path: Path = GFA_STORAGE_STATE_FILE) -> Optional[Path]:
+    """저장된 로그인 세션 파일이 있고 GFA_STORAGE_STATE_MAX_AGE_HOURS 이내면 경로를 돌려준다."""
+    try:
+        if not path.is_file() or path.stat().st_size <= 0:
+            return None
+        age_hours = (time.time() - path.stat().st_mtime) / 3600.0
+    except Exception:
+        return None
+    if GFA_STORAGE_STATE_MAX_AGE_HOURS > 0 and age_hours > GFA_STORAGE_STATE_MAX_AGE_HOURS:
+        log(f"⌛ 저장된 로그인 세션이 오래되어 무시합니다 ({age_hours:.1f}h)")
+        return None
+    return path
 
 
 class GfaCrawler:
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, storage_state: Optional[Path] = None):
         self.headless = headless
+        self.storage_state = storage_state
+        self.debug_tag = ""
         self.play = None
         self.browser = None
         self.context = None
@@ -1000,10 +1015,65 @@ class GfaCrawler:
             ) from e
         self.play = sync_playwright().start()
         self.browser = self.play.chromium.launch(headless=self.headless, args=["--disable-blink-features=AutomationControlled"])
-        self.context = self.browser.new_context(accept_downloads=True, viewport={"width": 1600, "height": 1200})
+        self.new_context()
+        return self
+
+    def new_context(self) -> None:
+        """브라우저는 그대로 두고 저장된 세션으로 격리된 새 컨텍스트/페이지를 연다."""
+        if self.context:
+            try:
+                self.context.close()
+            except Exception:
+                pass
+        kwargs: Dict[str, Any] = {"accept_downloads": True, "viewport": {"width": 1600, "height": 1200}}
+        if self.storage_state and Path(self.storage_state).is_file():
+            kwargs["storage_state"] = str(self.storage_state)
+        self.context = self.browser.new_context(**kwargs)
         self.page = self.context.new_page()
         self.page.set_default_timeout(GFA_PLAYWRIGHT_TIMEOUT_MS)
-        return self
+
+    def save_storage_state(self, path: Path = GFA_STORAGE_STATE_FILE) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        self.context.storage_state(path=str(tmp))
+        try:
+            os.chmod(tmp, 0o600)
+        except Exception:
+            pass
+        os.replace(tmp, path)
+        self.storage_state = path
+
+    def is_logged_out(self) -> bool:
+        url = ""
+        try:
+            url = self.page.url or ""
+        except Exception:
+            pass
+        return "nidlogin" in url or "nid.naver.com" in url
+
+    def ensure_session(self, user_id: str, password: str, path: Path = GFA_STORAGE_STATE_FILE) -> bool:
+        """저장된 세션으로 GFA 진입을 먼저 시도하고, 만료된 경우에만 로그인 후 세션을 저장한다.
+
+        로그인을 새로 했으면 True 를 돌려준다.
+        """
+        if self.storage_state:
+            try:
+                self.go_gfa_platform()
+                if not self.is_logged_out():
+                    log("♻️ 저장된 로그인 세션 재사용")
+                    return False
+            except Exception as e:
+                log(f"⚠️ 저장된 로그인 세션 만료/무효 → 재로그인 | {type(e).__name__}")
+            self.storage_state = None
+            self.new_context()
+        self.login(user_id, password)
+        self.go_gfa_platform()
+        try:
+            self.save_storage_state(path)
+            log(f"💾 로그인 세션 저장: {path}")
+        except Exception as e:
+            log(f"⚠️ 로그인 세션 저장 실패 | {type(e).__name__}: {e}")
+        return True
 
     def __exit__(self, exc_type, exc, tb):
         try:
@@ -1022,9 +1092,12 @@ class GfaCrawler:
         except Exception:
             pass
 
-    def screenshot(self, name: str) -> Path:
+    def _debug_path(self, name: str) -> Path:
         ensure_dirs()
-        p = GFA_DEBUG_DIR / name
+        return GFA_DEBUG_DIR / (f"{self.debug_tag}_{name}" if self.debug_tag else name)
+
+    def screenshot(self, name: str) -> Path:
+        p = self._debug_path(name)
         try:
             self.page.screenshot(path=str(p), full_page=True)
         except Exception:
@@ -1032,8 +1105,7 @@ class GfaCrawler:
         return p
 
     def page_dump(self, name: str) -> Path:
-        ensure_dirs()
-        p = GFA_DEBUG_DIR / name
+        p = self._debug_path(name)
         try:
             p.write_text(self.page.content(), encoding="utf-8")
         except Exception:
@@ -1173,6 +1245,9 @@ class GfaCrawler:
         if "ads.naver.com" not in (self.page.url or ""):
             self.goto_soft(ADS_HOME_URL, wait_until="domcontentloaded")
             self.wait_network_idle(4)
+            # 세션 만료로 로그인 페이지로 튕기면 메뉴 탐색 없이 돌려주고 호출 측이 is_logged_out 으로 판단한다.
+            if self.is_logged_out():
+                return
 
         success_markers = [
             "광고 계정", "성과 리포트", "대시보드", "광고관리", "캠페인 만들기",
@@ -1345,51 +1420,153 @@ class GfaCrawler:
         return save_path
 
 
+class GfaSessionExpired(RuntimeError):
+    """계정 크롤링 중 로그인 페이지로 돌아간 경우."""
+
+
+class GfaSharedSession:
+    """병렬 워커가 함께 쓰는 저장 로그인 세션. 실행 중 만료되면 한 워커만 다시 로그인해 파일을 갱신한다."""
+
+    def __init__(self, user_id: str, password: str, path: Path):
+        self.user_id = user_id
+        self.password = password
+        self.path = path
+        self.lock = threading.Lock()
+        self.generation = 0
+
+    def refresh(self, crawler: GfaCrawler, seen_generation: int) -> None:
+        with self.lock:
+            if self.generation == seen_generation:
+                log("🔑 로그인 세션 만료 → 재로그인 후 세션 갱신")
+                crawler.storage_state = None
+                crawler.new_context()
+                crawler.login(self.user_id, self.password)
+                crawler.go_gfa_platform()
+                crawler.save_storage_state(self.path)
+                self.generation += 1
+                log(f"💾 로그인 세션 갱신: {self.path}")
+            else:
+                log("♻️ 다른 워커가 갱신한 로그인 세션 사용")
+            crawler.storage_state = self.path
+
+
+def crawl_account_report(crawler: GfaCrawler, acc: Dict[str, str], target_dt: date) -> Path:
+    """계정 선택 → 날짜 지정 → 리포트 다운로드까지 브라우저 단계만 수행하고 파일 경로를 돌려준다."""
+    customer_id = _to_str(acc.get("id"))
+    account_name = _to_str(acc.get("name")) or customer_id
+    crawler.go_gfa_platform()
+    if crawler.is_logged_out():
+        raise GfaSessionExpired("저장된 로그인 세션이 만료되었습니다.")
+    crawler.select_account(customer_id, account_name)
+    crawler.go_report_area()
+    crawler.switch_to_creative_level()
+    crawler.set_date_filter(target_dt)
+    return crawler.download_report(account_name, target_dt)
+
+
+def _crawl_one_account(crawler: GfaCrawler, engine: Engine, acc: Dict[str, str], target_dt: date) -> None:
+    customer_id = _to_str(acc.get("id"))
+    account_name = _to_str(acc.get("name")) or customer_id
+    log(f"🚀 [CRAWL] [{account_name}] ({customer_id}) 수집 시작 | {target_dt.isoformat()}")
+    upsert_many(engine, "dim_account", [{"customer_id": customer_id, "account_name": account_name}], ["customer_id"])
+    report_path = crawl_account_report(crawler, acc, target_dt)
+    log(f"   ↳ 다운로드 완료: {report_path}")
+    parsed = read_report_file(report_path)
+    dim_campaign_rows, dim_adgroup_rows, dim_ad_rows, fact_campaign_rows, fact_ad_rows = parse_gfa_report(parsed, customer_id, account_name, target_dt)
+
+    if dim_campaign_rows:
+        upsert_many(engine, "dim_campaign", dim_campaign_rows, ["customer_id", "campaign_id"])
+    if dim_adgroup_rows:
+        upsert_many(engine, "dim_adgroup", dim_adgroup_rows, ["customer_id", "adgroup_id"])
+    if dim_ad_rows:
+        upsert_many(engine, "dim_ad", dim_ad_rows, ["customer_id", "ad_id"])
+    replace_fact_range(engine, "fact_campaign_daily", fact_campaign_rows, customer_id, target_dt)
+    replace_fact_range(engine, "fact_ad_daily", fact_ad_rows, customer_id, target_dt)
+    log(f"✅ [CRAWL] [{account_name}] 완료 | campaigns={len(fact_campaign_rows)} rows, creatives={len(fact_ad_rows)} rows")
+
+
+def _crawl_worker(
+    crawler: GfaCrawler,
+    engine: Engine,
+    pending: List[Dict[str, str]],
+    lock: threading.Lock,
+    target_dt: date,
+    errors: List[str],
+    session: GfaSharedSession,
+    crawl_account_fn: Callable[[GfaCrawler, Engine, Dict[str, str], date], None] = _crawl_one_account,
+) -> None:
+    # 브라우저 하나를 재사용하고 계정마다 저장된 세션으로 격리된 컨텍스트를 새로 연다.
+    while True:
+        with lock:
+            if not pending:
+                return
+            acc = pending.pop(0)
+        customer_id = _to_str(acc.get("id"))
+        account_name = _to_str(acc.get("name")) or customer_id
+        crawler.debug_tag = slugify(account_name)
+        try:
+            for attempt in range(GFA_SESSION_RELOGIN_RETRIES + 1):
+                seen_generation = session.generation
+                try:
+                    if crawler.storage_state:
+                        crawler.new_context()
+                    crawl_account_fn(crawler, engine, acc, target_dt)
+                    break
+                except Exception as e:
+                    expired = isinstance(e, GfaSessionExpired) or crawler.is_logged_out()
+                    if not expired or attempt >= GFA_SESSION_RELOGIN_RETRIES:
+                        raise
+                    log(f"⚠️ [{account_name}] 실행 중 로그인 세션 만료 감지 → 재로그인 후 재시도 ({attempt + 1}/{GFA_SESSION_RELOGIN_RETRIES})")
+                    session.refresh(crawler, seen_generation)
+        except Exception as e:
+            msg = f"[{account_name}] {customer_id} 실패: {e}"
+            with lock:
+                errors.append(msg)
+            log(f"❌ {msg}")
+            try:
+                crawler.screenshot(f"err_{slugify(account_name)}.png")
+                crawler.page_dump(f"err_{slugify(account_name)}.html")
+            except Exception:
+                pass
+
+
+def _run_crawl_thread(engine: Engine, session: GfaSharedSession, pending: List[Dict[str, str]], lock: threading.Lock, target_dt: date, errors: List[str]) -> None:
+    # sync Playwright 객체는 스레드 간 공유가 안 되므로 워커 스레드마다 브라우저를 따로 띄운다.
+    try:
+        with GfaCrawler(headless=GFA_HEADLESS, storage_state=session.path) as crawler:
+            _crawl_worker(crawler, engine, pending, lock, target_dt, errors, session)
+    except Exception as e:
+        log(f"⚠️ 크롤링 워커 종료 | {type(e).__name__}: {e}")
+
+
 def collect_via_crawl(engine: Engine, accounts: List[Dict[str, str]], target_dt: date) -> None:
     if not GFA_ID or not GFA_PW:
         die("GFA_ID / GFA_PW 가 설정되지 않았습니다. ID/PW 크롤링 모드에서는 두 시크릿이 모두 필요합니다.")
 
     ensure_dirs()
     errors: List[str] = []
-
-    with GfaCrawler(headless=GFA_HEADLESS) as crawler:
-        crawler.login(GFA_ID, GFA_PW)
-        crawler.go_gfa_platform()
-
-        for acc in accounts:
-            customer_id = _to_str(acc.get("id"))
-            account_name = _to_str(acc.get("name")) or customer_id
-            try:
-                log(f"🚀 [CRAWL] [{account_name}] ({customer_id}) 수집 시작 | {target_dt.isoformat()}")
-                upsert_many(engine, "dim_account", [{"customer_id": customer_id, "account_name": account_name}], ["customer_id"])
-                crawler.go_gfa_platform()
-                crawler.select_account(customer_id, account_name)
-                crawler.go_report_area()
-                crawler.switch_to_creative_level()
-                crawler.set_date_filter(target_dt)
-                report_path = crawler.download_report(account_name, target_dt)
-                log(f"   ↳ 다운로드 완료: {report_path}")
-                parsed = read_report_file(report_path)
-                dim_campaign_rows, dim_adgroup_rows, dim_ad_rows, fact_campaign_rows, fact_ad_rows = parse_gfa_report(parsed, customer_id, account_name, target_dt)
-
-                if dim_campaign_rows:
-                    upsert_many(engine, "dim_campaign", dim_campaign_rows, ["customer_id", "campaign_id"])
-                if dim_adgroup_rows:
-                    upsert_many(engine, "dim_adgroup", dim_adgroup_rows, ["customer_id", "adgroup_id"])
-                if dim_ad_rows:
-                    upsert_many(engine, "dim_ad", dim_ad_rows, ["customer_id", "ad_id"])
-                replace_fact_range(engine, "fact_campaign_daily", fact_campaign_rows, customer_id, target_dt)
-                replace_fact_range(engine, "fact_ad_daily", fact_ad_rows, customer_id, target_dt)
-                log(f"✅ [CRAWL] [{account_name}] 완료 | campaigns={len(fact_campaign_rows)} rows, creatives={len(fact_ad_rows)} rows")
-            except Exception as e:
-                msg = f"[{account_name}] {customer_id} 실패: {e}"
-                errors.append(msg)
-                log(f"❌ {msg}")
-                try:
-                    crawler.screenshot(f"err_{slugify(account_name)}.png")
-                    crawler.page_dump(f"err_{slugify(account_name)}.html")
-                except Exception:
-                    pass
+    pending = list(accounts)
+    lock = threading.Lock()
+    session = GfaSharedSession(GFA_ID, GFA_PW, GFA_STORAGE_STATE_FILE)
+    workers = min(GFA_CRAWL_WORKERS, len(pending)) or 1
+
+    with GfaCrawler(headless=GFA_HEADLESS, storage_state=load_storage_state_path(session.path)) as crawler:
+        crawler.ensure_session(GFA_ID, GFA_PW, session.path)
+        threads: List[threading.Thread] = []
+        if workers > 1 and crawler.storage_state:
+            log(f"🧵 GFA 크롤링 병렬 워커: {workers}개")
+            for i in range(workers - 1):
+                t = threading.Thread(
+                    target=_run_crawl_thread,
+                    args=(engine, session, pending, lock, target_dt, errors),
+                    name=f"gfa-crawl-{i + 1}",
+                    daemon=True,
+                )
+                t.start()
+                threads.append(t)
+        _crawl_worker(crawler, engine, pending, lock, target_dt, errors, session)
+        for t in threads:
+            t.join()
 
     if errors:
         die("; ".join(errors))
@@ -1407,42 +1584,54 @@ def filter_accounts(accounts: List[Dict[str, str]], account_name: str, account_n
     return out
 
 
+def _collect_api_account(client: GfaApiClient, engine: Engine, acc: Dict[str, str], target_dt: date) -> None:
+    customer_id = _to_str(acc.get("id"))
+    account_name = _to_str(acc.get("name")) or customer_id
+    log(f"🚀 [API] [{account_name}] ({customer_id}) 수집 시작 | {target_dt.isoformat()}")
+    manager_no = client.resolve_manager_account_no(customer_id)
+    log(f"   ↳ [{account_name}] AccessManagerAccountNo = {manager_no}")
+    upsert_many(engine, "dim_account", [{"customer_id": customer_id, "account_name": account_name}], ["customer_id"])
+    dims = fetch_dimension_lists(client, customer_id, manager_no)
+    dim_campaign_rows = normalize_campaign_rows(customer_id, dims.get("campaigns", []))
+    dim_adset_rows = normalize_adset_rows(customer_id, dims.get("adsets", []))
+    dim_creative_rows = normalize_creative_rows(customer_id, dims.get("creatives", []))
+    if dim_campaign_rows:
+        upsert_many(engine, "dim_campaign", dim_campaign_rows, ["customer_id", "campaign_id"])
+    if dim_adset_rows:
+        upsert_many(engine, "dim_adgroup", dim_adset_rows, ["customer_id", "adgroup_id"])
+    if dim_creative_rows:
+        upsert_many(engine, "dim_ad", dim_creative_rows, ["customer_id", "ad_id"])
+    perf_campaigns = fetch_past_performance(client, customer_id, manager_no, target_dt, "campaigns")
+    perf_creatives = fetch_past_performance(client, customer_id, manager_no, target_dt, "creatives")
+    if not dim_campaign_rows or not dim_adset_rows or not dim_creative_rows:
+        upsert_placeholder_dims_from_perf(engine, customer_id, perf_campaigns, perf_creatives)
+    fact_campaign_rows = build_campaign_fact_rows(customer_id, target_dt, perf_campaigns, data_source="gfa_api")
+    fact_ad_rows = build_ad_fact_rows(customer_id, target_dt, perf_creatives, data_source="gfa_api")
+    replace_fact_range(engine, "fact_campaign_daily", fact_campaign_rows, customer_id, target_dt)
+    replace_fact_range(engine, "fact_ad_daily", fact_ad_rows, customer_id, target_dt)
+    log(f"✅ [API] [{account_name}] 완료 | campaigns={len(fact_campaign_rows)} rows, creatives={len(fact_ad_rows)} rows")
+
+
 def collect_via_api(engine: Engine, accounts: List[Dict[str, str]], target_dt: date, access_token: str) -> None:
     client = GfaApiClient(access_token)
     errors: List[str] = []
-    for acc in accounts:
-        customer_id = _to_str(acc.get("id"))
-        account_name = _to_str(acc.get("name")) or customer_id
-        if not customer_id:
-            continue
-        log(f"🚀 [API] [{account_name}] ({customer_id}) 수집 시작 | {target_dt.isoformat()}")
-        try:
-            manager_no = client.resolve_manager_account_no(customer_id)
-            log(f"   ↳ AccessManagerAccountNo = {manager_no}")
-            upsert_many(engine, "dim_account", [{"customer_id": customer_id, "account_name": account_name}], ["customer_id"])
-            dims = fetch_dimension_lists(client, customer_id, manager_no)
-            dim_campaign_rows = normalize_campaign_rows(customer_id, dims.get("campaigns", []))
-            dim_adset_rows = normalize_adset_rows(customer_id, dims.get("adsets", []))
-            dim_creative_rows = normalize_creative_rows(customer_id, dims.get("creatives", []))
-            if dim_campaign_rows:
-                upsert_many(engine, "dim_campaign", dim_campaign_rows, ["customer_id", "campaign_id"])
-            if dim_adset_rows:
-                upsert_many(engine, "dim_adgroup", dim_adset_rows, ["customer_id", "adgroup_id"])
-            if dim_creative_rows:
-                upsert_many(engine, "dim_ad", dim_creative_rows, ["customer_id", "ad_id"])
-            perf_campaigns = fetch_past_performance(client, customer_id, manager_no, target_dt, "campaigns")
-            perf_creatives = fetch_past_performance(client, customer_id, manager_no, target_dt, "creatives")
-            if not dim_campaign_rows or not dim_adset_rows or not dim_creative_rows:
-                upsert_placeholder_dims_from_perf(engine, customer_id, perf_campaigns, perf_creatives)
-            fact_campaign_rows = build_campaign_fact_rows(customer_id, target_dt, perf_campaigns, data_source="gfa_api")
-            fact_ad_rows = build_ad_fact_rows(customer_id, target_dt, perf_creatives, data_source="gfa_api")
-            replace_fact_range(engine, "fact_campaign_daily", fact_campaign_rows, customer_id, target_dt)
-            replace_fact_range(engine, "fact_ad_daily", fact_ad_rows, customer_id, target_dt)
-            log(f"✅ [API] [{account_name}] 완료 | campaigns={len(fact_campaign_rows)} rows, creatives={len(fact_ad_rows)} rows")
-        except Exception as e:
-            msg = f"[{account_name}] {customer_id} 실패: {e}"
-            errors.append(msg)
-            log(f"❌ {msg}")
+    targets = [acc for acc in accounts if _to_str(acc.get("id"))]
+    if not targets:
+        return
+    workers = min(GFA_API_WORKERS, len(targets))
+    log(f"🧵 GFA API 병렬 워커: {workers}개")
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(_collect_api_account, client, engine, acc, target_dt): acc for acc in targets}
+        for future in concurrent.futures.as_completed(futures):
+            acc = futures[future]
+            try:
+                future.result()
+            except Exception as e:
+                customer_id = _to_str(acc.get("id"))
+                account_name = _to_str(acc.get("name")) or customer_id
+                msg = f"[{account_name}] {customer_id} 실패: {e}"
+                errors.append(msg)
+                log(f"❌ {msg}")
     if errors:
         die("; ".join(errors))
 
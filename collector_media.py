@@ -101,6 +101,27 @@ def _m_safe_text(v: Any, default: str = '전체') -> str:
     return s
 
 
+def _m_cell_text(col: pd.Series) -> pd.Series:
+    # 기존 행 순회의 str(row.iloc[i]) 와 같게 비어 있는 셀은 "nan" 으로 본다.
+    return col.astype(object).where(col.notna(), 'nan').astype(str)
+
+
+def _m_map_unique(col: pd.Series, fn) -> pd.Series:
+    """Apply a scalar normalizer once per distinct value of ``col``."""
+    codes, uniques = pd.factorize(col.to_numpy(dtype=object), use_na_sentinel=False)
+    mapped = pd.Series([fn(v) for v in uniques] or [''], dtype=object).to_numpy()
+    return pd.Series(mapped[codes], index=col.index, dtype=object)
+
+
+def _m_safe_float_series(col: pd.Series) -> pd.Series:
+    cleaned = col.astype(object).where(col.notna(), '').astype(str).str.replace(',', '', regex=False).str.strip()
+    out = pd.to_numeric(cleaned, errors='coerce').astype(float)
+    leftover = out.isna() & ~cleaned.isin(['', '-'])
+    if leftover.any():
+        out[leftover] = cleaned[leftover].map(_m_safe_float)
+    return out.fillna(0.0)
+
+
 def _map_campaign_type_label(v: Any) -> str:
     s = str(v or '').strip()
     if not s:
@@ -261,65 +282,155 @@ def replace_media_fact_range(engine: Engine, rows: List[Dict[str, Any]], custome
     dropped_zero_rows = max(0, input_rows - len(rows))
     if dropped_zero_rows:
         log(f"ℹ️ fact_media_daily 0성과 행 제외 | cid={customer_id} dt={d1} dropped={dropped_zero_rows} kept={len(rows)}")
-    last_delete_err: Exception | None = None
-    delete_sql = text(
-        f"DELETE FROM {table} WHERE customer_id=:cid AND dt=:dt" +
-        (" AND campaign_type = ANY(:types)" if scoped_campaign_types else "")
-    )
-
-    for attempt in range(1, 4):
-        try:
-            with engine.begin() as conn:
-                conn.execute(delete_sql, {'cid': str(customer_id), 'dt': d1, 'types': scoped_campaign_types or []})
-            last_delete_err = None
-            break
-        except Exception as e:
-            last_delete_err = e
-            log(f"⚠️ fact_media_daily 삭제 실패 {attempt}/3 | cid={customer_id} dt={d1} pk={pk_cols} | {type(e).__name__}: {e}")
-            time.sleep(2)
-    if last_delete_err is not None:
-        raise RuntimeError(f"fact_media_daily 삭제 실패 | cid={customer_id} dt={d1} pk={pk_cols} | {type(last_delete_err).__name__}: {last_delete_err}") from last_delete_err
-
-    if not rows:
-        reason = 'all_zero_filtered' if input_rows else 'empty'
-        log(f"ℹ️ fact_media_daily 적재 대상 없음 | cid={customer_id} dt={d1} reason={reason} input_rows={input_rows}")
-        return 0
-
-    df = pd.DataFrame(rows).astype(object).where(pd.notnull, None)
-    df = _prepare_media_fact_rows_for_conflict(df, pk_cols).astype(object).where(pd.notnull, None)
-    cols = list(df.columns)
-    update_cols = [c for c in cols if c not in pk_cols]
-    col_names = ", ".join([f'"{c}"' for c in cols])
-    conflict_cols_sql = ", ".join(pk_cols)
-    conflict_clause = (
-        f'ON CONFLICT ({conflict_cols_sql}) DO UPDATE SET ' +
-        ', '.join([f'"{c}"=EXCLUDED."{c}"' for c in update_cols])
-        if update_cols else
-        f'ON CONFLICT ({conflict_cols_sql}) DO NOTHING'
+    delete_sql = (
+        f"DELETE FROM {table} WHERE customer_id=%(cid)s AND dt=%(dt)s" +
+        (" AND campaign_type = ANY(%(types)s)" if scoped_campaign_types else "")
     )
-    sql = f'INSERT INTO {table} ({col_names}) VALUES %s {conflict_clause}'
-    tuples = list(df.itertuples(index=False, name=None))
-
-    last_upsert_err: Exception | None = None
+    delete_params = {'cid': str(customer_id), 'dt': d1, 'types': list(scoped_campaign_types or [])}
+
+    sql, tuples = None, []
+    if rows:
+        df = pd.DataFrame(rows).astype(object).where(pd.notnull, None)
+        df = _prepare_media_fact_rows_for_conflict(df, pk_cols).astype(object).where(pd.notnull, None)
+        cols = list(df.columns)
+        update_cols = [c for c in cols if c not in pk_cols]
+        col_names = ", ".join([f'"{c}"' for c in cols])
+        conflict_cols_sql = ", ".join(pk_cols)
+        conflict_clause = (
+            f'ON CONFLICT ({conflict_cols_sql}) DO UPDATE SET ' +
+            ', '.join([f'"{c}"=EXCLUDED."{c}"' for c in update_cols])
+            if update_cols else
+            f'ON CONFLICT ({conflict_cols_sql}) DO NOTHING'
+        )
+        sql = f'INSERT INTO {table} ({col_names}) VALUES %s {conflict_clause}'
+        tuples = list(df.itertuples(index=False, name=None))
+
+    # 일별 삭제/적재와 월 rollup 재계산을 한 트랜잭션으로 묶어 fact_media_monthly 가 일별과 어긋난 채 남지 않게 한다.
+    last_err: Exception | None = None
     for attempt in range(1, 4):
         raw_conn, cur = None, None
         try:
             raw_conn = engine.raw_connection()
             cur = raw_conn.cursor()
-            psycopg2.extras.execute_values(cur, sql, tuples, page_size=5000)
+            cur.execute(delete_sql, delete_params)
+            if tuples:
+                psycopg2.extras.execute_values(cur, sql, tuples, page_size=5000)
+            refresh_media_monthly_rollup_in_txn(cur, customer_id, d1)
             raw_conn.commit()
-            log(f"✅ fact_media_daily 적재 완료 | cid={customer_id} dt={d1} rows={len(df)} pk={pk_cols}")
-            return len(df)
+            if tuples:
+                log(f"✅ fact_media_daily 적재 완료 | cid={customer_id} dt={d1} rows={len(tuples)} pk={pk_cols}")
+            else:
+                reason = 'all_zero_filtered' if input_rows else 'empty'
+                log(f"ℹ️ fact_media_daily 적재 대상 없음 | cid={customer_id} dt={d1} reason={reason} input_rows={input_rows}")
+            return len(tuples)
         except Exception as e:
-            last_upsert_err = e
+            last_err = e
             if raw_conn:
-                _safe_rollback(raw_conn, ctx=f"fact_media_daily upsert cid={customer_id} dt={d1}")
-            log(f"⚠️ fact_media_daily 적재 실패 {attempt}/3 | cid={customer_id} dt={d1} rows={len(df)} pk={pk_cols} | {type(e).__name__}: {e}")
+                _safe_rollback(raw_conn, ctx=f"fact_media_daily replace cid={customer_id} dt={d1}")
+            log(f"⚠️ fact_media_daily 교체 실패 {attempt}/3 | cid={customer_id} dt={d1} rows={len(tuples)} pk={pk_cols} | {type(e).__name__}: {e}")
             time.sleep(2)
         finally:
-            _safe_close(cur, label="cursor", ctx=f"fact_media_daily upsert cid={customer_id} dt={d1}")
-            _safe_close(raw_conn, label="connection", ctx=f"fact_media_daily upsert cid={customer_id} dt={d1}")
-    raise RuntimeError(f"fact_media_daily 적재 최종 실패 | cid={customer_id} dt={d1} rows={len(df)} pk={pk_cols} | {type(last_upsert_err).__name__}: {last_upsert_err}") from last_upsert_err
+            _safe_close(cur, label="cursor", ctx=f"fact_media_daily replace cid={customer_id} dt={d1}")
+            _safe_close(raw_conn, label="connection", ctx=f"fact_media_daily replace cid={customer_id} dt={d1}")
+    raise RuntimeError(f"fact_media_daily 교체 최종 실패 | cid={customer_id} dt={d1} rows={len(tuples)} pk={pk_cols} | {type(last_err).__name__}: {last_err}") from last_err
+
+
+# view_media._query_media_region 의 일별 경로와 같은 기본값으로 묶어야 월 rollup 과 일별 가장자리가 같은 키로 합쳐진다.
+_MEDIA_MONTHLY_ROLLUP_SELECT = """
+    SELECT
+        date_trunc('month', dt)::date AS month_start,
+        customer_id,
+        COALESCE(CAST(campaign_type AS TEXT), '') AS campaign_type,
+        COALESCE(NULLIF(CAST(media_name AS TEXT), ''), '전체') AS media_name,
+        COALESCE(NULLIF(CAST(device_name AS TEXT), ''), '기타') AS device_name,
+        SUM(COALESCE(imp, 0)) AS imp,
+        SUM(COALESCE(clk, 0)) AS clk,
+        SUM(COALESCE(cost, 0)) AS cost,
+        SUM(COALESCE(conv, 0)) AS conv,
+        SUM(COALESCE(sales, 0)) AS sales
+    FROM fact_media_daily
+    {where}
+    GROUP BY 1, 2, 3, 4, 5
+"""
+
+
+def _month_bounds(d1: date) -> Tuple[date, date]:
+    month_start = date(d1.year, d1.month, 1)
+    next_month = date(d1.year + (d1.month // 12), d1.month % 12 + 1, 1)
+    return month_start, next_month
+
+
+_MEDIA_MONTHLY_INSERT = "INSERT INTO fact_media_monthly (month_start, customer_id, campaign_type, media_name, device_name, imp, clk, cost, conv, sales) "
+
+
+def refresh_media_monthly_rollup_in_txn(cur, customer_id: str, d1: date) -> None:
+    """Rebuild the fact_media_monthly row set for the month containing d1 on an open cursor.
+
+    The media page reads whole months from this rollup and only the partial
+    edges of the selected range from fact_media_daily, so it runs in the same
+    transaction as every fact_media_daily replace; the caller commits.
+    """
+    month_start, next_month = _month_bounds(pd.to_datetime(d1).date())
+    params = {'cid': str(customer_id), 'm1': month_start, 'm2': next_month}
+    cur.execute("DELETE FROM fact_media_monthly WHERE customer_id = %(cid)s AND month_start = %(m1)s", params)
+    cur.execute(
+        _MEDIA_MONTHLY_INSERT
+        + _MEDIA_MONTHLY_ROLLUP_SELECT.format(where="WHERE customer_id = %(cid)s AND dt >= %(m1)s AND dt < %(m2)s"),
+        params,
+    )
+
+
+# 일별에는 있는데 rollup 행이 없는 계정-월, 그리고 기기 기본값('기타') 통일 전에 만들어진 계정-월
+_MEDIA_MONTHLY_BACKFILL_TARGETS = """
+    SELECT d.customer_id, d.month_start
+    FROM (SELECT DISTINCT customer_id, date_trunc('month', dt)::date AS month_start FROM fact_media_daily) d
+    WHERE NOT EXISTS (
+        SELECT 1 FROM fact_media_monthly m WHERE m.customer_id = d.customer_id AND m.month_start = d.month_start
+    )
+    UNION
+    SELECT DISTINCT d.customer_id, date_trunc('month', d.dt)::date AS month_start
+    FROM fact_media_daily d
+    WHERE COALESCE(d.device_name, '') = ''
+      AND NOT EXISTS (
+          SELECT 1 FROM fact_media_monthly m
+          WHERE m.customer_id = d.customer_id AND m.month_start = date_trunc('month', d.dt)::date AND m.device_name = '기타'
+      )
+    ORDER BY 2, 1
+"""
+
+
+def backfill_media_monthly_rollup(engine: Engine) -> Dict[str, int]:
+    """Rebuild fact_media_monthly for every customer-month the rollup does not cover yet.
+
+    Explicit migration step (settings page / ``collector.py --backfill_media_monthly``);
+    it scans all of fact_media_daily, so it is not run on collector start. Each
+    customer-month commits on its own, so a rerun after a failure or timeout resumes
+    from the months that are still missing.
+    """
+    with engine.connect() as conn:
+        targets = conn.execute(text(_MEDIA_MONTHLY_BACKFILL_TARGETS)).fetchall()
+    out = {"targets": len(targets), "rebuilt": 0, "failed": 0}
+    if not targets:
+        log("✅ fact_media_monthly 채우기 | 빠진 계정-월 없음")
+        return out
+    raw_conn, cur = None, None
+    try:
+        raw_conn = engine.raw_connection()
+        cur = raw_conn.cursor()
+        for customer_id, month_start in targets:
+            try:
+                refresh_media_monthly_rollup_in_txn(cur, customer_id, month_start)
+                raw_conn.commit()
+                out["rebuilt"] += 1
+            except Exception as e:
+                _safe_rollback(raw_conn, ctx=f"fact_media_monthly backfill cid={customer_id} month={month_start}")
+                out["failed"] += 1
+                log(f"⚠️ fact_media_monthly 채우기 실패 | cid={customer_id} month={month_start} | {_exc_label(e)}")
+    finally:
+        _safe_close(cur, label="cursor", ctx="fact_media_monthly backfill")
+        _safe_close(raw_conn, label="connection", ctx="fact_media_monthly backfill")
+    log(f"✅ fact_media_monthly 채우기 | 대상 {out['targets']}개 계정-월, 완료 {out['rebuilt']}, 실패 {out['failed']}")
+    return out
 
 
 def _log_media_parse_diag(diag: Dict[str, Any]):
@@ -330,16 +441,6 @@ def _log_media_parse_diag(diag: Dict[str, Any]):
     )
 
 
-def _resolve_media_campaign_id(row, ad_idx: int, camp_idx: int, ad_to_campaign: Dict[str, str]) -> str:
-    campaign_id = ''
-    if ad_idx != -1 and len(row) > ad_idx:
-        ad_id = str(row.iloc[ad_idx]).strip()
-        campaign_id = str(ad_to_campaign.get(ad_id, '') or '').strip()
-    if not campaign_id and camp_idx != -1 and len(row) > camp_idx:
-        campaign_id = str(row.iloc[camp_idx]).strip()
-    return campaign_id
-
-
 def _build_media_collect_meta(base_meta: Dict[str, Any] | None, *, status: str, selected_source: str, saved_rows: int) -> Dict[str, Any]:
     meta = dict(base_meta or {})
     meta['status'] = status
@@ -561,21 +662,9 @@ def build_media_rows_from_campaign_device(target_date: date, customer_id: str, c
     return rows
 
 
-def build_media_rows_from_campaign_total_db(engine: Engine, customer_id: str, target_date: date, campaign_type_map: Dict[str, str], allowed_campaign_ids: set[str] | None = None) -> List[Dict[str, Any]]:
-    sql = text("""
-        SELECT campaign_id, imp, clk, cost, conv, sales
-        FROM fact_campaign_daily
-        WHERE customer_id = :cid AND dt = :dt
-    """)
-    try:
-        with engine.connect() as conn:
-            rows = conn.execute(sql, {'cid': str(customer_id), 'dt': target_date}).mappings().all()
-    except Exception as e:
-        _log_best_effort_failure('campaign total fallback 조회', e, ctx=f'cid={customer_id} dt={target_date}')
-        return []
-
+def build_media_rows_from_campaign_totals(campaign_rows: List[Dict[str, Any]] | None, target_date: date, customer_id: str, campaign_type_map: Dict[str, str], allowed_campaign_ids: set[str] | None = None) -> List[Dict[str, Any]]:
     agg: Dict[Tuple[str, str, str, str], Dict[str, Any]] = {}
-    for r in rows:
+    for r in campaign_rows or []:
         cid = str(r.get('campaign_id') or '').strip()
         if not cid:
             continue
@@ -593,6 +682,21 @@ def build_media_rows_from_campaign_total_db(engine: Engine, customer_id: str, ta
     return rows
 
 
+def build_media_rows_from_campaign_total_db(engine: Engine, customer_id: str, target_date: date, campaign_type_map: Dict[str, str], allowed_campaign_ids: set[str] | None = None) -> List[Dict[str, Any]]:
+    sql = text("""
+        SELECT campaign_id, imp, clk, cost, conv, sales
+        FROM fact_campaign_daily
+        WHERE customer_id = :cid AND dt = :dt
+    """)
+    try:
+        with engine.connect() as conn:
+            rows = conn.execute(sql, {'cid': str(customer_id), 'dt': target_date}).mappings().all()
+    except Exception as e:
+        _log_best_effort_failure('campaign total fallback 조회', e, ctx=f'cid={customer_id} dt={target_date}')
+        return []
+    return build_media_rows_from_campaign_totals(rows, target_date, customer_id, campaign_type_map, allowed_campaign_ids=allowed_campaign_ids)
+
+
 def parse_media_report_rows(df: pd.DataFrame, target_date: date, customer_id: str, ad_to_campaign: Dict[str, str], campaign_type_map: Dict[str, str], allowed_campaign_ids: set[str] | None = None) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     if df is None or df.empty:
         return [], {'status': 'empty'}
@@ -627,40 +731,51 @@ def parse_media_report_rows(df: pd.DataFrame, target_date: date, customer_id: st
         _log_media_parse_diag(diag)
         return [], diag
 
-    agg: Dict[Tuple[str, str, str, str], Dict[str, Any]] = {}
-    row_count = 0
-    mapped_rows = 0
-    short_rows = 0
-    missing_campaign_rows = 0
-    filtered_rows = 0
     max_idx = max([x for x in [ad_idx, camp_idx, media_idx, region_idx, device_idx, imp_idx, clk_idx, cost_idx, conv_idx, sales_idx] if x != -1], default=0)
-    for _, row in data_df.iterrows():
-        row_count += 1
-        if len(row) <= max_idx:
-            short_rows += 1
-            continue
-
-        campaign_id = _resolve_media_campaign_id(row, ad_idx, camp_idx, ad_to_campaign)
-        if not campaign_id:
-            missing_campaign_rows += 1
-            continue
-        if allowed_campaign_ids is not None and campaign_id not in allowed_campaign_ids:
-            filtered_rows += 1
-            continue
-
-        mapped_rows += 1
-        campaign_type = campaign_type_map.get(campaign_id, '기타')
-        media_name = _m_safe_text(row.iloc[media_idx] if media_idx != -1 and len(row) > media_idx else '', '전체')
-        region_name = _m_safe_text(row.iloc[region_idx] if region_idx != -1 and len(row) > region_idx else '', '전체')
-        raw_device = row.iloc[device_idx] if device_idx != -1 and len(row) > device_idx else ''
-        device_name = normalize_device_name(raw_device) or _m_safe_text(raw_device, '전체')
-        key = (campaign_type, media_name, region_name, device_name)
-        bucket = agg.setdefault(key, {'imp': 0, 'clk': 0, 'cost': 0, 'conv': 0.0, 'sales': 0})
-        bucket['imp'] += int(round(_m_safe_float(row.iloc[imp_idx]) if imp_idx != -1 and len(row) > imp_idx else 0))
-        bucket['clk'] += int(round(_m_safe_float(row.iloc[clk_idx]) if clk_idx != -1 and len(row) > clk_idx else 0))
-        bucket['cost'] += int(round(_m_safe_float(row.iloc[cost_idx]) if cost_idx != -1 and len(row) > cost_idx else 0))
-        bucket['conv'] += float(_m_safe_float(row.iloc[conv_idx]) if conv_idx != -1 and len(row) > conv_idx else 0)
-        bucket['sales'] += int(round(_m_safe_float(row.iloc[sales_idx]) if sales_idx != -1 and len(row) > sales_idx else 0))
+    row_count = len(data_df)
+    short_rows = row_count if len(data_df.columns) <= max_idx else 0
+    frame = data_df if not short_rows else data_df.iloc[0:0]
+
+    # 소재ID -> ad_to_campaign 매핑을 먼저 보고, 없으면 캠페인ID 컬럼 값을 쓴다.
+    campaign_ids = pd.Series('', index=frame.index, dtype=object)
+    if ad_idx != -1:
+        ad_ids = _m_cell_text(frame.iloc[:, ad_idx]).str.strip()
+        campaign_ids = ad_ids.map(lambda x: str(ad_to_campaign.get(x, '') or '').strip()).astype(object)
+    if camp_idx != -1:
+        campaign_ids = campaign_ids.where(campaign_ids != '', _m_cell_text(frame.iloc[:, camp_idx]).str.strip())
+    has_campaign = campaign_ids != ''
+    missing_campaign_rows = int((~has_campaign).sum())
+    keep = has_campaign
+    filtered_rows = 0
+    if allowed_campaign_ids is not None:
+        allowed = campaign_ids.isin(allowed_campaign_ids)
+        filtered_rows = int((has_campaign & ~allowed).sum())
+        keep = has_campaign & allowed
+    mapped_rows = int(keep.sum())
+
+    kept = frame[keep.to_numpy(dtype=bool)]
+    campaign_ids = campaign_ids[keep]
+
+    def _dim(idx: int, fn) -> pd.Series:
+        col = kept.iloc[:, idx] if idx != -1 else pd.Series('', index=kept.index, dtype=object)
+        return _m_map_unique(col, fn)
+
+    def _metric(idx: int) -> pd.Series:
+        return _m_safe_float_series(kept.iloc[:, idx]) if idx != -1 else pd.Series(0.0, index=kept.index)
+
+    parts = pd.DataFrame({
+        'campaign_type': campaign_ids.map(campaign_type_map).fillna('기타'),
+        'media_name': _dim(media_idx, lambda v: _m_safe_text(v, '전체')),
+        'region_name': _dim(region_idx, lambda v: _m_safe_text(v, '전체')),
+        'device_name': _dim(device_idx, lambda v: normalize_device_name(v) or _m_safe_text(v, '전체')),
+        'imp': _metric(imp_idx).round().astype('int64'),
+        'clk': _metric(clk_idx).round().astype('int64'),
+        'cost': _metric(cost_idx).round().astype('int64'),
+        'conv': _metric(conv_idx),
+        'sales': _metric(sales_idx).round().astype('int64'),
+    })
+    grouped = parts.groupby(['campaign_type', 'media_name', 'region_name', 'device_name'], sort=False)[['imp', 'clk', 'cost', 'conv', 'sales']].sum()
+    agg: Dict[Tuple[str, str, str, str], Dict[str, Any]] = dict(zip(grouped.index.tolist(), grouped.to_dict('records')))
 
     rows, agg_diag = _finalize_media_rows(agg, target_date, customer_id, data_source='ad_report_dimension')
     diag = {
@@ -679,7 +794,7 @@ def parse_media_report_rows(df: pd.DataFrame, target_date: date, customer_id: st
     return rows, diag
 
 
-def collect_media_fact(engine: Engine, customer_id: str, target_date: date, ad_report_df: pd.DataFrame | None, ad_to_campaign_map: Dict[str, str], campaign_type_map: Dict[str, str], camp_device_stat: Dict[Tuple[str, str], Dict[str, Any]] | None = None, allowed_campaign_ids: set[str] | None = None, scoped_campaign_types: List[str] | None = None) -> Tuple[int, Dict[str, Any]]:
+def collect_media_fact(engine: Engine, customer_id: str, target_date: date, ad_report_df: pd.DataFrame | None, ad_to_campaign_map: Dict[str, str], campaign_type_map: Dict[str, str], camp_device_stat: Dict[Tuple[str, str], Dict[str, Any]] | None = None, allowed_campaign_ids: set[str] | None = None, scoped_campaign_types: List[str] | None = None, campaign_total_rows: List[Dict[str, Any]] | None = None) -> Tuple[int, Dict[str, Any]]:
     media_rows, meta = parse_media_report_rows(ad_report_df, target_date, customer_id, ad_to_campaign_map, campaign_type_map, allowed_campaign_ids=allowed_campaign_ids)
     if media_rows:
         saved = replace_media_fact_range(engine, media_rows, customer_id, target_date, scoped_campaign_types=scoped_campaign_types)
@@ -695,7 +810,11 @@ def collect_media_fact(engine: Engine, customer_id: str, target_date: date, ad_r
             _log_media_collect_choice(customer_id, target_date, meta)
             return saved, meta
 
-    total_rows = build_media_rows_from_campaign_total_db(engine, customer_id, target_date, campaign_type_map, allowed_campaign_ids=allowed_campaign_ids)
+    # 같은 실행에서 fact_campaign_daily 에 막 쓴 행이 넘어오면 DB 를 다시 읽지 않는다.
+    if campaign_total_rows is not None:
+        total_rows = build_media_rows_from_campaign_totals(campaign_total_rows, target_date, customer_id, campaign_type_map, allowed_campaign_ids=allowed_campaign_ids)
+    else:
+        total_rows = build_media_rows_from_campaign_total_db(engine, customer_id, target_date, campaign_type_map, allowed_campaign_ids=allowed_campaign_ids)
     if total_rows:
         saved = replace_media_fact_range(engine, total_rows, customer_id, target_date, scoped_campaign_types=scoped_campaign_types)
         meta = _build_media_collect_meta(meta, status='fallback_total', selected_source='campaign_total_fallback', saved_rows=saved)
@@ -5,13 +5,18 @@
 - account_master.xlsx 에서 platform=meta 인 계정만 읽음
 - Meta 광고계정 일별 캠페인 성과 수집
 - fact_campaign_daily 로 업서트
+- 기간이 길면 비동기 insights 작업(report_run_id)으로 요청, 계정은 병렬 수집
+- x-business-use-case-usage 사용량 헤더 기준으로 요청 간격을 조절
 """
 from __future__ import annotations
 
+import concurrent.futures
+import json
 import os
+import threading
 import time
-from datetime import date, timedelta
-from typing import List
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
 import requests
@@ -27,6 +32,15 @@ load_dotenv()
 META_ACCESS_TOKEN = os.getenv("META_ACCESS_TOKEN", "")
 DB_URL = os.getenv("DATABASE_URL", "").strip()
 META_API_VERSION = os.getenv("META_API_VERSION", "v19.0")
+META_WORKERS = max(1, int(os.getenv("META_WORKERS", "4") or 4))
+# 기간(일수)이 이 값 이상이면 비동기 insights 작업으로 요청한다.
+META_ASYNC_MIN_DAYS = int(os.getenv("META_ASYNC_MIN_DAYS", "7") or 7)
+META_ASYNC_POLL_SEC = float(os.getenv("META_ASYNC_POLL_SEC", "2") or 2)
+META_ASYNC_TIMEOUT_SEC = float(os.getenv("META_ASYNC_TIMEOUT_SEC", "900") or 900)
+# 사용량(%)이 이 값을 넘으면 요청 사이에 대기를 넣기 시작한다.
+META_THROTTLE_START_PCT = float(os.getenv("META_THROTTLE_START_PCT", "60") or 60)
+META_THROTTLE_MAX_SLEEP_SEC = float(os.getenv("META_THROTTLE_MAX_SLEEP_SEC", "60") or 60)
+META_RATE_LIMIT_CODES = {4, 17, 32, 613, 80000, 80001, 80002, 80003, 80004, 80005, 80006, 80008, 80009, 80014}
 
 
 def log(msg: str):
@@ -40,6 +54,114 @@ def get_engine() -> Engine:
     return create_engine(db_url, poolclass=NullPool, future=True)
 
 
+class MetaUsageThrottle:
+    """Graph API 사용량 헤더를 보고 모든 워커의 다음 요청 시각을 늦춘다.
+
+    x-business-use-case-usage 의 call_count / total_cputime / total_time 중 최댓값이
+    META_THROTTLE_START_PCT 를 넘으면 100% 에 가까울수록 길게 쉬고,
+    estimated_time_to_regain_access(분)가 오면 그만큼 멈춘다.
+    """
+
+    def __init__(self, start_pct: float = META_THROTTLE_START_PCT, max_sleep_sec: float = META_THROTTLE_MAX_SLEEP_SEC):
+        self.start_pct = float(start_pct)
+        self.max_sleep_sec = float(max_sleep_sec)
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+        self.last_pct = 0.0
+
+    @staticmethod
+    def usage_from_headers(headers) -> tuple[float, float]:
+        """(최대 사용률 %, 차단 해제까지 남은 초) 를 돌려준다."""
+        pct = 0.0
+        regain_sec = 0.0
+        raw = (headers or {}).get("x-business-use-case-usage")
+        try:
+            buc = json.loads(raw) if raw else {}
+        except Exception:
+            buc = {}
+        for entries in (buc.values() if isinstance(buc, dict) else []):
+            for entry in entries if isinstance(entries, list) else []:
+                for key in ("call_count", "total_cputime", "total_time"):
+                    try:
+                        pct = max(pct, float(entry.get(key) or 0))
+                    except Exception:
+                        pass
+                try:
+                    regain_sec = max(regain_sec, float(entry.get("estimated_time_to_regain_access") or 0) * 60.0)
+                except Exception:
+                    pass
+        for name in ("x-ad-account-usage", "x-app-usage"):
+            try:
+                usage = json.loads((headers or {}).get(name) or "{}")
+            except Exception:
+                usage = {}
+            for key in ("acc_id_util_pct", "call_count", "total_cputime", "total_time"):
+                try:
+                    pct = max(pct, float(usage.get(key) or 0))
+                except Exception:
+                    pass
+        return pct, regain_sec
+
+    def delay_for(self, pct: float, regain_sec: float = 0.0) -> float:
+        if regain_sec > 0:
+            return regain_sec
+        if pct < self.start_pct:
+            return 0.0
+        ratio = min(1.0, (pct - self.start_pct) / max(1.0, 100.0 - self.start_pct))
+        return round(self.max_sleep_sec * ratio * ratio, 2)
+
+    def update(self, headers) -> None:
+        pct, regain_sec = self.usage_from_headers(headers)
+        delay = self.delay_for(pct, regain_sec)
+        with self._lock:
+            self.last_pct = pct
+            if delay > 0:
+                self._resume_at = max(self._resume_at, time.time() + delay)
+        if delay >= 5:
+            log(f"⏳ Meta 사용량 {pct:.0f}% → {delay:.0f}초 대기")
+
+    def backoff(self, sec: float) -> None:
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.time() + sec)
+
+    def wait(self) -> None:
+        while True:
+            with self._lock:
+                remaining = self._resume_at - time.time()
+            if remaining <= 0:
+                return
+            time.sleep(min(remaining, 5.0))
+
+
+_throttle = MetaUsageThrottle()
+_thread_local = threading.local()
+
+
+def _get_session() -> requests.Session:
+    if not hasattr(_thread_local, "session"):
+        _thread_local.session = requests.Session()
+    return _thread_local.session
+
+
+def _meta_request(method: str, url: str, params: Optional[Dict[str, Any]] = None, *, retries: int = 4) -> Dict[str, Any]:
+    """사용량 스로틀을 거쳐 Graph API 를 호출한다. rate limit 에러는 대기 후 재시도."""
+    res_json: Dict[str, Any] = {}
+    for attempt in range(retries):
+        _throttle.wait()
+        response = _get_session().request(method, url, params=params, timeout=60)
+        _throttle.update(response.headers)
+        try:
+            res_json = response.json()
+        except Exception:
+            res_json = {"error": {"message": f"HTTP {response.status_code}: {response.text[:200]}"}}
+        err = res_json.get("error") if isinstance(res_json, dict) else None
+        if isinstance(err, dict) and err.get("code") in META_RATE_LIMIT_CODES and attempt < retries - 1:
+            _throttle.backoff(min(META_THROTTLE_MAX_SLEEP_SEC, 15.0 * (attempt + 1)))
+            continue
+        return res_json
+    return res_json
+
+
 def _extract_action_value(actions_list: list, action_type: str) -> float:
     if not isinstance(actions_list, list):
         return 0.0
@@ -52,6 +174,57 @@ def _extract_action_value(actions_list: list, action_type: str) -> float:
     return 0.0
 
 
+def _range_days(start_date: str, end_date: str) -> int:
+    try:
+        d1 = datetime.strptime(start_date, "%Y-%m-%d").date()
+        d2 = datetime.strptime(end_date, "%Y-%m-%d").date()
+        return (d2 - d1).days + 1
+    except Exception:
+        return 1
+
+
+def _page_insights(account_id: str, url: str, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    all_data: List[Dict[str, Any]] = []
+    while True:
+        res_json = _meta_request("GET", url, params)
+        if "error" in res_json:
+            log(f"⚠️ Meta API 에러 ({account_id}): {res_json['error'].get('message')}")
+            break
+        all_data.extend(res_json.get("data", []))
+        paging = res_json.get("paging", {})
+        if "next" not in paging:
+            break
+        url = paging["next"]
+        params = {}
+    return all_data
+
+
+def _run_async_insights(account_id: str, url: str, params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """비동기 insights 작업을 만들고 완료될 때까지 폴링한다. 작업이 실패하면 None."""
+    job = _meta_request("POST", url, params)
+    report_run_id = str(job.get("report_run_id") or "")
+    if not report_run_id:
+        log(f"⚠️ Meta 비동기 작업 생성 실패 ({account_id}): {(job.get('error') or {}).get('message', job)}")
+        return None
+    job_url = f"https://graph.facebook.com/{META_API_VERSION}/{report_run_id}"
+    deadline = time.time() + META_ASYNC_TIMEOUT_SEC
+    poll = META_ASYNC_POLL_SEC
+    while True:
+        status = _meta_request("GET", job_url, {"access_token": META_ACCESS_TOKEN, "fields": "async_status,async_percent_completion"})
+        state = str(status.get("async_status") or "")
+        if state == "Job Completed":
+            break
+        if state in {"Job Failed", "Job Skipped"} or "error" in status:
+            log(f"⚠️ Meta 비동기 작업 실패 ({account_id}): {state or status.get('error')}")
+            return None
+        if time.time() > deadline:
+            log(f"⚠️ Meta 비동기 작업 시간 초과 ({account_id}): {status.get('async_percent_completion')}%")
+            return None
+        time.sleep(poll)
+        poll = min(poll * 1.5, 15.0)
+    return _page_insights(account_id, f"{job_url}/insights", {"access_token": META_ACCESS_TOKEN, "limit": params.get("limit", 1000)})
+
+
 def fetch_meta_campaign_daily(act_id: str, start_date: str, end_date: str) -> pd.DataFrame:
     if not META_ACCESS_TOKEN:
         log("❌ META_ACCESS_TOKEN이 설정되지 않았습니다.")
@@ -68,21 +241,14 @@ def fetch_meta_campaign_daily(act_id: str, start_date: str, end_date: str) -> pd
         "time_increment": 1,
         "limit": 1000,
     }
-    all_data = []
+    all_data: List[Dict[str, Any]] = []
     try:
-        while True:
-            response = requests.get(url, params=params, timeout=60)
-            res_json = response.json()
-            if "error" in res_json:
-                log(f"⚠️ Meta API 에러 ({account_id}): {res_json['error'].get('message')}")
-                break
-            all_data.extend(res_json.get("data", []))
-            paging = res_json.get("paging", {})
-            if "next" not in paging:
-                break
-            url = paging["next"]
-            params = {}
-            time.sleep(0.5)
+        fetched = None
+        if _range_days(start_date, end_date) >= META_ASYNC_MIN_DAYS:
+            fetched = _run_async_insights(account_id, url, params)
+        if fetched is None:
+            fetched = _page_insights(account_id, url, params)
+        all_data = fetched
     except Exception as e:
         log(f"⚠️ Meta 요청 예외 ({account_id}): {e}")
 
@@ -132,18 +298,27 @@ def run_meta_collector(start_date: str, end_date: str):
         return
     engine = get_engine()
     total = 0
-    for acc in accounts:
-        log(f"👉 수집 중: [{acc['name']}] / account={acc['id']}")
-        df = fetch_meta_campaign_daily(acc['id'], start_date, end_date)
-        if df.empty:
-            log("   - 데이터 없음")
-            continue
-        try:
-            cnt = upsert_df(engine, "fact_campaign_daily", df, ["dt", "customer_id", "campaign_id"])
-            total += cnt
-            log(f"   ✅ {cnt}행 적재")
-        except Exception as e:
-            log(f"   ❌ DB 적재 실패: {e}")
+    workers = min(META_WORKERS, len(accounts))
+    # API 호출은 병렬로, DB 적재는 끝난 계정 순서대로 메인 스레드에서 처리한다.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(fetch_meta_campaign_daily, acc['id'], start_date, end_date): acc for acc in accounts}
+        for future in concurrent.futures.as_completed(futures):
+            acc = futures[future]
+            log(f"👉 수집 완료: [{acc['name']}] / account={acc['id']}")
+            try:
+                df = future.result()
+            except Exception as e:
+                log(f"   ❌ 수집 실패: {e}")
+                continue
+            if df.empty:
+                log("   - 데이터 없음")
+                continue
+            try:
+                cnt = upsert_df(engine, "fact_campaign_daily", df, ["dt", "customer_id", "campaign_id"])
+                total += cnt
+                log(f"   ✅ {cnt}행 적재")
+            except Exception as e:
+                log(f"   ❌ DB 적재 실패: {e}")
     log(f"🎉 Meta Ads 수집 완료! 총 {total}행 적재됨.")
 
 
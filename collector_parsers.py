@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import csv
+import io
 import os
 import re
 from datetime import date, datetime
@@ -9,6 +10,8 @@ from typing import Any, Dict, List, Tuple
 
 import pandas as pd
 
+from collector_debug import save_debug_artifact
+
 
 def log(msg: str):
     print(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}", flush=True)
@@ -343,17 +346,17 @@ def _conv_flush_debug_rows(debug_rows: list[dict], report_hint: str, debug_accou
     if fast_mode or not debug_rows or not debug_account_name or not debug_target_date:
         return
     dbg_dir = os.path.join(os.getcwd(), "debug_split_rows")
-    os.makedirs(dbg_dir, exist_ok=True)
     safe_name = re.sub(r'[^0-9A-Za-z가-힣._-]+', '_', str(debug_account_name))
-    out_path = os.path.join(dbg_dir, f"{debug_target_date}_{safe_name}_{report_hint}.csv")
     fields = [
         "report_tp", "date", "account_name", "campaign_id", "adgroup_id", "keyword_id", "keyword_text", "keyword_mapped_id", "ad_id",
         "parsed_type", "parsed_count", "parsed_sales", "kept", "reason", "row"
     ]
-    with open(out_path, 'w', encoding='utf-8-sig', newline='') as f:
-        w = csv.DictWriter(f, fieldnames=fields)
-        w.writeheader()
-        w.writerows(debug_rows)
+    buf = io.StringIO()
+    w = csv.DictWriter(buf, fieldnames=fields)
+    w.writeheader()
+    w.writerows(debug_rows)
+    # 파일 쓰기/압축은 collector_debug 백그라운드 writer 가 DEBUG_REPORT_POLICY 에 따라 처리한다.
+    save_debug_artifact(dbg_dir, f"{debug_target_date}_{safe_name}_{report_hint}.csv", buf.getvalue(), encoding="utf-8-sig")
 
 
 def _conv_guess_campaign_id_from_row(vals: list[str]) -> str:
@@ -7,6 +7,9 @@ from typing import Any, Callable, Dict, List, Tuple
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from collector_debug import begin_debug_scope, end_debug_scope
+from collector_timing import begin_account, end_account, stage_span
+
 
 def _log(msg: str) -> None:
     print(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}", flush=True)
@@ -176,7 +179,7 @@ def _save_report_stats_and_breakdowns(
     clear_fact_scope_fn: Callable[..., Any],
     parse_ad_device_report_fn: Callable[..., tuple],
     filter_stat_result_fn: Callable[..., dict],
-    save_device_stats_fn: Callable[..., int],
+    save_device_stats_fn: Callable[..., Dict[str, Dict[str, int]]],
     summarize_stat_res_fn: Callable[[dict], dict],
     collect_media_fact_fn: Callable[..., tuple],
     skip_keyword_stats: bool,
@@ -185,15 +188,18 @@ def _save_report_stats_and_breakdowns(
     log_fn: Callable[[str], None] = _log,
 ) -> Tuple[int, int, int, int, int, int, Dict[str, Any]]:
     collect_campaign_stats, collect_keyword_stats, collect_ad_stats = _scope_enabled_collectors(sa_scope, collect_sa, normalize_sa_scope_fn)
-    c_cnt = fetch_stats_fallback_fn(engine, customer_id, target_date, target_camp_ids, "campaign_id", "fact_campaign_daily", split_map=camp_map, scoped_replace=shopping_only) if collect_campaign_stats else 0
-    if collect_keyword_stats:
-        if shopping_only and target_kw_ids:
-            clear_fact_scope_fn(engine, "fact_keyword_daily", customer_id, target_date, "keyword_id", target_kw_ids)
-            k_cnt = 0
+    campaign_rows: List[Dict[str, Any]] = []
+    with stage_span("stats_campaign", targets=len(target_camp_ids)):
+        c_cnt = fetch_stats_fallback_fn(engine, customer_id, target_date, target_camp_ids, "campaign_id", "fact_campaign_daily", split_map=camp_map, scoped_replace=shopping_only, rows_out=campaign_rows) if collect_campaign_stats else 0
+    with stage_span("stats_keyword", targets=len(target_kw_ids)):
+        if collect_keyword_stats:
+            if shopping_only and target_kw_ids:
+                clear_fact_scope_fn(engine, "fact_keyword_daily", customer_id, target_date, "keyword_id", target_kw_ids)
+                k_cnt = 0
+            else:
+                k_cnt = fetch_stats_fallback_fn(engine, customer_id, target_date, target_kw_ids, "keyword_id", "fact_keyword_daily", split_map=kw_map, scoped_replace=shopping_only) if not skip_keyword_stats else 0
         else:
-            k_cnt = fetch_stats_fallback_fn(engine, customer_id, target_date, target_kw_ids, "keyword_id", "fact_keyword_daily", split_map=kw_map, scoped_replace=shopping_only) if not skip_keyword_stats else 0
-    else:
-        k_cnt = 0
+            k_cnt = 0
 
     device_ad_cnt = 0
     device_campaign_cnt = 0
@@ -204,26 +210,28 @@ def _save_report_stats_and_breakdowns(
     if not skip_ad_stats:
         if ad_report_df is not None and not getattr(ad_report_df, "empty", False):
             if collect_ad_stats:
-                a_cnt = fetch_stats_fallback_fn(
-                    engine,
-                    customer_id,
-                    target_date,
-                    target_ad_ids,
-                    "ad_id",
-                    "fact_ad_daily",
-                    split_map=ad_map,
-                    scoped_replace=shopping_only,
-                )
+                with stage_span("stats_ad", targets=len(target_ad_ids)):
+                    a_cnt = fetch_stats_fallback_fn(
+                        engine,
+                        customer_id,
+                        target_date,
+                        target_ad_ids,
+                        "ad_id",
+                        "fact_ad_daily",
+                        split_map=ad_map,
+                        scoped_replace=shopping_only,
+                    )
                 ad_stat = {}
             else:
                 a_cnt = 0
                 ad_stat = {}
 
             if collect_device:
-                ad_device_stat, camp_device_stat, device_meta = parse_ad_device_report_fn(ad_report_df, ad_to_campaign=ad_to_campaign_map)
-                if shopping_only:
-                    ad_device_stat = filter_stat_result_fn(ad_device_stat, set(target_ad_ids))
-                    camp_device_stat = filter_stat_result_fn(camp_device_stat, set(target_camp_ids))
+                with stage_span("device_parse", report_rows=len(ad_report_df)):
+                    ad_device_stat, camp_device_stat, device_meta = parse_ad_device_report_fn(ad_report_df, ad_to_campaign=ad_to_campaign_map)
+                    if shopping_only:
+                        ad_device_stat = filter_stat_result_fn(ad_device_stat, set(target_ad_ids))
+                        camp_device_stat = filter_stat_result_fn(camp_device_stat, set(target_camp_ids))
             else:
                 ad_device_stat, camp_device_stat, device_meta = {}, {}, {"status": "disabled", "reason": "collect_mode=sa_only"}
                 result["device_status"] = "disabled"
@@ -231,14 +239,19 @@ def _save_report_stats_and_breakdowns(
             if collect_device and device_meta.get("status") == "ok":
                 result["device_status"] = "ok"
                 result["device_missing_campaign_rows"] = int(device_meta.get("missing_campaign_rows", 0) or 0)
-                device_ad_cnt = save_device_stats_fn(
-                    engine, customer_id, target_date, "fact_ad_device_daily", "ad_id", ad_device_stat,
-                    data_source="report_device_total_only", source_report="AD"
-                )
-                device_campaign_cnt = save_device_stats_fn(
-                    engine, customer_id, target_date, "fact_campaign_device_daily", "campaign_id", camp_device_stat,
-                    data_source="report_device_total_only", source_report="AD"
-                )
+                with stage_span("device_save"):
+                    device_counts = save_device_stats_fn(
+                        engine, customer_id, target_date,
+                        [("fact_ad_device_daily", "ad_id", ad_device_stat), ("fact_campaign_device_daily", "campaign_id", camp_device_stat)],
+                        data_source="report_device_total_only", source_report="AD"
+                    )
+                device_ad_cnt = device_counts["fact_ad_device_daily"]["staged"]
+                device_campaign_cnt = device_counts["fact_campaign_device_daily"]["staged"]
+                # 재실행 때 실제로 바뀐 행만 쓰므로 적재 행 수와 별도로 변경/삭제 행 수를 남긴다.
+                device_written = sum(c["written"] for c in device_counts.values())
+                device_deleted = sum(c["deleted"] for c in device_counts.values())
+                result["device_rows_written"] = device_written
+                result["device_rows_deleted"] = device_deleted
                 if ad_stat:
                     total_from_ad = {
                         "imp": sum(int(v.get("imp", 0) or 0) for v in ad_stat.values()),
@@ -260,7 +273,7 @@ def _save_report_stats_and_breakdowns(
                 miss_msg = f", 캠페인 매핑누락={miss}건" if miss else ""
                 log_fn(
                     f"   ✅ [ {account_name} ] PC/M 분리 저장 완료: 캠페인({device_campaign_cnt}) | 소재({device_ad_cnt})"
-                    f"{miss_msg} | parser={device_parser_version}"
+                    f" | 변경={device_written} 삭제={device_deleted}{miss_msg} | parser={device_parser_version}"
                 )
             elif collect_device:
                 result["device_status"] = str(device_meta.get("status") or "unknown")
@@ -284,7 +297,8 @@ def _save_report_stats_and_breakdowns(
         else:
             if collect_ad_stats:
                 log_fn(f"   ⚠️ [ {account_name} ] AD 리포트 없음 → 소재만 실시간 stats 총합으로 대체합니다.")
-                a_cnt = fetch_stats_fallback_fn(engine, customer_id, target_date, target_ad_ids, "ad_id", "fact_ad_daily", split_map=ad_map, scoped_replace=shopping_only)
+                with stage_span("stats_ad", targets=len(target_ad_ids)):
+                    a_cnt = fetch_stats_fallback_fn(engine, customer_id, target_date, target_ad_ids, "ad_id", "fact_ad_daily", split_map=ad_map, scoped_replace=shopping_only)
             else:
                 log_fn(f"   ℹ️ [ {account_name} ] AD 리포트가 없어 PC/M 전용 적재를 건너뜁니다.")
                 a_cnt = 0
@@ -294,11 +308,13 @@ def _save_report_stats_and_breakdowns(
         a_cnt = 0
         result["device_status"] = "not_requested"
 
-    media_cnt, media_meta = collect_media_fact_fn(
-        engine, customer_id, target_date, ad_report_df, ad_to_campaign_map, campaign_type_map, camp_device_stat,
-        allowed_campaign_ids=set(target_camp_ids) if target_camp_ids else None,
-        scoped_campaign_types=['쇼핑검색'] if shopping_only else None,
-    )
+    with stage_span("media"):
+        media_cnt, media_meta = collect_media_fact_fn(
+            engine, customer_id, target_date, ad_report_df, ad_to_campaign_map, campaign_type_map, camp_device_stat,
+            allowed_campaign_ids=set(target_camp_ids) if target_camp_ids else None,
+            scoped_campaign_types=['쇼핑검색'] if shopping_only else None,
+            campaign_total_rows=campaign_rows if (collect_campaign_stats and target_camp_ids) else None,
+        )
     detail_rows = int(media_meta.get('detail_rows', 0) or 0)
     summary_rows = int(media_meta.get('summary_rows', 0) or 0)
     result["media_rows_saved"] = int(media_cnt or 0)
@@ -632,7 +648,8 @@ def _prepare_account_report_fetch_plan(
             split_candidate_reports = ["AD_CONVERSION", "SHOPPINGKEYWORD_CONVERSION_DETAIL"]
             report_types.extend(split_candidate_reports)
             split_attempted = bool(collect_sa)
-        dfs = fetch_multiple_stat_reports_fn(customer_id, report_types, target_date)
+        with stage_span("report_build", reports=",".join(report_types)):
+            dfs = fetch_multiple_stat_reports_fn(customer_id, report_types, target_date)
         result["ad_report_status"], result["ad_report_rows"] = df_state_fn(dfs.get("AD"))
         ad_conv_df = dfs.get("AD_CONVERSION") if "AD_CONVERSION" in report_types else None
         shop_kw_conv_df = dfs.get("SHOPPINGKEYWORD_CONVERSION_DETAIL") if "SHOPPINGKEYWORD_CONVERSION_DETAIL" in report_types else None
@@ -735,19 +752,25 @@ def process_account(
 ) -> Dict[str, Any]:
     log_fn(f"▶️ [ {account_name} ] 업체 데이터 조회 시작...")
 
+    timing = begin_account(customer_id, account_name, target_date)
+    debug_scope = begin_debug_scope(customer_id, target_date)
     result = new_account_collect_result_fn(customer_id, account_name, target_date, collect_mode, sa_scope, skip_dim, fast_mode, shopping_only)
     stage = "init"
     result["stage"] = stage
+    timing.mark("job_lock")
     job_lock = acquire_job_lock_fn(engine, customer_id, target_date)
     if job_lock is False:
         result["status"] = "skipped"
         result["notes"].append("job_lock_busy")
         log_fn(f"⏭️ [ {account_name} ] 동일 날짜/계정 수집이 이미 실행 중이라 건너뜁니다. ({target_date})")
+        end_debug_scope(debug_scope, failed=False)
+        end_account(timing, result)
         return result
 
     try:
         stage = "normalize_collect_mode"
         result["stage"] = stage
+        timing.mark(stage)
         collect_mode = (collect_mode or "sa_with_device").strip().lower()
         sa_scope = normalize_sa_scope_fn(sa_scope)
         collect_sa = collect_mode in {"sa_only", "sa_with_device"}
@@ -773,6 +796,7 @@ def process_account(
 
         stage = "load_dim_targets"
         result["stage"] = stage
+        timing.mark(stage)
         target_bundle = sync_structure_and_collect_targets_fn(
             engine,
             customer_id=customer_id,
@@ -844,6 +868,7 @@ def process_account(
 
         stage = "build_keyword_lookup"
         result["stage"] = stage
+        timing.mark(stage)
         try:
             keyword_lookup, keyword_unique_lookup = build_keyword_lookup_bundle_fn(
                 engine,
@@ -860,11 +885,13 @@ def process_account(
 
         stage = "load_maps"
         result["stage"] = stage
+        timing.mark(stage)
         ad_to_campaign_map = build_ad_to_campaign_map_fn(engine, customer_id)
         campaign_type_map = build_campaign_type_map_fn(engine, customer_id)
 
         stage = "fetch_reports"
         result["stage"] = stage
+        timing.mark(stage)
         dfs, split_candidate_reports, split_attempted, use_realtime_fallback, realtime_reason = prepare_account_report_fetch_plan_fn(
             customer_id=customer_id,
             account_name=account_name,
@@ -876,10 +903,13 @@ def process_account(
 
         stage = "save_realtime_fallback" if use_realtime_fallback else "resolve_split_payload"
         result["stage"] = stage
+        timing.mark(stage)
         if use_realtime_fallback:
+            dfs.clear()
             collect_campaign_stats, collect_keyword_stats, collect_ad_stats = scope_enabled_collectors_fn(sa_scope, collect_sa)
+            campaign_rows: List[Dict[str, Any]] = []
             if collect_sa:
-                c_cnt = fetch_stats_fallback_fn(engine, customer_id, target_date, target_camp_ids, "campaign_id", "fact_campaign_daily", scoped_replace=shopping_only) if collect_campaign_stats else 0
+                c_cnt = fetch_stats_fallback_fn(engine, customer_id, target_date, target_camp_ids, "campaign_id", "fact_campaign_daily", scoped_replace=shopping_only, rows_out=campaign_rows) if collect_campaign_stats else 0
                 if collect_keyword_stats:
                     if shopping_only and target_kw_ids:
                         clear_fact_scope_fn(engine, "fact_keyword_daily", customer_id, target_date, "keyword_id", target_kw_ids)
@@ -899,6 +929,7 @@ def process_account(
                 engine, customer_id, target_date, None, ad_to_campaign_map, campaign_type_map, None,
                 allowed_campaign_ids=set(target_camp_ids) if target_camp_ids else None,
                 scoped_campaign_types=['쇼핑검색'] if shopping_only else None,
+                campaign_total_rows=campaign_rows if (collect_sa and collect_campaign_stats and target_camp_ids) else None,
             )
             if media_cnt:
                 log_fn(f"   ✅ [ {account_name} ] 매체/지역/기기 요약 저장 완료: {media_cnt}건 | source={media_meta.get('status')}")
@@ -919,9 +950,12 @@ def process_account(
                 customer_id=customer_id,
                 result=result,
             )
+            # 전환/쇼핑검색어 리포트는 분리 맵으로 바뀌었으니 여기서 놓고, AD 프레임만 저장 단계로 넘긴다.
+            dfs.clear()
 
             stage = "save_stats_and_breakdowns"
             result["stage"] = stage
+            timing.mark(stage)
             c_cnt, k_cnt, a_cnt, device_ad_cnt, device_campaign_cnt, media_cnt, media_meta = save_report_stats_and_breakdowns_fn(
                 engine,
                 customer_id=customer_id,
@@ -942,10 +976,12 @@ def process_account(
                 ad_map=ad_map,
                 result=result,
             )
+            ad_report_df = None
 
             if collect_sa and not is_ad_only_scope_fn(sa_scope):
                 stage = "save_shopping_query_split"
                 result["stage"] = stage
+                timing.mark(stage)
                 replace_query_fact_range_fn(engine, shop_query_rows, customer_id, target_date)
                 if shop_query_rows:
                     log_fn(f"   ✅ [ {account_name} ] 쇼핑검색어 분리 저장 완료: {len(shop_query_rows)}건")
@@ -954,6 +990,7 @@ def process_account(
 
             stage = "finalize_result"
             result["stage"] = stage
+            timing.mark(stage)
             finalize_account_result_fn(
                 result,
                 account_name=account_name,
@@ -970,7 +1007,8 @@ def process_account(
             if callable(refresh_overview_report_source_cache_fn) and result.get("status") == "ok":
                 try:
                     if int(result.get("k_cnt", 0) or 0) > 0 or int(result.get("shopping_query_rows_saved", 0) or 0) > 0:
-                        refresh_overview_report_source_cache_fn(engine, customer_id, target_date, target_date)
+                        with stage_span("refresh_overview_cache"):
+                            refresh_overview_report_source_cache_fn(engine, customer_id, target_date, target_date)
                         log_fn(f"   ✅ [ {account_name} ] 오버뷰 보고서 소스 캐시 갱신 완료")
                 except Exception as e:
                     log_best_effort_failure_fn("overview report cache refresh", e, ctx=f"customer_id={customer_id} dt={target_date}")
@@ -987,5 +1025,8 @@ def process_account(
             log_fn(f"   ↳ traceback: {tb_tail}")
     finally:
         if job_lock is not False:
-            release_job_lock_fn(job_lock, customer_id, target_date)
+            with stage_span("job_lock_release"):
+                release_job_lock_fn(job_lock, customer_id, target_date)
+        end_debug_scope(debug_scope, failed=result.get("status") == "error")
+        end_account(timing, result)
     return result
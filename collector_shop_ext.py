@@ -19,7 +19,12 @@ import hashlib
 import argparse
 import random
 import re
+import threading
+import concurrent.futures
+import contextvars
+from contextlib import contextmanager
 import requests
+from requests.adapters import HTTPAdapter
 import pandas as pd
 from datetime import datetime, date, timedelta
 from urllib.parse import urlparse
@@ -28,6 +33,8 @@ from sqlalchemy import create_engine, text
 import psycopg2.extras
 from sqlalchemy.pool import NullPool
 
+from collector_debug import begin_debug_scope, end_debug_scope, save_debug_artifact
+
 try:
     from account_master import load_naver_accounts
 except Exception:
@@ -83,6 +90,13 @@ def _load_shopping_fixed_override() -> dict:
 BASE_URL = "https://api.searchad.naver.com"
 TIMEOUT = 60
 DEBUG_REPORT_DIR = os.getenv("DEBUG_REPORT_DIR", "debug_reports")
+# 동시 요청 수는 429 발생률에 따라 MIN~MAX 사이에서 자동 조절된다.
+SHOP_EXT_MAX_WORKERS = max(1, int(os.getenv("SHOP_EXT_MAX_WORKERS", "12") or 12))
+SHOP_EXT_MIN_WORKERS = max(1, min(SHOP_EXT_MAX_WORKERS, int(os.getenv("SHOP_EXT_MIN_WORKERS", "1") or 1)))
+SHOP_EXT_INITIAL_WORKERS = max(SHOP_EXT_MIN_WORKERS, min(SHOP_EXT_MAX_WORKERS, int(os.getenv("SHOP_EXT_INITIAL_WORKERS", "6") or 6)))
+# 1 이면 대상 ID 가 확정되는 즉시 리포트 다운로드와 동시에 /stats 를 미리 조회한다.
+# 보강이 필요 없는 계정도 /stats 지연·쿼터를 그대로 쓰게 되므로 기본은 끔 (리포트를 본 뒤 필요할 때만 조회).
+SHOP_EXT_STATS_PREFETCH = str(os.getenv("SHOP_EXT_STATS_PREFETCH", "0") or "0").strip().lower() not in ("0", "false", "no", "off")
 
 
 def log(msg: str):
@@ -179,13 +193,88 @@ def make_headers(method: str, path: str, customer_id: str) -> dict:
     }
 
 
+class AdaptiveConcurrency:
+    """429 비율에 따라 동시 요청 수를 조절하는 게이트 (429 시 절반, 연속 성공 시 +1)"""
+
+    def __init__(self, initial: int, minimum: int, maximum: int, cooldown_sec: float = 2.0):
+        self.minimum = max(1, int(minimum))
+        self.maximum = max(self.minimum, int(maximum))
+        self.limit = max(self.minimum, min(self.maximum, int(initial)))
+        self.cooldown_sec = float(cooldown_sec)
+        self.requests = 0
+        self.throttled = 0
+        self._active = 0
+        self._streak = 0
+        self._last_cut = 0.0
+        self._cond = threading.Condition()
+
+    @contextmanager
+    def slot(self):
+        with self._cond:
+            while self._active >= self.limit:
+                self._cond.wait()
+            self._active += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._active -= 1
+                self._cond.notify_all()
+
+    def on_success(self):
+        with self._cond:
+            self.requests += 1
+            self._streak += 1
+            if self._streak >= self.limit * 2 and self.limit < self.maximum:
+                self.limit += 1
+                self._streak = 0
+                self._cond.notify_all()
+
+    def on_throttle(self):
+        with self._cond:
+            self.requests += 1
+            self.throttled += 1
+            self._streak = 0
+            now = time.monotonic()
+            # 같은 순간에 몰려온 429 여러 건으로 한꺼번에 줄어들지 않도록 쿨다운 동안 한 번만 줄인다.
+            if now - self._last_cut >= self.cooldown_sec and self.limit > self.minimum:
+                self.limit = max(self.minimum, self.limit // 2)
+                self._last_cut = now
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {"limit": self.limit, "requests": self.requests, "throttled": self.throttled}
+
+
+_concurrency = AdaptiveConcurrency(SHOP_EXT_INITIAL_WORKERS, SHOP_EXT_MIN_WORKERS, SHOP_EXT_MAX_WORKERS)
+_session_lock = threading.Lock()
+_session = None
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=SHOP_EXT_MAX_WORKERS + 4)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
 def request_json(method: str, path: str, customer_id: str, params: dict | None = None, json_data: dict | None = None, raise_error=False):
     url = BASE_URL + path
-    session = requests.Session()
+    session = get_session()
     max_retries = 6
     for attempt in range(max_retries):
         try:
-            r = session.request(method, url, headers=make_headers(method, path, customer_id), params=params, json=json_data, timeout=TIMEOUT)
+            with _concurrency.slot():
+                r = session.request(method, url, headers=make_headers(method, path, customer_id), params=params, json=json_data, timeout=TIMEOUT)
+            if r.status_code == 429:
+                _concurrency.on_throttle()
+            else:
+                _concurrency.on_success()
             if r.status_code in (429, 500, 502, 503, 504):
                 time.sleep(2 + attempt + random.uniform(0.1, 0.8))
                 continue
@@ -215,11 +304,8 @@ def save_debug_report(tp: str, customer_id: str, job_id: str, content: str):
     try:
         if not content:
             return
-        os.makedirs(DEBUG_REPORT_DIR, exist_ok=True)
         ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        path = os.path.join(DEBUG_REPORT_DIR, f"{ts}_{customer_id}_{tp}_{job_id}.txt")
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(content)
+        save_debug_artifact(DEBUG_REPORT_DIR, f"{ts}_{customer_id}_{tp}_{job_id}.txt", content)
     except Exception:
         pass
 
@@ -246,6 +332,37 @@ def _manual_report_parse(txt: str, delim: str) -> pd.DataFrame:
     return pd.DataFrame(norm_rows)
 
 
+_REPORT_BARE_CR = re.compile(r"\r(?!\n)")
+
+
+def _fast_report_parse(txt: str, delim: str) -> pd.DataFrame | None:
+    """C 엔진 파싱. 결과는 _manual_report_parse 와 동일(셀 strip, 빈 줄 유지, 짧은 행은 "" 패딩).
+
+    따옴표(인용 규칙/열 수가 달라짐), 단독 CR(csv.reader 가 오류로 거부함), NUL 문자가 있는
+    비정형 원문은 None 을 돌려 기존 수동/폴백 경로에 맡긴다.
+    """
+    if '"' in txt or "\x00" in txt or _REPORT_BARE_CR.search(txt):
+        return None
+    # 따옴표가 없으면 행별 필드 수 = 구분자 수 + 1 이므로 최대 열 수를 미리 알 수 있다.
+    width = max(ln.count(delim) for ln in txt.split("\n")) + 1
+    df = pd.read_csv(
+        io.BytesIO(txt.encode("utf-8")),
+        sep=delim,
+        header=None,
+        names=range(width),
+        dtype=str,
+        encoding="utf-8",
+        na_filter=False,
+        skip_blank_lines=False,
+        quoting=csv.QUOTE_NONE,
+        engine="c",
+    )
+    df.columns = pd.RangeIndex(width)
+    for col in df.columns:
+        df[col] = df[col].str.strip()
+    return df
+
+
 def _pandas_report_parse(txt: str, delim: str) -> pd.DataFrame:
     return pd.read_csv(io.StringIO(txt), sep=delim, header=None, dtype=str, on_bad_lines="skip").fillna("")
 
@@ -268,13 +385,20 @@ def parse_report_text_to_df(txt: str) -> pd.DataFrame:
     tries = _report_parse_delimiters(lines)
 
     for delim in tries:
+        mode, df = "fast", None
         try:
-            df = _manual_report_parse(txt, delim)
-            if not df.empty and max(df.shape) > 1:
-                _log_report_parse_diag("manual", delim, df)
-                return df
+            df = _fast_report_parse(txt, delim)
         except Exception:
-            pass
+            df = None
+        if df is None:
+            mode = "manual"
+            try:
+                df = _manual_report_parse(txt, delim)
+            except Exception:
+                continue
+        if not df.empty and max(df.shape) > 1:
+            _log_report_parse_diag(mode, delim, df)
+            return df
 
     for delim in tries:
         try:
@@ -300,7 +424,7 @@ def resolve_download_url(dl_url: str) -> str:
 
 
 def download_report_dataframe(customer_id: str, tp: str, job_id: str, initial_url: str) -> pd.DataFrame:
-    session = requests.Session()
+    session = get_session()
     current_url = initial_url
     for retry in range(3):
         url = resolve_download_url(current_url)
@@ -878,9 +1002,9 @@ def fetch_extension_stats_map(customer_id: str, ids: list[str], target_date: dat
         return {}
     chunks = [ids[i:i+50] for i in range(0, len(ids), 50)]
     out: dict[str, dict] = {}
-    max_workers = min(6, max(1, len(chunks)))
+    # 실제 동시 요청 수는 request_json 의 _concurrency 게이트가 429 비율에 맞춰 제한한다.
+    max_workers = min(SHOP_EXT_MAX_WORKERS, max(1, len(chunks)))
     try:
-        import concurrent.futures
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
             futures = [executor.submit(_fetch_stats_chunk, customer_id, chunk, target_date) for chunk in chunks]
             for fut in futures:
@@ -898,6 +1022,8 @@ def fetch_extension_stats_map(customer_id: str, ids: list[str], target_date: dat
     except Exception as e:
         log(f"⚠️ /stats 확장소재 보강 조회 실패: {e}")
         return {}
+    snap = _concurrency.snapshot()
+    log(f"   ↪ /stats 조회 동시성: chunks={len(chunks)} | limit={snap['limit']} | 429={snap['throttled']}/{snap['requests']}")
     return out
 
 
@@ -969,14 +1095,53 @@ def _fetch_selected_campaigns(customer_id: str, ext_bucket: str, result: dict):
     return selected_camps, ""
 
 
+def _extension_ad_row(customer_id: str, ext: dict, adgroup_id: str) -> dict:
+    ext_info = _normalize_ext_info(ext)
+    display_name = parse_ext_name(ext)
+    return {
+        "customer_id": str(customer_id),
+        "ad_id": str(ext.get("nccAdExtensionId") or "").strip(),
+        "adgroup_id": adgroup_id,
+        "ad_name": display_name,
+        "status": ext.get("status"),
+        "ad_title": display_name,
+        "ad_desc": display_name,
+        "pc_landing_url": _first_non_empty(ext_info, ["pcLandingUrl", "landingUrl", "pcUrl", "url"]),
+        "mobile_landing_url": _first_non_empty(ext_info, ["mobileLandingUrl", "landingUrl", "mobileUrl", "url"]),
+        "creative_text": display_name[:500],
+    }
+
+
+def _fetch_owner_extensions(customer_id: str, owner_id: str) -> list:
+    s, exts = request_json("GET", "/ncc/ad-extensions", customer_id, params={"ownerId": owner_id})
+    return exts if s == 200 and isinstance(exts, list) else []
+
+
+def _fetch_campaign_adgroups(customer_id: str, campaign_id: str) -> list:
+    s, groups = request_json("GET", "/ncc/adgroups", customer_id, params={"nccCampaignId": campaign_id})
+    return groups if s == 200 and isinstance(groups, list) else []
+
+
 def _collect_extension_targets(customer_id: str, selected_camps: list, result: dict):
     _set_result_stage(result, "collect_extension_targets")
     camp_rows, ag_rows, ad_rows = [], [], []
     ad_bucket_map = {}
     target_ad_ids = []
 
-    for c in selected_camps:
-        cid = str(c.get("nccCampaignId"))
+    # 1) 캠페인 공통 확장소재 + 광고그룹 목록, 2) 광고그룹별 확장소재 순으로 병렬 조회하고
+    #    행 순서는 캠페인 → 그룹 순서 그대로 조립한다.
+    camp_ids = [str(c.get("nccCampaignId")) for c in selected_camps]
+    workers = min(SHOP_EXT_MAX_WORKERS, max(1, len(camp_ids)))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        camp_ext_futs = [executor.submit(_fetch_owner_extensions, customer_id, cid) for cid in camp_ids]
+        group_futs = [executor.submit(_fetch_campaign_adgroups, customer_id, cid) for cid in camp_ids]
+        camp_exts_list = [f.result() for f in camp_ext_futs]
+        groups_list = [f.result() for f in group_futs]
+        group_ids = [str(g.get("nccAdgroupId")) for groups in groups_list for g in groups]
+        group_ext_futs = {gid: executor.submit(_fetch_owner_extensions, customer_id, gid) for gid in dict.fromkeys(group_ids)}
+        group_exts = {gid: f.result() for gid, f in group_ext_futs.items()}
+
+    for c, cid, camp_exts, groups in zip(selected_camps, camp_ids, camp_exts_list, groups_list):
         bucket = campaign_bucket(c.get("campaignTp"))
         camp_rows.append({
             "customer_id": str(customer_id),
@@ -986,40 +1151,23 @@ def _collect_extension_targets(customer_id: str, selected_camps: list, result: d
             "status": c.get("status"),
         })
 
-        for owner_id, agid, agname in [(cid, f"CAMP_{cid}", "[캠페인 공통 소재]")]:
-            s, camp_exts = request_json("GET", "/ncc/ad-extensions", customer_id, params={"ownerId": owner_id})
-            camp_exts = camp_exts if s == 200 and isinstance(camp_exts, list) else []
-            if camp_exts:
-                ag_rows.append({
-                    "customer_id": str(customer_id),
-                    "adgroup_id": agid,
-                    "campaign_id": cid,
-                    "adgroup_name": agname,
-                    "status": "ELIGIBLE",
-                })
-                for ext in camp_exts:
-                    ext_id = str(ext.get("nccAdExtensionId") or "").strip()
-                    if not ext_id:
-                        continue
-                    target_ad_ids.append(ext_id)
-                    ad_bucket_map[ext_id] = bucket
-                    ext_info = _normalize_ext_info(ext)
-                    display_name = parse_ext_name(ext)
-                    ad_rows.append({
-                        "customer_id": str(customer_id),
-                        "ad_id": ext_id,
-                        "adgroup_id": agid,
-                        "ad_name": display_name,
-                        "status": ext.get("status"),
-                        "ad_title": display_name,
-                        "ad_desc": display_name,
-                        "pc_landing_url": _first_non_empty(ext_info, ["pcLandingUrl", "landingUrl", "pcUrl", "url"]),
-                        "mobile_landing_url": _first_non_empty(ext_info, ["mobileLandingUrl", "landingUrl", "mobileUrl", "url"]),
-                        "creative_text": display_name[:500],
-                    })
-
-        s_groups, groups = request_json("GET", "/ncc/adgroups", customer_id, params={"nccCampaignId": cid})
-        groups = groups if s_groups == 200 and isinstance(groups, list) else []
+        if camp_exts:
+            agid = f"CAMP_{cid}"
+            ag_rows.append({
+                "customer_id": str(customer_id),
+                "adgroup_id": agid,
+                "campaign_id": cid,
+                "adgroup_name": "[캠페인 공통 소재]",
+                "status": "ELIGIBLE",
+            })
+            for ext in camp_exts:
+                ext_id = str(ext.get("nccAdExtensionId") or "").strip()
+                if not ext_id:
+                    continue
+                target_ad_ids.append(ext_id)
+                ad_bucket_map[ext_id] = bucket
+                ad_rows.append(_extension_ad_row(customer_id, ext, agid))
+
         for g in groups:
             gid = str(g.get("nccAdgroupId"))
             ag_rows.append({
@@ -1029,28 +1177,13 @@ def _collect_extension_targets(customer_id: str, selected_camps: list, result: d
                 "adgroup_name": g.get("name"),
                 "status": g.get("status"),
             })
-            s_exts, exts = request_json("GET", "/ncc/ad-extensions", customer_id, params={"ownerId": gid})
-            exts = exts if s_exts == 200 and isinstance(exts, list) else []
-            for ext in exts:
+            for ext in group_exts.get(gid, []):
                 ext_id = str(ext.get("nccAdExtensionId") or "").strip()
                 if not ext_id:
                     continue
                 target_ad_ids.append(ext_id)
                 ad_bucket_map[ext_id] = bucket
-                ext_info = _normalize_ext_info(ext)
-                display_name = parse_ext_name(ext)
-                ad_rows.append({
-                    "customer_id": str(customer_id),
-                    "ad_id": ext_id,
-                    "adgroup_id": gid,
-                    "ad_name": display_name,
-                    "status": ext.get("status"),
-                    "ad_title": display_name,
-                    "ad_desc": display_name,
-                    "pc_landing_url": _first_non_empty(ext_info, ["pcLandingUrl", "landingUrl", "pcUrl", "url"]),
-                    "mobile_landing_url": _first_non_empty(ext_info, ["mobileLandingUrl", "landingUrl", "mobileUrl", "url"]),
-                    "creative_text": display_name[:500],
-                })
+                ad_rows.append(_extension_ad_row(customer_id, ext, gid))
 
     result["campaign_rows"] = len(camp_rows)
     result["adgroup_rows"] = len(ag_rows)
@@ -1068,8 +1201,12 @@ def _persist_extension_dimensions(engine, camp_rows: list, ag_rows: list, ad_row
 def _load_extension_report_metrics(customer_id: str, target_date: date, target_ad_ids: list[str], ext_bucket: str, result: dict):
     _set_result_stage(result, "fetch_reports")
     log(f"   ▶ ADEXTENSION / ADEXTENSION_CONVERSION 리포트 수집 중...")
-    base_df = fetch_stat_report(customer_id, "ADEXTENSION", target_date)
-    conv_df = fetch_stat_report(customer_id, "ADEXTENSION_CONVERSION", target_date)
+    # 원문 리포트 debug 저장이 계정 scope(failures/sample 정책)를 따르도록 현재 context 를 복사해 넘긴다.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        base_fut = executor.submit(contextvars.copy_context().run, fetch_stat_report, customer_id, "ADEXTENSION", target_date)
+        conv_fut = executor.submit(contextvars.copy_context().run, fetch_stat_report, customer_id, "ADEXTENSION_CONVERSION", target_date)
+        base_df = base_fut.result()
+        conv_df = conv_fut.result()
     result["report_base_rows"] = int(len(base_df) if base_df is not None else 0)
     result["report_conv_rows"] = int(len(conv_df) if conv_df is not None else 0)
     result["report_status"] = "ok" if (result["report_base_rows"] > 0 or result["report_conv_rows"] > 0) else "zero_data"
@@ -1096,14 +1233,18 @@ def _should_fetch_extension_stats(metric_map: dict, conv_map: dict) -> bool:
     )
 
 
-def _enrich_extension_metrics_with_stats(customer_id: str, target_ad_ids: list[str], target_date: date, metric_map: dict, conv_map: dict, result: dict):
+def _enrich_extension_metrics_with_stats(customer_id: str, target_ad_ids: list[str], target_date: date, metric_map: dict, conv_map: dict, result: dict, stats_future=None):
     _set_result_stage(result, "maybe_fetch_stats")
     stats_needed = _should_fetch_extension_stats(metric_map, conv_map)
     stats_map = {}
     if stats_needed:
         result["stats_status"] = "started"
-        log(f"   ↪ /stats 확장소재 보강 조회 시작: target_ids={len(target_ad_ids)}")
-        stats_map = fetch_extension_stats_map(customer_id, target_ad_ids, target_date)
+        if stats_future is not None:
+            log(f"   ↪ /stats 확장소재 보강 조회(선조회 결과 사용): target_ids={len(target_ad_ids)}")
+            stats_map = stats_future.result() or {}
+        else:
+            log(f"   ↪ /stats 확장소재 보강 조회 시작: target_ids={len(target_ad_ids)}")
+            stats_map = fetch_extension_stats_map(customer_id, target_ad_ids, target_date)
         result["stats_rows"] = len(stats_map)
         result["stats_status"] = "ok" if stats_map else "zero_data"
         if stats_map:
@@ -1116,6 +1257,8 @@ def _enrich_extension_metrics_with_stats(customer_id: str, target_ad_ids: list[s
             f"stats_enriched={source_counts['stats_enriched']} | report_preferred={source_counts['report_preferred']}"
         )
     else:
+        if stats_future is not None:
+            stats_future.cancel()
         result["stats_status"] = "skipped"
     return metric_map, stats_map
 
@@ -1177,6 +1320,17 @@ def _persist_extension_fact(engine, customer_id: str, target_date: date, target_
 
 
 def process_account(engine, customer_id: str, target_date: date, ext_bucket: str = "shopping"):
+    # DEBUG_REPORT_POLICY=failures 는 계정 scope 에 원문을 모아 두었다가 error 로 끝난 계정만 남긴다.
+    debug_scope = begin_debug_scope(customer_id, target_date)
+    result = None
+    try:
+        result = _process_account(engine, customer_id, target_date, ext_bucket)
+        return result
+    finally:
+        end_debug_scope(debug_scope, failed=not isinstance(result, dict) or result.get("status") == "error")
+
+
+def _process_account(engine, customer_id: str, target_date: date, ext_bucket: str = "shopping"):
     result = _new_run_result(customer_id, target_date, ext_bucket)
     log(f"--- [ {customer_id} ] {bucket_label(ext_bucket)} 확장소재 수집 시작 ({target_date}) ---")
     try:
@@ -1185,16 +1339,27 @@ def process_account(engine, customer_id: str, target_date: date, ext_bucket: str
             return _finalize_run_result(result, "error", reason)
 
         camp_rows, ag_rows, ad_rows, target_ad_ids, ad_bucket_map = _collect_extension_targets(customer_id, selected_camps, result)
-        _set_result_stage(result, "persist_dimensions")
-        _persist_extension_dimensions(engine, camp_rows, ag_rows, ad_rows)
-        log(f"   ▶ 캠페인({len(camp_rows)}), 광고그룹({len(ag_rows)}), 확장소재({len(ad_rows)}) 매핑 완료!")
 
         if not target_ad_ids:
+            _set_result_stage(result, "persist_dimensions")
+            _persist_extension_dimensions(engine, camp_rows, ag_rows, ad_rows)
+            log(f"   ▶ 캠페인({len(camp_rows)}), 광고그룹({len(ag_rows)}), 확장소재({len(ad_rows)}) 매핑 완료!")
             log("   ⚠️ 수집 대상 확장소재가 없습니다.")
             return _finalize_run_result(result, "zero_data", "no_target_extensions")
 
-        metric_map, base_map, conv_map, base_df, conv_df = _load_extension_report_metrics(customer_id, target_date, target_ad_ids, ext_bucket, result)
-        metric_map, stats_map = _enrich_extension_metrics_with_stats(customer_id, target_ad_ids, target_date, metric_map, conv_map, result)
+        # dim 적재(와 켜져 있으면 /stats 선조회)는 리포트 생성/다운로드를 기다리는 동안 백그라운드로 진행한다.
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as stage_executor:
+            _set_result_stage(result, "persist_dimensions")
+            dim_future = stage_executor.submit(_persist_extension_dimensions, engine, camp_rows, ag_rows, ad_rows)
+            stats_future = (
+                stage_executor.submit(fetch_extension_stats_map, customer_id, target_ad_ids, target_date)
+                if SHOP_EXT_STATS_PREFETCH else None
+            )
+            metric_map, base_map, conv_map, base_df, conv_df = _load_extension_report_metrics(customer_id, target_date, target_ad_ids, ext_bucket, result)
+            _set_result_stage(result, "persist_dimensions")
+            dim_future.result()
+            log(f"   ▶ 캠페인({len(camp_rows)}), 광고그룹({len(ag_rows)}), 확장소재({len(ad_rows)}) 매핑 완료!")
+            metric_map, stats_map = _enrich_extension_metrics_with_stats(customer_id, target_ad_ids, target_date, metric_map, conv_map, result, stats_future=stats_future)
 
         result["metric_rows"] = len(metric_map)
         if not metric_map:
@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+"""collector_timing.py - 계정별 수집 단계 소요 시간 계측
+
+- process_account 가 begin_account/end_account 로 계정 구간을 열고 닫음
+- timing.mark(stage) 는 상위 단계 전환, stage_span(...) 은 그 안의 하위 구간 (API/파싱/DB 적재)
+- 하위 구간 시간은 상위 단계에서 빼서 배타 시간으로 남기므로 stage_sec 합 = 계정 wall time
+- 결과 dict 의 stage_sec/stage_calls 를 summarize_stage_timings 가 실행 요약으로 집계
+- COLLECTOR_STAGE_TRACE_FILE 을 주면 span 단위 JSONL trace 도 남긴다
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List
+
+# 비워두면 JSONL trace 는 남기지 않고 결과 dict 의 stage_sec 집계만 채운다.
+STAGE_TRACE_FILE = (os.getenv("COLLECTOR_STAGE_TRACE_FILE") or "").strip()
+
+_thread_state = threading.local()
+_trace_lock = threading.Lock()
+
+
+def set_trace_path(path: str | None) -> None:
+    global STAGE_TRACE_FILE
+    STAGE_TRACE_FILE = str(path or "").strip()
+
+
+class AccountStageTimer:
+    """Monotonic stage spans for one account/date, attributed as exclusive (self) time.
+
+    ``mark(stage)`` closes the current top-level stage and opens the next one, which
+    mirrors how process_account walks ``result["stage"]``. ``stage_span`` nests inside
+    the open stage; a child's time is subtracted from its parent so stage_sec sums to
+    the account wall time.
+    """
+
+    def __init__(self, customer_id: str, account_name: str, target_date: date | str):
+        self.customer_id = str(customer_id)
+        self.account_name = str(account_name)
+        self.target_date = str(target_date)
+        self.started = time.perf_counter()
+        self.stage_sec: Dict[str, float] = {}
+        self.stage_calls: Dict[str, int] = {}
+        self.spans: List[Dict[str, Any]] = []
+        self._stack: List[Dict[str, Any]] = []
+        self._marked: Dict[str, Any] | None = None
+
+    def _push(self, stage: str, labels: Dict[str, Any]) -> Dict[str, Any]:
+        frame = {"stage": stage, "start": time.perf_counter(), "child": 0.0, "labels": labels}
+        self._stack.append(frame)
+        return frame
+
+    def _pop(self, frame: Dict[str, Any]) -> None:
+        if not any(f is frame for f in self._stack):
+            return
+        while self._stack:
+            top = self._stack.pop()
+            end = time.perf_counter()
+            dur = end - top["start"]
+            own = max(0.0, dur - top["child"])
+            if self._stack:
+                self._stack[-1]["child"] += dur
+            stage = top["stage"]
+            self.stage_sec[stage] = self.stage_sec.get(stage, 0.0) + own
+            self.stage_calls[stage] = self.stage_calls.get(stage, 0) + 1
+            if STAGE_TRACE_FILE:
+                span = {
+                    "stage": stage,
+                    "parent": self._stack[-1]["stage"] if self._stack else "",
+                    "depth": len(self._stack),
+                    "start_ms": round((top["start"] - self.started) * 1000.0, 3),
+                    "dur_ms": round(dur * 1000.0, 3),
+                    "self_ms": round(own * 1000.0, 3),
+                }
+                span.update(top["labels"])
+                self.spans.append(span)
+            if top is frame:
+                return
+
+    def mark(self, stage: str) -> None:
+        if self._marked is not None:
+            self._pop(self._marked)
+        self._marked = self._push(stage, {})
+
+    @contextmanager
+    def span(self, stage: str, **labels: Any) -> Iterator[None]:
+        frame = self._push(stage, labels)
+        try:
+            yield
+        finally:
+            self._pop(frame)
+
+    def finish(self, result: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        if self._stack:
+            self._pop(self._stack[0])
+        self._marked = None
+        elapsed = time.perf_counter() - self.started
+        summary = {
+            "elapsed_sec": round(elapsed, 3),
+            "stage_sec": {k: round(v, 3) for k, v in sorted(self.stage_sec.items(), key=lambda kv: -kv[1])},
+            "stage_calls": dict(self.stage_calls),
+        }
+        if result is not None:
+            result.update(summary)
+        _write_trace(self)
+        return summary
+
+
+def _write_trace(timer: AccountStageTimer) -> None:
+    path = STAGE_TRACE_FILE
+    if not path or not timer.spans:
+        return
+    head = {
+        "ts": datetime.now().isoformat(timespec="seconds"),
+        "customer_id": timer.customer_id,
+        "account_name": timer.account_name,
+        "target_date": timer.target_date,
+        "thread": threading.current_thread().name,
+    }
+    lines = "".join(json.dumps({**head, **span}, ensure_ascii=False, default=str) + "\n" for span in timer.spans)
+    timer.spans = []
+    try:
+        # 계정 단위로 한 번에 append 해서 worker 스레드끼리 줄이 섞이지 않게 한다.
+        with _trace_lock:
+            with open(path, "a", encoding="utf-8") as fp:
+                fp.write(lines)
+    except OSError as e:
+        print(f"[{datetime.now().strftime('%H:%M:%S')}] ⚠️ stage trace 기록 실패 | path={path} | {type(e).__name__}: {e}", flush=True)
+
+
+def begin_account(customer_id: str, account_name: str, target_date: date | str) -> AccountStageTimer:
+    timer = AccountStageTimer(customer_id, account_name, target_date)
+    _thread_state.timer = timer
+    return timer
+
+
+def end_account(timer: AccountStageTimer, result: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    try:
+        return timer.finish(result)
+    finally:
+        if getattr(_thread_state, "timer", None) is timer:
+            _thread_state.timer = None
+
+
+def current_timer() -> AccountStageTimer | None:
+    return getattr(_thread_state, "timer", None)
+
+
+@contextmanager
+def stage_span(stage: str, **labels: Any) -> Iterator[None]:
+    """Time a nested stage for the account running on this thread (no-op outside process_account)."""
+    timer = current_timer()
+    if timer is None:
+        yield
+        return
+    with timer.span(stage, **labels):
+        yield
+
+
+def summarize_stage_timings(rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate per-account stage_sec from collection results for the run summary."""
+    timed = [r for r in rows or [] if isinstance(r, dict) and isinstance(r.get("stage_sec"), dict)]
+    totals: Dict[str, float] = {}
+    calls: Dict[str, int] = {}
+    per_stage: Dict[str, List[float]] = {}
+    for r in timed:
+        for stage, sec in r["stage_sec"].items():
+            sec = float(sec or 0.0)
+            totals[stage] = totals.get(stage, 0.0) + sec
+            per_stage.setdefault(stage, []).append(sec)
+        for stage, n in (r.get("stage_calls") or {}).items():
+            calls[stage] = calls.get(stage, 0) + int(n or 0)
+    grand = sum(totals.values())
+    stages = []
+    for stage, total in sorted(totals.items(), key=lambda kv: -kv[1]):
+        vals = sorted(per_stage.get(stage) or [0.0])
+        stages.append({
+            "stage": stage,
+            "total_sec": round(total, 3),
+            "share": (total / grand) if grand > 0 else 0.0,
+            "calls": calls.get(stage, 0),
+            "p95_sec": round(vals[min(len(vals) - 1, int(round((len(vals) - 1) * 0.95)))], 3),
+        })
+    slowest = sorted(timed, key=lambda r: -float(r.get("elapsed_sec") or 0.0))
+    return {"accounts": len(timed), "total_sec": round(grand, 3), "stages": stages, "slowest": slowest}
@@ -12,6 +12,8 @@ from sqlalchemy.exc import OperationalError, StatementError, InterfaceError
 from sqlalchemy.pool import QueuePool
 from datetime import date
 
+from perf_utils import perf_timed
+
 # ==========================================
 # 1. Database Connection (QueuePool 적용)
 # ==========================================
@@ -951,6 +953,7 @@ def _compute_total_ratio_metrics(row: dict) -> dict:
     return row
 
 @st.cache_data(ttl=300, max_entries=10, show_spinner=False)
+@perf_timed("budget_bundle")
 def query_budget_bundle(_engine, cids: tuple, yesterday: date, avg_d1: date, avg_d2: date, month_d1: date, month_d2: date, prev_month_d1: date, prev_month_d2: date, avg_days: int) -> pd.DataFrame:
     meta = get_meta(_engine)
     if meta.empty:
@@ -1071,6 +1074,7 @@ def query_campaign_off_log(_engine, d1: date, d2: date, cids: tuple) -> pd.DataF
     )
 
 @st.cache_data(ttl=43200, max_entries=20, show_spinner=False)
+@perf_timed("entity_totals")
 def get_entity_totals(_engine, entity: str, d1: date, d2: date, cids: tuple, type_sel: tuple) -> dict:
     if not table_exists(_engine, f"fact_{entity}_daily"):
         return {}
@@ -1109,6 +1113,7 @@ def get_entity_totals(_engine, entity: str, d1: date, d2: date, cids: tuple, typ
     return _compute_total_ratio_metrics(row)
 
 @st.cache_data(ttl=43200, max_entries=10, show_spinner=False)
+@perf_timed("campaign_bundle")
 def query_campaign_bundle(_engine, d1: date, d2: date, cids: tuple, type_sel: tuple, topn_cost: int = 0) -> pd.DataFrame:
     if not table_exists(_engine, "fact_campaign_daily"):
         return pd.DataFrame()
@@ -1147,6 +1152,7 @@ def query_campaign_bundle(_engine, d1: date, d2: date, cids: tuple, type_sel: tu
     return _finalize_bundle_df(df, "campaign_type")
 
 @st.cache_data(ttl=43200, max_entries=10, show_spinner=False)
+@perf_timed("keyword_bundle")
 def query_keyword_bundle(_engine, d1: date, d2: date, cids, type_sel: tuple, topn_cost: int = 0, include_dt: bool = False) -> pd.DataFrame:
     if not table_exists(_engine, "fact_keyword_daily"):
         return pd.DataFrame()
@@ -1187,6 +1193,7 @@ def query_keyword_bundle(_engine, d1: date, d2: date, cids, type_sel: tuple, top
     return _finalize_bundle_df(df, "campaign_type_label")
 
 @st.cache_data(ttl=43200, max_entries=10, show_spinner=False)
+@perf_timed("ad_bundle")
 def query_ad_bundle(_engine, d1: date, d2: date, cids: tuple, type_sel: tuple, topn_cost: int = 0, top_k: int = 50, include_dt: bool = False) -> pd.DataFrame:
     if not table_exists(_engine, "fact_ad_daily"):
         return pd.DataFrame()
@@ -1228,6 +1235,7 @@ def query_ad_bundle(_engine, d1: date, d2: date, cids: tuple, type_sel: tuple, t
     return _finalize_bundle_df(df, "campaign_type_label")
 
 @st.cache_data(ttl=43200, max_entries=10, show_spinner=False)
+@perf_timed("campaign_timeseries")
 def query_campaign_timeseries(_engine, d1: date, d2: date, cids: tuple, type_sel: tuple) -> pd.DataFrame:
     if not table_exists(_engine, "fact_campaign_daily"):
         return pd.DataFrame()
@@ -1285,6 +1293,7 @@ def ensure_overview_report_source_cache(_engine) -> None:
 
 
 @st.cache_data(ttl=3600, max_entries=200, show_spinner=False)
+@perf_timed("overview_report_source_cache")
 def query_overview_report_source_cache(_engine, source_kind: str, d1: date, d2: date, cids: tuple, type_sel: tuple, limit_n: int = 5) -> pd.DataFrame:
     safe_limit = _safe_limit(limit_n, 5, 50)
     try:
@@ -1327,6 +1336,7 @@ def query_overview_report_source_cache(_engine, source_kind: str, d1: date, d2:
     )
 
 @st.cache_data(ttl=43200, max_entries=10, show_spinner=False)
+@perf_timed("shopping_search_terms")
 def query_shopping_search_terms(_engine, d1: date, d2: date, cids: tuple) -> pd.DataFrame:
     if not table_exists(_engine, "fact_shopping_query_daily"):
         return pd.DataFrame()
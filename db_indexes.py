@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""db_indexes.py - (customer_id, dt) indexes for dashboard access patterns.
+
+The fact tables are keyed by (dt, customer_id, id). Dashboard bundles and the
+timeseries query filter by `customer_id IN (...)` + `dt BETWEEN`, so a
+(customer_id, dt) index turns those into bitmap range scans instead of Seq Scans.
+
+Metric columns are deliberately not INCLUDEd: the collector rewrites them every run,
+and an indexed metric rules out HOT updates and grows every upsert. On the seeded
+bench DB (explain_dashboard_queries --analyze) the bundles ran within noise of the
+metric-covering variant at ~40% of its index size, and on write-hot tables the
+visibility map is rarely all-visible for recent days anyway.
+
+Indexes are built only from the settings action or the advisor scripts, never from
+collector startup.
+"""
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+
+def _log(msg: str) -> None:
+    print(msg, flush=True)
+
+
+class IndexSpec:
+    def __init__(self, name: str, table: str, key_columns: List[str], include_columns: List[str] | None = None):
+        self.name = name
+        self.table = table
+        self.key_columns = list(key_columns)
+        self.include_columns = list(include_columns or [])
+
+
+DASHBOARD_INDEX_SPECS: List[IndexSpec] = [
+    # query_campaign_bundle / query_campaign_timeseries / get_entity_totals / 예산 집계
+    # INCLUDE 는 수집 시 바뀌지 않는 식별 컬럼만 둔다 (지표를 넣으면 HOT update 가 막힘)
+    IndexSpec("idx_fact_campaign_daily_cid_dt", "fact_campaign_daily", ["customer_id", "dt"], ["campaign_id"]),
+    # query_keyword_bundle / view_trend 일별 상세
+    IndexSpec("idx_fact_keyword_daily_cid_dt", "fact_keyword_daily", ["customer_id", "dt"], ["keyword_id"]),
+    # query_ad_bundle
+    IndexSpec("idx_fact_ad_daily_cid_dt", "fact_ad_daily", ["customer_id", "dt"], ["ad_id"]),
+    IndexSpec(
+        "idx_fact_shopping_query_daily_cid_dt",
+        "fact_shopping_query_daily",
+        ["customer_id", "dt"],
+        ["campaign_id", "adgroup_id", "query_text"],
+    ),
+    IndexSpec("idx_fact_campaign_device_daily_cid_dt", "fact_campaign_device_daily", ["customer_id", "dt"], ["campaign_id", "device_name"]),
+    IndexSpec("idx_fact_ad_device_daily_cid_dt", "fact_ad_device_daily", ["customer_id", "dt"], ["ad_id", "device_name"]),
+    IndexSpec("idx_fact_media_daily_cid_dt", "fact_media_daily", ["customer_id", "dt"]),
+    IndexSpec("idx_fact_bizmoney_daily_cid_dt", "fact_bizmoney_daily", ["customer_id", "dt"], ["bizmoney_balance"]),
+    IndexSpec("idx_fact_campaign_off_log_cid_dt", "fact_campaign_off_log", ["customer_id", "dt"], ["campaign_id", "off_time"]),
+    # 캠페인 유형 필터 → dim_campaign 조인
+    IndexSpec("idx_dim_campaign_tp", "dim_campaign", ["campaign_tp", "customer_id", "campaign_id"], ["campaign_name"]),
+    # 캠페인 드릴다운 (campaign_id → adgroup_id)
+    IndexSpec("idx_dim_adgroup_campaign", "dim_adgroup", ["customer_id", "campaign_id"], ["adgroup_id", "adgroup_name"]),
+    IndexSpec("idx_dim_keyword_adgroup", "dim_keyword", ["customer_id", "adgroup_id"], ["keyword_id"]),
+    IndexSpec("idx_dim_ad_adgroup", "dim_ad", ["customer_id", "adgroup_id"], ["ad_id"]),
+]
+
+
+def _load_table_columns(conn, tables: List[str]) -> Dict[str, List[str]]:
+    res = conn.execute(
+        text(
+            """
+            SELECT table_name, column_name
+            FROM information_schema.columns
+            WHERE table_schema = 'public' AND table_name = ANY(:tables)
+            ORDER BY table_name, ordinal_position
+            """
+        ),
+        {"tables": list(tables)},
+    )
+    out: Dict[str, List[str]] = {}
+    for table_name, column_name in res:
+        out.setdefault(str(table_name), []).append(str(column_name))
+    return out
+
+
+def _load_index_state(conn, names: List[str]) -> Dict[str, Tuple[bool, List[str]]]:
+    """name -> (indisvalid, key + INCLUDE columns in order) for existing indexes."""
+    res = conn.execute(
+        text(
+            """
+            SELECT c.relname, i.indisvalid, array_agg(a.attname ORDER BY k.ord)
+            FROM pg_class c
+            JOIN pg_index i ON i.indexrelid = c.oid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            CROSS JOIN LATERAL unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+            WHERE n.nspname = 'public' AND c.relname = ANY(:names)
+            GROUP BY c.relname, i.indisvalid
+            """
+        ),
+        {"names": list(names)},
+    )
+    return {str(name): (bool(valid), [str(c) for c in cols]) for name, valid, cols in res}
+
+
+def _spec_columns(spec: IndexSpec, table_columns: List[str]) -> List[str]:
+    cols = set(table_columns or [])
+    return list(spec.key_columns) + [c for c in spec.include_columns if c in cols and c not in spec.key_columns]
+
+
+def build_index_sql(spec: IndexSpec, table_columns: List[str], *, concurrently: bool = False) -> str | None:
+    """Return the CREATE INDEX statement for spec, or None when its key columns are missing.
+
+    INCLUDE columns that the table does not have (older schemas) are dropped so the
+    index still serves the range scan.
+    """
+    cols = set(table_columns or [])
+    if not cols or any(c not in cols for c in spec.key_columns):
+        return None
+    include = _spec_columns(spec, table_columns)[len(spec.key_columns):]
+    sql = f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS {spec.name} ON {spec.table} ({', '.join(spec.key_columns)})"
+    if include:
+        sql += f" INCLUDE ({', '.join(include)})"
+    return sql
+
+
+def ensure_dashboard_indexes(engine: Engine, *, concurrently: bool = False, specs: List[IndexSpec] | None = None) -> List[str]:
+    """Create any missing dashboard indexes. Returns names that were (re)built.
+
+    With concurrently=True the build does not block collector writes; an INVALID
+    index left behind by an interrupted concurrent build, or one whose columns differ
+    from its spec (e.g. the earlier metric-covering version), is dropped and rebuilt.
+    Failures are logged and skipped so schema setup never aborts on an index.
+    """
+    specs = list(specs or DASHBOARD_INDEX_SPECS)
+    created: List[str] = []
+    try:
+        with engine.connect() as conn:
+            table_columns = _load_table_columns(conn, sorted({s.table for s in specs}))
+            state = _load_index_state(conn, [s.name for s in specs])
+    except Exception as e:
+        _log(f"⚠️ 인덱스 메타 조회 실패 | {type(e).__name__}: {e}")
+        return created
+
+    for spec in specs:
+        existing = state.get(spec.name)
+        if existing is not None and existing[0] and existing[1] == _spec_columns(spec, table_columns.get(spec.table, [])):
+            continue
+        sql = build_index_sql(spec, table_columns.get(spec.table, []), concurrently=concurrently)
+        if not sql:
+            continue
+        try:
+            with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+                if existing is not None:
+                    conn.execute(text(f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS {spec.name}"))
+                conn.execute(text(sql))
+            created.append(spec.name)
+            _log(f"🗂️ 인덱스 생성 | {spec.name} ON {spec.table}")
+        except Exception as e:
+            _log(f"⚠️ 인덱스 생성 무시됨 | {spec.name} | {type(e).__name__}: {e}")
+    return created
+
+
+def collect_seq_scans(plan: dict) -> List[Tuple[str, float]]:
+    """Walk an EXPLAIN (FORMAT JSON) plan and return (relation, planned rows) for every Seq Scan."""
+    found: List[Tuple[str, float]] = []
+    stack = [plan.get("Plan", plan)]
+    while stack:
+        node = stack.pop()
+        if node.get("Node Type") == "Seq Scan":
+            found.append((str(node.get("Relation Name", "")), float(node.get("Plan Rows", 0) or 0)))
+        stack.extend(node.get("Plans", []) or [])
+    return found
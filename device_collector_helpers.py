@@ -5,6 +5,7 @@ import time
 from datetime import date
 from typing import Any, Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 import psycopg2.extras
 from sqlalchemy import text
@@ -111,52 +112,67 @@ def _nonempty_headers(row: pd.Series) -> List[str]:
     return [str(x) for x in row.fillna("").tolist() if str(x).strip()]
 
 
-def _score_header_row(row_vals: List[str]) -> int:
-    pk_score = 2 if any(x in row_vals for x in [_normalize_header(x) for x in AD_HEADER_CANDIDATES]) else 0
-    device_score = 2 if any(x in row_vals for x in [_normalize_header(x) for x in DEVICE_HEADER_CANDIDATES]) else 0
-    metric_hits = sum(1 for x in [_normalize_header(x) for x in IMP_HEADER_CANDIDATES + CLK_HEADER_CANDIDATES + COST_HEADER_CANDIDATES] if x in row_vals)
-    metric_score = min(metric_hits, 3)
-    return pk_score + device_score + metric_score
+def _normalized_cells(block: pd.DataFrame) -> np.ndarray:
+    """``_normalize_header(str(x))`` for every cell of ``block`` (NaN -> "")."""
+    if block.empty:
+        return np.empty((len(block), len(block.columns)), dtype=object)
+    return (
+        block.astype(object).fillna("").astype(str)
+        .apply(lambda col: col.str.lower().str.replace(r"[ _\-\"']", "", regex=True))
+        .to_numpy(dtype=object)
+    )
+
+
+def _score_header_rows(cells: np.ndarray) -> np.ndarray:
+    """Vectorized ``_score_header_row`` over a 2-D array of normalized cells."""
+    if cells.size == 0:
+        return np.zeros(cells.shape[0], dtype=int)
+    pk_score = np.isin(cells, [_normalize_header(x) for x in AD_HEADER_CANDIDATES]).any(axis=1) * 2
+    device_score = np.isin(cells, [_normalize_header(x) for x in DEVICE_HEADER_CANDIDATES]).any(axis=1) * 2
+    metric_hits = sum(
+        (cells == c).any(axis=1).astype(int)
+        for c in [_normalize_header(x) for x in IMP_HEADER_CANDIDATES + CLK_HEADER_CANDIDATES + COST_HEADER_CANDIDATES]
+    )
+    return pk_score + device_score + np.minimum(metric_hits, 3)
 
 
 def _detect_header_idx(df: pd.DataFrame) -> int:
-    best_idx = -1
-    best_score = -1
-    scan_limit = min(60, len(df))
-    for i in range(scan_limit):
-        row_vals = [_normalize_header(str(x)) for x in df.iloc[i].fillna("")]
-        score = _score_header_row(row_vals)
-        if score > best_score:
-            best_score = score
-            best_idx = i
-        if score >= 4:
-            return i
-    return best_idx if best_score >= 2 else -1
+    scores = _score_header_rows(_normalized_cells(df.head(min(60, len(df)))))
+    if scores.size == 0:
+        return -1
+    strong = np.flatnonzero(scores >= 4)
+    if strong.size:
+        return int(strong[0])
+    best_idx = int(np.argmax(scores))
+    return best_idx if scores[best_idx] >= 2 else -1
+
+
+def _device_names(values: pd.Series | np.ndarray) -> np.ndarray:
+    """``normalize_device_name`` per cell, evaluated once per distinct raw value."""
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object).ravel(), use_na_sentinel=False)
+    names = np.array([normalize_device_name(v) for v in uniques] or [""], dtype=object)
+    return names[codes].reshape(np.shape(values))
 
 
 def _infer_value_based_indices(df: pd.DataFrame) -> dict:
     if df is None or df.empty:
         return {}
-    sample = df.head(min(120, len(df))).copy()
+    sample = df.head(min(120, len(df))).astype(object).fillna("")
     ncols = len(sample.columns)
-    ad_idx = -1
-    ad_hits = -1
-    device_idx = -1
-    device_hits = -1
-    camp_idx = -1
-    camp_hits = -1
-
-    for idx in range(ncols):
-        col = sample.iloc[:, idx].fillna("")
-        a_hits = int(sum(1 for v in col if _looks_like_ad_id(v)))
-        d_hits = int(sum(1 for v in col if normalize_device_name(v)))
-        c_hits = int(sum(1 for v in col if _looks_like_campaign_id(v)))
-        if a_hits > ad_hits:
-            ad_hits, ad_idx = a_hits, idx
-        if d_hits > device_hits:
-            device_hits, device_idx = d_hits, idx
-        if c_hits > camp_hits:
-            camp_hits, camp_idx = c_hits, idx
+    ad_idx = ad_hits = device_idx = device_hits = camp_idx = camp_hits = -1
+
+    if ncols:
+        text_cells = sample.astype(str).apply(lambda col: col.str.strip().str.lower())
+        # np.argmax 는 동점이면 앞 컬럼을 고르므로 기존 컬럼 순회(strict >)와 같은 결과
+        ad_col_hits = text_cells.apply(lambda col: col.str.startswith("nad-")).sum(axis=0).to_numpy()
+        camp_col_hits = text_cells.apply(lambda col: col.str.startswith("cmp-")).sum(axis=0).to_numpy()
+        device_col_hits = (_device_names(sample.to_numpy(dtype=object)) != "").sum(axis=0)
+        ad_idx = int(np.argmax(ad_col_hits))
+        ad_hits = int(ad_col_hits[ad_idx])
+        device_idx = int(np.argmax(device_col_hits))
+        device_hits = int(device_col_hits[device_idx])
+        camp_idx = int(np.argmax(camp_col_hits))
+        camp_hits = int(camp_col_hits[camp_idx])
 
     metrics = {
         "imp_idx": DEFAULT_IMP_IDX if ncols > DEFAULT_IMP_IDX else -1,
@@ -185,6 +201,22 @@ def _infer_value_based_indices(df: pd.DataFrame) -> dict:
     }
 
 
+def _cell_text(col: pd.Series) -> pd.Series:
+    # 기존 iterrows 파서의 str(row.iloc[i]) 와 같게 비어 있는 셀은 "nan" 으로 본다.
+    return col.astype(object).where(col.notna(), "nan").astype(str)
+
+
+def _safe_float_series(col: pd.Series) -> pd.Series:
+    """Vectorized ``_safe_float``: thousands separators stripped, blank/'-'/garbage -> 0.0."""
+    cleaned = col.astype(object).where(col.notna(), "").astype(str).str.replace(",", "", regex=False).str.strip()
+    out = pd.to_numeric(cleaned, errors="coerce").astype(float)
+    leftover = out.isna() & ~cleaned.isin(["", "-"])
+    if leftover.any():
+        # float() 는 받지만 to_numeric 이 못 읽는 표기("1_000" 등)는 개별 변환으로 맞춘다.
+        out[leftover] = cleaned[leftover].map(_safe_float)
+    return out.fillna(0.0)
+
+
 def _ensure_column(engine: Engine, table: str, column: str, datatype: str):
     try:
         with engine.begin() as conn:
@@ -261,111 +293,85 @@ def build_ad_to_campaign_map(engine: Engine, customer_id: str) -> Dict[str, str]
         return {}
 
 
-def _fetch_existing_device_scope_pairs(engine: Engine, table: str, customer_id: str, d1: date, pk_name: str, ids: List[str]) -> List[Tuple[str, str]]:
-    ids = [str(x).strip() for x in (ids or []) if str(x).strip()]
-    if not ids:
-        return []
-    sql = text(
-        f"SELECT {pk_name}::text AS scope_id, COALESCE(device_name::text, '') AS device_name "
-        f"FROM {table} WHERE customer_id=:cid AND dt=:dt AND {pk_name} = ANY(:ids)"
-    )
-    with engine.connect() as conn:
-        rows = conn.execute(sql, {"cid": str(customer_id), "dt": d1, "ids": ids}).fetchall()
-    seen = set()
-    out: List[Tuple[str, str]] = []
-    for row in rows or []:
-        scope_id = str((row[0] if row else '') or '').strip()
-        device_name = str((row[1] if row else '') or '').strip()
-        key = (scope_id, device_name)
-        if scope_id and key not in seen:
-            seen.add(key)
-            out.append(key)
-    return out
-
-
-def _clear_stale_device_scope_pairs(engine: Engine, table: str, customer_id: str, d1: date, pk_name: str, pairs: List[Tuple[str, str]]):
-    stale_pairs = [(str(pk).strip(), str(device).strip()) for pk, device in (pairs or []) if str(pk).strip() and str(device).strip()]
-    if not stale_pairs:
-        return
-    ids = [pk for pk, _ in stale_pairs]
-    devices = [device for _, device in stale_pairs]
-    sql = text(
-        f"DELETE FROM {table} t USING (SELECT * FROM unnest(:ids, :devices)) AS s(scope_id, device_name) "
-        f"WHERE t.customer_id=:cid AND t.dt=:dt AND t.{pk_name}::text = s.scope_id::text AND COALESCE(t.device_name::text, '') = s.device_name::text"
-    )
-    for _ in range(3):
-        try:
-            with engine.begin() as conn:
-                conn.execute(sql, {"cid": str(customer_id), "dt": d1, "ids": ids, "devices": devices})
-            return
-        except Exception:
-            time.sleep(2)
-
+def _device_merge_sql(table: str, stage: str, pk_name: str, cols: List[str]) -> str:
+    """One statement: drop vanished (id, device) keys, insert new keys, update only changed rows.
 
-def replace_device_fact_range(engine: Engine, table: str, rows: List[Dict[str, Any]], customer_id: str, d1: date, pk_name: str):
+    Vanished keys are limited to ids present in this batch, as before; rows with an empty
+    device_name are never deleted.
+    """
     pk_cols = ["dt", "customer_id", pk_name, "device_name"]
-    scope_ids = []
-    seen = set()
-    for row in rows or []:
-        value = str((row or {}).get(pk_name) or '').strip()
-        if value and value not in seen:
-            seen.add(value)
-            scope_ids.append(value)
-
-    if not scope_ids:
-        if not rows:
-            for _ in range(3):
-                try:
-                    with engine.begin() as conn:
-                        conn.execute(text(f"DELETE FROM {table} WHERE customer_id=:cid AND dt=:dt"), {"cid": str(customer_id), "dt": d1})
-                    break
-                except Exception:
-                    time.sleep(2)
-            return
-    else:
-        if not rows:
-            for _ in range(3):
-                try:
-                    with engine.begin() as conn:
-                        conn.execute(
-                            text(f"DELETE FROM {table} WHERE customer_id=:cid AND dt=:dt AND {pk_name} = ANY(:ids)"),
-                            {"cid": str(customer_id), "dt": d1, "ids": scope_ids},
-                        )
-                    break
-                except Exception:
-                    time.sleep(2)
-            return
-
-        current_pairs = {(str((row or {}).get(pk_name) or '').strip(), str((row or {}).get('device_name') or '').strip()) for row in rows or []}
-        current_pairs = {pair for pair in current_pairs if pair[0] and pair[1]}
-        existing_pairs = _fetch_existing_device_scope_pairs(engine, table, customer_id, d1, pk_name, scope_ids)
-        stale_pairs = [pair for pair in existing_pairs if pair not in current_pairs]
-        if stale_pairs:
-            _clear_stale_device_scope_pairs(engine, table, customer_id, d1, pk_name, stale_pairs)
-
-    if not rows:
-        return
-
-    df = pd.DataFrame(rows).drop_duplicates(subset=pk_cols, keep="last").sort_values(by=pk_cols).astype(object).where(pd.notnull, None)
-    cols = list(df.columns)
     update_cols = [c for c in cols if c not in pk_cols]
     col_names = ", ".join([f'"{c}"' for c in cols])
     pk_str = ", ".join([f'"{c}"' for c in pk_cols])
-    conflict_clause = (
-        f"ON CONFLICT ({pk_str}) DO UPDATE SET " + ", ".join([f'"{c}"=EXCLUDED."{c}"' for c in update_cols])
-        if update_cols else
-        f"ON CONFLICT ({pk_str}) DO NOTHING"
+    if update_cols:
+        conflict_clause = (
+            f"ON CONFLICT ({pk_str}) DO UPDATE SET " + ", ".join([f'"{c}"=EXCLUDED."{c}"' for c in update_cols])
+            + " WHERE (" + ", ".join([f't."{c}"' for c in update_cols]) + ") IS DISTINCT FROM ("
+            + ", ".join([f'EXCLUDED."{c}"' for c in update_cols]) + ")"
+        )
+    else:
+        conflict_clause = f"ON CONFLICT ({pk_str}) DO NOTHING"
+    return f"""
+    WITH deleted AS (
+        DELETE FROM {table} d
+        WHERE d.customer_id = %(cid)s AND d.dt = %(dt)s
+          AND d.{pk_name}::text IN (SELECT DISTINCT s.{pk_name}::text FROM {stage} s WHERE COALESCE(s.{pk_name}::text, '') <> '')
+          AND COALESCE(d.device_name::text, '') <> ''
+          AND NOT EXISTS (
+              SELECT 1 FROM {stage} s
+              WHERE s.{pk_name}::text = d.{pk_name}::text AND s.device_name::text = d.device_name::text
+          )
+        RETURNING 1
+    ), written AS (
+        INSERT INTO {table} AS t ({col_names})
+        SELECT {col_names} FROM {stage}
+        {conflict_clause}
+        RETURNING 1
     )
-    sql = f"INSERT INTO {table} ({col_names}) VALUES %s {conflict_clause}"
-    tuples = list(df.itertuples(index=False, name=None))
+    SELECT (SELECT COUNT(*) FROM deleted), (SELECT COUNT(*) FROM written)
+    """
+
+
+def replace_device_fact_ranges(engine: Engine, customer_id: str, d1: date, batches: List[Tuple[str, str, List[Dict[str, Any]]]]) -> Dict[str, Dict[str, int]]:
+    """Sync one customer/date of several device fact tables in one transaction.
+
+    ``batches`` is ``[(table, pk_name, rows), ...]``. Rows are staged in per-table temp
+    tables and merged in one statement each, so unchanged rows are not rewritten on the
+    daily reruns. The staging tables are created once per DB session and emptied on
+    commit. Returns staged/written/deleted counts per table.
+    """
+    out = {table: {"staged": 0, "written": 0, "deleted": 0} for table, _, _ in batches}
+    plans = []
+    for table, pk_name, rows in batches:
+        if not rows:
+            plans.append((table, None, None, None, None))
+            continue
+        pk_cols = ["dt", "customer_id", pk_name, "device_name"]
+        df = pd.DataFrame(rows).drop_duplicates(subset=pk_cols, keep="last").sort_values(by=pk_cols).astype(object).where(pd.notnull, None)
+        cols = list(df.columns)
+        stage = f"_stage_{table}"
+        tuples = list(df.itertuples(index=False, name=None))
+        plans.append((table, stage, ", ".join([f'"{c}"' for c in cols]), _device_merge_sql(table, stage, pk_name, cols), tuples))
+    params = {"cid": str(customer_id), "dt": d1}
 
     for _ in range(3):
         raw_conn, cur = None, None
         try:
             raw_conn = engine.raw_connection()
             cur = raw_conn.cursor()
-            psycopg2.extras.execute_values(cur, sql, tuples, page_size=5000)
+            counts = {}
+            for table, stage, col_names, merge_sql, tuples in plans:
+                if not tuples:
+                    cur.execute(f"DELETE FROM {table} WHERE customer_id=%(cid)s AND dt=%(dt)s", params)
+                    counts[table] = {"staged": 0, "written": 0, "deleted": int(cur.rowcount or 0)}
+                    continue
+                cur.execute(f"CREATE TEMP TABLE IF NOT EXISTS {stage} ON COMMIT DELETE ROWS AS SELECT {col_names} FROM {table} WITH NO DATA")
+                psycopg2.extras.execute_values(cur, f"INSERT INTO {stage} ({col_names}) VALUES %s", tuples, page_size=5000)
+                cur.execute(merge_sql, params)
+                deleted, written = cur.fetchone()
+                counts[table] = {"staged": len(tuples), "written": int(written or 0), "deleted": int(deleted or 0)}
             raw_conn.commit()
+            out.update(counts)
             break
         except Exception:
             if raw_conn:
@@ -385,6 +391,13 @@ def replace_device_fact_range(engine: Engine, table: str, rows: List[Dict[str, A
                     raw_conn.close()
                 except Exception:
                     pass
+    return out
+
+
+def replace_device_fact_range(engine: Engine, table: str, rows: List[Dict[str, Any]], customer_id: str, d1: date, pk_name: str) -> Dict[str, int]:
+    """Single-table form of ``replace_device_fact_ranges``."""
+    return replace_device_fact_ranges(engine, customer_id, d1, [(table, pk_name, rows)])[table]
+
 
 def parse_ad_device_report(
     df: pd.DataFrame,
@@ -448,86 +461,84 @@ def parse_ad_device_report(
             "infer_device_hits": inferred.get("device_hits"),
         }
 
-    ad_stats: Dict[Tuple[str, str], dict] = {}
-    scan_rows = 0
-    reject_short = 0
-    reject_empty_ad = 0
-    reject_empty_device = 0
-    reject_zero_metrics = 0
-    preview_rows = []
     max_idx = max([x for x in [ad_idx, device_idx, camp_idx, imp_idx, clk_idx, cost_idx, conv_idx, sales_idx, rank_idx] if x != -1], default=0)
-
-    for row_no, (_, row) in enumerate(data_df.iterrows(), start=1):
-        scan_rows += 1
-        if len(row) <= max_idx:
-            reject_short += 1
-            continue
-        raw_ad_id = row.iloc[ad_idx] if ad_idx != -1 and len(row) > ad_idx else ""
-        raw_device = row.iloc[device_idx] if device_idx != -1 and len(row) > device_idx else ""
-        ad_id = str(raw_ad_id).strip()
-        if not _looks_like_ad_id(ad_id):
-            reject_empty_ad += 1
-            if len(preview_rows) < 3 and (str(raw_ad_id).strip() or str(raw_device).strip()):
-                preview_rows.append({
-                    "row_no": row_no,
-                    "raw_ad": str(raw_ad_id),
-                    "raw_device": str(raw_device),
-                    "reason": "empty_ad",
-                })
-            continue
-        device_name = normalize_device_name(raw_device)
-        if not device_name:
-            reject_empty_device += 1
-            if len(preview_rows) < 3:
-                preview_rows.append({
-                    "row_no": row_no,
-                    "raw_ad": str(raw_ad_id),
-                    "raw_device": str(raw_device),
-                    "reason": "empty_device",
-                })
-            continue
-
-        imp = int(_safe_float(row.iloc[imp_idx])) if imp_idx != -1 and len(row) > imp_idx else 0
-        clk = int(_safe_float(row.iloc[clk_idx])) if clk_idx != -1 and len(row) > clk_idx else 0
-        cost = int(_safe_float(row.iloc[cost_idx])) if cost_idx != -1 and len(row) > cost_idx else 0
-        conv = _safe_float(row.iloc[conv_idx]) if conv_idx != -1 and len(row) > conv_idx else 0.0
-        sales = int(_safe_float(row.iloc[sales_idx])) if sales_idx != -1 and len(row) > sales_idx else 0
-        if imp == 0 and clk == 0 and cost == 0 and conv == 0 and sales == 0:
-            reject_zero_metrics += 1
-            if len(preview_rows) < 3:
-                preview_rows.append({
-                    "row_no": row_no,
-                    "raw_ad": str(raw_ad_id),
-                    "raw_device": str(raw_device),
-                    "device_name": device_name,
-                    "reason": "zero_metrics",
-                })
-            continue
-
-        key = (ad_id, device_name)
-        bucket = ad_stats.setdefault(key, {
-            "campaign_id": "",
-            "imp": 0,
-            "clk": 0,
-            "cost": 0,
-            "conv": 0.0,
-            "sales": 0,
-            "rank_sum": 0.0,
-            "rank_cnt": 0,
-        })
-        campaign_id = str(row.iloc[camp_idx]).strip() if camp_idx != -1 and len(row) > camp_idx else ""
-        bucket["campaign_id"] = bucket.get("campaign_id") or campaign_id or ad_to_campaign.get(ad_id, "")
-        bucket["imp"] += imp
-        bucket["clk"] += clk
-        bucket["cost"] += cost
-        bucket["conv"] += conv
-        bucket["sales"] += sales
-
-        if rank_idx != -1 and len(row) > rank_idx:
-            rnk = _safe_float(row.iloc[rank_idx])
-            if rnk > 0 and imp > 0:
-                bucket["rank_sum"] += (rnk * imp)
-                bucket["rank_cnt"] += imp
+    scan_rows = len(data_df)
+    reject_short = scan_rows if len(data_df.columns) <= max_idx else 0
+    frame = data_df if not reject_short else data_df.iloc[0:0]
+
+    def _col(idx: int) -> pd.Series:
+        return frame.iloc[:, idx] if idx != -1 else pd.Series("", index=frame.index, dtype=object)
+
+    raw_ad = _cell_text(_col(ad_idx))
+    raw_device = _cell_text(_col(device_idx))
+    ad_ids = raw_ad.str.strip()
+    ad_ok = ad_ids.str.lower().str.startswith("nad-").to_numpy(dtype=bool)
+    device_names = pd.Series(_device_names(_col(device_idx).to_numpy(dtype=object)), index=frame.index, dtype=object)
+    device_ok = (device_names != "").to_numpy(dtype=bool)
+
+    def _metric(idx: int) -> pd.Series:
+        return _safe_float_series(frame.iloc[:, idx]) if idx != -1 else pd.Series(0.0, index=frame.index)
+
+    metrics = pd.DataFrame({
+        # int(float) 와 같게 0 방향으로 버림
+        "imp": _metric(imp_idx).astype("int64"),
+        "clk": _metric(clk_idx).astype("int64"),
+        "cost": _metric(cost_idx).astype("int64"),
+        "conv": _metric(conv_idx),
+        "sales": _metric(sales_idx).astype("int64"),
+    })
+    nonzero = metrics.ne(0).any(axis=1).to_numpy(dtype=bool)
+
+    reasons = np.select(
+        [~ad_ok, ~device_ok, ~nonzero],
+        ["empty_ad", "empty_device", "zero_metrics"],
+        default="",
+    )
+    reject_empty_ad = int((reasons == "empty_ad").sum())
+    reject_empty_device = int((reasons == "empty_device").sum())
+    reject_zero_metrics = int((reasons == "zero_metrics").sum())
+    previewable = (reasons != "") & ((reasons != "empty_ad") | (raw_ad.str.strip() != "").to_numpy() | (raw_device.str.strip() != "").to_numpy())
+    preview_rows = []
+    for pos in np.flatnonzero(previewable)[:3]:
+        item = {"row_no": int(pos) + 1, "raw_ad": raw_ad.iat[pos], "raw_device": raw_device.iat[pos]}
+        if reasons[pos] == "zero_metrics":
+            item["device_name"] = device_names.iat[pos]
+        item["reason"] = str(reasons[pos])
+        preview_rows.append(item)
+
+    kept = reasons == ""
+    ad_stats: Dict[Tuple[str, str], dict] = {}
+    if kept.any():
+        rows = metrics[kept].copy()
+        rows["ad_id"] = ad_ids[kept]
+        rows["device_name"] = device_names[kept]
+        # 행의 캠페인ID가 비면 ad_to_campaign 값을 쓰고, (소재, 기기)별 처음 채워진 값을 유지
+        row_campaign = _cell_text(_col(camp_idx)[kept]).str.strip() if camp_idx != -1 else pd.Series("", index=rows.index, dtype=object)
+        mapped_campaign = rows["ad_id"].map(lambda x: ad_to_campaign.get(x, ""))
+        rows["campaign_id"] = row_campaign.where(row_campaign != "", mapped_campaign).replace("", np.nan)
+        if rank_idx != -1:
+            rnk = _safe_float_series(_col(rank_idx)[kept])
+            ranked = (rnk > 0) & (rows["imp"] > 0)
+            rows["rank_sum"] = (rnk * rows["imp"]).where(ranked, 0.0)
+            rows["rank_cnt"] = rows["imp"].where(ranked, 0)
+        else:
+            rows["rank_sum"] = 0.0
+            rows["rank_cnt"] = 0
+
+        grouped = rows.groupby(["ad_id", "device_name"], sort=False)
+        agg = grouped[["imp", "clk", "cost", "conv", "sales", "rank_sum", "rank_cnt"]].sum()
+        agg.insert(0, "campaign_id", grouped["campaign_id"].first().fillna(""))
+        for key, rec in zip(agg.index.tolist(), agg.to_dict("records")):
+            ad_stats[key] = {
+                "campaign_id": rec["campaign_id"],
+                "imp": int(rec["imp"]),
+                "clk": int(rec["clk"]),
+                "cost": int(rec["cost"]),
+                "conv": float(rec["conv"]),
+                "sales": int(rec["sales"]),
+                "rank_sum": float(rec["rank_sum"]),
+                "rank_cnt": int(rec["rank_cnt"]),
+            }
 
     if not ad_stats:
         return {}, {}, {
@@ -555,30 +566,25 @@ def parse_ad_device_report(
             "infer_camp_hits": inferred.get("camp_hits"),
         }
 
+    ad_frame = agg.reset_index()
+    ad_frame["campaign_id"] = ad_frame["campaign_id"].astype(str).str.strip()
+    missing_campaign_count = int((ad_frame["campaign_id"] == "").sum())
+    camp_agg = (
+        ad_frame[ad_frame["campaign_id"] != ""]
+        .groupby(["campaign_id", "device_name"], sort=False)[["imp", "clk", "cost", "conv", "sales", "rank_sum", "rank_cnt"]]
+        .sum()
+    )
     campaign_stats: Dict[Tuple[str, str], dict] = {}
-    missing_campaign_count = 0
-    for (ad_id, device_name), bucket in ad_stats.items():
-        campaign_id = str(bucket.get("campaign_id") or ad_to_campaign.get(ad_id, "")).strip()
-        if not campaign_id:
-            missing_campaign_count += 1
-            continue
-        key = (campaign_id, device_name)
-        cb = campaign_stats.setdefault(key, {
-            "imp": 0,
-            "clk": 0,
-            "cost": 0,
-            "conv": 0.0,
-            "sales": 0,
-            "rank_sum": 0.0,
-            "rank_cnt": 0,
-        })
-        cb["imp"] += int(bucket.get("imp", 0) or 0)
-        cb["clk"] += int(bucket.get("clk", 0) or 0)
-        cb["cost"] += int(bucket.get("cost", 0) or 0)
-        cb["conv"] += float(bucket.get("conv", 0.0) or 0.0)
-        cb["sales"] += int(bucket.get("sales", 0) or 0)
-        cb["rank_sum"] += float(bucket.get("rank_sum", 0.0) or 0.0)
-        cb["rank_cnt"] += int(bucket.get("rank_cnt", 0) or 0)
+    for key, rec in zip(camp_agg.index.tolist(), camp_agg.to_dict("records")):
+        campaign_stats[key] = {
+            "imp": int(rec["imp"]),
+            "clk": int(rec["clk"]),
+            "cost": int(rec["cost"]),
+            "conv": float(rec["conv"]),
+            "sales": int(rec["sales"]),
+            "rank_sum": float(rec["rank_sum"]),
+            "rank_cnt": int(rec["rank_cnt"]),
+        }
 
     return ad_stats, campaign_stats, {
         "status": "ok",
@@ -590,19 +596,14 @@ def parse_ad_device_report(
     }
 
 
-def save_device_stats(
-    engine: Engine,
+def _device_fact_rows(
     customer_id: str,
     target_date: date,
-    table_name: str,
     pk_name: str,
     stat_res: Dict[Tuple[str, str], dict],
-    data_source: str = "report_device_total_only",
-    source_report: str = "AD",
-) -> int:
-    if not stat_res:
-        return 0
-
+    data_source: str,
+    source_report: str,
+) -> List[Dict[str, Any]]:
     rows = []
     for (entity_id, device_name), s in stat_res.items():
         if not entity_id or not device_name:
@@ -626,9 +627,31 @@ def save_device_stats(
             "data_source": data_source,
             "source_report": source_report,
         })
+    return rows
+
 
-    replace_device_fact_range(engine, table_name, rows, customer_id, target_date, pk_name)
-    return len(rows)
+def save_device_stats(
+    engine: Engine,
+    customer_id: str,
+    target_date: date,
+    device_stats: List[Tuple[str, str, Dict[Tuple[str, str], dict]]],
+    data_source: str = "report_device_total_only",
+    source_report: str = "AD",
+) -> Dict[str, Dict[str, int]]:
+    """Save ``[(table_name, pk_name, stat_res), ...]`` in one transaction.
+
+    Tables with an empty ``stat_res`` are left untouched. Returns staged/written/deleted
+    counts per table (zeros for skipped tables).
+    """
+    batches = [
+        (table_name, pk_name, _device_fact_rows(customer_id, target_date, pk_name, stat_res, data_source, source_report))
+        for table_name, pk_name, stat_res in device_stats
+        if stat_res
+    ]
+    out = {table_name: {"staged": 0, "written": 0, "deleted": 0} for table_name, _, _ in device_stats}
+    if batches:
+        out.update(replace_device_fact_ranges(engine, customer_id, target_date, batches))
+    return out
 
 
 def summarize_stat_res(stat_res: Dict[Tuple[str, str], dict]) -> dict:
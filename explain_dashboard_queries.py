@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+대시보드 쿼리 EXPLAIN 점검 스크립트.
+
+data.query_*_bundle / query_campaign_timeseries / view_trend 일별 상세가 실제로 만드는
+SQL을 그대로 가로채서 EXPLAIN (FORMAT JSON)을 돌리고, 플랜에 남은 Seq Scan을 보고합니다.
+
+예시:
+  python explain_dashboard_queries.py --database-url postgresql://localhost/da_ads_local --seed --drop-indexes
+  python explain_dashboard_queries.py --database-url postgresql://localhost/da_ads_local --ensure-indexes --fail-on-seq-scan
+
+--seed 는 합성 계정/캠페인/키워드/소재 데이터를 넣습니다. 운영 DB에는 쓰지 마세요.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sys
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+from db_indexes import DASHBOARD_INDEX_SPECS, collect_seq_scans, ensure_dashboard_indexes
+
+SEED_CUSTOMER_BASE = 9100000
+SEED_CAMPAIGN_TYPES = ["WEB_SITE", "SHOPPING", "POWER_CONTENTS", "BRAND_SEARCH"]
+
+
+def die(msg: str, code: int = 1) -> None:
+    print(f"❌ {msg}", file=sys.stderr)
+    raise SystemExit(code)
+
+
+def make_engine(db_url: str) -> Engine:
+    if db_url.startswith("postgres://"):
+        db_url = db_url.replace("postgres://", "postgresql+psycopg2://", 1)
+    elif db_url.startswith("postgresql://"):
+        db_url = db_url.replace("postgresql://", "postgresql+psycopg2://", 1)
+    return create_engine(db_url, poolclass=NullPool, future=True)
+
+
+def seed_synthetic_data(
+    engine: Engine,
+    *,
+    accounts: int,
+    campaigns: int,
+    adgroups: int,
+    keywords: int,
+    ads: int,
+    days: int,
+    end_dt: date,
+    first_account: int = 1,
+    active_pct: int = 100,
+    analyze: bool = True,
+) -> None:
+    """Insert a deterministic synthetic SA dataset (ON CONFLICT DO NOTHING, safe to re-run).
+
+    ``first_account`` lets callers seed large volumes in account chunks, and
+    ``active_pct`` keeps only that share of keyword/ad days so fact density looks
+    like a real account instead of every entity spending every day.
+    """
+    from collector_db import ensure_tables
+
+    ensure_tables(engine)
+    start_dt = end_dt - timedelta(days=max(1, days) - 1)
+    params = {
+        "base": SEED_CUSTOMER_BASE,
+        "a1": int(first_account),
+        "a2": int(first_account) + max(1, int(accounts)) - 1,
+        "active_pct": max(1, min(100, int(active_pct))),
+        "campaigns": int(campaigns),
+        "adgroups": int(adgroups),
+        "keywords": int(keywords),
+        "ads": int(ads),
+        "types": SEED_CAMPAIGN_TYPES,
+        "d1": start_dt,
+        "d2": end_dt,
+    }
+    stmts = [
+        """
+        INSERT INTO dim_account (customer_id, account_name)
+        SELECT (:base + a)::text, 'seed_account_' || a
+        FROM generate_series(:a1, :a2) a
+        ON CONFLICT DO NOTHING
+        """,
+        """
+        INSERT INTO dim_campaign (customer_id, campaign_id, campaign_name, campaign_tp, status)
+        SELECT (:base + a)::text, 'cmp-' || a || '-' || c, 'seed_campaign_' || c,
+               (CAST(:types AS TEXT[]))[1 + (c % cardinality(CAST(:types AS TEXT[])))], 'ELIGIBLE'
+        FROM generate_series(:a1, :a2) a, generate_series(1, :campaigns) c
+        ON CONFLICT DO NOTHING
+        """,
+        """
+        INSERT INTO dim_adgroup (customer_id, adgroup_id, adgroup_name, campaign_id, status)
+        SELECT (:base + a)::text, 'grp-' || a || '-' || c || '-' || g, 'seed_adgroup_' || c || '_' || g, 'cmp-' || a || '-' || c, 'ELIGIBLE'
+        FROM generate_series(:a1, :a2) a, generate_series(1, :campaigns) c, generate_series(1, :adgroups) g
+        ON CONFLICT DO NOTHING
+        """,
+        """
+        INSERT INTO dim_keyword (customer_id, keyword_id, adgroup_id, keyword, status)
+        SELECT (:base + a)::text, 'kwd-' || a || '-' || c || '-' || g || '-' || k, 'grp-' || a || '-' || c || '-' || g, 'seed keyword ' || c || '-' || g || '-' || k, 'ELIGIBLE'
+        FROM generate_series(:a1, :a2) a, generate_series(1, :campaigns) c, generate_series(1, :adgroups) g, generate_series(1, :keywords) k
+        ON CONFLICT DO NOTHING
+        """,
+        """
+        INSERT INTO dim_ad (customer_id, ad_id, adgroup_id, ad_name, status, ad_title)
+        SELECT (:base + a)::text, 'nad-' || a || '-' || c || '-' || g || '-' || n, 'grp-' || a || '-' || c || '-' || g, 'seed_ad_' || n, 'ELIGIBLE', 'seed title ' || n
+        FROM generate_series(:a1, :a2) a, generate_series(1, :campaigns) c, generate_series(1, :adgroups) g, generate_series(1, :ads) n
+        ON CONFLICT DO NOTHING
+        """,
+    ]
+    metric_select = """
+        (abs(hashtext(e.id || d::text)) % 5000)::bigint AS imp,
+        (abs(hashtext(d::text || e.id)) % 200)::bigint AS clk,
+        (abs(hashtext(e.id || d::text || 'c')) % 100000)::bigint AS cost,
+        (abs(hashtext(e.id || d::text || 'v')) % 10)::double precision AS conv,
+        (abs(hashtext(e.id || d::text || 's')) % 500000)::bigint AS sales
+    """
+    for table, id_col, dim_table, sparse in [
+        ("fact_campaign_daily", "campaign_id", "dim_campaign", False),
+        ("fact_keyword_daily", "keyword_id", "dim_keyword", True),
+        ("fact_ad_daily", "ad_id", "dim_ad", True),
+    ]:
+        active_sql = "WHERE abs(hashtext(e.id || d::text || 'a')) % 100 < :active_pct" if sparse else ""
+        stmts.append(
+            f"""
+            INSERT INTO {table} (dt, customer_id, {id_col}, imp, clk, cost, conv, sales)
+            SELECT d::date, e.customer_id, e.id, {metric_select}
+            FROM (SELECT customer_id, {id_col} AS id FROM {dim_table} WHERE customer_id IN (SELECT (:base + a)::text FROM generate_series(:a1, :a2) a)) e,
+                 generate_series(CAST(:d1 AS DATE), CAST(:d2 AS DATE), interval '1 day') d
+            {active_sql}
+            ON CONFLICT DO NOTHING
+            """
+        )
+    with engine.begin() as conn:
+        for stmt in stmts:
+            conn.execute(text(stmt), params)
+    if analyze:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for table in ["dim_campaign", "dim_adgroup", "dim_keyword", "dim_ad", "fact_campaign_daily", "fact_keyword_daily", "fact_ad_daily"]:
+                conn.execute(text(f"VACUUM ANALYZE {table}"))
+    print(f"🌱 seed 완료 | accounts={params['a1']}~{params['a2']} campaigns={campaigns} adgroups={adgroups} keywords={keywords} ads={ads} | {start_dt}~{end_dt}")
+
+
+def drop_dashboard_indexes(engine: Engine) -> None:
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for spec in DASHBOARD_INDEX_SPECS:
+            conn.execute(text(f"DROP INDEX IF EXISTS {spec.name}"))
+
+
+def _resolve_scope(engine: Engine, args) -> tuple[date, date, tuple]:
+    with engine.connect() as conn:
+        max_dt = conn.execute(text("SELECT MAX(dt) FROM fact_campaign_daily")).scalar()
+        cids = args.cids
+        if not cids:
+            rows = conn.execute(
+                text("SELECT DISTINCT customer_id FROM fact_campaign_daily WHERE dt = :dt ORDER BY customer_id LIMIT :n"),
+                {"dt": max_dt, "n": int(args.cid_count)},
+            )
+            cids = [str(r[0]) for r in rows]
+    if max_dt is None:
+        die("fact_campaign_daily가 비어 있습니다. --seed 로 데이터를 먼저 넣어주세요.")
+    d2 = max_dt
+    d1 = d2 - timedelta(days=max(1, int(args.range_days)) - 1)
+    return d1, d2, tuple(str(c) for c in cids)
+
+
+def capture_dashboard_queries(engine: Engine, d1: date, d2: date, cids: tuple) -> list[tuple[str, str, dict]]:
+    """Run the dashboard query builders with sql_read swapped for a recorder."""
+    import pandas as pd
+    import data
+    import view_trend
+
+    for logger_name in list(logging.root.manager.loggerDict):
+        if logger_name.startswith("streamlit"):
+            logging.getLogger(logger_name).setLevel(logging.ERROR)
+
+    captured: list[tuple[str, str, dict]] = []
+    label = {"name": ""}
+
+    def _recording_sql_read(_engine, query: str, params: dict = None) -> pd.DataFrame:
+        captured.append((label["name"], query, dict(params or {})))
+        return pd.DataFrame()
+
+    scenarios = [
+        ("campaign_bundle", lambda: data.query_campaign_bundle.__wrapped__(engine, d1, d2, cids, tuple(), 0)),
+        ("campaign_bundle[type]", lambda: data.query_campaign_bundle.__wrapped__(engine, d1, d2, cids, ("파워링크",), 0)),
+        ("keyword_bundle", lambda: data.query_keyword_bundle.__wrapped__(engine, d1, d2, cids, tuple(), 0)),
+        ("keyword_bundle[dt]", lambda: data.query_keyword_bundle.__wrapped__(engine, d1, d2, cids, tuple(), 0, True)),
+        ("ad_bundle", lambda: data.query_ad_bundle.__wrapped__(engine, d1, d2, cids, tuple(), 0)),
+        ("campaign_timeseries", lambda: data.query_campaign_timeseries.__wrapped__(engine, d1, d2, cids, tuple())),
+        ("campaign_timeseries[type]", lambda: data.query_campaign_timeseries.__wrapped__(engine, d1, d2, cids, ("파워링크",))),
+        ("campaign_totals[type]", lambda: data.get_entity_totals.__wrapped__(engine, "campaign", d1, d2, cids, ("파워링크",))),
+        ("trend_internal_daily_detail", lambda: view_trend.get_internal_daily_detail(engine, d1, d2, cids)),
+    ]
+
+    orig_data_read, orig_trend_read = data.sql_read, view_trend.sql_read
+    data.sql_read = _recording_sql_read
+    view_trend.sql_read = _recording_sql_read
+    try:
+        for name, fn in scenarios:
+            label["name"] = name
+            try:
+                fn()
+            except Exception as e:
+                print(f"⚠️ {name} 쿼리 생성 실패 | {type(e).__name__}: {e}")
+    finally:
+        data.sql_read = orig_data_read
+        view_trend.sql_read = orig_trend_read
+    return captured
+
+
+def explain_query(engine: Engine, query: str, params: dict, *, analyze: bool) -> dict:
+    opts = "ANALYZE, BUFFERS, FORMAT JSON" if analyze else "FORMAT JSON"
+    with engine.connect() as conn:
+        raw = conn.execute(text(f"EXPLAIN ({opts}) {query}"), params).scalar()
+    doc = raw if isinstance(raw, list) else json.loads(raw)
+    return doc[0]
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="대시보드 쿼리 EXPLAIN + Seq Scan 리포트")
+    ap.add_argument("--database-url", default=os.getenv("DATABASE_URL", ""), help="기본값: DATABASE_URL 환경변수")
+    ap.add_argument("--seed", action="store_true", help="합성 데이터 적재 (로컬 DB 전용)")
+    ap.add_argument("--seed-accounts", type=int, default=20)
+    ap.add_argument("--seed-campaigns", type=int, default=10)
+    ap.add_argument("--seed-adgroups", type=int, default=4)
+    ap.add_argument("--seed-keywords", type=int, default=8)
+    ap.add_argument("--seed-ads", type=int, default=3)
+    ap.add_argument("--seed-days", type=int, default=120)
+    ap.add_argument("--drop-indexes", action="store_true", help="db_indexes 인덱스를 지우고 점검 (before 측정)")
+    ap.add_argument("--ensure-indexes", action="store_true", help="db_indexes 인덱스를 만든 뒤 점검 (after 측정)")
+    ap.add_argument("--cids", nargs="*", default=None, help="필터할 customer_id (기본: 최신일 기준 상위 --cid-count 개)")
+    ap.add_argument("--cid-count", type=int, default=3)
+    ap.add_argument("--range-days", type=int, default=30)
+    ap.add_argument("--analyze", action="store_true", help="EXPLAIN ANALYZE 로 실제 실행 시간까지 측정")
+    ap.add_argument("--fail-on-seq-scan", action="store_true", help="fact_* 테이블 Seq Scan 이 있으면 exit 1")
+    ap.add_argument("--json", dest="json_out", default="", help="결과를 JSON 파일로 저장")
+    args = ap.parse_args()
+
+    if not args.database_url:
+        die("DATABASE_URL 또는 --database-url 이 필요합니다.")
+    engine = make_engine(args.database_url)
+
+    if args.seed:
+        seed_synthetic_data(
+            engine,
+            accounts=args.seed_accounts,
+            campaigns=args.seed_campaigns,
+            adgroups=args.seed_adgroups,
+            keywords=args.seed_keywords,
+            ads=args.seed_ads,
+            days=args.seed_days,
+            end_dt=date.today() - timedelta(days=1),
+        )
+    if args.drop_indexes:
+        drop_dashboard_indexes(engine)
+        print("🧹 대시보드 인덱스 삭제")
+    if args.ensure_indexes:
+        created = ensure_dashboard_indexes(engine)
+        print(f"🗂️ 대시보드 인덱스 보장 | 신규 {len(created)}개")
+    if args.drop_indexes or args.ensure_indexes:
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            for table in ["fact_campaign_daily", "fact_keyword_daily", "fact_ad_daily"]:
+                conn.execute(text(f"VACUUM ANALYZE {table}"))
+
+    d1, d2, cids = _resolve_scope(engine, args)
+    print(f"🔎 범위 {d1}~{d2} | customer_id {len(cids)}개 {list(cids)}")
+
+    results = []
+    flagged = 0
+    for name, query, params in capture_dashboard_queries(engine, d1, d2, cids):
+        try:
+            plan = explain_query(engine, query, params, analyze=args.analyze)
+        except Exception as e:
+            print(f"⚠️ {name} EXPLAIN 실패 | {type(e).__name__}: {e}")
+            results.append({"query": name, "error": f"{type(e).__name__}: {e}"})
+            continue
+        seq_scans = collect_seq_scans(plan)
+        fact_seq = [rel for rel, _ in seq_scans if rel.startswith("fact_")]
+        flagged += len(fact_seq)
+        row = {
+            "query": name,
+            "total_cost": plan.get("Plan", {}).get("Total Cost"),
+            "execution_ms": plan.get("Execution Time"),
+            "seq_scans": [{"relation": rel, "plan_rows": rows} for rel, rows in seq_scans],
+        }
+        results.append(row)
+        mark = "❌" if fact_seq else "✅"
+        exec_txt = f" | exec={row['execution_ms']:.1f}ms" if row["execution_ms"] is not None else ""
+        scans_txt = ", ".join(f"{rel}({int(rows)})" for rel, rows in seq_scans) or "-"
+        print(f"{mark} {name:<30} cost={row['total_cost']}{exec_txt} | seq_scan: {scans_txt}")
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as fp:
+            json.dump({"d1": str(d1), "d2": str(d2), "cids": list(cids), "results": results}, fp, ensure_ascii=False, indent=2)
+        print(f"📝 저장: {args.json_out}")
+
+    print(f"fact_* Seq Scan {flagged}건")
+    if args.fail_on_seq_scan and flagged:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,616 @@
+# -*- coding: utf-8 -*-
+"""mock_naver_api.py - 로컬 네이버 검색광고 API 목 서버
+
+실제 API 를 호출하지 않고 collector.py / collect_bizmoney.py 처리량을 재기 위한 서버
+- 지원 엔드포인트
+  GET    /ncc/campaigns, /ncc/adgroups, /ncc/keywords, /ncc/ads
+  GET    /stats
+  GET    /stat-reports, /stat-reports/{id}   POST /stat-reports   DELETE /stat-reports/{id}
+  GET    /report-download?authtoken=...      (AD / AD_CONVERSION / SHOPPINGKEYWORD_CONVERSION_DETAIL TSV)
+  GET    /billing/bizmoney
+  GET    /__mock/stats                       (요청 수 / 429 수 집계, 벤치마크용)
+- 계정 구조와 지표는 (seed, customer_id, 날짜) 로 결정되고, /stats 는 AD 리포트 행 지표를 id별로 합산하므로 두 값이 서로 맞는다
+- 리포트 빌드 지연(--report-latency), 요청 지연(--latency-ms), 429 주입(--throttle-rate / --max-rps) 설정 가능
+
+사용 예
+  python mock_naver_api.py accounts --count 50 --out /tmp/mock_account_master.xlsx
+  python mock_naver_api.py serve --port 18080 --campaigns 8 --adgroups 6 --keywords 30 --ads 3
+  NAVER_API_BASE_URL=http://127.0.0.1:18080 NAVER_API_KEY=mock NAVER_API_SECRET=mock \\
+      ACCOUNT_MASTER_FILE=/tmp/mock_account_master.xlsx python collector.py --date 2026-04-01
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import date, datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+import pandas as pd
+
+MOCK_CUSTOMER_BASE = 9100000
+KEYWORD_VOCAB = ["운동화", "러닝화", "캠핑의자", "가방", "원피스", "노트북", "선크림", "텀블러", "키보드", "패딩"]
+KEYWORD_MODIFIERS = ["", "추천", "남성", "여성", "할인", "최저가", "브랜드", "세일", "인기", "후기"]
+CONVERSION_TYPES = ["purchase", "add_to_cart", "wishlist"]
+REPORT_CACHE_SIZE = 256
+
+AD_REPORT_HEADER = [
+    "일별", "고객ID", "캠페인ID", "광고그룹ID", "키워드ID", "광고ID", "비즈채널ID", "매체이름", "노출기기",
+    "노출수", "클릭수", "총비용", "전환수", "전환매출액", "평균노출순위",
+]
+AD_CONVERSION_REPORT_HEADER = [
+    "일별", "고객ID", "캠페인ID", "광고그룹ID", "키워드ID", "광고ID", "비즈채널ID", "매체이름", "노출기기",
+    "전환방식", "전환유형", "전환수", "전환매출액",
+]
+
+
+def log(msg: str):
+    print(f"[{datetime.now().strftime('%H:%M:%S')}] {msg}", flush=True)
+
+
+class ScaleSpec:
+    """계정 1개의 구조 규모 (캠페인 수, 캠페인당 광고그룹 수, 광고그룹당 키워드/소재 수)."""
+
+    def __init__(self, campaigns: int = 8, adgroups: int = 6, keywords: int = 30, ads: int = 3, shopping_ratio: float = 0.25):
+        self.campaigns = max(1, int(campaigns))
+        self.adgroups = max(1, int(adgroups))
+        self.keywords = max(0, int(keywords))
+        self.ads = max(1, int(ads))
+        self.shopping_ratio = min(1.0, max(0.0, float(shopping_ratio)))
+
+
+class SyntheticAccount:
+    """customer_id 하나의 캠페인/광고그룹/키워드/소재 트리 (seed 기준 결정적)."""
+
+    def __init__(self, customer_id: str, spec: ScaleSpec, seed: int = 0):
+        self.customer_id = str(customer_id)
+        self.seed = seed
+        rng = random.Random(f"{seed}:{customer_id}")
+        self.campaigns: List[dict] = []
+        self.adgroups: Dict[str, List[dict]] = {}
+        self.keywords: Dict[str, List[dict]] = {}
+        self.ads: Dict[str, List[dict]] = {}
+        self.shopping_campaign_ids: set[str] = set()
+        self.stats_cache: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+        shopping_cnt = int(round(spec.campaigns * spec.shopping_ratio))
+        for ci in range(spec.campaigns):
+            is_shopping = ci < shopping_cnt
+            cid = f"cmp-a001-{ci % 100:02d}-{self.customer_id}{ci:05d}"
+            self.campaigns.append({
+                "nccCampaignId": cid,
+                "customerId": self.customer_id,
+                "name": f"{'쇼핑' if is_shopping else '파워링크'}_캠페인_{ci + 1}",
+                "campaignTp": "SHOPPING" if is_shopping else "WEB_SITE",
+                "status": "ELIGIBLE",
+                "userLock": False,
+                "dailyBudget": rng.choice([0, 30000, 50000, 100000]),
+            })
+            if is_shopping:
+                self.shopping_campaign_ids.add(cid)
+            groups = []
+            for gi in range(spec.adgroups):
+                gid = f"grp-a001-{ci % 100:02d}-{self.customer_id}{ci:03d}{gi:04d}"
+                groups.append({
+                    "nccAdgroupId": gid,
+                    "nccCampaignId": cid,
+                    "customerId": self.customer_id,
+                    "name": f"광고그룹_{ci + 1}_{gi + 1}",
+                    "adgroupType": "SHOPPING" if is_shopping else "WEB_SITE",
+                    "status": "ELIGIBLE",
+                    "userLock": False,
+                })
+                kws = []
+                if not is_shopping:
+                    for ki in range(spec.keywords):
+                        kw_text = f"{rng.choice(KEYWORD_VOCAB)} {rng.choice(KEYWORD_MODIFIERS)}".strip()
+                        kws.append({
+                            "nccKeywordId": f"nkw-a001-{ci % 100:02d}-{self.customer_id}{ci:03d}{gi:03d}{ki:04d}",
+                            "nccAdgroupId": gid,
+                            "keyword": kw_text,
+                            "status": "ELIGIBLE",
+                            "userLock": False,
+                        })
+                self.keywords[gid] = kws
+                ads = []
+                for ai in range(spec.ads):
+                    title = f"{rng.choice(KEYWORD_VOCAB)} 상품 {ai + 1}"
+                    inner: Dict[str, Any] = {"pcLandingUrl": f"https://shop.example.com/p/{ci}-{gi}-{ai}", "mobileLandingUrl": f"https://m.shop.example.com/p/{ci}-{gi}-{ai}"}
+                    if is_shopping:
+                        inner["shoppingProduct"] = {"name": title, "imageUrl": f"https://img.example.com/{ci}-{gi}-{ai}.jpg"}
+                    else:
+                        inner.update({"headline": title, "description": f"{title} 최저가 할인"})
+                    ads.append({
+                        "nccAdId": f"nad-a001-{ci % 100:02d}-{self.customer_id}{ci:03d}{gi:03d}{ai:03d}",
+                        "nccAdgroupId": gid,
+                        "type": "SHOPPING_PRODUCT_AD" if is_shopping else "TEXT_45",
+                        "ad": inner,
+                        "status": "ELIGIBLE",
+                        "userLock": False,
+                    })
+                self.ads[gid] = ads
+            self.adgroups[cid] = groups
+
+    def iter_ad_rows(self):
+        """(campaign, adgroup, keyword|None, ad) 조합. 파워링크 소재는 광고그룹 키워드 앞쪽 일부에 붙는다."""
+        for camp in self.campaigns:
+            cid = camp["nccCampaignId"]
+            for grp in self.adgroups.get(cid, []):
+                gid = grp["nccAdgroupId"]
+                kws = self.keywords.get(gid, [])[:3]
+                for ad in self.ads.get(gid, []):
+                    if kws:
+                        for kw in kws:
+                            yield camp, grp, kw, ad
+                    else:
+                        yield camp, grp, None, ad
+
+
+def _metrics(seed: int, key: str, stat_dt: str) -> Dict[str, Any]:
+    rng = random.Random(f"{seed}:{key}:{stat_dt}")
+    imp = rng.randint(0, 900)
+    clk = rng.randint(0, max(0, imp // 15))
+    cost = clk * rng.randint(80, 900)
+    conv = rng.randint(0, max(0, clk // 8))
+    sales = conv * rng.randint(9000, 90000)
+    rank = round(rng.uniform(1.0, 15.0), 1) if imp else 0.0
+    return {"imp": imp, "clk": clk, "cost": cost, "conv": conv, "sales": sales, "rank": rank}
+
+
+def stats_totals(account: SyntheticAccount, stat_dt: str) -> Dict[str, Dict[str, Any]]:
+    """/stats 응답용 id별 합계. AD 리포트와 같은 행 단위 _metrics 를 캠페인/광고그룹/키워드/소재로 합산한다."""
+    cached = account.stats_cache.get(stat_dt)
+    if cached is not None:
+        return cached
+    totals: Dict[str, Dict[str, Any]] = {}
+    for camp, grp, kw, ad in account.iter_ad_rows():
+        kid = kw["nccKeywordId"] if kw else "-"
+        owners = [camp["nccCampaignId"], grp["nccAdgroupId"], ad["nccAdId"]] + ([kid] if kw else [])
+        for device in ("P", "M"):
+            m = _metrics(account.seed, f"{ad['nccAdId']}:{kid}:{device}", stat_dt)
+            for obj_id in owners:
+                t = totals.setdefault(obj_id, {"imp": 0, "clk": 0, "cost": 0, "conv": 0, "sales": 0, "rank_imp": 0.0})
+                for k in ("imp", "clk", "cost", "conv", "sales"):
+                    t[k] += m[k]
+                t["rank_imp"] += m["rank"] * m["imp"]
+    for t in totals.values():
+        # 평균 순위는 노출 가중 평균 (실제 /stats avgRnk 와 같은 기준)
+        t["rank"] = round(t.pop("rank_imp") / t["imp"], 1) if t["imp"] else 0.0
+    account.stats_cache[stat_dt] = totals
+    return totals
+
+
+def build_report_tsv(account: SyntheticAccount, report_tp: str, stat_dt: str) -> str:
+    """AD / AD_CONVERSION / SHOPPINGKEYWORD_CONVERSION_DETAIL 리포트 본문."""
+    cus = account.customer_id
+    lines: List[str] = []
+    if report_tp == "AD":
+        lines.append("\t".join(AD_REPORT_HEADER))
+        for camp, grp, kw, ad in account.iter_ad_rows():
+            kid = kw["nccKeywordId"] if kw else "-"
+            for device in ("P", "M"):
+                m = _metrics(account.seed, f"{ad['nccAdId']}:{kid}:{device}", stat_dt)
+                if not m["imp"]:
+                    continue
+                lines.append("\t".join(map(str, [
+                    stat_dt, cus, camp["nccCampaignId"], grp["nccAdgroupId"], kid, ad["nccAdId"], f"bsn-a001-00-{cus}",
+                    "네이버 통합검색", device, m["imp"], m["clk"], m["cost"], m["conv"], m["sales"], m["rank"],
+                ])))
+    elif report_tp == "AD_CONVERSION":
+        lines.append("\t".join(AD_CONVERSION_REPORT_HEADER))
+        for camp, grp, kw, ad in account.iter_ad_rows():
+            kid = kw["nccKeywordId"] if kw else "-"
+            for device in ("P", "M"):
+                m = _metrics(account.seed, f"{ad['nccAdId']}:{kid}:{device}", stat_dt)
+                if not m["conv"]:
+                    continue
+                rng = random.Random(f"{account.seed}:conv:{ad['nccAdId']}:{kid}:{device}:{stat_dt}")
+                ctype = rng.choice(CONVERSION_TYPES)
+                lines.append("\t".join(map(str, [
+                    stat_dt, cus, camp["nccCampaignId"], grp["nccAdgroupId"], kid, ad["nccAdId"], f"bsn-a001-00-{cus}",
+                    "네이버 통합검색", device, rng.choice([1, 2]), ctype, m["conv"], m["sales"],
+                ])))
+    elif report_tp == "SHOPPINGKEYWORD_CONVERSION_DETAIL":
+        # 실제 리포트처럼 헤더 없이 내려준다 (collector_parsers 휴리스틱 경로).
+        for camp, grp, _kw, ad in account.iter_ad_rows():
+            if camp["nccCampaignId"] not in account.shopping_campaign_ids:
+                continue
+            rng = random.Random(f"{account.seed}:sq:{ad['nccAdId']}:{stat_dt}")
+            for _ in range(rng.randint(0, 4)):
+                query = f"{rng.choice(KEYWORD_VOCAB)} {rng.choice(KEYWORD_MODIFIERS)}".strip()
+                conv = rng.randint(1, 3)
+                lines.append("\t".join(map(str, [
+                    stat_dt, cus, camp["nccCampaignId"], grp["nccAdgroupId"], query, ad["nccAdId"], f"bsn-a001-00-{cus}",
+                    rng.choice(["P", "M"]), rng.choice(["구매완료", "장바구니담기", "위시리스트추가"]), conv, conv * rng.randint(9000, 90000),
+                ])))
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+class RateLimiter:
+    """초당 요청 상한 (토큰 버킷). max_rps <= 0 이면 제한 없음."""
+
+    def __init__(self, max_rps: float):
+        self.max_rps = float(max_rps or 0)
+        self._tokens = self.max_rps
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        if self.max_rps <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.max_rps, self._tokens + (now - self._last) * self.max_rps)
+            self._last = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return True
+            return False
+
+
+class MockNaverState:
+    """서버 전역 상태: 계정 캐시, 리포트 잡, 요청 통계."""
+
+    def __init__(self, spec: ScaleSpec, *, seed: int = 0, report_latency: float = 2.0, latency_ms: float = 0.0,
+                 throttle_rate: float = 0.0, max_rps: float = 0.0, base_url: str = ""):
+        self.spec = spec
+        self.seed = seed
+        self.report_latency = max(0.0, float(report_latency))
+        self.latency_ms = max(0.0, float(latency_ms))
+        self.throttle_rate = min(1.0, max(0.0, float(throttle_rate)))
+        self.limiter = RateLimiter(max_rps)
+        self.base_url = base_url.rstrip("/")
+        self._accounts: Dict[str, SyntheticAccount] = {}
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._reports: "OrderedDict[Tuple[str, str, str], bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self.started_at = time.time()
+        self.counters: Dict[str, int] = {}
+
+    def account(self, customer_id: str) -> SyntheticAccount:
+        with self._lock:
+            acc = self._accounts.get(customer_id)
+        if acc is None:
+            acc = SyntheticAccount(customer_id, self.spec, self.seed)
+            with self._lock:
+                acc = self._accounts.setdefault(customer_id, acc)
+        return acc
+
+    def count(self, key: str, n: int = 1):
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + n
+
+    def should_throttle(self) -> bool:
+        if not self.limiter.allow():
+            return True
+        if self.throttle_rate <= 0:
+            return False
+        with self._lock:
+            return self._rng.random() < self.throttle_rate
+
+    def create_job(self, customer_id: str, report_tp: str, stat_dt: str) -> Dict[str, Any]:
+        job_id = str(uuid.uuid4().int % 10**10)
+        token = uuid.uuid4().hex
+        job = {
+            "reportJobId": job_id,
+            "reportTp": report_tp,
+            "statDt": stat_dt,
+            "customerId": customer_id,
+            "status": "REGIST",
+            "downloadUrl": "",
+            "_token": token,
+            "_ready_at": time.monotonic() + self.report_latency,
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+        return job
+
+    def job_view(self, job_id: str, customer_id: str) -> Dict[str, Any] | None:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job["customerId"] != customer_id:
+                return None
+            if job["status"] != "BUILT" and time.monotonic() >= job["_ready_at"]:
+                job["status"] = "BUILT"
+                job["downloadUrl"] = f"{self.base_url}/report-download?authtoken={job['_token']}"
+            elif job["status"] == "REGIST":
+                job["status"] = "RUNNING"
+            return {k: v for k, v in job.items() if not k.startswith("_")}
+
+    def list_jobs(self, customer_id: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            ids = [jid for jid, j in self._jobs.items() if j["customerId"] == customer_id]
+        return [v for v in (self.job_view(jid, customer_id) for jid in ids) if v]
+
+    def delete_job(self, job_id: str, customer_id: str) -> bool:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job["customerId"] != customer_id:
+                return False
+            del self._jobs[job_id]
+            return True
+
+    def report_bytes(self, token: str) -> bytes | None:
+        with self._lock:
+            job = next((j for j in self._jobs.values() if j["_token"] == token), None)
+        if not job or job["status"] != "BUILT":
+            return None
+        key = (job["customerId"], job["reportTp"], job["statDt"])
+        with self._lock:
+            body = self._reports.get(key)
+            if body is not None:
+                self._reports.move_to_end(key)
+                return body
+        body = build_report_tsv(self.account(job["customerId"]), job["reportTp"], job["statDt"]).encode("utf-8")
+        with self._lock:
+            self._reports[key] = body
+            while len(self._reports) > REPORT_CACHE_SIZE:
+                self._reports.popitem(last=False)
+        return body
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "uptime_sec": round(time.time() - self.started_at, 3),
+                "accounts": len(self._accounts),
+                "open_jobs": len(self._jobs),
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+
+def _stat_dt_from_time_range(raw: str) -> str:
+    try:
+        since = json.loads(raw or "{}").get("since", "")
+        return datetime.strptime(since, "%Y-%m-%d").strftime("%Y%m%d")
+    except Exception:
+        return date.today().strftime("%Y%m%d")
+
+
+class MockNaverHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockNaverSA/1.0"
+    state: MockNaverState
+
+    def log_message(self, format, *args):  # noqa: A002 - BaseHTTPRequestHandler 시그니처
+        return
+
+    def _send(self, code: int, body: bytes = b"", content_type: str = "application/json; charset=UTF-8"):
+        # 헤더와 본문을 한 번에 써야 클라이언트 keep-alive 에서 Nagle/지연 ACK 대기(~40ms)가 생기지 않는다.
+        reason = self.responses.get(code, ("",))[0]
+        head = (
+            f"HTTP/1.1 {code} {reason}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        ).encode("latin-1")
+        self.wfile.write(head + body)
+        self.wfile.flush()
+
+    def _json(self, code: int, data: Any):
+        self._send(code, json.dumps(data, ensure_ascii=False).encode("utf-8"))
+
+    def _handle(self, method: str):
+        st = self.state
+        parsed = urlparse(self.path)
+        path = parsed.path.rstrip("/") or "/"
+        query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+
+        if path == "/__mock/stats":
+            self._json(200, st.snapshot())
+            return
+
+        route = path.split("/")[1] if path.count("/") >= 1 else path
+        st.count(f"{method} /{route}")
+        if st.latency_ms:
+            time.sleep(st.latency_ms / 1000.0)
+
+        if path == "/report-download":
+            body = st.report_bytes(query.get("authtoken", ""))
+            if body is None:
+                self._json(404, {"code": 404, "title": "report not found"})
+            else:
+                st.count("report_bytes", len(body))
+                self._send(200, body, "text/plain; charset=UTF-8")
+            return
+
+        customer_id = str(self.headers.get("X-Customer") or "").strip()
+        if not self.headers.get("X-API-KEY") or not customer_id:
+            self._json(401, {"code": 401, "title": "missing X-API-KEY / X-Customer"})
+            return
+        if st.should_throttle():
+            st.count("throttled_429")
+            self._json(429, {"code": 1016, "title": "Too many requests"})
+            return
+
+        acc = st.account(customer_id)
+        if method == "GET" and path == "/ncc/campaigns":
+            self._json(200, acc.campaigns)
+        elif method == "GET" and path == "/ncc/adgroups":
+            cid = query.get("nccCampaignId", "")
+            self._json(200, acc.adgroups.get(cid, []) if cid else [g for gs in acc.adgroups.values() for g in gs])
+        elif method == "GET" and path == "/ncc/keywords":
+            self._json(200, acc.keywords.get(query.get("nccAdgroupId", ""), []))
+        elif method == "GET" and path == "/ncc/ads":
+            self._json(200, acc.ads.get(query.get("nccAdgroupId") or query.get("ownerId") or "", []))
+        elif method == "GET" and path == "/stats":
+            ids = [x for x in query.get("ids", "").split(",") if x]
+            stat_dt = _stat_dt_from_time_range(query.get("timeRange", ""))
+            totals = stats_totals(acc, stat_dt)
+            empty = {"imp": 0, "clk": 0, "cost": 0, "conv": 0, "sales": 0, "rank": 0.0}
+            data = []
+            for obj_id in ids:
+                m = totals.get(obj_id, empty)
+                data.append({"id": obj_id, "impCnt": m["imp"], "clkCnt": m["clk"], "salesAmt": m["cost"], "ccnt": m["conv"], "convAmt": m["sales"], "avgRnk": m["rank"]})
+            self._json(200, {"data": data})
+        elif method == "POST" and path == "/stat-reports":
+            try:
+                payload = json.loads(raw_body or b"{}")
+            except ValueError:
+                payload = {}
+            report_tp = str(payload.get("reportTp") or "")
+            if report_tp not in {"AD", "AD_CONVERSION", "SHOPPINGKEYWORD_CONVERSION_DETAIL"}:
+                self._json(400, {"code": 400, "title": f"unsupported reportTp: {report_tp}"})
+                return
+            job = st.create_job(customer_id, report_tp, str(payload.get("statDt") or date.today().strftime("%Y%m%d")))
+            self._json(200, {k: v for k, v in job.items() if not k.startswith("_")})
+        elif method == "GET" and path == "/stat-reports":
+            self._json(200, st.list_jobs(customer_id))
+        elif path.startswith("/stat-reports/"):
+            job_id = path.rsplit("/", 1)[-1]
+            if method == "GET":
+                view = st.job_view(job_id, customer_id)
+                if view:
+                    self._json(200, view)
+                else:
+                    self._json(404, {"code": 404, "title": "job not found"})
+            elif method == "DELETE":
+                self._send(204 if st.delete_job(job_id, customer_id) else 404)
+            else:
+                self._json(405, {"code": 405, "title": "method not allowed"})
+        elif method == "GET" and path == "/billing/bizmoney":
+            rng = random.Random(f"{st.seed}:bizmoney:{customer_id}")
+            self._json(200, {
+                "customerId": customer_id,
+                "bizmoney": rng.randint(0, 5_000_000),
+                "freeBizmoney": rng.choice([0, 0, 10000]),
+                "couponBizmoney": 0,
+                "prepaidBizmoney": 0,
+                "bizCoupon": 0,
+            })
+        else:
+            self._json(404, {"code": 404, "title": f"unknown endpoint: {method} {path}"})
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+
+class MockNaverServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+def make_server(host: str, port: int, state: MockNaverState) -> MockNaverServer:
+    handler = type("BoundMockNaverHandler", (MockNaverHandler,), {"state": state})
+    server = MockNaverServer((host, port), handler)
+    if not state.base_url:
+        state.base_url = f"http://{host}:{server.server_address[1]}"
+    return server
+
+
+def start_background_server(spec: ScaleSpec | None = None, *, host: str = "127.0.0.1", port: int = 0, **state_kwargs) -> Tuple[MockNaverServer, MockNaverState]:
+    """벤치마크 스크립트용: 별도 스레드에서 서버를 띄우고 (server, state) 를 돌려준다. 종료는 server.shutdown()."""
+    state = MockNaverState(spec or ScaleSpec(), **state_kwargs)
+    server = make_server(host, port, state)
+    threading.Thread(target=server.serve_forever, name="mock-naver-api", daemon=True).start()
+    return server, state
+
+
+def synthetic_accounts(count: int, *, start: int = MOCK_CUSTOMER_BASE, shared_bizmoney_every: int = 0) -> List[Dict[str, str]]:
+    """목 계정 목록. shared_bizmoney_every=N 이면 N개 단위로 비즈머니 공유 그룹을 만든다."""
+    rows: List[Dict[str, str]] = []
+    for i in range(max(0, int(count))):
+        name = f"목업체_{i + 1:04d}"
+        shared = shared_bizmoney_every > 1
+        rows.append({
+            "id": str(start + i),
+            "name": name,
+            "manager": f"담당자{i % 5 + 1}",
+            "bizmoney_mode": "shared" if shared else "separate",
+            "bizmoney_group_key": f"목그룹_{i // shared_bizmoney_every + 1:03d}" if shared else name,
+        })
+    return rows
+
+
+def write_account_master(path: str, accounts: List[Dict[str, str]]) -> str:
+    """account_master.load_naver_accounts / collector 레거시 accounts.xlsx 둘 다 읽는 형식으로 저장."""
+    df = pd.DataFrame([
+        {
+            "업체명": a["name"],
+            "커스텀 ID": a["id"],
+            "담당자": a.get("manager", ""),
+            "bizmoney_mode": a.get("bizmoney_mode", "separate"),
+            "비즈머니그룹키": a.get("bizmoney_group_key", a["name"]),
+        }
+        for a in accounts
+    ])
+    if path.lower().endswith(".csv"):
+        df.to_csv(path, index=False, encoding="utf-8-sig")
+    else:
+        df.to_excel(path, sheet_name="계정마스터", index=False)
+    return path
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="로컬 네이버 검색광고 API 목 서버")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    serve = sub.add_parser("serve", help="목 서버 실행")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=18080)
+    serve.add_argument("--seed", type=int, default=0)
+    serve.add_argument("--campaigns", type=int, default=8, help="계정당 캠페인 수")
+    serve.add_argument("--adgroups", type=int, default=6, help="캠페인당 광고그룹 수")
+    serve.add_argument("--keywords", type=int, default=30, help="광고그룹당 키워드 수 (파워링크)")
+    serve.add_argument("--ads", type=int, default=3, help="광고그룹당 소재 수")
+    serve.add_argument("--shopping-ratio", type=float, default=0.25, help="쇼핑검색 캠페인 비율")
+    serve.add_argument("--report-latency", type=float, default=2.0, help="stat-report 가 BUILT 되기까지 초")
+    serve.add_argument("--latency-ms", type=float, default=0.0, help="요청마다 추가 지연(ms)")
+    serve.add_argument("--throttle-rate", type=float, default=0.0, help="무작위 429 비율 (0~1)")
+    serve.add_argument("--max-rps", type=float, default=0.0, help="초당 요청 상한, 넘으면 429 (0=무제한)")
+
+    accounts = sub.add_parser("accounts", help="목 계정 마스터 파일 생성")
+    accounts.add_argument("--count", type=int, default=50)
+    accounts.add_argument("--start", type=int, default=MOCK_CUSTOMER_BASE)
+    accounts.add_argument("--shared-bizmoney-every", type=int, default=0)
+    accounts.add_argument("--out", default="mock_account_master.xlsx")
+    return parser
+
+
+def main():
+    args = build_arg_parser().parse_args()
+    if args.cmd == "accounts":
+        rows = synthetic_accounts(args.count, start=args.start, shared_bizmoney_every=args.shared_bizmoney_every)
+        write_account_master(args.out, rows)
+        log(f"🗂️ 목 계정 {len(rows)}개 저장: {args.out} (customer_id {args.start}~{args.start + len(rows) - 1})")
+        return
+
+    spec = ScaleSpec(args.campaigns, args.adgroups, args.keywords, args.ads, args.shopping_ratio)
+    state = MockNaverState(
+        spec,
+        seed=args.seed,
+        report_latency=args.report_latency,
+        latency_ms=args.latency_ms,
+        throttle_rate=args.throttle_rate,
+        max_rps=args.max_rps,
+    )
+    server = make_server(args.host, args.port, state)
+    log(
+        f"🧪 목 네이버 API 서버 시작: {state.base_url} | 계정당 캠페인 {spec.campaigns} x 광고그룹 {spec.adgroups} "
+        f"x 키워드 {spec.keywords} / 소재 {spec.ads} | 리포트 지연 {state.report_latency}s | 429 비율 {state.throttle_rate} | max_rps {args.max_rps or '-'}"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        log(f"🛑 목 서버 종료 | {json.dumps(state.snapshot(), ensure_ascii=False)}")
+
+
+if __name__ == "__main__":
+    main()
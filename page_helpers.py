@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import os
 import re
 import textwrap
@@ -388,24 +389,47 @@ def _perf_common_merge_meta(df: pd.DataFrame, meta: pd.DataFrame) -> pd.DataFram
     )
     merged = out.merge(meta_view, on="_customer_id_key", how="left")
     return merged.drop(columns=["_customer_id_key"], errors="ignore")
+def comparison_cache_key(prefix: str, cur_range: tuple, cmp_range: tuple, *filters) -> str:
+    """Session cache key for a merged current/comparison table: (current range, comparison range, filter hash)."""
+    filter_hash = hashlib.sha1(repr(filters).encode("utf-8")).hexdigest()[:16]
+    return f"{prefix}::{cur_range[0]}~{cur_range[1]}::{cmp_range[0]}~{cmp_range[1]}::{filter_hash}"
+
+def frame_cache_sig(df: pd.DataFrame, cols: list) -> str:
+    """Content hash of a frame's merge-key/metric columns, so a comparison cache key changes when either side's data does."""
+    if df is None or df.empty:
+        return "empty"
+    sub = df[[c for c in dict.fromkeys(cols) if c in df.columns]]
+    try:
+        hashed = pd.util.hash_pandas_object(sub, index=False)
+    except TypeError:
+        hashed = pd.util.hash_pandas_object(sub.astype(str), index=False)
+    return f"{len(sub.index)}:{hashlib.sha1(hashed.to_numpy().tobytes()).hexdigest()[:16]}"
+
 def append_comparison_data(df_cur: pd.DataFrame, df_prev: pd.DataFrame, join_keys: list) -> pd.DataFrame:
     if df_prev is None or df_prev.empty or df_cur is None or df_cur.empty: return df_cur.copy()
     valid_join_keys = [k for k in join_keys if k in df_cur.columns and k in df_prev.columns]
     if not valid_join_keys: return df_cur.copy()
     
     df_c = df_cur.copy()
+    df_p = df_prev.copy()
     for k in valid_join_keys:
         df_c[k] = df_c[k].astype(str)
-        df_prev[k] = df_prev[k].astype(str)
+        df_p[k] = df_p[k].astype(str)
         
-    num_cols = df_prev.select_dtypes(include=[np.number]).columns.tolist()
+    num_cols = df_p.select_dtypes(include=[np.number]).columns.tolist()
     agg_dict = {c: 'sum' for c in num_cols if c not in valid_join_keys}
     if 'avg_rank' in agg_dict: agg_dict['avg_rank'] = 'mean'
     
-    base_agg = df_prev.groupby(valid_join_keys, as_index=False).agg(agg_dict)
-    base_agg.rename(columns={c: f"{c}_base" for c in agg_dict.keys()}, inplace=True)
-    
-    return df_c.merge(base_agg, on=valid_join_keys, how='left').fillna(0)
+    # 비교 기간 합계를 현재 행의 키 순서로 reindex 해서 merge 없이 붙인다
+    base_agg = df_p.groupby(valid_join_keys).agg(agg_dict)
+    if len(valid_join_keys) > 1:
+        row_keys = pd.MultiIndex.from_frame(df_c[valid_join_keys])
+    else:
+        row_keys = pd.Index(df_c[valid_join_keys[0]])
+    aligned = base_agg.reindex(row_keys)
+    for c in agg_dict.keys():
+        df_c[f"{c}_base"] = aligned[c].to_numpy()
+    return df_c.fillna(0)
 
 def style_table_deltas(val):
     return style_table_deltas_positive(val)
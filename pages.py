@@ -11,6 +11,7 @@ import streamlit_compat  # noqa: F401
 from data import *
 from ui import render_hero
 from page_helpers import BUILD_TAG, build_filters
+from perf_utils import set_perf_page, timed_block
 
 
 PAGE_DESCRIPTIONS = {
@@ -152,6 +153,19 @@ def main():
         st.info("담당자 또는 광고주(계정) 필터를 먼저 1개 이상 선택하면 데이터가 표시됩니다.")
         st.stop()
 
+    set_perf_page(nav)
+    perf_extra = {}
+    if f and f.get("start") and f.get("end"):
+        perf_extra = {
+            "range_days": (f["end"] - f["start"]).days + 1,
+            "cids": len(f.get("selected_customer_ids") or []),
+            "types": len(f.get("type_sel") or []),
+        }
+    with timed_block(nav, kind="page", **perf_extra):
+        _render_selected_page(nav, meta, engine, f)
+
+
+def _render_selected_page(nav: str, meta, engine, f: dict | None) -> None:
     if nav == "요약":
         from view_overview import page_overview
         page_overview(meta, engine, f)
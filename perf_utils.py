@@ -1,15 +1,208 @@
 # -*- coding: utf-8 -*-
-"""Lightweight profiling helpers for dashboard runtime diagnostics."""
+"""Lightweight profiling helpers for dashboard runtime diagnostics.
+
+Events always go to the per-session panel when 속도 진단 is on. When
+``PERF_TELEMETRY_URL`` is set (``sqlite:///path/perf.db`` or a Postgres URL) they are
+also queued and written in batches by a background thread, so slow pages/filters
+can be compared across all users.
+"""
 from __future__ import annotations
 
+import atexit
+import functools
+import inspect
+import json
+import os
+import queue
+import threading
 import time
+import uuid
 from contextlib import contextmanager
-from typing import Any, Dict
+from datetime import date, datetime, timezone
+from typing import Any, Callable, Dict, List
 
+import pandas as pd
 import streamlit as st
 
 _SESSION_KEY = "_perf_events"
 _ENABLE_KEY = "_show_perf_diag"
+_PAGE_KEY = "_perf_page"
+_SESSION_ID_KEY = "_perf_session_id"
+
+
+def _env_int(name: str, default: int, min_value: int = 1) -> int:
+    try:
+        value = int(os.getenv(name, str(default)) or default)
+    except Exception:
+        value = default
+    return max(min_value, value)
+
+
+PERF_TELEMETRY_URL = (os.getenv("PERF_TELEMETRY_URL") or "").strip()
+PERF_TELEMETRY_TABLE = "dashboard_perf_events"
+PERF_TELEMETRY_BATCH = _env_int("PERF_TELEMETRY_BATCH", 200)
+PERF_TELEMETRY_FLUSH_SEC = _env_int("PERF_TELEMETRY_FLUSH_SEC", 5)
+PERF_TELEMETRY_QUEUE_MAX = _env_int("PERF_TELEMETRY_QUEUE_MAX", 20000)
+
+_TELEMETRY_COLUMNS = ["ts", "session_id", "page", "kind", "label", "elapsed_ms", "row_count", "extra"]
+
+
+class PerfTelemetrySink:
+    """Bounded queue + single writer thread. ``emit`` never blocks; overflow is dropped and counted."""
+
+    def __init__(self, url: str, table: str = PERF_TELEMETRY_TABLE, *, batch: int = PERF_TELEMETRY_BATCH, flush_sec: float = PERF_TELEMETRY_FLUSH_SEC, queue_max: int = PERF_TELEMETRY_QUEUE_MAX):
+        self.url = str(url).strip()
+        self.table = table
+        self.batch = max(1, int(batch))
+        self.flush_sec = max(0.1, float(flush_sec))
+        self.is_sqlite = self.url.startswith("sqlite:")
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(queue_max)))
+        self._flush_requested = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._conn = None
+
+    def emit(self, event: Dict[str, Any]) -> None:
+        if self._thread is None:
+            self._start()
+        try:
+            self._idle.clear()
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        if self._thread is None:
+            return True
+        self._flush_requested.set()
+        deadline = time.monotonic() + max(0.0, timeout)
+        while time.monotonic() < deadline:
+            if self._queue.empty() and self._idle.is_set():
+                return True
+            time.sleep(0.02)
+        return False
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="perf-telemetry", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        pending: List[Dict[str, Any]] = []
+        last_flush = time.monotonic()
+        while True:
+            try:
+                pending.append(self._queue.get(timeout=0.5))
+                while len(pending) < self.batch:
+                    pending.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            due = (time.monotonic() - last_flush) >= self.flush_sec or self._flush_requested.is_set()
+            if pending and (len(pending) >= self.batch or due):
+                self._write(pending)
+                pending = []
+                last_flush = time.monotonic()
+            if not pending and self._queue.empty():
+                self._flush_requested.clear()
+                self._idle.set()
+
+    def _connect(self):
+        if self._conn is not None:
+            return self._conn
+        if self.is_sqlite:
+            import sqlite3
+
+            path = self.url.split(":///", 1)[-1] if ":///" in self.url else self.url.split(":", 1)[-1]
+            conn = sqlite3.connect(path or "perf_telemetry.db", timeout=10)
+            conn.execute(
+                f"""CREATE TABLE IF NOT EXISTS {self.table} (
+                    ts REAL, session_id TEXT, page TEXT, kind TEXT, label TEXT,
+                    elapsed_ms REAL, row_count INTEGER, extra TEXT
+                )"""
+            )
+            conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_ts ON {self.table} (ts)")
+            conn.commit()
+        else:
+            import psycopg2
+
+            dsn = self.url.replace("postgresql+psycopg2://", "postgresql://", 1).replace("postgres://", "postgresql://", 1)
+            conn = psycopg2.connect(dsn)
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"""CREATE TABLE IF NOT EXISTS {self.table} (
+                        ts TIMESTAMPTZ, session_id TEXT, page TEXT, kind TEXT, label TEXT,
+                        elapsed_ms DOUBLE PRECISION, row_count INTEGER, extra TEXT
+                    )"""
+                )
+                cur.execute(f"CREATE INDEX IF NOT EXISTS idx_{self.table}_ts ON {self.table} (ts)")
+            conn.commit()
+        self._conn = conn
+        return conn
+
+    def _write(self, events: List[Dict[str, Any]]) -> None:
+        rows = []
+        for e in events:
+            ts = float(e.get("ts") or time.time())
+            rows.append((
+                ts if self.is_sqlite else datetime.fromtimestamp(ts, tz=timezone.utc),
+                e.get("session_id") or "",
+                e.get("page") or "",
+                e.get("kind") or "",
+                e.get("label") or "",
+                float(e.get("elapsed_ms") or 0.0),
+                e.get("row_count"),
+                json.dumps(e.get("extra") or {}, ensure_ascii=False, default=str),
+            ))
+        try:
+            conn = self._connect()
+            cols = ", ".join(_TELEMETRY_COLUMNS)
+            if self.is_sqlite:
+                conn.executemany(f"INSERT INTO {self.table} ({cols}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                conn.commit()
+            else:
+                import psycopg2.extras
+
+                with conn.cursor() as cur:
+                    psycopg2.extras.execute_values(cur, f"INSERT INTO {self.table} ({cols}) VALUES %s", rows, page_size=500)
+                conn.commit()
+            self.written += len(rows)
+        except Exception as e:
+            # 대시보드 요청 경로에 영향을 주지 않도록 배치는 버리고 다음 배치에서 재연결한다.
+            self.failed += len(rows)
+            self._close_quietly()
+            print(f"[{datetime.now().strftime('%H:%M:%S')}] ⚠️ perf telemetry 저장 실패 | rows={len(rows)} | {type(e).__name__}: {e}", flush=True)
+
+    def _close_quietly(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+_SINK: PerfTelemetrySink | None = None
+_SINK_LOCK = threading.Lock()
+
+
+def get_telemetry_sink() -> PerfTelemetrySink | None:
+    global _SINK
+    if not PERF_TELEMETRY_URL:
+        return None
+    if _SINK is None:
+        with _SINK_LOCK:
+            if _SINK is None:
+                _SINK = PerfTelemetrySink(PERF_TELEMETRY_URL)
+                atexit.register(_SINK.flush, 5.0)
+    return _SINK
 
 
 def perf_enabled() -> bool:
@@ -26,19 +219,54 @@ def reset_perf_events() -> None:
         pass
 
 
+def set_perf_page(page: str) -> None:
+    try:
+        st.session_state[_PAGE_KEY] = str(page or "")
+    except Exception:
+        pass
+
+
+def _session_context() -> tuple[str, str]:
+    try:
+        sid = st.session_state.get(_SESSION_ID_KEY)
+        if not sid:
+            sid = uuid.uuid4().hex[:12]
+            st.session_state[_SESSION_ID_KEY] = sid
+        return sid, str(st.session_state.get(_PAGE_KEY, "") or "")
+    except Exception:
+        return "", ""
+
+
 def _append_event(kind: str, label: str, elapsed_ms: float, extra: Dict[str, Any] | None = None) -> None:
-    if not perf_enabled():
+    sink = get_telemetry_sink()
+    show = perf_enabled()
+    if sink is None and not show:
         return
-    try:
-        events = st.session_state.setdefault(_SESSION_KEY, [])
-        events.append({
+    extra = extra or {}
+    if show:
+        try:
+            events = st.session_state.setdefault(_SESSION_KEY, [])
+            events.append({
+                "kind": str(kind),
+                "label": str(label),
+                "elapsed_ms": round(float(elapsed_ms), 1),
+                "extra": extra,
+            })
+        except Exception:
+            pass
+    if sink is not None:
+        session_id, page = _session_context()
+        rows = extra.get("rows")
+        sink.emit({
+            "ts": time.time(),
+            "session_id": session_id,
+            "page": page,
             "kind": str(kind),
             "label": str(label),
-            "elapsed_ms": round(float(elapsed_ms), 1),
-            "extra": extra or {},
+            "elapsed_ms": float(elapsed_ms),
+            "row_count": int(rows) if isinstance(rows, (int, float)) else None,
+            "extra": {k: v for k, v in extra.items() if k != "rows"},
         })
-    except Exception:
-        pass
 
 
 def record_db_timing(kind: str, label: str, elapsed_ms: float, **extra: Any) -> None:
@@ -55,6 +283,137 @@ def timed_block(label: str, kind: str = "block", **extra: Any):
         _append_event(kind, label, elapsed_ms, extra)
 
 
+def _loader_filter_extra(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    extra: Dict[str, Any] = {}
+    d1, d2 = arguments.get("d1"), arguments.get("d2")
+    if isinstance(d1, date) and isinstance(d2, date):
+        extra["range_days"] = (d2 - d1).days + 1
+    cids = arguments.get("cids")
+    if cids is not None and not isinstance(cids, str):
+        extra["cids"] = len(cids)
+    type_sel = arguments.get("type_sel")
+    if type_sel:
+        extra["types"] = len(type_sel)
+    for key in ("topn_cost", "include_dt"):
+        if key in arguments:
+            extra[key] = arguments[key]
+    return extra
+
+
+def perf_timed(label: str, kind: str = "loader") -> Callable:
+    """Time a data loader (place under ``st.cache_data`` so only real DB executions are recorded)."""
+
+    def decorator(fn: Callable) -> Callable:
+        sig = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not PERF_TELEMETRY_URL and not perf_enabled():
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            out = None
+            try:
+                out = fn(*args, **kwargs)
+                return out
+            finally:
+                elapsed_ms = (time.perf_counter() - t0) * 1000.0
+                try:
+                    extra = _loader_filter_extra(sig.bind_partial(*args, **kwargs).arguments)
+                except TypeError:
+                    extra = {}
+                if isinstance(out, pd.DataFrame):
+                    extra["rows"] = int(len(out))
+                _append_event(kind, label, elapsed_ms, extra)
+
+        return wrapper
+
+    return decorator
+
+
+def load_perf_summary(group_by: str = "label", days: int = 7, url: str | None = None) -> pd.DataFrame:
+    """p50/p95 per loader (``group_by="label"``) or per page over the last ``days`` days."""
+    url = (url if url is not None else PERF_TELEMETRY_URL).strip()
+    if not url:
+        return pd.DataFrame()
+    keys = ["kind", "label"] if group_by == "label" else ["page"]
+    since = time.time() - max(1, int(days)) * 86400
+    sink = PerfTelemetrySink(url)
+    conn = sink._connect()
+    try:
+        if sink.is_sqlite:
+            # SQLite 에는 percentile 집계가 없어 기간 내 원본을 읽어 pandas 로 계산한다.
+            raw = pd.read_sql_query(
+                f"SELECT page, kind, label, elapsed_ms, row_count FROM {sink.table} WHERE ts >= ?",
+                conn,
+                params=(since,),
+            )
+            if group_by == "label":
+                raw = raw[raw["kind"] != "page"]
+            else:
+                raw = raw[raw["kind"] == "page"]
+            if raw.empty:
+                return pd.DataFrame()
+            grouped = raw.groupby(keys)
+            df = pd.DataFrame({
+                "calls": grouped["elapsed_ms"].size(),
+                "p50_ms": grouped["elapsed_ms"].quantile(0.50),
+                "p95_ms": grouped["elapsed_ms"].quantile(0.95),
+                "max_ms": grouped["elapsed_ms"].max(),
+                "avg_rows": grouped["row_count"].mean(),
+            }).reset_index()
+        else:
+            kind_filter = "kind <> 'page'" if group_by == "label" else "kind = 'page'"
+            key_sql = ", ".join(keys)
+            with conn.cursor() as cur:
+                cur.execute(
+                    f"""
+                    SELECT {key_sql}, COUNT(*) AS calls,
+                           percentile_cont(0.5) WITHIN GROUP (ORDER BY elapsed_ms) AS p50_ms,
+                           percentile_cont(0.95) WITHIN GROUP (ORDER BY elapsed_ms) AS p95_ms,
+                           MAX(elapsed_ms) AS max_ms,
+                           AVG(row_count) AS avg_rows
+                    FROM {sink.table}
+                    WHERE ts >= to_timestamp(%(since)s) AND {kind_filter}
+                    GROUP BY {key_sql}
+                    """,
+                    {"since": since},
+                )
+                df = pd.DataFrame(cur.fetchall(), columns=[c[0] for c in cur.description])
+    finally:
+        sink._close_quietly()
+    if df.empty:
+        return df
+    for col in ["p50_ms", "p95_ms", "max_ms", "avg_rows"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").round(1)
+    return df.sort_values("p95_ms", ascending=False).reset_index(drop=True)
+
+
+def render_perf_telemetry_summary() -> None:
+    if not PERF_TELEMETRY_URL:
+        st.caption("PERF_TELEMETRY_URL 이 설정되지 않아 전체 사용자 속도 통계를 수집하지 않습니다.")
+        return
+    days = st.selectbox("집계 기간", [1, 7, 30], index=1, format_func=lambda d: f"최근 {d}일", key="perf_summary_days")
+    try:
+        by_loader = load_perf_summary("label", days)
+        by_page = load_perf_summary("page", days)
+    except Exception as e:
+        st.error(f"속도 통계 조회 실패: {e}")
+        return
+    sink = get_telemetry_sink()
+    if sink is not None:
+        st.caption(f"이 프로세스 기록 {sink.written:,}건 · 대기열 초과 버림 {sink.dropped:,}건 · 저장 실패 {sink.failed:,}건")
+    st.markdown("##### 페이지별 p50 / p95")
+    if by_page.empty:
+        st.info("집계할 페이지 기록이 없습니다.")
+    else:
+        st.dataframe(by_page, use_container_width=True, hide_index=True)
+    st.markdown("##### 로더별 p50 / p95")
+    if by_loader.empty:
+        st.info("집계할 로더 기록이 없습니다.")
+    else:
+        st.dataframe(by_loader, use_container_width=True, hide_index=True)
+
+
 def render_perf_panel() -> None:
     if not perf_enabled():
         return
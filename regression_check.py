@@ -9,6 +9,7 @@ from __future__ import annotations
 import argparse
 import ast
 import sys
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
 
@@ -88,7 +89,6 @@ def check_backfill_public_contract(root: Path) -> list[str]:
         'parse_base_report',
         '_record_backfill_result',
         'emit_backfill_run_summary',
-        '_log_backfill_db_failure',
     }
     missing = sorted(required - funcs)
     if missing:
@@ -98,28 +98,34 @@ def check_backfill_public_contract(root: Path) -> list[str]:
 
 def check_backfill_parser_contract(root: Path) -> list[str]:
     path = root / 'collector_backfill_recent_sa.py'
-    if not path.exists():
-        raise RegressionFailure('collector_backfill_recent_sa.py 가 없습니다')
-    tree = _read_ast(path)
-    funcs = _function_names(tree)
+    parsers_path = root / 'collector_parsers.py'
+    if not path.exists() or not parsers_path.exists():
+        raise RegressionFailure('collector_backfill_recent_sa.py 또는 collector_parsers.py 가 없습니다')
+    forked = sorted(n for n in _function_names(_read_ast(path)) if n.startswith('_conv_'))
+    if forked:
+        raise RegressionFailure(f'backfill 이 전환 리포트 파서를 별도로 들고 있습니다: {", ".join(forked)}')
+    funcs = _function_names(_read_ast(parsers_path))
     required = {
-        '_conv_process_header_mode',
-        '_conv_process_heuristic_mode',
-        '_conv_collect_type_hits',
+        '_conv_try_header_mode',
+        '_conv_try_heuristic_mode',
+        '_conv_find_type_hits',
         '_conv_pick_numeric_payload',
-        '_log_backfill_conv_diag',
     }
     missing = sorted(required - funcs)
     if missing:
-        raise RegressionFailure(f'backfill 파서 helper 누락: {", ".join(missing)}')
-    return [f"ok | backfill 파서 helper 유지 ({', '.join(sorted(required))})"]
+        raise RegressionFailure(f'collector_parsers 파서 helper 누락: {", ".join(missing)}')
+    return [f"ok | backfill 은 collector_parsers 파서 helper 공유 ({', '.join(sorted(required))})"]
 
 
 def check_backfill_stage_logging(root: Path) -> list[str]:
     path = root / 'collector_backfill_recent_sa.py'
-    if not path.exists():
-        raise RegressionFailure('collector_backfill_recent_sa.py 가 없습니다')
-    text = path.read_text(encoding='utf-8')
+    runner_path = root / 'collector_runner.py'
+    if not path.exists() or not runner_path.exists():
+        raise RegressionFailure('collector_backfill_recent_sa.py 또는 collector_runner.py 가 없습니다')
+    backfill_text = path.read_text(encoding='utf-8')
+    runner_text = runner_path.read_text(encoding='utf-8')
+    if 'collector_mod.process_account' not in backfill_text:
+        raise RegressionFailure('backfill 이 collector.process_account 파이프라인을 쓰지 않습니다')
     required_tokens = [
         'result["stage"]',
         'stage=',
@@ -127,10 +133,76 @@ def check_backfill_stage_logging(root: Path) -> list[str]:
         'save_stats_and_breakdowns',
         'resolve_split_payload',
     ]
-    missing = [tok for tok in required_tokens if tok not in text]
+    missing = [tok for tok in required_tokens if tok not in runner_text]
+    missing += [tok for tok in required_tokens[:2] if tok not in backfill_text]
     if missing:
         raise RegressionFailure(f'backfill stage/error 추적 토큰 누락: {", ".join(missing)}')
-    return ['ok | backfill stage/error 추적 토큰 유지']
+    return ['ok | backfill stage/error 추적 토큰 유지 (collector_runner 공유)']
+
+_BACKFILL_CONV_FIXTURE = '\n'.join([
+    '일별\t고객ID\t캠페인ID\t광고그룹ID\t키워드ID\t소재ID\t비즈채널ID\t매체\tPC모바일\t전환방식\t전환유형\t전환수\t전환매출액',
+    '20260401\t1234567\tcmp-a001-00\tgrp-a001-00-11\t-\tnad-a001-00-72\tbsn-a001-00\t2288\tM\t1\tadd_to_cart\t0\t21308',
+    '20260401\t1234567\tcmp-a001-01\tgrp-a001-01-00\t-\tnad-a001-01-80\tbsn-a001-01\t8321\tM\t1\tetc\t0\t2595',
+    '20260401\t1234567\tcmp-a001-04\tgrp-a001-04-14\tnkw-a001-04-07\tnad-a001-04-61\tbsn-a001-04\t6572\tM\t1\t구매완료\t1\t18462',
+    '20260401\t1234567\tcmp-a001-04\tgrp-a001-04-17\tnkw-a001-04-45\tnad-a001-04-03\tbsn-a001-04\t3835\tP\t2\t3\t2\t4132',
+    '20260401\t1234567\tcmp-a001-05\tgrp-a001-05-08\tnkw-a001-05-46\tnad-a001-05-11\tbsn-a001-05\t7555\tM\t2\t구매완료\t0\t24336',
+    '20260401\t1234567\tcmp-a001-04\tgrp-a001-04-10\tnkw-a001-04-42\tnad-a001-04-32\tbsn-a001-04\t8829\tP\t2\tetc\t3\t12500',
+])
+
+_BACKFILL_SHOP_KW_FIXTURE = '\n'.join([
+    '20260401\t1234567\tcmp-a001-01\tgrp-a001-01-09\t캠핑의자\tnad-a001-01-14\tbsn-a001-01\tP\t구매완료\t2\t45224',
+    '20260401\t1234567\tcmp-a001-00\tgrp-a001-00-02\t캠핑의자\tnad-a001-00-17\tbsn-a001-00\tP\t장바구니담기\t2\t27295',
+    '20260401\t1234567\tcmp-a001-03\tgrp-a001-03-04\t캠핑의자\tnad-a001-03-12\tbsn-a001-03\tM\t구매완료\t2\t33848',
+    '20260401\t1234567\tcmp-a001-01\tgrp-a001-01-03\t-\tnad-a001-01-15\tbsn-a001-01\tP\tetc\t0\t13787',
+    '20260401\t1234567\tcmp-a001-03\tgrp-a001-03-01\t캠핑의자\tnad-a001-03-13\tbsn-a001-03\tM\tadd_to_cart\t0\t6585',
+    '20260401\t1234567\tcmp-a001-02\tgrp-a001-02-07\t러닝화 남성\tnad-a001-02-26\tbsn-a001-02\tM\tadd_to_cart\t3\t24148',
+    '20260401\t1234567\tcmp-a001-02\tgrp-a001-02-02\t가방 추천\tnad-a001-02-29\tbsn-a001-02\tP\tpurchase\t1\t45758',
+])
+
+_BACKFILL_AD_FIXTURE = '\n'.join([
+    '일별\t고객ID\t캠페인ID\t광고그룹ID\t키워드ID\t소재ID\t비즈채널ID\t매체\tPC모바일\t노출수\t클릭수\t총비용\t평균노출순위',
+    '20260401\t1234567\tcmp-a001-05\tgrp-a001-05-08\t-\tnad-a001-05-28\tbsn-a001-05\t1787\tM\t22\t13\t70378\t8.6',
+    '20260401\t1234567\tcmp-a001-01\tgrp-a001-01-07\t-\tnad-a001-01-51\tbsn-a001-01\t5486\tP\t613\t17\t32139\t14.9',
+    '20260401\t1234567\tcmp-a001-02\tgrp-a001-02-15\t-\tnad-a001-02-56\tbsn-a001-02\t4043\tM\t556\t23\t30447\t11.4',
+    '20260401\t1234567\tcmp-a001-04\tgrp-a001-04-05\t-\tnad-a001-04-78\tbsn-a001-04\t8524\tP\t744\t32\t28602\t13.8',
+])
+
+# 기존 collector_backfill_recent_sa 자체 파서로 위 fixture 를 돌린 결과
+_BACKFILL_EXPECTED = {
+    'conv_summary': {'purchase_conv': 1.0, 'purchase_sales': 42798, 'cart_conv': 2.0, 'cart_sales': 25440, 'wishlist_conv': 0.0, 'wishlist_sales': 0},
+    'conv_keys': (3, 3, 4),
+    'query_rows': (6, 10.0, 182858),
+    'ad_rows': (4, 1935, 85, 161566, 1935),
+}
+
+
+def check_backfill_report_parity(root: Path) -> list[str]:
+    sys.path.insert(0, str(root))
+    try:
+        from datetime import date
+
+        import collector_api as api_mod
+        import collector_parsers as parsers_mod
+    except Exception as exc:
+        return [f'note | collector_parsers import 불가: backfill 리포트 동등성 점검 스킵 ({type(exc).__name__})']
+
+    parsers_mod.log = lambda *_a, **_k: None
+    conv_df = api_mod.parse_report_text_to_df(_BACKFILL_CONV_FIXTURE)
+    camp, kw, ad, summary = parsers_mod.process_conversion_report(conv_df, None, 'AD_CONVERSION', {}, {}, None, 'fixture', '2026-04-01', fast_mode=True)
+    if summary != _BACKFILL_EXPECTED['conv_summary'] or (len(camp), len(kw), len(ad)) != _BACKFILL_EXPECTED['conv_keys']:
+        raise RegressionFailure(f'AD_CONVERSION 집계가 기존 backfill 과 다릅니다: {summary} / {(len(camp), len(kw), len(ad))}')
+
+    query_rows = parsers_mod.parse_shopping_query_report(api_mod.parse_report_text_to_df(_BACKFILL_SHOP_KW_FIXTURE), date(2026, 4, 1), '1234567')
+    got = (len(query_rows), sum(r['total_conv'] for r in query_rows), sum(r['total_sales'] for r in query_rows))
+    if got != _BACKFILL_EXPECTED['query_rows']:
+        raise RegressionFailure(f'쇼핑검색어 행 집계가 기존 backfill 과 다릅니다: {got}')
+
+    ad_map = parsers_mod.parse_base_report(api_mod.parse_report_text_to_df(_BACKFILL_AD_FIXTURE), 'AD')
+    got = (len(ad_map),) + tuple(sum(v[k] for v in ad_map.values()) for k in ('imp', 'clk', 'cost', 'rank_cnt'))
+    if got != _BACKFILL_EXPECTED['ad_rows']:
+        raise RegressionFailure(f'AD 리포트 집계가 기존 backfill 과 다릅니다: {got}')
+    return ['ok | backfill 리포트 fixture 집계 = 기존 backfill 파서 (AD_CONVERSION/SHOPPINGKEYWORD_CONVERSION_DETAIL/AD)']
+
 
 def check_sa_scope_contract(root: Path) -> list[str]:
     collector_path = root / 'collector.py'
@@ -146,9 +218,924 @@ def check_sa_scope_contract(root: Path) -> list[str]:
     return msgs
 
 
+def check_trend_internal_join_contract(root: Path) -> list[str]:
+    path = root / 'view_trend.py'
+    if not path.exists():
+        raise RegressionFailure('view_trend.py 가 없습니다')
+    source = path.read_text(encoding='utf-8')
+    tree = ast.parse(source, filename=str(path))
+    targets = {'get_internal_daily_detail', '_internal_daily_detail_sql'}
+    segments = [
+        ast.get_source_segment(source, node) or ''
+        for node in ast.walk(tree)
+        if isinstance(node, ast.FunctionDef) and node.name in targets
+    ]
+    if len(segments) != len(targets):
+        raise RegressionFailure('view_trend.py 내부 일별 상세 함수 누락')
+    joined = '\n'.join(segments)
+    if '::text' in joined or 'CAST(' in joined.upper():
+        raise RegressionFailure('view_trend 내부 일별 상세 조인에 TEXT 캐스트가 남아 있습니다')
+    return ['ok | view_trend 내부 일별 상세 캐스트 없는 조인 유지']
+
+
+_LEGACY_TREND_INTERNAL_SQL = """
+    SELECT f.dt::date AS dt, COALESCE(c.campaign_name, g.campaign_id::text, '알 수 없음') AS campaign_name,
+        COALESCE(g.adgroup_name, dk.adgroup_id::text, '알 수 없음') AS adgroup_name,
+        SUM(f.imp) AS imp, SUM(f.clk) AS clk, SUM(f.cost) AS cost, SUM(COALESCE(f.sales, 0)) AS sales
+    FROM fact_keyword_daily f JOIN dim_keyword dk ON f.customer_id::text = dk.customer_id::text AND f.keyword_id::text = dk.keyword_id::text
+    LEFT JOIN dim_adgroup g ON dk.customer_id::text = g.customer_id::text AND dk.adgroup_id::text = g.adgroup_id::text
+    LEFT JOIN dim_campaign c ON g.customer_id::text = c.customer_id::text AND g.campaign_id::text = c.campaign_id::text
+    WHERE f.dt BETWEEN :d1 AND :d2 AND f.customer_id::text IN ({cids}) GROUP BY 1, 2, 3
+"""
+
+
+def check_trend_internal_explain(root: Path, db_url: str) -> list[str]:
+    """Before/after EXPLAIN on a seeded local Postgres (explain_dashboard_queries.py --seed)."""
+    sys.path.insert(0, str(root))
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.pool import NullPool
+
+    import view_trend
+    from db_indexes import collect_seq_scans
+
+    if db_url.startswith('postgresql://'):
+        db_url = db_url.replace('postgresql://', 'postgresql+psycopg2://', 1)
+    engine = create_engine(db_url, poolclass=NullPool, future=True)
+    with engine.connect() as conn:
+        max_dt = conn.execute(text('SELECT MAX(dt) FROM fact_keyword_daily')).scalar()
+        if max_dt is None:
+            return ['note | fact_keyword_daily 비어 있음: 트렌드 EXPLAIN 점검 스킵']
+        cids = [str(r[0]) for r in conn.execute(text('SELECT DISTINCT customer_id FROM fact_keyword_daily WHERE dt = :dt ORDER BY 1 LIMIT 3'), {'dt': max_dt})]
+        params = {'d1': str(max_dt - timedelta(days=29)), 'd2': str(max_dt)}
+        where_cid, cid_params = view_trend._build_in_filter('f.customer_id', tuple(cids), 'trend_cid')
+        before_sql = _LEGACY_TREND_INTERNAL_SQL.format(cids=', '.join("'" + c.replace("'", "''") + "'" for c in cids))
+        after_sql = view_trend._internal_daily_detail_sql(True, True, 'f.sales', where_cid)
+        before = conn.execute(text(f'EXPLAIN (FORMAT JSON) {before_sql}'), params).scalar()[0]
+        after = conn.execute(text(f'EXPLAIN (FORMAT JSON) {after_sql}'), {**params, **cid_params}).scalar()[0]
+
+    before_cost = float(before['Plan']['Total Cost'])
+    after_cost = float(after['Plan']['Total Cost'])
+    after_fact_seq = [rel for rel, _ in collect_seq_scans(after) if rel == 'fact_keyword_daily']
+    if after_fact_seq:
+        raise RegressionFailure('트렌드 내부 일별 상세가 fact_keyword_daily 를 Seq Scan 합니다 (db_indexes 적용 여부 확인)')
+    if after_cost > before_cost:
+        raise RegressionFailure(f'트렌드 내부 일별 상세 플랜 비용 증가 | before={before_cost:.1f} after={after_cost:.1f}')
+    return [f'ok | 트렌드 내부 일별 상세 EXPLAIN cost before={before_cost:.1f} after={after_cost:.1f}']
+
+
+_SHOP_EXT_REPORT_FIXTURES = [
+    '확장소재ID\t노출수\t클릭수\t총비용\next-1\t100\t5\t300\next-2\t7\t0\t0',
+    '20260101\t123\tcmp-1\tgrp-1\text-1\t10\t1\n20260101\t123\tcmp-1\n\n20260101\t123\tcmp-2\tgrp-9\text-3\t\t\t\t',
+    ' ext-1 \t 12 \t\u3000\next-2\t\xa03\xa0\t',
+    'a,b,c\r\n1,2\r\n3,4,5,6\r\n',
+    'id\tname\next-1\t"quoted\tname"\next-2\t"x"',
+    'id\tv\rext-1\t1\rext-2',
+    'ext-1',
+    '\ufeffid,clk\next-1,3',
+]
+
+
+def _legacy_shop_ext_report_parse(mod, txt: str):
+    """collector_shop_ext.parse_report_text_to_df 의 기존(csv.reader 우선) 동작 재현"""
+    import pandas as pd
+
+    txt = (txt or '').replace('\ufeff', '').strip()
+    if not txt:
+        return pd.DataFrame()
+    tries = mod._report_parse_delimiters(txt.splitlines())
+    for delim in tries:
+        try:
+            df = mod._manual_report_parse(txt, delim)
+            if not df.empty and max(df.shape) > 1:
+                return df
+        except Exception:
+            pass
+    for delim in tries:
+        try:
+            df = mod._pandas_report_parse(txt, delim)
+            if not df.empty:
+                return df
+        except Exception:
+            pass
+    return pd.DataFrame()
+
+
+def check_shop_ext_report_parse_parity(root: Path) -> list[str]:
+    sys.path.insert(0, str(root))
+    try:
+        import pandas as pd
+        import collector_shop_ext as mod
+    except Exception as exc:
+        return [f'note | collector_shop_ext import 불가: 리포트 파싱 동등성 점검 스킵 ({type(exc).__name__})']
+
+    mod.log = lambda *_a, **_k: None
+    for i, txt in enumerate(_SHOP_EXT_REPORT_FIXTURES):
+        expected = _legacy_shop_ext_report_parse(mod, txt)
+        actual = mod.parse_report_text_to_df(txt)
+        try:
+            pd.testing.assert_frame_equal(actual, expected)
+        except AssertionError as exc:
+            raise RegressionFailure(f'확장소재 리포트 파싱 결과가 기존과 다릅니다 (fixture #{i}): {str(exc).splitlines()[0]}')
+    return [f'ok | 확장소재 리포트 C 엔진 파싱 = 기존 수동 파싱 ({len(_SHOP_EXT_REPORT_FIXTURES)} fixtures)']
+
+
+_DEVICE_REPORT_HEADER = '일자\t캠페인ID\t광고그룹ID\t키워드ID\t키워드\t광고ID\t매체\tPC Mobile Type\t노출수\t클릭수\t총비용\t전환수\t전환매출액\t순위합\t평균노출순위'
+_DEVICE_REPORT_FIXTURES = [
+    _DEVICE_REPORT_HEADER + '\n'
+    '20260401\tcmp-1\tgrp-1\tkw-1\tk\tnad-1\tnaver\tP\t1,200\t10\t5,000\t1.5\t30000\t0\t2.5\n'
+    '20260401\tcmp-1\tgrp-1\tkw-1\tk\tnad-1\tnaver\tM\t800\t4\t2000\t0\t0\t0\t3\n'
+    '20260401\t\tgrp-1\tkw-2\tk\tnad-2\tnaver\tMOBILE\t10\t1\t100\t\t\t0\t-\n'
+    '20260401\tcmp-1\tgrp-1\tkw-1\tk\tnad-1\tnaver\tP\t5\t0\t1_000\t0\t0\t0\t1\n'
+    '20260401\tcmp-2\tgrp-2\tkw-3\tk\tnad-3\tnaver\ttablet\t5\t0\t0\t0\t0\t0\t1\n'
+    '20260401\tcmp-2\tgrp-2\tkw-3\tk\tnad-3\tnaver\tPC\t0\t0\t0\t0\t0\t0\t0\n'
+    '20260401\tcmp-2\tgrp-2\tkw-3\tk\t-\tnaver\tPC\t1\t0\t0\t0\t0\t0\t0\n'
+    '20260401\tcmp-2\tgrp-2',
+    # 헤더 없이 값으로 컬럼 추정
+    '20260401\tcmp-9\tgrp\tkw\tx\tnad-9\ty\t모바일\t3\t1\t90\t0\t0\tz\t4\n'
+    '20260401\tcmp-9\tgrp\tkw\tx\tnad-9\ty\tdesktop\t2\t0\t10\t1\t500\tz\t1',
+    # 전부 0 / 기기 미상 -> no_rows 진단 메타
+    _DEVICE_REPORT_HEADER + '\n20260401\tcmp-1\tg\tk\tk\tnad-1\tn\tP\t0\t0\t0\t0\t0\t0\t0\n20260401\tcmp-1\tg\tk\tk\tnad-2\tn\t?\t1\t0\t0\t0\t0\t0\t0',
+    '광고ID\tPC Mobile Type\t노출수\nnad-1\tP\t3\nnad-1\tP\t4',
+    '광고ID\t노출수\n-\t1',
+    'a\tb\nc\td',
+]
+
+
+def _device_report_fuzz_fixtures(count: int = 12, rows: int = 200) -> list[str]:
+    import random
+
+    devices = ['P', 'M', 'PC', 'MOBILE', '모바일', '', '-', 'desktop', 'tablet', 'pc web']
+    out = []
+    for seed in range(count):
+        rnd = random.Random(seed)
+        lines = [_DEVICE_REPORT_HEADER] if seed % 3 else []
+        for _ in range(rows):
+            row = [
+                '20260401', rnd.choice([f'cmp-{rnd.randint(1, 5)}', '', '-']), 'grp', 'kw', 'x',
+                rnd.choice([f'nad-{rnd.randint(1, 30)}', '', '-']), 'y', rnd.choice(devices),
+                rnd.choice(['0', str(rnd.randint(0, 1000)), '1,234', '', '-']), str(rnd.randint(0, 5)),
+                rnd.choice(['0', str(rnd.randint(0, 5000))]), rnd.choice(['0', '1.5', '2', '']),
+                str(rnd.randint(0, 50000)), 'z', rnd.choice(['0', '2.5', str(rnd.randint(1, 15)), '']),
+            ]
+            if rnd.random() < 0.05:
+                row = row[:rnd.randint(3, 14)]
+            lines.append('\t'.join(row))
+        out.append('\n'.join(lines))
+    return out
+
+
+def _legacy_device_detect_header_idx(mod, df) -> int:
+    """device_collector_helpers._detect_header_idx 의 기존(행 순회) 동작 재현"""
+    def score(row_vals: list[str]) -> int:
+        norm = mod._normalize_header
+        pk_score = 2 if any(x in row_vals for x in [norm(x) for x in mod.AD_HEADER_CANDIDATES]) else 0
+        device_score = 2 if any(x in row_vals for x in [norm(x) for x in mod.DEVICE_HEADER_CANDIDATES]) else 0
+        metric_hits = sum(1 for x in [norm(x) for x in mod.IMP_HEADER_CANDIDATES + mod.CLK_HEADER_CANDIDATES + mod.COST_HEADER_CANDIDATES] if x in row_vals)
+        return pk_score + device_score + min(metric_hits, 3)
+
+    best_idx, best_score = -1, -1
+    for i in range(min(60, len(df))):
+        s = score([mod._normalize_header(str(x)) for x in df.iloc[i].fillna('')])
+        if s > best_score:
+            best_score, best_idx = s, i
+        if s >= 4:
+            return i
+    return best_idx if best_score >= 2 else -1
+
+
+def _legacy_device_infer_indices(mod, df) -> dict:
+    """device_collector_helpers._infer_value_based_indices 의 기존(셀 순회) 동작 재현"""
+    if df is None or df.empty:
+        return {}
+    sample = df.head(min(120, len(df))).copy()
+    ncols = len(sample.columns)
+    best = {'ad': (-1, -1), 'device': (-1, -1), 'camp': (-1, -1)}
+    for idx in range(ncols):
+        col = sample.iloc[:, idx].fillna('')
+        hits = {
+            'ad': int(sum(1 for v in col if mod._looks_like_ad_id(v))),
+            'device': int(sum(1 for v in col if mod.normalize_device_name(v))),
+            'camp': int(sum(1 for v in col if mod._looks_like_campaign_id(v))),
+        }
+        for k, n in hits.items():
+            if n > best[k][0]:
+                best[k] = (n, idx)
+    defaults = {'ad': mod.DEFAULT_AD_IDX, 'device': mod.DEFAULT_DEVICE_IDX, 'camp': mod.DEFAULT_CAMP_IDX}
+    out = {}
+    for k, (n, idx) in best.items():
+        out[f'{k}_idx'] = idx if n > 0 else (defaults[k] if ncols > defaults[k] else -1)
+        out[f'{k}_hits'] = n
+    for k, idx in [('imp', mod.DEFAULT_IMP_IDX), ('clk', mod.DEFAULT_CLK_IDX), ('cost', mod.DEFAULT_COST_IDX),
+                   ('conv', mod.DEFAULT_CONV_IDX), ('sales', mod.DEFAULT_SALES_IDX), ('rank', mod.DEFAULT_RANK_IDX)]:
+        out[f'{k}_idx'] = idx if ncols > idx else -1
+    return out
+
+
+def _legacy_parse_ad_device_report(mod, df, ad_to_campaign=None):
+    """device_collector_helpers.parse_ad_device_report 의 기존(iterrows) 동작 재현"""
+    if df is None or df.empty:
+        return {}, {}, {'status': 'empty', 'parser': mod.DEVICE_PARSER_VERSION}
+    ad_to_campaign = ad_to_campaign or {}
+    raw_df = df.reset_index(drop=True).copy()
+    header_idx = _legacy_device_detect_header_idx(mod, raw_df)
+    raw_headers: list[str] = []
+    roles = ['ad', 'camp', 'device', 'imp', 'clk', 'cost', 'conv', 'sales', 'rank']
+    if header_idx != -1:
+        raw_headers = mod._nonempty_headers(raw_df.iloc[header_idx])
+        headers = [mod._normalize_header(str(x)) for x in raw_df.iloc[header_idx].fillna('')]
+        data_df = raw_df.iloc[header_idx + 1:].reset_index(drop=True)
+        cands = [mod.AD_HEADER_CANDIDATES, mod.CAMPAIGN_HEADER_CANDIDATES, mod.DEVICE_HEADER_CANDIDATES, mod.IMP_HEADER_CANDIDATES,
+                 mod.CLK_HEADER_CANDIDATES, mod.COST_HEADER_CANDIDATES, mod.CONV_HEADER_CANDIDATES, mod.SALES_HEADER_CANDIDATES, mod.RANK_HEADER_CANDIDATES]
+        idx = {r: mod._get_col_idx(headers, c) for r, c in zip(roles, cands)}
+    else:
+        data_df = raw_df
+        idx = {r: -1 for r in roles}
+    inferred = _legacy_device_infer_indices(mod, data_df if not data_df.empty else raw_df)
+    for r in roles:
+        if idx[r] == -1:
+            idx[r] = inferred.get(f'{r}_idx', -1)
+    if idx['ad'] == -1 or idx['device'] == -1:
+        return {}, {}, {
+            'status': 'missing_required_columns' if header_idx != -1 else 'no_header', 'parser': mod.DEVICE_PARSER_VERSION,
+            'header_idx': header_idx, 'ad_idx': idx['ad'], 'device_idx': idx['device'], 'camp_idx': idx['camp'],
+            'sample_headers': raw_headers[:16], 'infer_ad_hits': inferred.get('ad_hits'), 'infer_device_hits': inferred.get('device_hits'),
+        }
+
+    def cell(row, r, default):
+        return row.iloc[idx[r]] if idx[r] != -1 and len(row) > idx[r] else default
+
+    ad_stats: dict = {}
+    counts = {'scan_rows': 0, 'reject_short': 0, 'reject_empty_ad': 0, 'reject_empty_device': 0, 'reject_zero_metrics': 0}
+    preview_rows = []
+    max_idx = max([x for x in idx.values() if x != -1], default=0)
+    for row_no, (_, row) in enumerate(data_df.iterrows(), start=1):
+        counts['scan_rows'] += 1
+        if len(row) <= max_idx:
+            counts['reject_short'] += 1
+            continue
+        raw_ad_id, raw_device = cell(row, 'ad', ''), cell(row, 'device', '')
+        ad_id = str(raw_ad_id).strip()
+        if not mod._looks_like_ad_id(ad_id):
+            counts['reject_empty_ad'] += 1
+            if len(preview_rows) < 3 and (str(raw_ad_id).strip() or str(raw_device).strip()):
+                preview_rows.append({'row_no': row_no, 'raw_ad': str(raw_ad_id), 'raw_device': str(raw_device), 'reason': 'empty_ad'})
+            continue
+        device_name = mod.normalize_device_name(raw_device)
+        if not device_name:
+            counts['reject_empty_device'] += 1
+            if len(preview_rows) < 3:
+                preview_rows.append({'row_no': row_no, 'raw_ad': str(raw_ad_id), 'raw_device': str(raw_device), 'reason': 'empty_device'})
+            continue
+        imp, clk, cost = (int(mod._safe_float(cell(row, r, 0))) for r in ('imp', 'clk', 'cost'))
+        conv = mod._safe_float(cell(row, 'conv', 0.0))
+        sales = int(mod._safe_float(cell(row, 'sales', 0)))
+        if imp == 0 and clk == 0 and cost == 0 and conv == 0 and sales == 0:
+            counts['reject_zero_metrics'] += 1
+            if len(preview_rows) < 3:
+                preview_rows.append({'row_no': row_no, 'raw_ad': str(raw_ad_id), 'raw_device': str(raw_device), 'device_name': device_name, 'reason': 'zero_metrics'})
+            continue
+        bucket = ad_stats.setdefault((ad_id, device_name), {'campaign_id': '', 'imp': 0, 'clk': 0, 'cost': 0, 'conv': 0.0, 'sales': 0, 'rank_sum': 0.0, 'rank_cnt': 0})
+        campaign_id = str(cell(row, 'camp', '')).strip() if idx['camp'] != -1 else ''
+        bucket['campaign_id'] = bucket.get('campaign_id') or campaign_id or ad_to_campaign.get(ad_id, '')
+        bucket['imp'] += imp
+        bucket['clk'] += clk
+        bucket['cost'] += cost
+        bucket['conv'] += conv
+        bucket['sales'] += sales
+        if idx['rank'] != -1 and len(row) > idx['rank']:
+            rnk = mod._safe_float(row.iloc[idx['rank']])
+            if rnk > 0 and imp > 0:
+                bucket['rank_sum'] += rnk * imp
+                bucket['rank_cnt'] += imp
+    if not ad_stats:
+        meta = {'status': 'no_rows', 'parser': mod.DEVICE_PARSER_VERSION, 'header_idx': header_idx, 'sample_headers': raw_headers[:16]}
+        for r in ['ad', 'camp', 'device', 'imp', 'clk', 'cost', 'conv', 'sales', 'rank']:
+            meta[f'{r}_idx'] = idx[r]
+        meta.update(counts)
+        meta.update({'preview_rows': preview_rows, 'infer_ad_hits': inferred.get('ad_hits'),
+                     'infer_device_hits': inferred.get('device_hits'), 'infer_camp_hits': inferred.get('camp_hits')})
+        return {}, {}, meta
+    campaign_stats: dict = {}
+    missing = 0
+    for (ad_id, device_name), bucket in ad_stats.items():
+        campaign_id = str(bucket.get('campaign_id') or ad_to_campaign.get(ad_id, '')).strip()
+        if not campaign_id:
+            missing += 1
+            continue
+        cb = campaign_stats.setdefault((campaign_id, device_name), {'imp': 0, 'clk': 0, 'cost': 0, 'conv': 0.0, 'sales': 0, 'rank_sum': 0.0, 'rank_cnt': 0})
+        for k in cb:
+            cb[k] += bucket[k]
+    return ad_stats, campaign_stats, {
+        'status': 'ok', 'parser': mod.DEVICE_PARSER_VERSION, 'ad_rows': len(ad_stats), 'campaign_rows': len(campaign_stats),
+        'missing_campaign_rows': missing, 'header_idx': header_idx,
+    }
+
+
+def _same_parse_output(a, b) -> bool:
+    import math
+
+    if isinstance(a, dict) and isinstance(b, dict):
+        return list(a) == list(b) and all(_same_parse_output(a[k], b[k]) for k in a)
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(_same_parse_output(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) or isinstance(b, float):
+        # groupby 합계는 보정 합산이라 마지막 자리 오차만 허용
+        return type(a) is type(b) and math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+    return type(a) is type(b) and a == b
+
+
+def check_device_report_parse_parity(root: Path) -> list[str]:
+    sys.path.insert(0, str(root))
+    try:
+        import collector_api as api
+        import device_collector_helpers as mod
+    except Exception as exc:
+        return [f'note | device_collector_helpers import 불가: 기기 리포트 파싱 동등성 점검 스킵 ({type(exc).__name__})']
+
+    fixtures = _DEVICE_REPORT_FIXTURES + _device_report_fuzz_fixtures()
+    ad_map = {f'nad-{i}': f'cmp-map{i % 4}' for i in range(1, 31) if i % 2}
+    for i, txt in enumerate(fixtures):
+        raw_df = api.parse_report_text_to_df(txt, compact=False)
+        df = api.parse_report_text_to_df(txt)
+        for mapping in (None, ad_map):
+            expected = _legacy_parse_ad_device_report(mod, raw_df, ad_to_campaign=mapping)
+            actual = mod.parse_ad_device_report(df, ad_to_campaign=mapping)
+            if not _same_parse_output(actual, expected):
+                raise RegressionFailure(f'기기 리포트 파싱 결과가 기존과 다릅니다 (fixture #{i}, meta={actual[2].get("status")} vs {expected[2].get("status")})')
+    return [f'ok | 기기 리포트 벡터 파싱 = 기존 iterrows 파싱 ({len(fixtures)} fixtures x ad_to_campaign 유/무)']
+
+
+_MEDIA_REPORT_HEADER = '일자\t캠페인ID\t광고그룹ID\t광고ID\t매체\t지역\tPC Mobile Type\t노출수\t클릭수\t총비용\t전환수\t전환매출액'
+
+
+def _media_report_fixtures(count: int = 10, rows: int = 150) -> list[str]:
+    import random
+
+    out = [
+        _MEDIA_REPORT_HEADER + '\n20260401\tcmp-1\tg\tnad-1\tnaver\t서울\tP\t1,200\t3\t2.5\t1.5\t9000\n'
+        '20260401\t\tg\tnad-2\t-\t\tM\t10\t1\t3.5\t\t\n20260401\tcmp-9\tg\t\tnan\t부산\ttablet\t1\t0\t0\t0\t0\n20260401\tcmp-1',
+        '광고ID\t매체\t노출수\t클릭수\t총비용\nnad-1\tblog\t5\t1\t100\nnad-3\t\t7\t0\t0',
+    ]
+    for seed in range(count):
+        rnd = random.Random(seed)
+        lines = [_MEDIA_REPORT_HEADER]
+        for _ in range(rows):
+            row = [
+                '20260401', rnd.choice([f'cmp-{rnd.randint(1, 6)}', '', '-']), 'grp', rnd.choice([f'nad-{rnd.randint(1, 40)}', '']),
+                rnd.choice(['naver', '네이버 블로그', '', '-', 'nan', 'None']), rnd.choice(['서울', '부산', '']),
+                rnd.choice(['P', 'M', '모바일', 'PC', 'tablet', '', 'desktop']), rnd.choice(['0', str(rnd.randint(0, 900)), '1,234', '']),
+                str(rnd.randint(0, 9)), rnd.choice([str(rnd.randint(0, 9000)), '2.5', '3.5']), rnd.choice(['0', '1.5', '']), str(rnd.randint(0, 9999)),
+            ]
+            if rnd.random() < 0.05:
+                row = row[:rnd.randint(2, 11)]
+            lines.append('\t'.join(row))
+        out.append('\n'.join(lines))
+    return out
+
+
+def _legacy_media_header_rows(mod, df, target_date, customer_id, ad_to_campaign, campaign_type_map, allowed_campaign_ids=None):
+    """collector_media.parse_media_report_rows 헤더 모드의 기존(iterrows) 집계 재현 (rows, 집계 카운터)"""
+    raw_df = df.reset_index(drop=True).copy()
+    header_idx = mod._detect_media_header_idx(raw_df)
+    headers = [mod._m_normalize_header(x) for x in raw_df.iloc[header_idx].fillna('').tolist()]
+    data_df = raw_df.iloc[header_idx + 1:].reset_index(drop=True)
+    idx = {
+        'ad': mod._m_get_col_idx(headers, mod.AD_HEADER_CANDIDATES_LOCAL),
+        'camp': mod._m_get_col_idx(headers, ['캠페인id', 'campaignid', 'ncccampaignid']),
+        'media': mod._m_get_col_idx(headers, mod.MEDIA_HEADER_CANDIDATES),
+        'region': mod._m_get_col_idx(headers, mod.REGION_HEADER_CANDIDATES),
+        'device': mod._m_get_col_idx(headers, mod.DEVICE_HEADER_CANDIDATES_LOCAL),
+        'imp': mod._m_get_col_idx(headers, mod.IMP_HEADER_CANDIDATES_LOCAL),
+        'clk': mod._m_get_col_idx(headers, mod.CLK_HEADER_CANDIDATES_LOCAL),
+        'cost': mod._m_get_col_idx(headers, mod.COST_HEADER_CANDIDATES_LOCAL),
+        'conv': mod._m_get_col_idx(headers, mod.CONV_HEADER_CANDIDATES_LOCAL),
+        'sales': mod._m_get_col_idx(headers, mod.SALES_HEADER_CANDIDATES_LOCAL),
+    }
+
+    def cell(row, k, default=''):
+        return row.iloc[idx[k]] if idx[k] != -1 and len(row) > idx[k] else default
+
+    agg: dict = {}
+    counts = {'row_count': 0, 'mapped_rows': 0, 'short_rows': 0, 'missing_campaign_rows': 0, 'filtered_rows': 0}
+    max_idx = max([x for x in idx.values() if x != -1], default=0)
+    for _, row in data_df.iterrows():
+        counts['row_count'] += 1
+        if len(row) <= max_idx:
+            counts['short_rows'] += 1
+            continue
+        campaign_id = ''
+        if idx['ad'] != -1:
+            campaign_id = str(ad_to_campaign.get(str(cell(row, 'ad')).strip(), '') or '').strip()
+        if not campaign_id and idx['camp'] != -1:
+            campaign_id = str(cell(row, 'camp')).strip()
+        if not campaign_id:
+            counts['missing_campaign_rows'] += 1
+            continue
+        if allowed_campaign_ids is not None and campaign_id not in allowed_campaign_ids:
+            counts['filtered_rows'] += 1
+            continue
+        counts['mapped_rows'] += 1
+        raw_device = cell(row, 'device')
+        key = (
+            campaign_type_map.get(campaign_id, '기타'),
+            mod._m_safe_text(cell(row, 'media'), '전체'),
+            mod._m_safe_text(cell(row, 'region'), '전체'),
+            mod.normalize_device_name(raw_device) or mod._m_safe_text(raw_device, '전체'),
+        )
+        bucket = agg.setdefault(key, {'imp': 0, 'clk': 0, 'cost': 0, 'conv': 0.0, 'sales': 0})
+        for k in ('imp', 'clk', 'cost', 'sales'):
+            bucket[k] += int(round(mod._m_safe_float(cell(row, k, 0))))
+        bucket['conv'] += float(mod._m_safe_float(cell(row, 'conv', 0)))
+    rows, _ = mod._finalize_media_rows(agg, target_date, customer_id, data_source='ad_report_dimension')
+    return rows, counts
+
+
+def check_media_report_parse_parity(root: Path) -> list[str]:
+    sys.path.insert(0, str(root))
+    try:
+        import collector_api as api
+        import collector_media as mod
+    except Exception as exc:
+        return [f'note | collector_media import 불가: 매체 리포트 집계 동등성 점검 스킵 ({type(exc).__name__})']
+
+    mod.log = lambda *_a, **_k: None
+    ad_map = {f'nad-{i}': f'cmp-{i % 7}' for i in range(1, 41) if i % 3}
+    type_map = {f'cmp-{i}': t for i, t in enumerate(['파워링크', '쇼핑검색', '파워컨텐츠', '브랜드검색', '플레이스'])}
+    fixtures = _media_report_fixtures()
+    dt = date(2026, 4, 1)
+    for i, txt in enumerate(fixtures):
+        raw_df = api.parse_report_text_to_df(txt, compact=False)
+        df = api.parse_report_text_to_df(txt)
+        for allowed in (None, {'cmp-1', 'cmp-2', 'cmp-6'}):
+            expected_rows, expected_counts = _legacy_media_header_rows(mod, raw_df, dt, 'c1', ad_map, type_map, allowed)
+            rows, diag = mod.parse_media_report_rows(df, dt, 'c1', ad_map, type_map, allowed_campaign_ids=allowed)
+            counts = {k: diag.get(k) for k in expected_counts}
+            if rows != expected_rows or counts != expected_counts:
+                raise RegressionFailure(f'매체 리포트 집계가 기존과 다릅니다 (fixture #{i}, counts={counts} vs {expected_counts})')
+
+    total = [{'campaign_id': 'cmp-1', 'imp': 10, 'clk': 1, 'cost': 100, 'conv': 1.0, 'sales': 500}, {'campaign_id': 'cmp-4', 'imp': 5, 'clk': 0, 'cost': 0, 'conv': 0.0, 'sales': 0}]
+    def _no_db_reread(*_a, **_k):
+        raise RegressionFailure('in-run 캠페인 합계가 있는데 fact_campaign_daily 를 다시 조회합니다')
+
+    orig = (mod.replace_media_fact_range, mod.build_media_rows_from_campaign_total_db)
+    mod.replace_media_fact_range = lambda _engine, rows, *_a, **_k: len(rows)
+    mod.build_media_rows_from_campaign_total_db = _no_db_reread
+    try:
+        n, meta = mod.collect_media_fact(None, 'c1', dt, None, {}, type_map, None, campaign_total_rows=total)
+    finally:
+        mod.replace_media_fact_range, mod.build_media_rows_from_campaign_total_db = orig
+    if n != 2 or meta.get('selected_source') != 'campaign_total_fallback':
+        raise RegressionFailure(f'캠페인 합계 fallback 결과가 다릅니다: n={n} meta={meta}')
+    return [f'ok | 매체 리포트 groupby 집계 = 기존 iterrows 집계 ({len(fixtures)} fixtures), 캠페인 합계 fallback 은 실행 중 행 재사용']
+
+
+_COMPACT_EDGE_FIXTURE = (
+    '20260401\tcmp-1\tgrp-1\tnkw-1\tnad-1\t007\t1,234\t2.50\t3\t12\t9876543210\t0.5\n'
+    '20260401\tcmp-1\tgrp-1\t-\tnad-2\t008\t5\t1.25\t\t7\t9876543211\t1.5\n'
+    '20260401\tcmp-2\tgrp-2\tnkw-2\tnad-3\t009\t-\t3\t4\t-3\t9876543212\t2\n'
+)
+
+
+def check_report_frame_compaction(root: Path) -> list[str]:
+    sys.path.insert(0, str(root))
+    try:
+        import collector_api as api
+        import collector_parsers as parsers_mod
+        from mock_naver_api import ScaleSpec, SyntheticAccount, build_report_tsv
+    except Exception as exc:
+        return [f'note | collector_parsers import 불가: 리포트 프레임 compact 점검 스킵 ({type(exc).__name__})']
+
+    parsers_mod.log = lambda *_a, **_k: None
+    account = SyntheticAccount('9200001', ScaleSpec(6, 4, 20, 2, 0.5))
+    ad_txt = build_report_tsv(account, 'AD', '20260401')
+    fixtures = {
+        'AD': ad_txt,
+        'AD_HEADERLESS': ad_txt.split('\n', 1)[1],
+        'AD_CONVERSION': build_report_tsv(account, 'AD_CONVERSION', '20260401'),
+        'SHOPPINGKEYWORD_CONVERSION_DETAIL': build_report_tsv(account, 'SHOPPINGKEYWORD_CONVERSION_DETAIL', '20260401'),
+        'EDGE': _COMPACT_EDGE_FIXTURE,
+    }
+    dt = date(2026, 4, 1)
+    for name, txt in fixtures.items():
+        raw = api.parse_report_text_to_df(txt, compact=False)
+        df = api.parse_report_text_to_df(txt)
+        if not raw.isna().equals(df.isna()) or not raw.astype(object).map(str).equals(df.astype(object).map(str)):
+            raise RegressionFailure(f'{name}: compact 후 셀 문자열이 원문과 다릅니다')
+        for i in range(len(raw)):
+            if [str(x) for x in raw.iloc[i].tolist()] != [str(x) for x in df.iloc[i].tolist()]:
+                raise RegressionFailure(f'{name}: compact 후 {i}번째 행 값이 원문과 다릅니다')
+        if name.startswith('AD') and name != 'AD_CONVERSION':
+            if parsers_mod.parse_base_report(df, 'AD') != parsers_mod.parse_base_report(raw, 'AD'):
+                raise RegressionFailure(f'{name}: compact 프레임의 AD 집계가 다릅니다')
+        if name == 'AD_CONVERSION':
+            args = (None, 'AD_CONVERSION', {}, {}, None, 'fixture', '2026-04-01')
+            if parsers_mod.process_conversion_report(df, *args, fast_mode=True) != parsers_mod.process_conversion_report(raw, *args, fast_mode=True):
+                raise RegressionFailure('AD_CONVERSION: compact 프레임의 전환 분리 집계가 다릅니다')
+        if name == 'SHOPPINGKEYWORD_CONVERSION_DETAIL':
+            if parsers_mod.parse_shopping_query_report(df, dt, '9200001') != parsers_mod.parse_shopping_query_report(raw, dt, '9200001'):
+                raise RegressionFailure('쇼핑검색어: compact 프레임 집계가 다릅니다')
+
+    headerless = api.parse_report_text_to_df(fixtures['AD_HEADERLESS'])
+    dtypes = [str(t) for t in headerless.dtypes]
+    if dtypes[2:6] != ['category'] * 4 or dtypes[9] != 'int32':
+        raise RegressionFailure(f'헤더 없는 AD 리포트 dtype 이 예상과 다릅니다: {dtypes}')
+    raw_mb = api.parse_report_text_to_df(fixtures['AD_HEADERLESS'], compact=False).memory_usage(deep=True).sum()
+    if headerless.memory_usage(deep=True).sum() >= raw_mb:
+        raise RegressionFailure('compact 프레임이 원본보다 작지 않습니다')
+    edge = api.parse_report_text_to_df(_COMPACT_EDGE_FIXTURE)
+    # "007"/"1,234"/"2.50"/빈칸 섞인 정수/"2" 섞인 소수 컬럼은 숫자로 바꾸면 문자열이 달라지므로 원문 유지
+    kinds = [getattr(t, 'kind', 'O') for t in edge.dtypes]
+    if any(kinds[i] in 'iuf' for i in (5, 6, 7, 8, 11)) or [str(edge.dtypes[i]) for i in (9, 10)] != ['int32', 'int64']:
+        raise RegressionFailure(f'compact 숫자 변환 대상이 예상과 다릅니다: {[str(t) for t in edge.dtypes]}')
+
+    runner_text = (root / 'collector_runner.py').read_text(encoding='utf-8')
+    if runner_text.count('dfs.clear()') < 2 or 'ad_report_df = None' not in runner_text:
+        raise RegressionFailure('process_account 가 단계가 끝난 리포트 프레임을 놓지 않습니다')
+    return [f'ok | 리포트 프레임 compact(category/int32) 후 셀 문자열·파서 결과 동일 ({len(fixtures)} fixtures)']
+
+
+def check_collector_stage_timing(root: Path) -> list[str]:
+    sys.path.insert(0, str(root))
+    import collector_timing as mod
+
+    runner_text = (root / 'collector_runner.py').read_text(encoding='utf-8')
+    db_text = (root / 'collector_db.py').read_text(encoding='utf-8')
+    if 'timing.mark(stage)' not in runner_text or 'end_account(timing, result)' not in runner_text:
+        raise RegressionFailure('collector_runner.process_account 단계 타이밍 훅이 없습니다')
+    if 'stage_span("db_write"' not in db_text:
+        raise RegressionFailure('collector_db._execute_values_in_chunks db_write span 이 없습니다')
+
+    with mod.stage_span('outside'):
+        pass
+    prev_trace = mod.STAGE_TRACE_FILE
+    mod.set_trace_path('')
+    try:
+        result: dict = {}
+        timer = mod.begin_account('1234567', 'fixture', '2026-04-01')
+        timer.mark('fetch_reports')
+        with mod.stage_span('report_download'):
+            with mod.stage_span('report_parse'):
+                pass
+        timer.mark('save_stats_and_breakdowns')
+        with mod.stage_span('db_write', table='fact_ad_daily'):
+            pass
+        with mod.stage_span('db_write', table='fact_keyword_daily'):
+            pass
+        mod.end_account(timer, result)
+    finally:
+        mod.set_trace_path(prev_trace)
+    if mod.current_timer() is not None:
+        raise RegressionFailure('end_account 후에도 스레드 타이머가 남아 있습니다')
+    stages = set(result.get('stage_sec') or {})
+    expected = {'fetch_reports', 'report_download', 'report_parse', 'save_stats_and_breakdowns', 'db_write'}
+    if stages != expected or result['stage_calls'].get('db_write') != 2:
+        raise RegressionFailure(f'단계 집계가 다릅니다: {sorted(stages)} calls={result.get("stage_calls")}')
+    # 배타 시간 합이 계정 wall time 을 넘으면 중첩 span 이 이중 집계된 것
+    if sum(result['stage_sec'].values()) > result['elapsed_sec'] + 0.005:
+        raise RegressionFailure('중첩 span 이 이중 집계됐습니다')
+    summary = mod.summarize_stage_timings([result, {'status': 'error'}])
+    if summary['accounts'] != 1 or {s['stage'] for s in summary['stages']} != expected:
+        raise RegressionFailure('summarize_stage_timings 집계가 다릅니다')
+    return ['ok | collector 단계 타이밍 span 배타 집계/요약 유지']
+
+
+def check_perf_telemetry_sink(root: Path) -> list[str]:
+    data_text = (root / 'data.py').read_text(encoding='utf-8')
+    if data_text.count('@perf_timed(') < 5:
+        raise RegressionFailure('data.py 대시보드 로더에 perf_timed 계측이 빠졌습니다')
+    try:
+        import streamlit  # noqa: F401
+    except ImportError:
+        return ['skip | streamlit 미설치로 perf telemetry sink 왕복 검사 생략']
+    import tempfile
+    import time
+
+    sys.path.insert(0, str(root))
+    import perf_utils as mod
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f'sqlite:///{tmp}/perf.db'
+        sink = mod.PerfTelemetrySink(url, batch=16, flush_sec=0.2)
+        now = time.time()
+        for i in range(40):
+            sink.emit({'ts': now, 'session_id': 's1', 'page': '요약', 'kind': 'loader', 'label': 'fixture_loader', 'elapsed_ms': float(i + 1), 'row_count': 10, 'extra': '{}'})
+        sink.emit({'ts': now, 'session_id': 's1', 'page': '요약', 'kind': 'page', 'label': '요약', 'elapsed_ms': 900.0, 'row_count': None, 'extra': '{}'})
+        if not sink.flush(10) or sink.written != 41:
+            raise RegressionFailure(f'perf telemetry flush 실패 (written={sink.written}, failed={sink.failed})')
+        by_label = mod.load_perf_summary('label', 1, url=url)
+        by_page = mod.load_perf_summary('page', 1, url=url)
+    if by_label.empty or int(by_label['calls'].iloc[0]) != 40 or by_page.empty or by_page['page'].iloc[0] != '요약':
+        raise RegressionFailure('perf telemetry p50/p95 집계가 다릅니다')
+    return ['ok | perf telemetry sink 배치 기록/로더·페이지 p50/p95 집계 유지']
+
+
+def check_dashboard_index_specs(root: Path) -> list[str]:
+    sys.path.insert(0, str(root))
+    import db_indexes as mod
+
+    if 'ensure_dashboard_indexes' in (root / 'collector_db.py').read_text(encoding='utf-8'):
+        raise RegressionFailure('collector_db.ensure_tables 가 수집 시작 때 대시보드 인덱스를 만듭니다 (설정 화면/점검 스크립트에서만 생성)')
+    metrics = {'imp', 'clk', 'cost', 'conv', 'sales', 'avg_rnk', 'total_conv', 'total_sales', 'bizmoney_balance'}
+    covered = [s.name for s in mod.DASHBOARD_INDEX_SPECS if s.table.startswith('fact_') and s.table != 'fact_bizmoney_daily' and metrics & set(s.include_columns)]
+    if covered:
+        raise RegressionFailure(f'fact 인덱스 INCLUDE 에 수집 시 갱신되는 지표가 있습니다 (HOT update 불가): {covered}')
+    return ['ok | 대시보드 인덱스는 수집 경로 밖에서만 생성, fact 인덱스에 지표 INCLUDE 없음']
+
+
+def check_media_monthly_backfill_contract(root: Path) -> list[str]:
+    db_text = (root / 'collector_db.py').read_text(encoding='utf-8')
+    media_text = (root / 'collector_media.py').read_text(encoding='utf-8')
+    if 'seed_media_monthly_rollup' in db_text or 'backfill_media_monthly_rollup' in db_text:
+        raise RegressionFailure('collector_db.ensure_tables 가 수집 시작 때 fact_media_monthly 전체 스캔을 합니다 (명시적 채우기 단계로만 실행)')
+    if 'def backfill_media_monthly_rollup(' not in media_text or 'NOT EXISTS' not in media_text.split('_MEDIA_MONTHLY_BACKFILL_TARGETS', 1)[-1].split('def ', 1)[0]:
+        raise RegressionFailure('fact_media_monthly 채우기가 계정-월 커버리지 기준이 아닙니다')
+    if '--backfill_media_monthly' not in (root / 'collector.py').read_text(encoding='utf-8') or 'backfill_media_monthly_rollup' not in (root / 'view_settings.py').read_text(encoding='utf-8'):
+        raise RegressionFailure('fact_media_monthly 채우기 진입점(collector.py 옵션 / 설정 버튼)이 없습니다')
+    return ['ok | fact_media_monthly 는 계정-월 커버리지 기준 명시적 채우기, 수집 시작 때 전체 스캔 없음']
+
+
+def check_keyword_comparison_cache_key(root: Path) -> list[str]:
+    text = (root / 'view_keyword.py').read_text(encoding='utf-8')
+    if 'base_sig = frame_cache_sig(base_bundle' not in text or 'view_sig, base_sig)' not in text:
+        raise RegressionFailure('키워드 기간 비교 세션 캐시 키에 비교 기간 데이터가 빠져 있습니다')
+    sys.path.insert(0, str(root))
+    try:
+        import pandas as pd
+        from page_helpers import frame_cache_sig
+    except Exception as exc:
+        return [f'note | page_helpers import 불가: 비교 캐시 키 점검 스킵 ({type(exc).__name__})']
+
+    keys = ['customer_id', 'adgroup_id', '키워드']
+    cols = keys + ['imp', 'clk', 'cost', 'conv', 'sales', 'avg_rank']
+    base = pd.DataFrame({'customer_id': ['1', '1'], 'adgroup_id': ['g1', 'g2'], '키워드': ['a', 'b'], 'imp': [10, 20], 'clk': [1, 2], 'cost': [100.0, 200.0], 'conv': [0.0, 1.0], 'sales': [0.0, 5000.0]})
+    # 행 수·광고비 합계는 그대로이고 전환/키만 바뀐 비교 기간 데이터
+    conv_changed = base.assign(conv=[1.0, 0.0])
+    key_changed = base.assign(adgroup_id=['g2', 'g1'])
+    sigs = {frame_cache_sig(df, cols) for df in (base, conv_changed, key_changed)}
+    if len(sigs) != 3 or frame_cache_sig(base.copy(), cols) != frame_cache_sig(base, cols):
+        raise RegressionFailure(f'frame_cache_sig 가 비교 기간 데이터 변경을 구분하지 못합니다: {sigs}')
+    return ['ok | 키워드 기간 비교 세션 캐시 키가 현재/비교 기간 프레임 내용을 모두 반영']
+
+
+def check_check_off_full_scan(root: Path) -> list[str]:
+    sys.path.insert(0, str(root))
+    try:
+        import check_off as mod
+    except Exception as exc:
+        return [f'note | check_off import 불가: 광고그룹 주기 전체 스캔 점검 스킵 ({type(exc).__name__})']
+
+    camps = [{'nccCampaignId': 'c1', 'status': 'ELIGIBLE'}]
+    grps = [
+        {'nccAdgroupId': 'g1', 'nccCampaignId': 'c1', 'status': 'ELIGIBLE'},
+        # 캠페인은 그대로인데 새로 자체 예산을 켠 광고그룹
+        {'nccAdgroupId': 'g2', 'nccCampaignId': 'c1', 'status': 'ELIGIBLE', 'useDailyBudget': True, 'dailyBudget': 1000},
+    ]
+    calls: list[tuple] = []
+
+    def fake_get_data(cid, path, params=None):
+        calls.append((path, dict(params or {})))
+        return camps if path == '/ncc/campaigns' else [g for g in grps if not params or g['nccCampaignId'] == params.get('nccCampaignId')]
+
+    def entry(etype, item, parent=''):
+        fields = mod.CAMPAIGN_FP_FIELDS if etype == 'campaign' else mod.ADGROUP_FP_FIELDS
+        return {'parent_id': parent, 'fingerprint': mod.fingerprint(item, fields), 'is_off': False, 'off_dt': None, 'own_budget': False}
+
+    scan_kst = datetime(2026, 4, 2, 9, 0)
+    state = {
+        ('campaign', 'c1'): entry('campaign', camps[0]),
+        ('campaign', 'c_gone'): entry('campaign', {'nccCampaignId': 'c_gone'}),
+        ('adgroup', 'g1'): entry('adgroup', grps[0], 'c1'),
+        ('adgroup', 'g_gone'): entry('adgroup', {'nccAdgroupId': 'g_gone'}, 'c_gone'),
+    }
+    saved = mod.get_data
+    mod.get_data = fake_get_data
+    try:
+        recent = dict(state)
+        recent[mod.FULL_SCAN_MARKER] = {'parent_id': '', 'fingerprint': (scan_kst - timedelta(hours=1)).strftime(mod.FULL_SCAN_TS_FMT), 'is_off': False, 'off_dt': None, 'own_budget': False}
+        _, _, rows, stale = mod.scan_account('9300001', recent, scan_kst.date(), scan_kst)
+        if any(path == '/ncc/adgroups' for path, _ in calls) or rows or stale:
+            raise RegressionFailure(f'전체 스캔 주기 전인데 광고그룹을 조회/정리합니다: calls={calls} rows={rows} stale={stale}')
+
+        for label, marker in (('KST 날짜 변경', (scan_kst - timedelta(hours=1, days=1))), ('시간 경과', scan_kst - timedelta(hours=mod.ADGROUP_FULL_SCAN_HOURS)), ('마커 없음', None)):
+            calls.clear()
+            due = dict(state)
+            if marker is not None:
+                due[mod.FULL_SCAN_MARKER] = {'parent_id': '', 'fingerprint': marker.strftime(mod.FULL_SCAN_TS_FMT), 'is_off': False, 'off_dt': None, 'own_budget': False}
+            _, _, rows, stale = mod.scan_account('9300001', due, scan_kst.date(), scan_kst)
+            if ('/ncc/adgroups', {}) not in calls:
+                raise RegressionFailure(f'{label}: 광고그룹 전체 목록을 다시 받지 않습니다: {calls}')
+            by_key = {(r[1], r[2]): r for r in rows}
+            if ('adgroup', 'g2') not in by_key or not by_key[('adgroup', 'g2')][7]:
+                raise RegressionFailure(f'{label}: 변경 없는 캠페인 아래 새 자체 예산 광고그룹을 놓칩니다')
+            if by_key.get(mod.FULL_SCAN_MARKER, (None,) * 5)[4] != scan_kst.strftime(mod.FULL_SCAN_TS_FMT):
+                raise RegressionFailure(f'{label}: 전체 스캔 시각 마커가 기록되지 않습니다')
+            if sorted(stale) != [('9300001', 'adgroup', 'g_gone'), ('9300001', 'campaign', 'c_gone')]:
+                raise RegressionFailure(f'{label}: 사라진 캠페인/광고그룹 상태 정리 대상이 다릅니다: {stale}')
+    finally:
+        mod.get_data = saved
+
+    text = (root / 'check_off.py').read_text(encoding='utf-8')
+    if 'DELETE FROM check_off_state' not in text:
+        raise RegressionFailure('write_results 가 사라진 대상의 check_off_state 행을 지우지 않습니다')
+    return [f'ok | check_off 광고그룹 전체 스캔: KST 하루 첫 실행/{mod.ADGROUP_FULL_SCAN_HOURS}시간마다, 사라진 대상 상태 정리']
+
+
+def check_debug_artifact_policy(root: Path) -> list[str]:
+    import gzip
+    import tempfile
+
+    sys.path.insert(0, str(root))
+    import collector_debug as mod
+
+    runner_text = (root / 'collector_runner.py').read_text(encoding='utf-8')
+    shop_ext_text = (root / 'collector_shop_ext.py').read_text(encoding='utf-8')
+    if 'end_debug_scope(debug_scope, failed=' not in runner_text or 'end_debug_scope(debug_scope, failed=' not in shop_ext_text:
+        raise RegressionFailure('collector_runner/collector_shop_ext process_account debug scope 훅이 없습니다')
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = mod.DebugArtifactWriter(compression='gzip', max_mb=0)
+        prev_writer = mod._writer
+        mod._writer = writer
+        try:
+            for idx, failed in enumerate([False, True]):
+                scope = mod.begin_debug_scope(f'cid{idx}', '2026-04-01')
+                mod.save_debug_artifact(Path(tmp) / 'fail', f'r{idx}.txt', 'payload', policy='failures')
+                mod.end_debug_scope(scope, failed=failed)
+            mod.save_debug_artifact(Path(tmp) / 'all', 'r.csv', '한글,값', encoding='utf-8-sig', policy='all')
+            stats = mod.flush_debug_artifacts(10)
+        finally:
+            mod._writer = prev_writer
+        kept = sorted(p.name for p in (Path(tmp) / 'fail').iterdir())
+        csv_bytes = gzip.decompress((Path(tmp) / 'all' / 'r.csv.gz').read_bytes())
+    if kept != ['r1.txt.gz'] or stats.get('skipped') != 1:
+        raise RegressionFailure(f'failures 정책이 실패 계정만 남기지 않습니다: {kept} {stats}')
+    if csv_bytes.decode('utf-8-sig') != '한글,값':
+        raise RegressionFailure('압축 debug artifact 원문이 보존되지 않습니다')
+
+    # shop_ext 처럼 리포트 다운로드를 worker 스레드로 넘겨도 계정 scope(failures/sample)를 따라야 한다.
+    if 'copy_context().run, fetch_stat_report' not in shop_ext_text:
+        raise RegressionFailure('collector_shop_ext 리포트 다운로드가 debug scope context 없이 worker 스레드로 제출됩니다')
+    import concurrent.futures
+    import contextvars
+
+    with tempfile.TemporaryDirectory() as tmp:
+        writer = mod.DebugArtifactWriter(compression='none', max_mb=0)
+        prev_writer = mod._writer
+        mod._writer = writer
+        try:
+            scope = mod.begin_debug_scope('cid-worker', '2026-04-01')
+            with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+                futs = [
+                    executor.submit(contextvars.copy_context().run, mod.save_debug_artifact, Path(tmp) / 'worker', f'w{i}.txt', 'payload', policy='failures')
+                    for i in range(2)
+                ]
+                for fut in futs:
+                    fut.result()
+            pending = len(scope.pending)
+            mod.end_debug_scope(scope, failed=True)
+            expected_sample = []
+            for key_date in [f'2026-04-{d:02d}' for d in range(1, 21)]:
+                scope = mod.begin_debug_scope('cid-sample', key_date)
+                if mod._sampled(scope.key):
+                    expected_sample.append(f'{key_date}.txt')
+                with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+                    executor.submit(contextvars.copy_context().run, mod.save_debug_artifact, Path(tmp) / 'sample', f'{key_date}.txt', 'x', policy='sample').result()
+                mod.end_debug_scope(scope, failed=False)
+            stats = mod.flush_debug_artifacts(10)
+        finally:
+            mod._writer = prev_writer
+        worker_kept = sorted(p.name for p in (Path(tmp) / 'worker').iterdir()) if (Path(tmp) / 'worker').exists() else []
+        sample_kept = sorted(p.name for p in (Path(tmp) / 'sample').iterdir()) if (Path(tmp) / 'sample').exists() else []
+    if pending != 2 or worker_kept != ['w0.txt', 'w1.txt']:
+        raise RegressionFailure(f'worker 스레드에서 저장한 debug artifact 가 계정 scope 에 담기지 않습니다: pending={pending} kept={worker_kept} {stats}')
+    if sample_kept != expected_sample:
+        raise RegressionFailure(f'worker 스레드 sample 정책이 계정/날짜 키로 결정되지 않습니다: {sample_kept} != {expected_sample}')
+
+    # 일별 재실행으로 같은 이름을 다시 쓰면 기존 항목을 대체해야 하고, prune 이 새 파일을 지우면 안 된다.
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / 'A.csv').write_bytes(b'x' * 60)
+        writer = mod.DebugArtifactWriter(compression='none', max_mb=104 / (1024 * 1024))
+        writer._write(Path(tmp), 'A.csv', b'y' * 60)
+        state = writer._dirs[Path(tmp)]
+        survived = (Path(tmp) / 'A.csv').exists()
+    if not survived or writer.stats['pruned'] or len(state['files']) != 1 or state['bytes'] != 60:
+        raise RegressionFailure(f'같은 이름 debug artifact 재기록 시 prune 이 새 파일을 지웁니다: stats={writer.stats} bytes={state["bytes"]}')
+    return ['ok | debug report 백그라운드 압축 저장/failures 정책 유지']
+
+
+def check_mock_stats_report_parity(root: Path) -> list[str]:
+    try:
+        sys.path.insert(0, str(root))
+        import pandas as pd
+        from mock_naver_api import AD_REPORT_HEADER, ScaleSpec, SyntheticAccount, build_report_tsv, stats_totals
+    except Exception as exc:
+        return [f'note | mock_naver_api import 불가: 목 /stats-리포트 합계 점검 스킵 ({type(exc).__name__})']
+    import io
+
+    acc = SyntheticAccount('9100001', ScaleSpec(3, 2, 4, 2, 0.34), 0)
+    df = pd.read_csv(io.StringIO(build_report_tsv(acc, 'AD', '20260401')), sep='\t', header=0, dtype={c: str for c in AD_REPORT_HEADER[:9]})
+    totals = stats_totals(acc, '20260401')
+    checked = 0
+    for id_col in ['캠페인ID', '광고그룹ID', '키워드ID', '광고ID']:
+        grouped = df[df[id_col] != '-'].groupby(id_col)[['노출수', '클릭수', '총비용', '전환수', '전환매출액']].sum()
+        for obj_id, row in grouped.iterrows():
+            got = totals.get(obj_id) or {}
+            if [got.get(k) for k in ('imp', 'clk', 'cost', 'conv', 'sales')] != [int(v) for v in row.tolist()]:
+                raise RegressionFailure(f'목 /stats 합계가 AD 리포트 행 합계와 다릅니다: {id_col}={obj_id}')
+            checked += 1
+    return [f'ok | 목 /stats = AD 리포트 행 합계 ({checked} ids)']
+
+
+def check_gfa_crawl_fixture(root: Path) -> list[str]:
+    import json
+    import tempfile
+    import threading
+    from functools import partial
+    from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+    try:
+        sys.path.insert(0, str(root))
+        import collector_gfa as mod
+    except Exception as exc:
+        return [f'note | collector_gfa import 불가: GFA 크롤러 픽스처 점검 스킵 ({type(exc).__name__})']
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, *args) -> None:
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(QuietHandler, directory=str(root / 'fixtures' / 'gfa_crawl')))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    patched = {
+        'GFA_LOGIN_URL': f'{base}/nidlogin.html',
+        'ADS_HOME_URL': f'{base}/index.html',
+        'GFA_PLATFORM_URL': f'{base}/index.html',
+        'GFA_PLATFORM_FALLBACK_URLS': [],
+        'GFA_PLAYWRIGHT_TIMEOUT_MS': 10000,
+    }
+    saved = {name: getattr(mod, name) for name in [*patched, 'GFA_DEBUG_DIR', 'GFA_DOWNLOAD_DIR']}
+    target_dt = date(2026, 4, 1)
+    accounts = [{'id': '1001', 'name': '픽스처A'}, {'id': '1002', 'name': '픽스처B'}]
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, value in {**patched, 'GFA_DEBUG_DIR': Path(tmp) / 'debug', 'GFA_DOWNLOAD_DIR': Path(tmp) / 'downloads'}.items():
+                setattr(mod, name, value)
+            state_path = Path(tmp) / 'storage_state.json'
+            crawler = mod.GfaCrawler(headless=True)
+            try:
+                crawler.__enter__()
+            except Exception as exc:
+                crawler.__exit__(None, None, None)
+                return [f'note | playwright/chromium 실행 불가: GFA 크롤러 픽스처 점검 스킵 ({type(exc).__name__})']
+            try:
+                if not crawler.ensure_session('fixture', 'fixture', state_path) or not state_path.is_file():
+                    raise RegressionFailure('픽스처 로그인 후 세션 파일이 저장되지 않았습니다')
+                report_path = mod.crawl_account_report(crawler, accounts[0], target_dt)
+                page_state = crawler.page.locator('#current-account')
+                picked = (page_state.get_attribute('data-cid'), page_state.get_attribute('data-level'), page_state.get_attribute('data-range'))
+                parsed = mod.parse_gfa_report(mod.read_report_file(report_path), '1001', '픽스처A', target_dt)
+            finally:
+                crawler.__exit__(None, None, None)
+            if picked != ('1001', 'creative', '2026-04-01~2026-04-01'):
+                raise RegressionFailure(f'픽스처 계정/단위/날짜 선택 결과가 다릅니다: {picked}')
+            if len(parsed[-1]) != 2 or sum(r['imp'] for r in parsed[-1]) != 2000:
+                raise RegressionFailure(f'픽스처 리포트 소재 행 파싱 결과가 다릅니다: {parsed[-1]}')
+
+            # 시작 때 확인한 세션이 실행 중 만료된 상황: 두 워커가 함께 만료를 만나도 재로그인은 한 번만 한다.
+            state = json.loads(state_path.read_text(encoding='utf-8'))
+            state['cookies'] = []
+            state_path.write_text(json.dumps(state), encoding='utf-8')
+            session = mod.GfaSharedSession('fixture', 'fixture', state_path)
+            pending, lock, errors, downloaded = list(accounts), threading.Lock(), [], []
+
+            def crawl_fn(c, _engine, acc, dt) -> None:
+                path = mod.crawl_account_report(c, acc, dt)
+                with lock:
+                    downloaded.append(path)
+
+            def run_worker() -> None:
+                with mod.GfaCrawler(headless=True, storage_state=state_path) as c:
+                    mod._crawl_worker(c, None, pending, lock, target_dt, errors, session, crawl_fn)
+
+            workers = [threading.Thread(target=run_worker) for _ in range(2)]
+            for t in workers:
+                t.start()
+            for t in workers:
+                t.join(120)
+    finally:
+        server.shutdown()
+        for name, value in saved.items():
+            setattr(mod, name, value)
+    if errors or len(downloaded) != 2:
+        raise RegressionFailure(f'세션 만료 후 재로그인/재시도가 동작하지 않습니다: errors={errors} downloaded={len(downloaded)}')
+    if session.generation != 1:
+        raise RegressionFailure(f'세션 만료 시 워커별로 중복 재로그인합니다: generation={session.generation}')
+    return ['ok | GFA 크롤러 로그인→계정 선택→날짜→다운로드 픽스처 통과, 실행 중 세션 만료 시 1회 재로그인 후 재시도']
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(description='Run minimal regression checks.')
     parser.add_argument('--repo', default='.', help='repository root path')
+    parser.add_argument('--explain-db', default='', help='seeded local Postgres URL for EXPLAIN-based checks')
     args = parser.parse_args()
     root = Path(args.repo).resolve()
 
@@ -161,8 +1148,27 @@ def main() -> int:
         check_backfill_public_contract,
         check_backfill_parser_contract,
         check_backfill_stage_logging,
+        check_backfill_report_parity,
         check_sa_scope_contract,
+        check_trend_internal_join_contract,
+        check_dashboard_index_specs,
+        check_media_monthly_backfill_contract,
+        check_shop_ext_report_parse_parity,
+        check_device_report_parse_parity,
+        check_media_report_parse_parity,
+        check_report_frame_compaction,
+        check_mock_stats_report_parity,
+        check_collector_stage_timing,
+        check_perf_telemetry_sink,
+        check_keyword_comparison_cache_key,
+        check_check_off_full_scan,
+        check_debug_artifact_policy,
+        check_gfa_crawl_fixture,
     ]
+    if args.explain_db:
+        def check_trend_internal_explain_db(r: Path) -> list[str]:
+            return check_trend_internal_explain(r, args.explain_db)
+        checks.append(check_trend_internal_explain_db)
     for fn in checks:
         try:
             notes.extend(fn(root))
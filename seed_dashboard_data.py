@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+대시보드 벤치마크용 합성 데이터 적재 스크립트.
+
+explain_dashboard_queries.seed_synthetic_data 로 SA 계정/캠페인/광고그룹/키워드/소재와
+fact_*_daily 를 넣고, 예산 화면과 쇼핑 검색어 화면이 읽는 dim_customer /
+fact_bizmoney_daily / fact_shopping_query_daily 까지 같은 customer_id 범위로 채웁니다.
+대량 적재는 계정 단위로 나눠 커밋하므로 중간에 끊겨도 다시 실행하면 이어서 채워집니다.
+
+예시:
+  python seed_dashboard_data.py --database-url postgresql://localhost/da_ads_bench --preset small
+  python seed_dashboard_data.py --database-url postgresql://localhost/da_ads_bench --preset large --ensure-indexes
+  python seed_dashboard_data.py --database-url postgresql://localhost/da_ads_bench --preset medium --days 90 --active-pct 50
+
+프리셋 large 는 200계정 x 365일 x 키워드 5만개(활성 35%) 규모입니다. 운영 DB에는 쓰지 마세요.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from db_indexes import ensure_dashboard_indexes
+from explain_dashboard_queries import SEED_CUSTOMER_BASE, die, make_engine, seed_synthetic_data
+
+# 키워드 수 = accounts x campaigns x adgroups x keywords (프리셋 large: 200*5*5*10 = 5만)
+SEED_PRESETS = {
+    "small": {"accounts": 20, "campaigns": 6, "adgroups": 4, "keywords": 10, "ads": 2, "days": 90, "active_pct": 60, "queries": 5},
+    "medium": {"accounts": 60, "campaigns": 5, "adgroups": 5, "keywords": 10, "ads": 2, "days": 180, "active_pct": 45, "queries": 8},
+    "large": {"accounts": 200, "campaigns": 5, "adgroups": 5, "keywords": 10, "ads": 2, "days": 365, "active_pct": 35, "queries": 10},
+}
+
+SEED_ANALYZE_TABLES = [
+    "dim_account",
+    "dim_campaign",
+    "dim_adgroup",
+    "dim_keyword",
+    "dim_ad",
+    "dim_customer",
+    "fact_campaign_daily",
+    "fact_keyword_daily",
+    "fact_ad_daily",
+    "fact_shopping_query_daily",
+    "fact_bizmoney_daily",
+]
+
+
+def ensure_dashboard_seed_tables(engine: Engine) -> None:
+    """dim_customer / fact_bizmoney_daily 는 collector_db 가 아닌 곳에서 만들어지므로 여기서 보장."""
+    with engine.begin() as conn:
+        conn.execute(text(
+            """
+            CREATE TABLE IF NOT EXISTS dim_customer (
+                customer_id TEXT PRIMARY KEY,
+                account_name TEXT,
+                manager TEXT,
+                monthly_budget BIGINT DEFAULT 0
+            )
+            """
+        ))
+        conn.execute(text(
+            """
+            CREATE TABLE IF NOT EXISTS fact_bizmoney_daily (
+                dt DATE,
+                customer_id TEXT,
+                bizmoney_balance BIGINT,
+                bizmoney_group_key TEXT,
+                bizmoney_mode TEXT,
+                source_customer_id TEXT,
+                is_group_representative BOOLEAN DEFAULT FALSE,
+                PRIMARY KEY(dt, customer_id)
+            )
+            """
+        ))
+
+
+def seed_dashboard_extras(engine: Engine, *, first_account: int, accounts: int, queries: int, days: int, end_dt: date, active_pct: int) -> None:
+    """Seed the budget/shopping-term tables for the same synthetic customer_id range."""
+    start_dt = end_dt - timedelta(days=max(1, days) - 1)
+    params = {
+        "base": SEED_CUSTOMER_BASE,
+        "a1": int(first_account),
+        "a2": int(first_account) + max(1, int(accounts)) - 1,
+        "queries": max(1, int(queries)),
+        "active_pct": max(1, min(100, int(active_pct))),
+        "d1": start_dt,
+        "d2": end_dt,
+    }
+    stmts = [
+        # 기존 dim_customer 가 to_sql 로 만들어져 PK 가 없을 수 있어 NOT EXISTS 로 중복을 피함
+        """
+        INSERT INTO dim_customer (customer_id, account_name, manager, monthly_budget)
+        SELECT (:base + a)::text, 'seed_account_' || a, '담당자' || (a % 7), ((a % 20) + 1) * 1000000
+        FROM generate_series(:a1, :a2) a
+        WHERE NOT EXISTS (SELECT 1 FROM dim_customer x WHERE CAST(x.customer_id AS TEXT) = (:base + a)::text)
+        """,
+        """
+        INSERT INTO fact_bizmoney_daily (dt, customer_id, bizmoney_balance, bizmoney_mode, source_customer_id, is_group_representative)
+        SELECT d::date, (:base + a)::text, (abs(hashtext(a::text || d::text)) % 5000000)::bigint, 'account', (:base + a)::text, TRUE
+        FROM generate_series(:a1, :a2) a,
+             generate_series(CAST(:d1 AS DATE), CAST(:d2 AS DATE), interval '1 day') d
+        ON CONFLICT DO NOTHING
+        """,
+        """
+        INSERT INTO fact_shopping_query_daily (
+            dt, customer_id, campaign_id, adgroup_id, ad_id, query_text,
+            total_conv, total_sales, purchase_conv, purchase_sales, cart_conv, cart_sales,
+            wishlist_conv, wishlist_sales, split_available, data_source
+        )
+        SELECT dt, customer_id, campaign_id, adgroup_id, ad_id, query_text,
+               purchase_conv + cart_conv + wishlist_conv, purchase_sales + cart_sales + wishlist_sales,
+               purchase_conv, purchase_sales, cart_conv, cart_sales, wishlist_conv, wishlist_sales,
+               TRUE, 'seed'
+        FROM (
+            SELECT d::date AS dt, g.customer_id, g.campaign_id, g.adgroup_id,
+                   g.adgroup_id || '-ad' AS ad_id,
+                   'seed query ' || (abs(hashtext(g.campaign_id)) % 50) || '-' || q AS query_text,
+                   (abs(hashtext(g.adgroup_id || d::text || q)) % 4)::double precision AS purchase_conv,
+                   (abs(hashtext(d::text || g.adgroup_id || q)) % 200000)::bigint AS purchase_sales,
+                   (abs(hashtext(g.adgroup_id || q || d::text)) % 3)::double precision AS cart_conv,
+                   (abs(hashtext(q || g.adgroup_id || d::text)) % 80000)::bigint AS cart_sales,
+                   (abs(hashtext(q || d::text || g.adgroup_id)) % 2)::double precision AS wishlist_conv,
+                   0::bigint AS wishlist_sales
+            FROM dim_adgroup g
+            JOIN dim_campaign c ON c.customer_id = g.customer_id AND c.campaign_id = g.campaign_id AND c.campaign_tp = 'SHOPPING'
+            CROSS JOIN generate_series(1, :queries) q
+            CROSS JOIN generate_series(CAST(:d1 AS DATE), CAST(:d2 AS DATE), interval '1 day') d
+            WHERE g.customer_id IN (SELECT (:base + a)::text FROM generate_series(:a1, :a2) a)
+              AND abs(hashtext(g.adgroup_id || d::text || q || 'a')) % 100 < :active_pct
+        ) s
+        ON CONFLICT DO NOTHING
+        """,
+    ]
+    with engine.begin() as conn:
+        for stmt in stmts:
+            conn.execute(text(stmt), params)
+
+
+def analyze_seed_tables(engine: Engine) -> None:
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in SEED_ANALYZE_TABLES:
+            conn.execute(text(f"VACUUM ANALYZE {table}"))
+
+
+def report_seed_volume(engine: Engine) -> dict:
+    counts = {}
+    with engine.connect() as conn:
+        for table in SEED_ANALYZE_TABLES:
+            # VACUUM ANALYZE 직후라 reltuples 로 충분하고, 수천만 행 COUNT(*) 를 피할 수 있음
+            counts[table] = int(conn.execute(text("SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE relname = :t"), {"t": table}).scalar() or 0)
+    return counts
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(description="대시보드 벤치마크용 합성 데이터 적재 (로컬 DB 전용)")
+    ap.add_argument("--database-url", default=os.getenv("DATABASE_URL", ""), help="기본값: DATABASE_URL 환경변수")
+    ap.add_argument("--preset", choices=sorted(SEED_PRESETS), default="small")
+    ap.add_argument("--accounts", type=int, default=None, help="프리셋 값 덮어쓰기")
+    ap.add_argument("--campaigns", type=int, default=None, help="계정당 캠페인 수")
+    ap.add_argument("--adgroups", type=int, default=None, help="캠페인당 광고그룹 수")
+    ap.add_argument("--keywords", type=int, default=None, help="광고그룹당 키워드 수")
+    ap.add_argument("--ads", type=int, default=None, help="광고그룹당 소재 수")
+    ap.add_argument("--days", type=int, default=None)
+    ap.add_argument("--active-pct", type=int, default=None, help="키워드/소재/검색어가 성과를 내는 일자 비율(%%)")
+    ap.add_argument("--queries", type=int, default=None, help="쇼핑 광고그룹당 검색어 수")
+    ap.add_argument("--end-date", default="", help="YYYY-MM-DD (기본: 어제)")
+    ap.add_argument("--chunk-accounts", type=int, default=10, help="한 트랜잭션에 넣을 계정 수")
+    ap.add_argument("--ensure-indexes", action="store_true", help="적재 후 db_indexes 인덱스 보장")
+    return ap
+
+
+def main() -> int:
+    args = build_arg_parser().parse_args()
+    if not args.database_url:
+        die("DATABASE_URL 또는 --database-url 이 필요합니다.")
+
+    spec = dict(SEED_PRESETS[args.preset])
+    for key in spec:
+        override = getattr(args, key)
+        if override is not None:
+            spec[key] = int(override)
+    try:
+        end_dt = date.fromisoformat(args.end_date) if args.end_date else date.today() - timedelta(days=1)
+    except ValueError:
+        die(f"--end-date 형식 오류: {args.end_date}")
+
+    engine = make_engine(args.database_url)
+    ensure_dashboard_seed_tables(engine)
+    total_keywords = spec["accounts"] * spec["campaigns"] * spec["adgroups"] * spec["keywords"]
+    print(
+        f"🌱 seed 시작 | preset={args.preset} accounts={spec['accounts']} keywords={total_keywords:,} "
+        f"days={spec['days']} active={spec['active_pct']}% | ~{end_dt}"
+    )
+
+    chunk = max(1, int(args.chunk_accounts))
+    started = time.perf_counter()
+    for first in range(1, spec["accounts"] + 1, chunk):
+        count = min(chunk, spec["accounts"] - first + 1)
+        t0 = time.perf_counter()
+        seed_synthetic_data(
+            engine,
+            accounts=count,
+            campaigns=spec["campaigns"],
+            adgroups=spec["adgroups"],
+            keywords=spec["keywords"],
+            ads=spec["ads"],
+            days=spec["days"],
+            end_dt=end_dt,
+            first_account=first,
+            active_pct=spec["active_pct"],
+            analyze=False,
+        )
+        seed_dashboard_extras(
+            engine,
+            first_account=first,
+            accounts=count,
+            queries=spec["queries"],
+            days=spec["days"],
+            end_dt=end_dt,
+            active_pct=spec["active_pct"],
+        )
+        print(f"   ↳ 계정 {first}~{first + count - 1} 적재 {time.perf_counter() - t0:.1f}s")
+
+    if args.ensure_indexes:
+        created = ensure_dashboard_indexes(engine)
+        print(f"🗂️ 대시보드 인덱스 보장 | 신규 {len(created)}개")
+    analyze_seed_tables(engine)
+
+    counts = report_seed_volume(engine)
+    for table, rows in counts.items():
+        print(f"   {table:<28} ~{rows:,} rows")
+    print(f"✅ seed 완료 | {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
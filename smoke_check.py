@@ -46,6 +46,10 @@ RUNTIME_HELP_SCRIPTS = [
     'fast_backfill.py',
     'collector_shop_ext.py',
     'backfill_single_legacy_sa.py',
+    'mock_naver_api.py',
+    'bench_collector.py',
+    'seed_dashboard_data.py',
+    'bench_dashboard_queries.py',
 ]
 
 
@@ -332,23 +332,10 @@ def _query_device_breakdown(engine, d1, d2, cids: tuple, type_sel: tuple, diag:
         type_filter = ''
         if type_vals:
             cp_col = _campaign_type_column(engine)
-            join_sql = ' LEFT JOIN dim_campaign c ON CAST(f.customer_id AS TEXT) = CAST(c.customer_id AS TEXT) AND CAST(f.campaign_id AS TEXT) = CAST(c.campaign_id AS TEXT) '
-            type_list = _sql_in_str_list(type_vals)
-            type_filter = f"""
-                AND (
-                    COALESCE(CAST(c.{cp_col} AS TEXT), '') IN ({type_list})
-                    OR (
-                        CASE
-                            WHEN COALESCE(CAST(c.{cp_col} AS TEXT), '') = 'WEB_SITE' THEN '파워링크'
-                            WHEN COALESCE(CAST(c.{cp_col} AS TEXT), '') = 'SHOPPING' THEN '쇼핑검색'
-                            WHEN COALESCE(CAST(c.{cp_col} AS TEXT), '') = 'POWER_CONTENTS' THEN '파워컨텐츠'
-                            WHEN COALESCE(CAST(c.{cp_col} AS TEXT), '') = 'BRAND_SEARCH' THEN '브랜드검색'
-                            WHEN COALESCE(CAST(c.{cp_col} AS TEXT), '') = 'PLACE' THEN '플레이스'
-                            ELSE COALESCE(CAST(c.{cp_col} AS TEXT), '')
-                        END
-                    ) IN ({type_list})
-                )
-            """
+            # fact/dim 키는 모두 TEXT 이므로 CAST 없이 조인해야 PK 인덱스를 탈 수 있습니다.
+            join_sql = ' LEFT JOIN dim_campaign c ON f.customer_id = c.customer_id AND f.campaign_id = c.campaign_id '
+            # type_vals 에 한글 라벨과 API 코드가 모두 들어 있으므로 CASE 변환 없이 IN 하나로 충분합니다.
+            type_filter = f"AND COALESCE(CAST(c.{cp_col} AS TEXT), '') IN ({_sql_in_str_list(type_vals)})"
         sql = f"""
             SELECT COALESCE(NULLIF(TRIM(f.device_name), ''), '기타') AS device_name,
                    SUM(CAST(COALESCE(f.cost,0) AS NUMERIC)) AS cost
@@ -399,6 +386,12 @@ def _query_device_breakdown(engine, d1, d2, cids: tuple, type_sel: tuple, diag:
     return pd.DataFrame()
 
 
+@st.cache_data(show_spinner=False, ttl=300, max_entries=20)
+def _cached_device_breakdown(_engine, d1: str, d2: str, cids: tuple, type_sel: tuple) -> tuple[pd.DataFrame, list]:
+    local_diag: list[dict] = []
+    return _query_device_breakdown(_engine, d1, d2, cids, type_sel, diag=local_diag), local_diag
+
+
 def _render_device_share_panel(device_df: pd.DataFrame) -> None:
     if device_df is None or device_df.empty:
         st.info('기기별 데이터가 없어 지출 비중을 표시할 수 없습니다.')
@@ -467,33 +460,30 @@ def _campaign_type_column(engine) -> str:
     return "campaign_tp" if "campaign_tp" in cols else ("campaign_type_label" if "campaign_type_label" in cols else "campaign_type")
 
 
-def _query_keyword_detail_for_campaign(engine, d1, d2, customer_id: str, campaign_id: str) -> pd.DataFrame:
-    if not table_exists(engine, "fact_keyword_daily"):
-        return pd.DataFrame()
-    cp_col = _campaign_type_column(engine)
-    kw_fact_cols = get_table_columns(engine, "fact_keyword_daily")
+_CAMPAIGN_TYPE_LABELS = {"WEB_SITE": "파워링크", "SHOPPING": "쇼핑검색", "POWER_CONTENTS": "파워컨텐츠", "BRAND_SEARCH": "브랜드검색", "PLACE": "플레이스"}
+
+
+def _detail_metric_selects(fact_cols: list) -> tuple[str, str, str]:
     expr = {
-        "purchase_conv_expr": "COALESCE(conv,0)",
-        "purchase_sales_expr": "COALESCE(sales,0)",
-        "total_conv_expr": "COALESCE(tot_conv, COALESCE(conv,0)+COALESCE(cart_conv,0)+COALESCE(wishlist_conv,0))",
-        "total_sales_expr": "COALESCE(tot_sales, COALESCE(sales,0)+COALESCE(cart_sales,0)+COALESCE(wishlist_sales,0))",
-        "cart_conv_expr": "COALESCE(cart_conv,0)",
-        "cart_sales_expr": "COALESCE(cart_sales,0)",
-        "wish_conv_expr": "COALESCE(wishlist_conv,0)",
-        "wish_sales_expr": "COALESCE(wishlist_sales,0)",
+        "purchase_conv_expr": "COALESCE(f.conv,0)",
+        "purchase_sales_expr": "COALESCE(f.sales,0)",
+        "total_conv_expr": "COALESCE(f.tot_conv, COALESCE(f.conv,0)+COALESCE(f.cart_conv,0)+COALESCE(f.wishlist_conv,0))",
+        "total_sales_expr": "COALESCE(f.tot_sales, COALESCE(f.sales,0)+COALESCE(f.cart_sales,0)+COALESCE(f.wishlist_sales,0))",
+        "cart_conv_expr": "COALESCE(f.cart_conv,0)",
+        "cart_sales_expr": "COALESCE(f.cart_sales,0)",
+        "wish_conv_expr": "COALESCE(f.wishlist_conv,0)",
+        "wish_sales_expr": "COALESCE(f.wishlist_sales,0)",
     }
     try:
         from data import _strict_conv_selects
-        expr = _strict_conv_selects(kw_fact_cols)
+        expr = _strict_conv_selects(fact_cols, alias="f")
     except Exception:
         pass
-    rank_col = next((c for c in ["avg_rank", "avg_rnk", "averageposition", "average_position", "avgrnk"] if c in kw_fact_cols), None)
-    rank_agg_sql = f", CASE WHEN SUM(imp) > 0 THEN SUM(COALESCE({rank_col}, 0) * imp) / SUM(imp) ELSE NULL END as avg_rank" if rank_col else ""
+    rank_col = next((c for c in ["avg_rank", "avg_rnk", "averageposition", "average_position", "avgrnk"] if c in fact_cols), None)
+    rank_agg_sql = f", CASE WHEN SUM(f.imp) > 0 THEN SUM(COALESCE(f.{rank_col}, 0) * f.imp) / SUM(f.imp) ELSE NULL END as avg_rank" if rank_col else ""
     rank_select_sql = ", agg.avg_rank" if rank_col else ""
-    sql = f"""
-        WITH agg AS (
-            SELECT customer_id, keyword_id,
-                   SUM(imp) as imp, SUM(clk) as clk, SUM(cost) as cost,
+    metric_sql = f"""
+                   SUM(f.imp) as imp, SUM(f.clk) as clk, SUM(f.cost) as cost,
                    SUM({expr['purchase_conv_expr']}) as conv,
                    SUM({expr['purchase_sales_expr']}) as sales,
                    SUM({expr['total_conv_expr']}) as tot_conv,
@@ -503,9 +493,49 @@ def _query_keyword_detail_for_campaign(engine, d1, d2, customer_id: str, campaig
                    SUM({expr['wish_conv_expr']}) as wishlist_conv,
                    SUM({expr['wish_sales_expr']}) as wishlist_sales
                    {rank_agg_sql}
-            FROM fact_keyword_daily
-            WHERE dt BETWEEN :d1 AND :d2 AND customer_id = :cid
-            GROUP BY customer_id, keyword_id
+    """
+    return metric_sql, rank_select_sql, rank_col or ""
+
+
+def _campaign_pair_params(d1, d2, campaign_pairs: tuple) -> dict:
+    return {
+        "d1": str(d1),
+        "d2": str(d2),
+        "cids": sorted({str(cid) for cid, _ in campaign_pairs}),
+        "camp_ids": sorted({str(camp_id) for _, camp_id in campaign_pairs}),
+    }
+
+
+def _finish_detail_frame(df: pd.DataFrame, campaign_pairs: tuple) -> pd.DataFrame:
+    if df.empty:
+        return df
+    # ANY(:cids) x ANY(:camp_ids) is a superset of the requested pairs; keep only the exact pairs.
+    wanted = {(str(cid), str(camp_id)) for cid, camp_id in campaign_pairs}
+    pair_keys = list(zip(df["customer_id"].astype(str), df["campaign_id"].astype(str)))
+    df = df[[k in wanted for k in pair_keys]].reset_index(drop=True)
+    if "campaign_type_label" in df.columns:
+        df["campaign_type_label"] = df["campaign_type_label"].map(lambda x: _CAMPAIGN_TYPE_LABELS.get(x, x))
+    return df
+
+
+def _query_keyword_detail_for_campaigns(engine, d1, d2, campaign_pairs: tuple) -> pd.DataFrame:
+    if not campaign_pairs or not table_exists(engine, "fact_keyword_daily"):
+        return pd.DataFrame()
+    cp_col = _campaign_type_column(engine)
+    metric_sql, rank_select_sql, _ = _detail_metric_selects(get_table_columns(engine, "fact_keyword_daily"))
+    sql = f"""
+        WITH scope AS (
+            SELECT k.customer_id, k.keyword_id
+            FROM dim_keyword k
+            JOIN dim_adgroup a ON k.adgroup_id = a.adgroup_id AND k.customer_id = a.customer_id
+            WHERE a.customer_id = ANY(:cids) AND a.campaign_id = ANY(:camp_ids)
+        ), agg AS (
+            SELECT f.customer_id, f.keyword_id,
+                   {metric_sql}
+            FROM fact_keyword_daily f
+            JOIN scope s ON f.customer_id = s.customer_id AND f.keyword_id = s.keyword_id
+            WHERE f.dt BETWEEN :d1 AND :d2 AND f.customer_id = ANY(:cids)
+            GROUP BY f.customer_id, f.keyword_id
         )
         SELECT
             agg.customer_id, a.campaign_id, k.adgroup_id, agg.keyword_id,
@@ -517,58 +547,33 @@ def _query_keyword_detail_for_campaign(engine, d1, d2, customer_id: str, campaig
         JOIN dim_keyword k ON agg.keyword_id = k.keyword_id AND agg.customer_id = k.customer_id
         JOIN dim_adgroup a ON k.adgroup_id = a.adgroup_id AND agg.customer_id = a.customer_id
         JOIN dim_campaign c ON a.campaign_id = c.campaign_id AND agg.customer_id = c.customer_id
-        WHERE agg.customer_id = :cid AND a.campaign_id = :camp_id
     """
-    df = sql_read(engine, sql, {"d1": str(d1), "d2": str(d2), "cid": str(customer_id), "camp_id": str(campaign_id)})
-    if not df.empty and "campaign_type_label" in df.columns:
-        mapping = {"WEB_SITE": "파워링크", "SHOPPING": "쇼핑검색", "POWER_CONTENTS": "파워컨텐츠", "BRAND_SEARCH": "브랜드검색", "PLACE": "플레이스"}
-        df["campaign_type_label"] = df["campaign_type_label"].map(lambda x: mapping.get(x, x))
-    return df
+    df = sql_read(engine, sql, _campaign_pair_params(d1, d2, campaign_pairs))
+    return _finish_detail_frame(df, campaign_pairs)
 
 
-def _query_ad_detail_for_campaign(engine, d1, d2, customer_id: str, campaign_id: str) -> pd.DataFrame:
-    if not table_exists(engine, "fact_ad_daily"):
+def _query_ad_detail_for_campaigns(engine, d1, d2, campaign_pairs: tuple) -> pd.DataFrame:
+    if not campaign_pairs or not table_exists(engine, "fact_ad_daily"):
         return pd.DataFrame()
     cp_col = _campaign_type_column(engine)
     ad_cols = get_table_columns(engine, "dim_ad")
     title_select = "ad.ad_title" if "ad_title" in ad_cols else "ad.ad_name as ad_title"
     image_select = "ad.image_url" if "image_url" in ad_cols else "'' as image_url"
     url_select = "ad.pc_landing_url as landing_url" if "pc_landing_url" in ad_cols else "'' as landing_url"
-    ad_fact_cols = get_table_columns(engine, "fact_ad_daily")
-    expr = {
-        "purchase_conv_expr": "COALESCE(conv,0)",
-        "purchase_sales_expr": "COALESCE(sales,0)",
-        "total_conv_expr": "COALESCE(tot_conv, COALESCE(conv,0)+COALESCE(cart_conv,0)+COALESCE(wishlist_conv,0))",
-        "total_sales_expr": "COALESCE(tot_sales, COALESCE(sales,0)+COALESCE(cart_sales,0)+COALESCE(wishlist_sales,0))",
-        "cart_conv_expr": "COALESCE(cart_conv,0)",
-        "cart_sales_expr": "COALESCE(cart_sales,0)",
-        "wish_conv_expr": "COALESCE(wishlist_conv,0)",
-        "wish_sales_expr": "COALESCE(wishlist_sales,0)",
-    }
-    try:
-        from data import _strict_conv_selects
-        expr = _strict_conv_selects(ad_fact_cols)
-    except Exception:
-        pass
-    rank_col = next((c for c in ["avg_rank", "avg_rnk", "averageposition", "average_position", "avgrnk"] if c in ad_fact_cols), None)
-    rank_agg_sql = f", CASE WHEN SUM(imp) > 0 THEN SUM(COALESCE({rank_col}, 0) * imp) / SUM(imp) ELSE NULL END as avg_rank" if rank_col else ""
-    rank_select_sql = ", agg.avg_rank" if rank_col else ""
+    metric_sql, rank_select_sql, _ = _detail_metric_selects(get_table_columns(engine, "fact_ad_daily"))
     sql = f"""
-        WITH agg AS (
-            SELECT customer_id, ad_id,
-                   SUM(imp) as imp, SUM(clk) as clk, SUM(cost) as cost,
-                   SUM({expr['purchase_conv_expr']}) as conv,
-                   SUM({expr['purchase_sales_expr']}) as sales,
-                   SUM({expr['total_conv_expr']}) as tot_conv,
-                   SUM({expr['total_sales_expr']}) as tot_sales,
-                   SUM({expr['cart_conv_expr']}) as cart_conv,
-                   SUM({expr['cart_sales_expr']}) as cart_sales,
-                   SUM({expr['wish_conv_expr']}) as wishlist_conv,
-                   SUM({expr['wish_sales_expr']}) as wishlist_sales
-                   {rank_agg_sql}
-            FROM fact_ad_daily
-            WHERE dt BETWEEN :d1 AND :d2 AND customer_id = :cid
-            GROUP BY customer_id, ad_id
+        WITH scope AS (
+            SELECT ad.customer_id, ad.ad_id
+            FROM dim_ad ad
+            JOIN dim_adgroup a ON ad.adgroup_id = a.adgroup_id AND ad.customer_id = a.customer_id
+            WHERE a.customer_id = ANY(:cids) AND a.campaign_id = ANY(:camp_ids)
+        ), agg AS (
+            SELECT f.customer_id, f.ad_id,
+                   {metric_sql}
+            FROM fact_ad_daily f
+            JOIN scope s ON f.customer_id = s.customer_id AND f.ad_id = s.ad_id
+            WHERE f.dt BETWEEN :d1 AND :d2 AND f.customer_id = ANY(:cids)
+            GROUP BY f.customer_id, f.ad_id
         )
         SELECT
             agg.customer_id, a.campaign_id, ad.adgroup_id, agg.ad_id,
@@ -580,13 +585,18 @@ def _query_ad_detail_for_campaign(engine, d1, d2, customer_id: str, campaign_id:
         JOIN dim_ad ad ON agg.ad_id = ad.ad_id AND agg.customer_id = ad.customer_id
         JOIN dim_adgroup a ON ad.adgroup_id = a.adgroup_id AND agg.customer_id = a.customer_id
         JOIN dim_campaign c ON a.campaign_id = c.campaign_id AND agg.customer_id = c.customer_id
-        WHERE agg.customer_id = :cid AND a.campaign_id = :camp_id
     """
-    df = sql_read(engine, sql, {"d1": str(d1), "d2": str(d2), "cid": str(customer_id), "camp_id": str(campaign_id)})
-    if not df.empty and "campaign_type_label" in df.columns:
-        mapping = {"WEB_SITE": "파워링크", "SHOPPING": "쇼핑검색", "POWER_CONTENTS": "파워컨텐츠", "BRAND_SEARCH": "브랜드검색", "PLACE": "플레이스"}
-        df["campaign_type_label"] = df["campaign_type_label"].map(lambda x: mapping.get(x, x))
-    return df
+    df = sql_read(engine, sql, _campaign_pair_params(d1, d2, campaign_pairs))
+    return _finish_detail_frame(df, campaign_pairs)
+
+
+@st.cache_data(show_spinner=False, ttl=300, max_entries=20)
+def _cached_campaign_detail_frames(_engine, d1: str, d2: str, campaign_pairs: tuple) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Keyword/ad detail for every requested (customer_id, campaign_id) pair in one round trip each."""
+    return (
+        _query_keyword_detail_for_campaigns(_engine, d1, d2, campaign_pairs),
+        _query_ad_detail_for_campaigns(_engine, d1, d2, campaign_pairs),
+    )
 
 
 def _is_shopping_campaign_type(series: pd.Series) -> pd.Series:
@@ -655,9 +665,18 @@ def _prefer_detail_source_by_campaign(kw_df: pd.DataFrame, ad_df: pd.DataFrame)
         return pd.concat(kept, ignore_index=True)
     return kw_df.reset_index(drop=True) if not kw_df.empty else ad_df.reset_index(drop=True)
 
-def _query_detail_bundles_for_campaign(engine, d1, d2, customer_id: str, campaign_id: str, diag: list | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
-    kw_bundle = _query_keyword_detail_for_campaign(engine, d1, d2, customer_id, campaign_id)
-    ad_bundle = _query_ad_detail_for_campaign(engine, d1, d2, customer_id, campaign_id)
+def _slice_campaign_detail(df: pd.DataFrame, customer_id: str, campaign_id: str) -> pd.DataFrame:
+    if df is None or df.empty:
+        return pd.DataFrame()
+    mask = (df["customer_id"].astype(str) == str(customer_id)) & (df["campaign_id"].astype(str) == str(campaign_id))
+    return df[mask].reset_index(drop=True)
+
+
+def _query_detail_bundles_for_campaign(engine, d1, d2, customer_id: str, campaign_id: str, diag: list | None = None, campaign_pairs: tuple | None = None) -> tuple[pd.DataFrame, pd.DataFrame]:
+    pairs = campaign_pairs or ((str(customer_id), str(campaign_id)),)
+    kw_all, ad_all = _cached_campaign_detail_frames(engine, str(d1), str(d2), pairs)
+    kw_bundle = _slice_campaign_detail(kw_all, customer_id, campaign_id)
+    ad_bundle = _slice_campaign_detail(ad_all, customer_id, campaign_id)
     _diag_add(diag, '상세-키워드', 'ok' if not kw_bundle.empty else 'zero_data', len(kw_bundle.index), 'fact_keyword_daily', f'customer_id={customer_id} campaign_id={campaign_id}')
     _diag_add(diag, '상세-소재', 'ok' if not ad_bundle.empty else 'zero_data', len(ad_bundle.index), 'fact_ad_daily', f'customer_id={customer_id} campaign_id={campaign_id}')
     
@@ -717,7 +736,8 @@ def _render_campaign_type_device_summary(disp_main: pd.DataFrame, engine, f: Dic
             )
         with col_device:
             st.markdown("<div style='font-size:13px;color:#4B5563;margin-bottom:8px;'>기기별 광고비 지출 비중</div>", unsafe_allow_html=True)
-            device_df = _query_device_breakdown(engine, f["start"], f["end"], tuple(f.get("selected_customer_ids", [])), tuple(f.get("type_sel", [])), diag=diag)
+            device_df, device_diag = _cached_device_breakdown(engine, str(f["start"]), str(f["end"]), tuple(f.get("selected_customer_ids", [])), tuple(f.get("type_sel", [])))
+            diag.extend(device_diag)
             _render_device_share_panel(device_df)
     st.markdown("<div style='height:18px;'></div>", unsafe_allow_html=True)
 
@@ -793,17 +813,15 @@ def _render_campaign_detail_table(title: str, df: pd.DataFrame, item_label: str,
     return True
 
 
-def _render_campaign_detail_section(selected_campaign: str, engine, f: Dict, selected_customer_id: str, selected_campaign_id: str, diag: list[dict], has_pre_patch_cur: bool) -> None:
+def _render_campaign_detail_section(selected_campaign: str, engine, f: Dict, selected_customer_id: str, selected_campaign_id: str, diag: list[dict], has_pre_patch_cur: bool, campaign_pairs: tuple | None = None) -> None:
     with st.spinner("🔄 선택한 캠페인의 하위 키워드/소재 성과를 불러오는 중입니다..."):
         try:
-            kw_detail, ext_ads = _query_detail_bundles_for_campaign(engine, f["start"], f["end"], selected_customer_id, selected_campaign_id, diag=diag)
+            kw_detail, ext_ads = _query_detail_bundles_for_campaign(engine, f["start"], f["end"], selected_customer_id, selected_campaign_id, diag=diag, campaign_pairs=campaign_pairs)
         except Exception as e:
             _diag_add(diag, '상세조회', 'error', 0, 'campaign_detail', f"{type(e).__name__}: {e}")
             kw_detail, ext_ads = pd.DataFrame(), pd.DataFrame()
             st.warning("상세 데이터를 불러오는 중 오류가 발생했습니다. 아래 조회 진단을 확인해 주세요.")
-    st.markdown("<div style='height: 12px;'></div>", unsafe_allow_html=True)
-    with st.container(border=True):
-        st.markdown(f"<h5 style='color: #335CFF; margin-bottom: 12px;'>[{escape(str(selected_campaign))}] 상세 분석</h5>", unsafe_allow_html=True)
+    with st.expander(f"[{selected_campaign}] 상세 분석", expanded=True):
         has_data = False
         has_data = _render_campaign_detail_table("확장소재 성과", ext_ads, "확장소재명", has_pre_patch_cur) or has_data
         if not ext_ads.empty:
@@ -834,15 +852,19 @@ def _render_campaign_summary_tab(view: pd.DataFrame, engine, f: Dict, diag: list
         "행을 선택하면 하위 그룹, 키워드, 소재 상세를 아래에서 확인할 수 있습니다.",
         [{"label": f"{len(disp_main_show):,}행 표시", "tone": "info"}, {"label": "선택 상세", "tone": "primary"}],
     )
-    event = st.dataframe(disp_main_show, width="stretch", hide_index=True, selection_mode="single-row", on_select="rerun", column_config=_campaign_fast_col_config(disp_main_show, "캠페인"))
+    event = st.dataframe(disp_main_show, width="stretch", hide_index=True, selection_mode="multi-row", on_select="rerun", column_config=_campaign_fast_col_config(disp_main_show, "캠페인"))
     selected_rows = event.selection.rows
     if not selected_rows:
         return
-    selected_idx = selected_rows[0]
-    selected_campaign = disp_main_src.iloc[selected_idx]["캠페인"]
-    selected_customer_id = str(disp_main_src.iloc[selected_idx].get("customer_id", ""))
-    selected_campaign_id = str(disp_main_src.iloc[selected_idx].get("campaign_id", ""))
-    _render_campaign_detail_section(selected_campaign, engine, f, selected_customer_id, selected_campaign_id, diag, has_pre_patch_cur)
+    selected = disp_main_src.iloc[list(selected_rows)]
+    # 선택된 캠페인 전체를 한 번에 조회해 두고 각 상세 영역은 공유 프레임에서 잘라 씁니다.
+    campaign_pairs = tuple(sorted({
+        (str(row.get("customer_id", "")), str(row.get("campaign_id", "")))
+        for _, row in selected.iterrows()
+    }))
+    st.markdown("<div style='height: 12px;'></div>", unsafe_allow_html=True)
+    for _, row in selected.iterrows():
+        _render_campaign_detail_section(row["캠페인"], engine, f, str(row.get("customer_id", "")), str(row.get("campaign_id", "")), diag, has_pre_patch_cur, campaign_pairs=campaign_pairs)
 
 
 def _group_mode_columns(show_deltas_grp: bool, show_mode: str) -> list[str]:
@@ -10,7 +10,7 @@ from typing import Dict
 from datetime import date
 
 from data import query_keyword_bundle, query_ad_bundle, query_shopping_search_terms, format_currency
-from page_helpers import get_dynamic_cmp_options, period_compare_range, _perf_common_merge_meta, render_item_comparison_search
+from page_helpers import comparison_cache_key, frame_cache_sig, get_dynamic_cmp_options, period_compare_range, _perf_common_merge_meta, render_item_comparison_search
 from ui import render_kpi_strip, render_toolbar, safe_numeric_col
 
 FMT_DICT = {
@@ -481,21 +481,26 @@ def _merge_keyword_view_with_shopping_terms(view: pd.DataFrame, shop_view: pd.Da
 
 def _apply_comparison_metrics(view_df: pd.DataFrame, base_df: pd.DataFrame, merge_keys: list) -> pd.DataFrame:
     if view_df.empty: return view_df
+    merged = view_df.copy()
     for k in merge_keys:
-        if k in view_df.columns: view_df[k] = view_df[k].astype(str)
-        if k in base_df.columns: base_df[k] = base_df[k].astype(str)
+        if k in merged.columns: merged[k] = merged[k].astype(str)
             
     agg_dict = {'imp': 'sum', 'clk': 'sum', 'cost': 'sum', 'conv': 'sum', 'sales': 'sum'}
         
-    if not base_df.empty and merge_keys:
-        base_agg = base_df.groupby(merge_keys, dropna=False).agg(agg_dict).reset_index()
+    if base_df is not None and not base_df.empty and merge_keys:
+        base_df = base_df.copy()
+        for k in merge_keys:
+            if k in base_df.columns: base_df[k] = base_df[k].astype(str)
+        base_agg = base_df.groupby(merge_keys, dropna=False).agg(agg_dict)
         if 'avg_rank' in base_df.columns:
             rank_agg = _weighted_avg_rank_by_keys(base_df, merge_keys)
             if not rank_agg.empty:
-                base_agg = base_agg.merge(rank_agg, on=merge_keys, how="left")
-        base_agg = base_agg.rename(columns={'imp': 'b_imp', 'clk': 'b_clk', 'cost': 'b_cost', 'conv': 'b_conv', 'sales': 'b_sales', 'avg_rank': 'b_avg_rank'})
-        merged = pd.merge(view_df, base_agg, on=merge_keys, how='left')
-    else: merged = view_df.copy()
+                base_agg['avg_rank'] = rank_agg.set_index(merge_keys)['avg_rank'].reindex(base_agg.index)
+        # 비교 기간 합계를 현재 행의 키 순서로 reindex → merge 없이 같은 위치끼리 차이 계산
+        row_keys = pd.MultiIndex.from_frame(merged[merge_keys]) if len(merge_keys) > 1 else pd.Index(merged[merge_keys[0]])
+        aligned = base_agg.reindex(row_keys)
+        for src, dst in [('imp', 'b_imp'), ('clk', 'b_clk'), ('cost', 'b_cost'), ('conv', 'b_conv'), ('sales', 'b_sales'), ('avg_rank', 'b_avg_rank')]:
+            if src in aligned.columns: merged[dst] = aligned[src].to_numpy()
         
     for c in ['b_imp', 'b_clk', 'b_cost', 'b_conv', 'b_sales']:
         if c not in merged.columns: merged[c] = 0
@@ -678,6 +683,24 @@ def render_keyword_main(view, top_n):
     _render_sticky_table(disp, "키워드", height=550, col_config=_keyword_fast_col_config(disp, "키워드"))
 
 
+@st.cache_data(ttl=43200, max_entries=10, show_spinner=False)
+def _cached_keyword_cmp_base(_engine, b1: date, b2: date, cids: tuple, type_sel: tuple, fetch_limit: int):
+    base_kw_bundle = query_keyword_bundle(_engine, b1, b2, list(cids), type_sel, topn_cost=fetch_limit)
+    base_ad_bundle = query_ad_bundle(_engine, b1, b2, cids, type_sel, topn_cost=fetch_limit, top_k=50)
+    base_kw_bundle = _prefer_total_conversion_for_keyword(base_kw_bundle)
+    base_ad_bundle = _prefer_total_conversion_for_keyword(base_ad_bundle)
+    base_shop_bundle = pd.DataFrame()
+    if _includes_shopping_type(type_sel):
+        base_shop_terms = _cached_keyword_shopping_terms(_engine, b1, b2, tuple(cids))
+        base_shop_bundle = _build_shopping_terms_base_bundle(base_shop_terms)
+        base_kw_bundle = _residualize_shopping_fact_conversions(base_kw_bundle, base_shop_bundle)
+        base_ad_bundle = _residualize_shopping_fact_conversions(base_ad_bundle, base_shop_bundle)
+
+    base_kw = base_kw_bundle.rename(columns={"keyword": "키워드"}) if not base_kw_bundle.empty else pd.DataFrame()
+    base_ad = base_ad_bundle.rename(columns={"ad_name": "키워드"}) if not base_ad_bundle.empty else pd.DataFrame()
+    return base_kw, base_ad, base_shop_bundle
+
+
 @st.fragment
 def render_keyword_cmp(view_orig, engine, cids, type_sel, top_n, start_dt, end_dt):
     # 기간 비교 시, 일자가 포함되어 있으면 키워드/그룹 단위 비교가 흩어지므로 다시 묶어줍니다.
@@ -685,6 +708,7 @@ def render_keyword_cmp(view_orig, engine, cids, type_sel, top_n, start_dt, end_d
         view = _aggregate_keyword_rows(view_orig, _KEYWORD_PERIOD_GROUP_COLS, include_rank=True)
     else:
         view = view_orig.copy()
+    view = view.reset_index(drop=True)
 
     st.markdown("<div style='display:flex; justify-content:flex-start; margin-bottom:8px;'>", unsafe_allow_html=True)
     show_deltas = st.toggle("증감률 보기", value=False, key="kw_abs_toggle")
@@ -724,19 +748,8 @@ def render_keyword_cmp(view_orig, engine, cids, type_sel, top_n, start_dt, end_d
             disp = disp[disp["키워드"].astype(str).str.contains(search_kw_cmp, case=False, na=False)]
 
     b1, b2 = period_compare_range(start_dt, end_dt, cmp_mode)
-    base_kw_bundle = query_keyword_bundle(engine, b1, b2, list(cids), type_sel, topn_cost=_keyword_fetch_limit(top_n, daily_breakdown=False))
-    base_ad_bundle = query_ad_bundle(engine, b1, b2, cids, type_sel, topn_cost=_keyword_fetch_limit(top_n, daily_breakdown=False), top_k=50)
-    base_kw_bundle = _prefer_total_conversion_for_keyword(base_kw_bundle)
-    base_ad_bundle = _prefer_total_conversion_for_keyword(base_ad_bundle)
-    base_shop_bundle = pd.DataFrame()
-    if _includes_shopping_type(type_sel):
-        base_shop_terms = _cached_keyword_shopping_terms(engine, b1, b2, tuple(cids))
-        base_shop_bundle = _build_shopping_terms_base_bundle(base_shop_terms)
-        base_kw_bundle = _residualize_shopping_fact_conversions(base_kw_bundle, base_shop_bundle)
-        base_ad_bundle = _residualize_shopping_fact_conversions(base_ad_bundle, base_shop_bundle)
-
-    base_kw = base_kw_bundle.rename(columns={"keyword": "키워드"}) if not base_kw_bundle.empty else pd.DataFrame()
-    base_ad = base_ad_bundle.rename(columns={"ad_name": "키워드"}) if not base_ad_bundle.empty else pd.DataFrame()
+    fetch_limit = _keyword_fetch_limit(top_n, daily_breakdown=False)
+    base_kw, base_ad, base_shop_bundle = _cached_keyword_cmp_base(engine, b1, b2, tuple(cids), tuple(type_sel), fetch_limit)
     base_bundle = pd.concat([base_kw, base_ad, base_shop_bundle], ignore_index=True, sort=False)
 
     if agg_kw_cmp:
@@ -764,10 +777,21 @@ def render_keyword_cmp(view_orig, engine, cids, type_sel, top_n, start_dt, end_d
         base_cols_cmp = ["키워드", "구분", "캠페인", "광고그룹", "업체명", "담당자", "캠페인유형"]
         if "평균순위" in disp.columns: base_cols_cmp.append("평균순위")
 
-    if not base_bundle.empty:
-        disp_cmp = _apply_comparison_metrics(disp, base_bundle, valid_keys)
-    else: 
-        disp_cmp = _apply_comparison_metrics(disp, pd.DataFrame(), [])
+    if agg_kw_cmp:
+        disp_cmp = _apply_comparison_metrics(disp, base_bundle, valid_keys if not base_bundle.empty else [])
+    else:
+        # 필터 전 전체 행 기준 결합 결과를 (현재 기간, 비교 기간, 필터, 양쪽 데이터) 단위로 보관하고 행 필터만 다시 적용
+        # 비교 기간 데이터만 바뀌어도 증감이 달라지므로 두 프레임의 키/지표 내용을 모두 키에 넣는다.
+        view_sig = frame_cache_sig(view, valid_keys + ["노출", "클릭", "광고비", "전환", "전환매출", "avg_rank"])
+        base_sig = frame_cache_sig(base_bundle, valid_keys + ["imp", "clk", "cost", "conv", "sales", "avg_rank"])
+        cache_key = comparison_cache_key("kw_cmp", (start_dt, end_dt), (b1, b2), tuple(cids), tuple(type_sel), top_n, tuple(valid_keys), view_sig, base_sig)
+        cached = st.session_state.get("_kw_cmp_merged")
+        if isinstance(cached, tuple) and cached[0] == cache_key:
+            merged_full = cached[1]
+        else:
+            merged_full = _apply_comparison_metrics(view, base_bundle, valid_keys if not base_bundle.empty else [])
+            st.session_state["_kw_cmp_merged"] = (cache_key, merged_full)
+        disp_cmp = merged_full.loc[disp.index] if not merged_full.empty else merged_full
 
     metrics_cols_cmp = []
     metrics_cols_cmp.extend(["노출", "노출 증감", "노출 차이"] if show_deltas else ["노출"])
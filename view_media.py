@@ -162,7 +162,32 @@ def _metric_expr(cols: set[str], *candidates: str) -> str:
             return f"COALESCE({c}, 0)"
     return "0"
 
+def _coalesce_text_expr(cols: set[str], candidates: list[str], default: str) -> str:
+    picked = [f"NULLIF(CAST({c} AS TEXT), '')" for c in candidates if c in cols]
+    if not picked:
+        return f"'{default}'"
+    return f"COALESCE({', '.join(picked)}, '{default}')"
+
+def _full_month_span(d1, d2) -> tuple | None:
+    """Return the first/last month_start fully covered by [d1, d2], or None."""
+    d1 = pd.Timestamp(d1)
+    d2 = pd.Timestamp(d2)
+    m1 = d1 if d1.day == 1 else (d1 + pd.offsets.MonthBegin(1))
+    last_full_end = d2 if d2.is_month_end else (d2.replace(day=1) - pd.Timedelta(days=1))
+    m2 = last_full_end.replace(day=1)
+    if m1 > m2:
+        return None
+    return m1.date(), m2.date()
+
 def _query_media_region(engine, f, diag: list | None = None) -> pd.DataFrame:
+    """Media/device breakdowns aggregated in SQL.
+
+    Returns one long frame with a ``_grain`` column ('media' or 'device').
+    Whole months inside the range come from the collector-maintained
+    fact_media_monthly rollup; only the partial edge days hit fact_media_daily.
+    Months collected before the rollup existed are filled once with
+    ``collector.py --backfill_media_monthly`` (or the settings page button).
+    """
     if not table_exists(engine, 'fact_media_daily'):
         _diag_add(diag, '매체 원천', 'error', 0, 'fact_media_daily', '테이블이 존재하지 않습니다.')
         return pd.DataFrame()
@@ -174,35 +199,44 @@ def _query_media_region(engine, f, diag: list | None = None) -> pd.DataFrame:
     cids = tuple(f.get('selected_customer_ids', []) or ())
     where_cid = f"AND CAST(customer_id AS TEXT) IN ({_sql_in_str_list(list(cids))})" if cids else ''
 
-    select_cols = [
-        'dt', 'customer_id',
-        'campaign_type' if 'campaign_type' in cols else None,
-        'campaign_tp' if 'campaign_tp' in cols else None,
-        'campaign_type_label' if 'campaign_type_label' in cols else None,
-        'media_name' if 'media_name' in cols else None,
-        'media_code' if 'media_code' in cols else None,
-        'media_tp' if 'media_tp' in cols else None,
-        'placement_name' if 'placement_name' in cols else None,
-        'placement_code' if 'placement_code' in cols else None,
-        'placement_tp' if 'placement_tp' in cols else None,
-        'region_name' if 'region_name' in cols else None,
-        'device_name' if 'device_name' in cols else None,
-        'device' if 'device' in cols else None,
-        'device_tp' if 'device_tp' in cols else None,
-        'device_type' if 'device_type' in cols else None,
-        'platform' if 'platform' in cols else None,
-        f"{_metric_expr(cols, 'imp')} AS imp",
-        f"{_metric_expr(cols, 'clk')} AS clk",
-        f"{_metric_expr(cols, 'cost')} AS cost",
-        f"{_metric_expr(cols, 'tot_conv', 'purchase_conv', 'conv')} AS conv",
-        f"{_metric_expr(cols, 'tot_sales', 'purchase_sales', 'sales')} AS sales",
-    ]
-    select_cols = [c for c in select_cols if c]
+    cp_candidates = [c for c in ['campaign_type', 'campaign_tp', 'campaign_type_label'] if c in cols]
+    type_filter = _type_filter_sql(type_vals, _coalesce_text_expr(cols, cp_candidates, '')) if type_vals and cp_candidates else ''
+    media_expr = _coalesce_text_expr(cols, ['media_name', 'placement_name', 'media_code', 'placement_code', 'media_tp', 'placement_tp'], '전체')
+    device_expr = _coalesce_text_expr(cols, ['device_name', 'device', 'device_tp', 'device_type', 'platform'], '기타')
+
+    month_span = _full_month_span(f['start'], f['end']) if table_exists(engine, 'fact_media_monthly') else None
+    daily_where = "dt BETWEEN :d1 AND :d2"
+    monthly_sql = ''
+    if month_span:
+        params['m1'], params['m2'] = str(month_span[0]), str(month_span[1])
+        daily_where += " AND dt NOT BETWEEN :m1 AND (CAST(:m2 AS DATE) + INTERVAL '1 month' - INTERVAL '1 day')"
+        monthly_sql = f"""
+            UNION ALL
+            SELECT media_name, device_name, imp, clk, cost, conv, sales
+            FROM fact_media_monthly
+            WHERE month_start BETWEEN :m1 AND :m2 {where_cid} {_type_filter_sql(type_vals) if type_vals else ''}
+        """
+
     sql = f"""
-        SELECT /* media_connection_fix_raw_v1 */
-            {', '.join(select_cols)}
-        FROM fact_media_daily
-        WHERE dt BETWEEN :d1 AND :d2 {where_cid}
+        WITH src AS (
+            SELECT
+                {media_expr} AS media_key,
+                {device_expr} AS device_key,
+                {_metric_expr(cols, 'imp')} AS imp,
+                {_metric_expr(cols, 'clk')} AS clk,
+                {_metric_expr(cols, 'cost')} AS cost,
+                {_metric_expr(cols, 'tot_conv', 'purchase_conv', 'conv')} AS conv,
+                {_metric_expr(cols, 'tot_sales', 'purchase_sales', 'sales')} AS sales
+            FROM fact_media_daily
+            WHERE {daily_where} {where_cid} {type_filter}
+            {monthly_sql}
+        )
+        SELECT /* media_grouping_sets_v1 */
+            CASE WHEN GROUPING(media_key) = 0 THEN 'media' ELSE 'device' END AS _grain,
+            media_key, device_key,
+            SUM(imp) AS imp, SUM(clk) AS clk, SUM(cost) AS cost, SUM(conv) AS conv, SUM(sales) AS sales
+        FROM src
+        GROUP BY GROUPING SETS ((media_key), (device_key))
     """
     try:
         raw = sql_read(engine, sql, params)
@@ -212,36 +246,19 @@ def _query_media_region(engine, f, diag: list | None = None) -> pd.DataFrame:
     if raw is None or raw.empty:
         _diag_add(diag, '매체 원천 조회', 'zero_data', 0, 'fact_media_daily', '기간/필터 기준 원천 데이터 없음')
         return pd.DataFrame()
-    _diag_add(diag, '매체 원천 조회', 'ok', len(raw.index), 'fact_media_daily', '원천 로우 조회 성공')
-
-    cp_candidates = [c for c in ['campaign_type', 'campaign_tp', 'campaign_type_label'] if c in raw.columns]
-    if type_vals and cp_candidates:
-        cp_series = raw[cp_candidates].bfill(axis=1).iloc[:, 0].fillna('').astype(str)
-        raw = raw[cp_series.isin(type_vals)]
-        if raw.empty:
-            _diag_add(diag, '유형 필터', 'zero_data', 0, 'fact_media_daily', '유형 필터 적용 후 데이터 없음')
-            return pd.DataFrame()
-        _diag_add(diag, '유형 필터', 'ok', len(raw.index), 'fact_media_daily', '유형 필터 적용 후 잔존')
-
-    media_cols = [c for c in ['media_name', 'placement_name', 'media_code', 'placement_code', 'media_tp', 'placement_tp'] if c in raw.columns]
-    device_cols = [c for c in ['device_name', 'device', 'device_tp', 'device_type', 'platform'] if c in raw.columns]
-
-    if media_cols:
-        raw['매체이름'] = raw[media_cols].replace('', np.nan).bfill(axis=1).iloc[:, 0].fillna('전체').map(_map_media_name)
-    else:
-        raw['매체이름'] = '전체'
-
-    if device_cols:
-        raw['기기명'] = raw[device_cols].replace('', np.nan).bfill(axis=1).iloc[:, 0].fillna('기타').map(_normalize_device_value)
-    else:
-        raw['기기명'] = '기타'
+    source = 'fact_media_monthly+fact_media_daily' if month_span else 'fact_media_daily'
+    _diag_add(diag, '매체 원천 조회', 'ok', len(raw.index), source, 'SQL 집계 조회 성공')
 
+    raw = raw.copy()
+    raw['매체이름'] = raw['media_key'].map(_map_media_name).where(raw['_grain'] == 'media', '전체')
+    raw['기기명'] = raw['device_key'].map(_normalize_device_value).where(raw['_grain'] == 'device', '기타')
     for c in ['imp', 'clk', 'cost', 'conv', 'sales']:
         raw[c] = pd.to_numeric(raw[c], errors='coerce').fillna(0)
 
-    out = raw.groupby(['매체이름', '기기명'], as_index=False)[['imp', 'clk', 'cost', 'conv', 'sales']].sum()
+    # Code → name mapping can fold several raw keys into one label, so re-sum the (small) SQL result.
+    out = raw.groupby(['_grain', '매체이름', '기기명'], as_index=False)[['imp', 'clk', 'cost', 'conv', 'sales']].sum()
     out = out.rename(columns={'imp':'노출수','clk':'클릭수','cost':'광고비','conv':'전환수','sales':'전환매출'})
-    _diag_add(diag, '매체 집계', 'ok' if not out.empty else 'zero_data', len(out.index), 'fact_media_daily', '매체/기기 기준 집계 완료')
+    _diag_add(diag, '매체 집계', 'ok' if not out.empty else 'zero_data', len(out.index), source, '매체/기기 GROUPING SETS 집계 완료')
     return out
 
 def _query_device(engine, f, diag: list | None = None, media_df: pd.DataFrame | None = None) -> pd.DataFrame:
@@ -251,7 +268,7 @@ def _query_device(engine, f, diag: list | None = None, media_df: pd.DataFrame |
     if media_df.empty:
         _diag_add(diag, '기기 집계', 'zero_data', 0, 'fact_media_daily', '매체 원천이 비어 기기 집계를 만들 수 없습니다.')
         return pd.DataFrame()
-    out = media_df.groupby('기기명', as_index=False)[['노출수', '클릭수', '광고비', '전환수', '전환매출']].sum()
+    out = media_df[media_df['_grain'] == 'device'][['기기명', '노출수', '클릭수', '광고비', '전환수', '전환매출']].reset_index(drop=True)
     _diag_add(diag, '기기 집계', 'ok' if not out.empty else 'zero_data', len(out.index), 'fact_media_daily', '매체 원천 기반 기기 집계 완료')
     return out
 
@@ -303,7 +320,7 @@ def page_media(engine, f):
         _render_diag_panel(diag, enabled=bool(f.get("show_diagnostics", False)))
         return
 
-    df_media = _calc_metrics(media_region_df.groupby('매체이름', as_index=False)[['노출수', '클릭수', '광고비', '전환수', '전환매출']].sum()) if media_region_df is not None and not media_region_df.empty else pd.DataFrame()
+    df_media = _calc_metrics(media_region_df[media_region_df['_grain'] == 'media'].drop(columns=['_grain', '기기명'])) if media_region_df is not None and not media_region_df.empty else pd.DataFrame()
     
     if device_df is not None and not device_df.empty:
         device_df['기기명'] = device_df['기기명'].apply(_normalize_device_value)
@@ -212,6 +212,26 @@ def _build_overview_timeseries_frames(daily_ts: pd.DataFrame, base_daily_ts: pd.
     return daily_disp, dow_disp, weekly_disp
 
 
+@st.cache_data(ttl=43200, max_entries=30, show_spinner=False)
+def _cached_overview_comparison(_engine, kind: str, cur_range: tuple, cmp_range: tuple, cids: tuple, type_sel: tuple):
+    """상세 패널 하나의 현재/비교 기간 결합 결과를 (현재 기간, 비교 기간, 필터) 단위로 캐시한다."""
+    d1, d2 = cur_range
+    b1, b2 = cmp_range
+    if kind == "campaign":
+        cur_camp = _cached_campaign_bundle(_engine, d1, d2, cids, type_sel)
+        base_camp = _cached_campaign_bundle(_engine, b1, b2, cids, type_sel)
+        return _build_overview_campaign_frames(cur_camp, base_camp, get_meta(_engine))
+    if kind == "keyword":
+        cur_kw = _cached_keyword_bundle(_engine, d1, d2, cids, type_sel)
+        base_kw = _cached_keyword_bundle(_engine, b1, b2, cids, type_sel)
+        return _build_overview_keyword_frames(cur_kw, base_kw)
+    if kind == "timeseries":
+        daily_ts = _cached_campaign_timeseries(_engine, d1, d2, cids, type_sel)
+        base_daily_ts = _cached_campaign_timeseries(_engine, b1, b2, cids, type_sel)
+        return _build_overview_timeseries_frames(daily_ts, base_daily_ts)
+    raise ValueError(f"unknown comparison kind: {kind}")
+
+
 def _get_top_keyword_report_text(kw_bundle: pd.DataFrame) -> str:
     top_kw_str = "없음"
     if kw_bundle is None or kw_bundle.empty:
@@ -512,52 +532,52 @@ def _safe_div(n, d, mult=1.0):
     sd = np.where(d == 0, 1, d)
     return np.where(d > 0, (n / sd) * mult, 0.0)
 
+def _group_comparison_metrics(df, group_col) -> pd.DataFrame:
+    sum_cols = ['imp', 'clk', 'cost', 'conv', 'sales']
+    if df is None or df.empty:
+        return pd.DataFrame(columns=sum_cols + ['tot_conv', 'tot_sales'])
+    sum_cols += [c for c in ('tot_conv', 'tot_sales') if c in df.columns]
+    work = df[[group_col]].copy()
+    for c in sum_cols:
+        work[c] = df[c] if c in df.columns else 0.0
+    grp = work.groupby(group_col)[sum_cols].sum()
+    if 'tot_conv' not in grp.columns: grp['tot_conv'] = grp['conv']
+    if 'tot_sales' not in grp.columns: grp['tot_sales'] = grp['sales']
+    rank = _weighted_avg_rank_by_group(df, group_col)
+    if not rank.empty:
+        grp['avg_rank'] = rank.dropna(subset=[group_col]).set_index(group_col)['avg_rank'].reindex(grp.index)
+    return grp
+
 def _build_comparison_df(cur_df, base_df, group_col, group_label, type_kor_map=None):
     if cur_df.empty and base_df.empty: return pd.DataFrame()
 
     cur_has_rank = not cur_df.empty and 'avg_rank' in cur_df.columns
     base_has_rank = not base_df.empty and 'avg_rank' in base_df.columns
-    base_cols = [group_col, 'imp', 'clk', 'cost', 'conv', 'sales']
-    for c in base_cols[1:]:
-        if not cur_df.empty and c not in cur_df.columns: cur_df[c] = 0.0
-        if not base_df.empty and c not in base_df.columns: base_df[c] = 0.0
 
-    cur_grp = cur_df.groupby(group_col)[base_cols[1:]].sum().reset_index() if not cur_df.empty else pd.DataFrame(columns=base_cols)
-    base_grp = base_df.groupby(group_col)[base_cols[1:]].sum().reset_index() if not base_df.empty else pd.DataFrame(columns=base_cols)
-    
-    if not cur_df.empty:
-        cur_grp['tot_conv'] = cur_df.groupby(group_col)['tot_conv'].sum().values if 'tot_conv' in cur_df.columns else cur_grp['conv']
-        cur_grp['tot_sales'] = cur_df.groupby(group_col)['tot_sales'].sum().values if 'tot_sales' in cur_df.columns else cur_grp['sales']
-        cur_rank = _weighted_avg_rank_by_group(cur_df, group_col)
-        if not cur_rank.empty:
-            cur_grp = cur_grp.merge(cur_rank, on=group_col, how="left")
-    
-    if not base_df.empty:
-        base_grp['tot_conv'] = base_df.groupby(group_col)['tot_conv'].sum().values if 'tot_conv' in base_df.columns else base_grp['conv']
-        base_grp['tot_sales'] = base_df.groupby(group_col)['tot_sales'].sum().values if 'tot_sales' in base_df.columns else base_grp['sales']
-        base_rank = _weighted_avg_rank_by_group(base_df, group_col)
-        if not base_rank.empty:
-            base_grp = base_grp.merge(base_rank, on=group_col, how="left")
-
-    merged = pd.merge(cur_grp, base_grp, on=group_col, how='outer', suffixes=('_cur', '_base')).fillna(0)
-
-    c_imp, b_imp = merged.get('imp_cur', 0), merged.get('imp_base', 0)
-    c_clk, b_clk = merged.get('clk_cur', 0), merged.get('clk_base', 0)
-    c_cost, b_cost = merged.get('cost_cur', 0), merged.get('cost_base', 0)
-    c_conv, b_conv = merged.get('conv_cur', 0), merged.get('conv_base', 0)
-    c_sales, b_sales = merged.get('sales_cur', 0), merged.get('sales_base', 0)
-    c_tot_conv, b_tot_conv = merged.get('tot_conv_cur', 0), merged.get('tot_conv_base', 0)
-    c_tot_sales, b_tot_sales = merged.get('tot_sales_cur', 0), merged.get('tot_sales_base', 0)
-    cur_rank_col = 'avg_rank_cur' if (cur_has_rank and base_has_rank) else ('avg_rank' if cur_has_rank else None)
-    base_rank_col = 'avg_rank_base' if (cur_has_rank and base_has_rank) else ('avg_rank' if base_has_rank and not cur_has_rank else None)
-    c_rank = pd.to_numeric(merged.get(cur_rank_col), errors="coerce") if cur_rank_col else pd.Series(np.nan, index=merged.index)
-    b_rank = pd.to_numeric(merged.get(base_rank_col), errors="coerce") if base_rank_col else pd.Series(np.nan, index=merged.index)
+    # 현재/비교 그룹 합계를 같은 인덱스로 정렬해서 outer merge 없이 바로 차이를 계산
+    cur_grp = _group_comparison_metrics(cur_df, group_col)
+    base_grp = _group_comparison_metrics(base_df, group_col)
+    keys = cur_grp.index.union(base_grp.index)
+    cur = cur_grp.reindex(keys).fillna(0).reset_index(drop=True)
+    base = base_grp.reindex(keys).fillna(0).reset_index(drop=True)
+    group_values = pd.Series(keys, dtype=object)
+
+    c_imp, b_imp = cur['imp'], base['imp']
+    c_clk, b_clk = cur['clk'], base['clk']
+    c_cost, b_cost = cur['cost'], base['cost']
+    c_conv, b_conv = cur['conv'], base['conv']
+    c_sales, b_sales = cur['sales'], base['sales']
+    c_tot_conv, b_tot_conv = cur['tot_conv'], base['tot_conv']
+    c_tot_sales, b_tot_sales = cur['tot_sales'], base['tot_sales']
+    cur_rank_col = 'avg_rank' if cur_has_rank else None
+    c_rank = pd.to_numeric(cur.get('avg_rank'), errors="coerce") if cur_has_rank else pd.Series(np.nan, index=cur.index)
+    b_rank = pd.to_numeric(base.get('avg_rank'), errors="coerce") if base_has_rank else pd.Series(np.nan, index=cur.index)
 
     c_cpc = _safe_div(c_cost, c_clk)
     b_cpc = _safe_div(b_cost, b_clk)
 
     out = pd.DataFrame()
-    out[group_label] = merged[group_col].astype(str).str.upper().map(type_kor_map).fillna(merged[group_col]) if type_kor_map else merged[group_col]
+    out[group_label] = group_values.astype(str).str.upper().map(type_kor_map).fillna(group_values) if type_kor_map else group_values
 
     out['노출수'] = c_imp
     out['클릭수'] = c_clk
@@ -659,17 +679,23 @@ def _build_ts_compare_df(cur_df, base_df, group_col, group_label, align_mode="la
 
     base_view = _build_ts_df(base_df, group_col, group_label) if base_df is not None and not base_df.empty else pd.DataFrame()
 
+    cur_view = cur_view.reset_index(drop=True)
+    merge_key = "_seq" if align_mode == "sequence" else group_label
     if align_mode == "sequence":
-        cur_view = cur_view.reset_index(drop=True).copy()
-        base_view = base_view.reset_index(drop=True).copy() if not base_view.empty else base_view
         cur_view["_seq"] = range(len(cur_view))
-        if not base_view.empty: base_view["_seq"] = range(len(base_view))
-        merge_key = "_seq"
-    else: merge_key = group_label
 
-    if not base_view.empty: merged = pd.merge(cur_view, base_view, on=merge_key, how="left", suffixes=("", "_base"))
+    merged = cur_view.copy()
+    if not base_view.empty:
+        # 비교 기간을 현재 행 순서(순번 또는 라벨)에 맞춰 reindex → 열 단위 벡터 연산
+        base_view = base_view.reset_index(drop=True)
+        if align_mode == "sequence":
+            aligned = base_view.reindex(range(len(cur_view)))
+        else:
+            aligned = base_view.drop_duplicates(subset=[group_label]).set_index(group_label, drop=False).reindex(cur_view[group_label])
+        for c in base_view.columns:
+            if c == merge_key: continue
+            merged[f"{c}_base" if c in cur_view.columns else c] = aligned[c].to_numpy()
     else:
-        merged = cur_view.copy()
         for c in cur_view.columns:
             if c != merge_key: merged[f"{c}_base"] = 0
 
@@ -817,8 +843,6 @@ def page_overview(meta: pd.DataFrame, engine, f: Dict) -> None:
             cur_kw = pd.DataFrame()
             _diag_add(diag, "키워드 번들(현재)", "error", 0, "query_keyword_bundle", f"{type(e).__name__}: {e}")
             
-        base_camp = pd.DataFrame()
-        base_kw = pd.DataFrame()
         kw_bundle = None
         _diag_add(diag, "캠페인 번들(비교)", "warn", 0, "query_campaign_bundle", f"비교 기간 {b1}~{b2} | 상세 패널 필요 시 지연 조회")
         _diag_add(diag, "키워드 번들(비교)", "warn", 0, "query_keyword_bundle", f"비교 기간 {b1}~{b2} | 상세 패널 필요 시 지연 조회")
@@ -830,7 +854,6 @@ def page_overview(meta: pd.DataFrame, engine, f: Dict) -> None:
             daily_ts = pd.DataFrame()
             _diag_add(diag, "일자 추이(현재)", "error", 0, "query_campaign_timeseries", f"{type(e).__name__}: {e}")
             
-        base_daily_ts = pd.DataFrame()
         _diag_add(diag, "일자 추이(비교)", "warn", 0, "query_campaign_timeseries", f"비교 기간 {b1}~{b2} | 기간별 상세 필요 시 지연 조회")
 
     account_name = "전체 계정"
@@ -1094,24 +1117,19 @@ def page_overview(meta: pd.DataFrame, engine, f: Dict) -> None:
         label_visibility="collapsed",
     )
 
-    # 탭별 화면 렌더링에 필요한 데이터만 지연 로드 (UI 응답성 최적화)
+    # 탭별 화면 렌더링에 필요한 비교 데이터만 지연 로드 (UI 응답성 최적화)
+    cur_range, cmp_range = (f["start"], f["end"]), (b1, b2)
     if detail_panel in {"업체별 요약", "매체·유형별 요약", "캠페인 상세 분석"}:
-        if base_camp is None or base_camp.empty:
-            try: base_camp = _cached_campaign_bundle(engine, b1, b2, cids, type_sel)
-            except Exception: base_camp = pd.DataFrame()
-        df_display, df_type_display, camp_disp = _build_overview_campaign_frames(cur_camp, base_camp, meta)
+        try: df_display, df_type_display, camp_disp = _cached_overview_comparison(engine, "campaign", cur_range, cmp_range, cids, type_sel)
+        except Exception: df_display, df_type_display, camp_disp = pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
 
     if detail_panel == "키워드 상세 분석":
-        if base_kw is None or base_kw.empty:
-            try: base_kw = _cached_keyword_bundle(engine, b1, b2, cids, type_sel)
-            except Exception: base_kw = pd.DataFrame()
-        kw_disp = _build_overview_keyword_frames(cur_kw, base_kw)
+        try: kw_disp = _cached_overview_comparison(engine, "keyword", cur_range, cmp_range, cids, type_sel)
+        except Exception: kw_disp = pd.DataFrame()
 
     if detail_panel == "기간별 상세":
-        if base_daily_ts is None or base_daily_ts.empty:
-            try: base_daily_ts = _cached_campaign_timeseries(engine, b1, b2, cids, type_sel)
-            except Exception: base_daily_ts = pd.DataFrame()
-        daily_disp, dow_disp, weekly_disp = _build_overview_timeseries_frames(daily_ts, base_daily_ts)
+        try: daily_disp, dow_disp, weekly_disp = _cached_overview_comparison(engine, "timeseries", cur_range, cmp_range, cids, type_sel)
+        except Exception: daily_disp, dow_disp, weekly_disp = pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
 
     # 렌더링 블록
     if detail_panel == "업체별 요약":
@@ -1184,46 +1202,41 @@ def page_overview(meta: pd.DataFrame, engine, f: Dict) -> None:
 
 
     # ----------------------------------------------------
-    # 엑셀 다운로드 (화면에 표시되지 않은 탭의 데이터도 모두 강제로 로드하여 시트별로 저장)
+    # 엑셀 다운로드 (요청 시에만 화면에 없는 탭까지 비교 데이터를 만들어 시트별로 저장)
     # ----------------------------------------------------
     st.markdown("<div style='height: 24px;'></div>", unsafe_allow_html=True)
-    
-    # 누락 방지를 위한 전체 데이터 프레임 강제 동기화 
-    if base_camp is None or base_camp.empty:
-        try: base_camp = _cached_campaign_bundle(engine, b1, b2, cids, type_sel)
-        except Exception: base_camp = pd.DataFrame()
-    if df_display.empty or camp_disp.empty:
-        df_display, df_type_display, camp_disp = _build_overview_campaign_frames(cur_camp, base_camp, meta)
-
-    if base_kw is None or base_kw.empty:
-        try: base_kw = _cached_keyword_bundle(engine, b1, b2, cids, type_sel)
-        except Exception: base_kw = pd.DataFrame()
-    if kw_disp.empty:
-        kw_disp = _build_overview_keyword_frames(cur_kw, base_kw)
-
-    if base_daily_ts is None or base_daily_ts.empty:
-        try: base_daily_ts = _cached_campaign_timeseries(engine, b1, b2, cids, type_sel)
-        except Exception: base_daily_ts = pd.DataFrame()
-    if daily_disp.empty:
-        daily_disp, dow_disp, weekly_disp = _build_overview_timeseries_frames(daily_ts, base_daily_ts)
-
-    has_data_to_export = any([not df_display.empty, not df_type_display.empty, not camp_disp.empty, not daily_disp.empty, not kw_disp.empty])
-    if has_data_to_export:
-        with st.container(border=True):
-            st.markdown("<div style='font-size:14px; font-weight:700; margin-bottom:8px;'>엑셀 데이터 일괄 다운로드</div>", unsafe_allow_html=True)
-            st.markdown("<div style='font-size:12px; color:var(--nv-muted); margin-bottom:10px;'>계정/유형/캠페인/키워드/일자/요일별 상세 데이터를 하나의 엑셀 파일로 내려받습니다.</div>", unsafe_allow_html=True)
-            excel_buffer = io.BytesIO()
-            with pd.ExcelWriter(excel_buffer) as writer:
-                if not df_display.empty: format_for_csv(df_display).to_excel(writer, sheet_name='계정별_성과상세', index=False)
-                if not df_type_display.empty: format_for_csv(df_type_display).to_excel(writer, sheet_name='유형별_성과상세', index=False)
-                if not camp_disp.empty: format_for_csv(camp_disp).to_excel(writer, sheet_name='캠페인별_성과상세', index=False)
-                if not kw_disp.empty: format_for_csv(kw_disp).to_excel(writer, sheet_name='키워드별_성과상세', index=False)
-                if not daily_disp.empty: format_for_csv(daily_disp).to_excel(writer, sheet_name='일자별_성과상세', index=False)
-                if not dow_disp.empty:
-                    dow_export = dow_disp.drop(columns=['요일']) if '요일' in dow_disp.columns else dow_disp
-                    format_for_csv(dow_export).to_excel(writer, sheet_name='요일별_성과상세', index=False)
-                if not weekly_disp.empty: format_for_csv(weekly_disp).to_excel(writer, sheet_name='주간_성과상세', index=False)
-            st.download_button("통합 엑셀 다운로드", data=excel_buffer.getvalue(), file_name=f"통합_상세_성과보고서_{f['start']}_{f['end']}.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", width="stretch")
+
+    with st.container(border=True):
+        st.markdown("<div style='font-size:14px; font-weight:700; margin-bottom:8px;'>엑셀 데이터 일괄 다운로드</div>", unsafe_allow_html=True)
+        st.markdown("<div style='font-size:12px; color:var(--nv-muted); margin-bottom:10px;'>계정/유형/캠페인/키워드/일자/요일별 상세 데이터를 하나의 엑셀 파일로 내려받습니다.</div>", unsafe_allow_html=True)
+        prepare_excel = st.toggle("엑셀 파일 준비", value=False, key="overview_excel_prepare")
+        if prepare_excel:
+            if df_display.empty or camp_disp.empty:
+                try: df_display, df_type_display, camp_disp = _cached_overview_comparison(engine, "campaign", cur_range, cmp_range, cids, type_sel)
+                except Exception: pass
+            if kw_disp.empty:
+                try: kw_disp = _cached_overview_comparison(engine, "keyword", cur_range, cmp_range, cids, type_sel)
+                except Exception: pass
+            if daily_disp.empty:
+                try: daily_disp, dow_disp, weekly_disp = _cached_overview_comparison(engine, "timeseries", cur_range, cmp_range, cids, type_sel)
+                except Exception: pass
+
+            has_data_to_export = any([not df_display.empty, not df_type_display.empty, not camp_disp.empty, not daily_disp.empty, not kw_disp.empty])
+            if has_data_to_export:
+                excel_buffer = io.BytesIO()
+                with pd.ExcelWriter(excel_buffer) as writer:
+                    if not df_display.empty: format_for_csv(df_display).to_excel(writer, sheet_name='계정별_성과상세', index=False)
+                    if not df_type_display.empty: format_for_csv(df_type_display).to_excel(writer, sheet_name='유형별_성과상세', index=False)
+                    if not camp_disp.empty: format_for_csv(camp_disp).to_excel(writer, sheet_name='캠페인별_성과상세', index=False)
+                    if not kw_disp.empty: format_for_csv(kw_disp).to_excel(writer, sheet_name='키워드별_성과상세', index=False)
+                    if not daily_disp.empty: format_for_csv(daily_disp).to_excel(writer, sheet_name='일자별_성과상세', index=False)
+                    if not dow_disp.empty:
+                        dow_export = dow_disp.drop(columns=['요일']) if '요일' in dow_disp.columns else dow_disp
+                        format_for_csv(dow_export).to_excel(writer, sheet_name='요일별_성과상세', index=False)
+                    if not weekly_disp.empty: format_for_csv(weekly_disp).to_excel(writer, sheet_name='주간_성과상세', index=False)
+                st.download_button("통합 엑셀 다운로드", data=excel_buffer.getvalue(), file_name=f"통합_상세_성과보고서_{f['start']}_{f['end']}.xlsx", mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", width="stretch")
+            else:
+                st.info("내보낼 데이터가 없습니다.")
 
     with st.expander("텍스트 보고서 생성", expanded=False):
         include_campaign_breakdown = st.checkbox(
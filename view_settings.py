@@ -10,6 +10,9 @@ import streamlit_antd_components as sac
 from sqlalchemy import text
 
 from data import sql_read, db_ping, seed_from_accounts_xlsx
+from collector_media import backfill_media_monthly_rollup
+from db_indexes import ensure_dashboard_indexes
+from perf_utils import render_perf_telemetry_summary
 from ui import render_toolbar
 
 
@@ -222,12 +225,26 @@ def page_settings(engine) -> None:
         if st.button("초고속 DB 목차 만들기", type="secondary", icon=":material/bolt:"):
             with st.spinner("진행 중..."):
                 try:
-                    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
-                        conn.execute(text("CREATE INDEX IF NOT EXISTS idx_fcd_dt ON fact_campaign_daily(dt);"))
-                        # ... 필요한 인덱스 쿼리들
-                    st.success("최적화 완료!", icon=":material/check_circle:")
+                    created = ensure_dashboard_indexes(engine, concurrently=True)
+                    st.success(f"최적화 완료! (신규 인덱스 {len(created)}개)", icon=":material/check_circle:")
                 except Exception as e:
                     st.error(f"오류: {e}")
+        if st.button("매체 월 집계 채우기", type="secondary", icon=":material/calendar_month:"):
+            with st.spinner("진행 중..."):
+                try:
+                    res = backfill_media_monthly_rollup(engine)
+                    if res["failed"]:
+                        st.warning(f"일부 실패: {res['failed']}/{res['targets']}개 계정-월 (다시 누르면 남은 월만 채웁니다)")
+                    else:
+                        st.success(f"완료! ({res['rebuilt']}개 계정-월)", icon=":material/check_circle:")
+                    st.cache_data.clear()
+                except Exception as e:
+                    st.error(f"오류: {e}")
+
+        sac.divider(align='center', color='gray', key='div_perf')
+
+        st.markdown("### 대시보드 속도 통계")
+        render_perf_telemetry_summary()
 
         sac.divider(align='center', color='gray', key='div_2')
 
@@ -12,7 +12,7 @@ from datetime import date, timedelta
 from typing import Dict
 import altair as alt
 
-from data import sql_read, get_table_columns, table_exists, _sql_in_str_list
+from data import sql_read, get_table_columns, table_exists, _build_in_filter
 
 
 
@@ -101,10 +101,25 @@ def get_datalab_trend(client_id: str, client_secret: str, keyword: str, start_da
 def _cached_internal_daily_detail(_engine, d1: date, d2: date, cids: tuple) -> pd.DataFrame:
     return get_internal_daily_detail(_engine, d1, d2, cids, diag=None)
 
+def _internal_daily_detail_sql(has_grp: bool, has_camp: bool, sales_col: str, where_cid: str) -> str:
+    # dim/fact 키는 모두 TEXT 라서 캐스트 없이 조인해야 PK/인덱스를 그대로 탄다.
+    g_join = "LEFT JOIN dim_adgroup g ON g.customer_id = dk.customer_id AND g.adgroup_id = dk.adgroup_id" if has_grp else ""
+    c_join = "LEFT JOIN dim_campaign c ON c.customer_id = g.customer_id AND c.campaign_id = g.campaign_id" if (has_grp and has_camp) else ""
+
+    c_name = "COALESCE(c.campaign_name, g.campaign_id, '알 수 없음')" if (has_grp and has_camp) else "'알 수 없음'"
+    g_name = "COALESCE(g.adgroup_name, dk.adgroup_id, '알 수 없음')" if has_grp else "dk.adgroup_id"
+
+    return f"""
+        SELECT f.dt AS dt, {c_name} AS campaign_name, {g_name} AS adgroup_name,
+            SUM(f.imp) AS imp, SUM(f.clk) AS clk, SUM(f.cost) AS cost, SUM(COALESCE({sales_col}, 0)) AS sales
+        FROM fact_keyword_daily f JOIN dim_keyword dk ON dk.customer_id = f.customer_id AND dk.keyword_id = f.keyword_id
+        {g_join} {c_join} WHERE f.dt BETWEEN :d1 AND :d2 {where_cid} GROUP BY 1, 2, 3
+        """
+
+
 def get_internal_daily_detail(_engine, d1: date, d2: date, cids: tuple, diag: list | None = None) -> pd.DataFrame:
     df_list = []
-    cid_str = _sql_in_str_list(list(cids))
-    where_cid = f"AND f.customer_id::text IN ({cid_str})" if cids else ""
+    where_cid, cid_params = _build_in_filter("f.customer_id", cids, "trend_cid")
     
     has_camp = table_exists(_engine, "dim_campaign")
     has_grp = table_exists(_engine, "dim_adgroup")
@@ -113,21 +128,9 @@ def get_internal_daily_detail(_engine, d1: date, d2: date, cids: tuple, diag: li
         _diag_add(diag, "내부 원천", "ok", None, "fact_keyword_daily + dim_keyword", "키워드 일별 상세 기준")
         f_cols = get_table_columns(_engine, "fact_keyword_daily")
         sales_col = "f.sales" if "sales" in f_cols else "0"
-        
-        g_join = "LEFT JOIN dim_adgroup g ON dk.customer_id::text = g.customer_id::text AND dk.adgroup_id::text = g.adgroup_id::text" if has_grp else ""
-        c_join = "LEFT JOIN dim_campaign c ON g.customer_id::text = c.customer_id::text AND g.campaign_id::text = c.campaign_id::text" if (has_grp and has_camp) else ""
-        
-        c_name = "COALESCE(c.campaign_name, g.campaign_id::text, '알 수 없음')" if (has_grp and has_camp) else "'알 수 없음'"
-        g_name = "COALESCE(g.adgroup_name, dk.adgroup_id::text, '알 수 없음')" if has_grp else "dk.adgroup_id::text"
-
-        sql = f"""
-        SELECT f.dt::date AS dt, {c_name} AS campaign_name, {g_name} AS adgroup_name,
-            SUM(f.imp) AS imp, SUM(f.clk) AS clk, SUM(f.cost) AS cost, SUM(COALESCE({sales_col}, 0)) AS sales
-        FROM fact_keyword_daily f JOIN dim_keyword dk ON f.customer_id::text = dk.customer_id::text AND f.keyword_id::text = dk.keyword_id::text
-        {g_join} {c_join} WHERE f.dt BETWEEN :d1 AND :d2 {where_cid} GROUP BY 1, 2, 3
-        """
+        sql = _internal_daily_detail_sql(has_grp, has_camp, sales_col, where_cid)
         try:
-            df1 = sql_read(_engine, sql, {"d1": str(d1), "d2": str(d2)})
+            df1 = sql_read(_engine, sql, {"d1": str(d1), "d2": str(d2), **cid_params})
             if df1 is not None and not df1.empty:
                 df_list.append(df1)
                 _diag_add(diag, "내부 원천 조회", "ok", len(df1.index), "fact_keyword_daily", "내부 키워드 일별 로우 조회 성공")